@@ -294,6 +294,7 @@ static struct name_to_val_mapping stats_filters_names[] = {
 static struct name_to_val_mapping output_formats_names[] = {
 	{ .short_name = "table", .value = OUTPUT_FORMAT_TABLE },
 	{ .short_name = "csv", .value = OUTPUT_FORMAT_CSV },
+	{ .short_name = "json", .value = OUTPUT_FORMAT_JSON },
 	{ NULL }
 };
 
@@ -2166,6 +2167,7 @@ int partition_list(unsigned int cache_id, unsigned int output_format)
 	/* 1 is writing end, 0 is reading end of a pipe */
 	FILE *intermediate_file[2];
 	bool use_csv, first_col;
+	int format = TEXT;
 
 	fd = open_ctrl_device();
 	if (fd == -1 )
@@ -2178,7 +2180,13 @@ int partition_list(unsigned int cache_id, unsigned int output_format)
 		return FAILURE;
 	}
 
-	use_csv = (output_format == OUTPUT_FORMAT_CSV);
+	if (output_format == OUTPUT_FORMAT_CSV)
+		format = RAW_CSV;
+	else if (output_format == OUTPUT_FORMAT_JSON)
+		format = JSON;
+
+	/* Machine readable formats leave priority of pinned IO class empty */
+	use_csv = (format != TEXT);
 
 	first_col = true;
 	fprintf(intermediate_file[1], TAG(TABLE_HEADER));
@@ -2218,7 +2226,7 @@ int partition_list(unsigned int cache_id, unsigned int output_format)
 
 	fclose(intermediate_file[1]);
 	if (!result && stat_format_output(intermediate_file[0], stdout,
-					  use_csv?RAW_CSV:TEXT)) {
+					  format)) {
 		cas_printf(LOG_ERR, "An error occurred during statistics formatting.\n");
 		result = FAILURE;
 	}
@@ -2758,7 +2766,10 @@ int list_caches(unsigned int list_format, bool by_id_path)
 	}
 
 	if (caches == NULL && !core_pool_path_cmd.core_pool_count) {
-		cas_printf(LOG_INFO, "No caches running\n");
+		if (OUTPUT_FORMAT_JSON == list_format)
+			printf("[]\n");
+		else
+			cas_printf(LOG_INFO, "No caches running\n");
 		return SUCCESS;
 	}
 
@@ -2771,7 +2782,12 @@ int list_caches(unsigned int list_format, bool by_id_path)
 
 	printout_ctx.intermediate = intermediate_file[0];
 	printout_ctx.out = stdout;
-	printout_ctx.type = (OUTPUT_FORMAT_CSV == list_format ? RAW_CSV : TEXT);
+	if (OUTPUT_FORMAT_CSV == list_format)
+		printout_ctx.type = RAW_CSV;
+	else if (OUTPUT_FORMAT_JSON == list_format)
+		printout_ctx.type = JSON;
+	else
+		printout_ctx.type = TEXT;
 
 	if (pthread_create(&thread, 0, list_printout, &printout_ctx)) {
 		cas_printf(LOG_ERR,"Failed to create thread.\n");
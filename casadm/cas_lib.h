@@ -67,6 +67,7 @@ enum output_format_t {
 	OUTPUT_FORMAT_INVALID = 0,
 	OUTPUT_FORMAT_TABLE = 1,
 	OUTPUT_FORMAT_CSV = 2,
+	OUTPUT_FORMAT_JSON = 3,
 	OUTPUT_FORMAT_DEFAULT = OUTPUT_FORMAT_TABLE
 };
 
@@ -286,6 +287,7 @@ int cas_module_version(char *buff, int size);
 int list_caches(unsigned int list_format, bool by_id_path);
 int cache_status(unsigned int cache_id, unsigned int core_id, int io_class_id,
 		 unsigned int stats_filters, unsigned int stats_format, bool by_id_path);
+int cache_status_all(unsigned int output_format);
 int get_inactive_core_count(const struct kcas_cache_info *cache_info);
 
 int open_ctrl_device_quiet();
@@ -468,7 +468,7 @@ int handle_start()
 }
 
 static cli_option list_options[] = {
-	{'o', "output-format", "Output format: {table|csv}", 1, "FORMAT", 0},
+	{'o', "output-format", "Output format: {table|csv|json}", 1, "FORMAT", 0},
 	{'b', "by-id-path", "Display by-id path to disks instead of short form /dev/sdx"},
 	{0}
 };
@@ -483,7 +483,7 @@ static cli_option stats_options[] = {
 	{'j', "core-id", "Limit display of core-specific statistics to only ones pertaining to a specific core. If this option is not given, casadm will display statistics pertaining to all cores assigned to given cache instance.", 1, "ID", 0},
 	{'d', "io-class-id", "Display per IO class statistics", 1, "ID", CLI_OPTION_OPTIONAL_ARG},
 	{'f', "filter", "Apply filters from the following set: {all, conf, usage, req, blk, err}", 1, "FILTER-SPEC"},
-	{'o', "output-format", "Output format: {table|csv}", 1, "FORMAT"},
+	{'o', "output-format", "Output format: {table|csv|json}", 1, "FORMAT"},
 	{'b', "by-id-path", "Display by-id path to disks instead of short form /dev/sdx"},
 	{0}
 };
@@ -544,6 +544,35 @@ int handle_stats()
 			    command_args_values.by_id_path);
 }
 
+static cli_option stats_all_options[] = {
+	{'o', "output-format", "Output format: {csv|json}", 1, "FORMAT"},
+	{0}
+};
+
+int stats_all_command_handle_option(char *opt, const char **arg)
+{
+	if (!strcmp(opt, "output-format")) {
+		command_args_values.output_format = validate_str_output_format(arg[0]);
+		if (OUTPUT_FORMAT_CSV != command_args_values.output_format &&
+				OUTPUT_FORMAT_JSON != command_args_values.output_format) {
+			cas_printf(LOG_ERR, "Only csv and json output formats are supported\n");
+			return FAILURE;
+		}
+	} else {
+		return FAILURE;
+	}
+
+	return 0;
+}
+
+int handle_stats_all()
+{
+	if (OUTPUT_FORMAT_JSON == command_args_values.output_format)
+		return cache_status_all(OUTPUT_FORMAT_JSON);
+
+	return cache_status_all(OUTPUT_FORMAT_CSV);
+}
+
 static cli_option stop_options[] = {
 	{'i', "cache-id", CACHE_ID_DESC, 1, "ID", CLI_OPTION_REQUIRED},
 	{'n', "no-data-flush", "Do not flush dirty data (may be dangerous)"},
@@ -605,7 +634,7 @@ int handle_stop()
 	.options = { \
 		{'i', "cache-id", CACHE_ID_DESC, 1, "ID", CLI_OPTION_REQUIRED}, \
 		{'j', "core-id", CORE_ID_DESC, 1, "ID", CLI_OPTION_REQUIRED}, \
-		{'o', "output-format", "Output format: {table|csv}", 1, "FORMAT"}, \
+		{'o', "output-format", "Output format: {table|csv|json}", 1, "FORMAT"}, \
 	CORE_PARAMS_NS_END()
 
 #define CACHE_PARAMS_NS_BEGIN(_name, _desc) { \
@@ -621,7 +650,7 @@ int handle_stop()
 
 #define GET_CACHE_PARAMS_NS(_name, _desc) \
 	CACHE_PARAMS_NS_BEGIN(_name, _desc) \
-		{'o', "output-format", "Output format: {table|csv}", 1, "FORMAT"}, \
+		{'o', "output-format", "Output format: {table|csv|json}", 1, "FORMAT"}, \
 	CACHE_PARAMS_NS_END()
 
 
@@ -1197,6 +1226,8 @@ int handle_get_param()
 
 	if (OUTPUT_FORMAT_CSV == command_args_values.output_format) {
 		format = RAW_CSV;
+	} else if (OUTPUT_FORMAT_JSON == command_args_values.output_format) {
+		format = JSON;
 	}
 
 	switch (command_args_values.params_type) {
@@ -1416,7 +1447,7 @@ static cli_option io_class_params_options[] = {
 	[io_class_opt_output_format] = {
 		.short_name = 'o',
 		.long_name = "output-format",
-		.desc = "Output format: {table|csv}",
+		.desc = "Output format: {table|csv|json}",
 		.args_count = 1,
 		.arg = "FORMAT",
 		.priv = (1 << io_class_opt_subcmd_list)
@@ -1872,7 +1903,7 @@ static cli_option version_options[] = {
 	{
 		.short_name = 'o',
 		.long_name = "output-format",
-		.desc = "Output format: {table|csv}",
+		.desc = "Output format: {table|csv|json}",
 		.args_count = 1,
 		.arg = "FORMAT",
 	},
@@ -1917,6 +1948,8 @@ static int handle_version(void)
 	int format = TEXT;
 	if (OUTPUT_FORMAT_CSV == command_args_values.output_format) {
 		format = RAW_CSV;
+	} else if (OUTPUT_FORMAT_JSON == command_args_values.output_format) {
+		format = JSON;
 	}
 
 	fclose(intermediate_file[1]);
@@ -2402,6 +2435,16 @@ static cli_command cas_commands[] = {
 			.flags = CLI_SU_REQUIRED,
 			.help = NULL,
 		},
+		{
+			.name = "stats-all",
+			.desc = "Print statistics for all caches, cores and IO classes",
+			.long_desc = NULL,
+			.options = stats_all_options,
+			.command_handle_opts = stats_all_command_handle_option,
+			.handle = handle_stats_all,
+			.flags = CLI_SU_REQUIRED,
+			.help = NULL,
+		},
 		{
 			.name = "reset-counters",
 			.short_name = 'Z',
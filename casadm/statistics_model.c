@@ -475,12 +475,12 @@ void print_stats_ioclass(struct kcas_io_class *io_class,
 int cache_stats_ioclasses(int ctrl_fd, const struct kcas_cache_info *cache_info,
 			  unsigned int cache_id, unsigned int core_id,
 			  int io_class_id, FILE *outfile,
-			  unsigned int stats_filters)
+			  unsigned int stats_filters, bool blk_postfix)
 {
 	struct kcas_io_class info = {};
 	struct kcas_get_stats stats = {};
 	int part_iter_id;
-	bool cache_stats = (core_id == OCF_CORE_ID_INVALID);
+	bool cache_stats = (core_id == OCF_CORE_ID_INVALID) && blk_postfix;
 	int ret;
 
 	if (io_class_id != OCF_IO_CLASS_INVALID) {
@@ -620,7 +620,7 @@ int cache_stats_conf(int ctrl_fd, const struct kcas_cache_info *cache_info,
 }
 
 void cache_stats_counters(struct kcas_get_stats *cache_stats, FILE *outfile,
-		unsigned int stats_filters)
+		unsigned int stats_filters, bool blk_postfix)
 {
 	/* Totals for requests stats. */
 	if (stats_filters & STATS_FILTER_REQ)
@@ -628,7 +628,7 @@ void cache_stats_counters(struct kcas_get_stats *cache_stats, FILE *outfile,
 
 	/* Totals for blocks stats. */
 	if (stats_filters & STATS_FILTER_BLK)
-		print_blk_stats(&cache_stats->blocks, true, outfile);
+		print_blk_stats(&cache_stats->blocks, blk_postfix, outfile);
 
 	/* Totals for error stats. */
 	if (stats_filters & STATS_FILTER_ERR)
@@ -637,7 +637,7 @@ void cache_stats_counters(struct kcas_get_stats *cache_stats, FILE *outfile,
 
 static int cache_stats(int ctrl_fd, const struct kcas_cache_info *cache_info,
 		      unsigned int cache_id, FILE *outfile, unsigned int stats_filters,
-		      bool by_id_path)
+		      bool by_id_path, bool blk_postfix)
 {
 	struct kcas_get_stats cache_stats = {};
 	bool standby;
@@ -673,7 +673,8 @@ static int cache_stats(int ctrl_fd, const struct kcas_cache_info *cache_info,
 	}
 
 	if (stats_filters & STATS_FILTER_COUNTERS)
-		cache_stats_counters(&cache_stats, outfile, stats_filters);
+		cache_stats_counters(&cache_stats, outfile, stats_filters,
+				blk_postfix);
 
 	return SUCCESS;
 }
@@ -747,6 +748,9 @@ int cache_status(unsigned int cache_id, unsigned int core_id, int io_class_id,
 	int ctrl_fd, i;
 	int ret = SUCCESS;
 	struct kcas_cache_info cache_info;
+	/* JSON consumer knows whether it asked for cache or core statistics,
+	 * so block statistics are named the same way for both */
+	bool blk_postfix = (OUTPUT_FORMAT_JSON != output_format);
 
 	ctrl_fd = open_ctrl_device();
 
@@ -772,7 +776,12 @@ int cache_status(unsigned int cache_id, unsigned int core_id, int io_class_id,
 	struct stats_printout_ctx printout_ctx;
 	printout_ctx.intermediate = intermediate_file[0];
 	printout_ctx.out = stdout;
-	printout_ctx.type = (OUTPUT_FORMAT_CSV == output_format ? CSV : TEXT);
+	if (OUTPUT_FORMAT_CSV == output_format)
+		printout_ctx.type = CSV;
+	else if (OUTPUT_FORMAT_JSON == output_format)
+		printout_ctx.type = JSON;
+	else
+		printout_ctx.type = TEXT;
 	pthread_t thread;
 	pthread_create(&thread, 0, stats_printout, &printout_ctx);
 
@@ -815,13 +824,13 @@ int cache_status(unsigned int cache_id, unsigned int core_id, int io_class_id,
 		if (cache_stats_ioclasses(ctrl_fd, &cache_info, cache_id,
 					core_id, io_class_id,
 					intermediate_file[1],
-					stats_filters)) {
+					stats_filters, blk_postfix)) {
 			ret = FAILURE;
 			goto cleanup;
 		}
 	} else if (core_id == OCF_CORE_ID_INVALID) {
 		if (cache_stats(ctrl_fd, &cache_info, cache_id, intermediate_file[1],
-					stats_filters, by_id_path)) {
+					stats_filters, by_id_path, blk_postfix)) {
 			ret = FAILURE;
 			goto cleanup;
 		}
@@ -846,3 +855,371 @@ cleanup:
 
 	return ret;
 }
+
+static const char *bulk_stats_columns[] = {
+	"Cache Id", "Core Id", "IO class Id",
+	/* usage */
+	"Occupancy [" UNIT_BLOCKS "]", "Free [" UNIT_BLOCKS "]",
+	"Clean [" UNIT_BLOCKS "]", "Dirty [" UNIT_BLOCKS "]",
+	/* requests */
+	"Read hits [" UNIT_REQUESTS "]", "Read deferred [" UNIT_REQUESTS "]",
+	"Read partial misses [" UNIT_REQUESTS "]",
+	"Read full misses [" UNIT_REQUESTS "]", "Read total [" UNIT_REQUESTS "]",
+	"Write hits [" UNIT_REQUESTS "]", "Write deferred [" UNIT_REQUESTS "]",
+	"Write partial misses [" UNIT_REQUESTS "]",
+	"Write full misses [" UNIT_REQUESTS "]", "Write total [" UNIT_REQUESTS "]",
+	"Pass-Through reads [" UNIT_REQUESTS "]",
+	"Pass-Through writes [" UNIT_REQUESTS "]",
+	"Serviced requests [" UNIT_REQUESTS "]",
+	"Total requests [" UNIT_REQUESTS "]",
+	/* blocks */
+	"Reads from core [" UNIT_BLOCKS "]", "Writes to core [" UNIT_BLOCKS "]",
+	"Total to/from core [" UNIT_BLOCKS "]",
+	"Reads from cache [" UNIT_BLOCKS "]", "Writes to cache [" UNIT_BLOCKS "]",
+	"Total to/from cache [" UNIT_BLOCKS "]",
+	"Reads from exported object [" UNIT_BLOCKS "]",
+	"Writes to exported object [" UNIT_BLOCKS "]",
+	"Total to/from exported object [" UNIT_BLOCKS "]",
+	/* errors */
+	"Cache read errors [" UNIT_REQUESTS "]",
+	"Cache write errors [" UNIT_REQUESTS "]",
+	"Cache total errors [" UNIT_REQUESTS "]",
+	"Core read errors [" UNIT_REQUESTS "]",
+	"Core write errors [" UNIT_REQUESTS "]",
+	"Core total errors [" UNIT_REQUESTS "]",
+	"Total errors [" UNIT_REQUESTS "]",
+};
+
+#define BULK_STATS_ID_COLUMNS 3
+#define BULK_STATS_COUNTERS \
+	(ARRAY_SIZE(bulk_stats_columns) - BULK_STATS_ID_COLUMNS)
+
+/**
+ * get all counters of single cache/core/IO class in order of
+ * bulk_stats_columns; counters which are not collected for given
+ * level (free space and errors of IO class) are marked as not valid
+ */
+static void bulk_stats_counters(const struct kcas_get_stats *stats,
+		uint64_t *vals, bool *valid)
+{
+	const struct ocf_stats_usage *u = &stats->usage;
+	const struct ocf_stats_requests *r = &stats->req;
+	const struct ocf_stats_blocks *b = &stats->blocks;
+	const struct ocf_stats_errors *e = &stats->errors;
+	bool ioclass = (stats->part_id != OCF_IO_CLASS_INVALID);
+	int n = 0, i;
+
+	vals[n++] = u->occupancy.value;
+	vals[n++] = u->free.value;
+	vals[n++] = u->clean.value;
+	vals[n++] = u->dirty.value;
+
+	vals[n++] = r->rd_hits.value;
+	vals[n++] = r->rd_deferred.value;
+	vals[n++] = r->rd_partial_misses.value;
+	vals[n++] = r->rd_full_misses.value;
+	vals[n++] = r->rd_total.value;
+	vals[n++] = r->wr_hits.value;
+	vals[n++] = r->wr_deferred.value;
+	vals[n++] = r->wr_partial_misses.value;
+	vals[n++] = r->wr_full_misses.value;
+	vals[n++] = r->wr_total.value;
+	vals[n++] = r->rd_pt.value;
+	vals[n++] = r->wr_pt.value;
+	vals[n++] = r->serviced.value;
+	vals[n++] = r->total.value;
+
+	vals[n++] = b->core_volume_rd.value;
+	vals[n++] = b->core_volume_wr.value;
+	vals[n++] = b->core_volume_total.value;
+	vals[n++] = b->cache_volume_rd.value;
+	vals[n++] = b->cache_volume_wr.value;
+	vals[n++] = b->cache_volume_total.value;
+	vals[n++] = b->volume_rd.value;
+	vals[n++] = b->volume_wr.value;
+	vals[n++] = b->volume_total.value;
+
+	for (i = 0; i < n; i++)
+		valid[i] = true;
+	/* Free space is not accounted per IO class */
+	valid[1] = !ioclass;
+
+	vals[n++] = e->cache_volume_rd.value;
+	vals[n++] = e->cache_volume_wr.value;
+	vals[n++] = e->cache_volume_total.value;
+	vals[n++] = e->core_volume_rd.value;
+	vals[n++] = e->core_volume_wr.value;
+	vals[n++] = e->core_volume_total.value;
+	vals[n++] = e->total.value;
+
+	for (; i < n; i++)
+		valid[i] = !ioclass;
+
+	assert(n == BULK_STATS_COUNTERS);
+}
+
+static void print_bulk_id(FILE *outfile, unsigned int id, unsigned int invalid)
+{
+	if (id == invalid)
+		fprintf(outfile, "-,");
+	else
+		fprintf(outfile, "%u,", id);
+}
+
+static void print_bulk_stats_csv(FILE *outfile, const struct kcas_get_stats *stats,
+		const uint64_t *vals, const bool *valid)
+{
+	int i;
+
+	fprintf(outfile, "%u,", stats->cache_id);
+	print_bulk_id(outfile, stats->core_id, OCF_CORE_ID_INVALID);
+	print_bulk_id(outfile, stats->part_id, OCF_IO_CLASS_INVALID);
+
+	for (i = 0; i < BULK_STATS_COUNTERS; i++) {
+		if (valid[i])
+			fprintf(outfile, "%lu", vals[i]);
+		fprintf(outfile, "%s", i + 1 < BULK_STATS_COUNTERS ? "," : "\n");
+	}
+}
+
+static void print_bulk_stats_json(FILE *outfile, const uint64_t *vals,
+		const bool *valid, float flush_progress)
+{
+	bool first = true;
+	int i;
+
+	fprintf(outfile, "\"stats\":{");
+	for (i = 0; i < BULK_STATS_COUNTERS; i++) {
+		if (!valid[i])
+			continue;
+		fprintf(outfile, "%s\"%s\":%lu", first ? "" : ",",
+			bulk_stats_columns[BULK_STATS_ID_COLUMNS + i], vals[i]);
+		first = false;
+	}
+	/* Only present while cache or core is being flushed */
+	if (flush_progress) {
+		fprintf(outfile, "%s\"Flush progress [%%]\":%.1f",
+			first ? "" : ",", flush_progress);
+	}
+	fprintf(outfile, "}");
+}
+
+static float bulk_core_flush_progress(int ctrl_fd, unsigned int cache_id,
+		unsigned int core_id)
+{
+	struct kcas_core_info core_info = {};
+
+	core_info.cache_id = cache_id;
+	core_info.core_id = core_id;
+
+	if (ioctl(ctrl_fd, KCAS_IOCTL_CORE_INFO, &core_info) < 0)
+		return 0;
+
+	return calculate_flush_progress(core_info.info.dirty,
+			core_info.info.flushed);
+}
+
+static int bulk_stats_print(int ctrl_fd, unsigned int cache_id,
+		unsigned int core_id, unsigned int part_id,
+		float flush_progress, unsigned int output_format,
+		FILE *outfile)
+{
+	struct kcas_get_stats stats = {};
+	uint64_t vals[BULK_STATS_COUNTERS];
+	bool valid[BULK_STATS_COUNTERS];
+
+	stats.cache_id = cache_id;
+	stats.core_id = core_id;
+	stats.part_id = part_id;
+
+	if (ioctl(ctrl_fd, KCAS_IOCTL_GET_STATS, &stats) < 0) {
+		cas_printf(LOG_ERR, "Error while retrieving stats for cache %u\n",
+				cache_id);
+		print_err(stats.ext_err_code);
+		return FAILURE;
+	}
+
+	bulk_stats_counters(&stats, vals, valid);
+
+	if (OUTPUT_FORMAT_JSON == output_format)
+		print_bulk_stats_json(outfile, vals, valid, flush_progress);
+	else
+		print_bulk_stats_csv(outfile, &stats, vals, valid);
+
+	return SUCCESS;
+}
+
+/**
+ * @brief print statistics of IO classes of single cache or core;
+ *	  in JSON they are nested in "io_classes" array of its parent
+ */
+static int bulk_stats_ioclasses(int ctrl_fd, unsigned int cache_id,
+		unsigned int core_id, const bool *part_exists,
+		unsigned int output_format, FILE *outfile)
+{
+	bool json = (OUTPUT_FORMAT_JSON == output_format);
+	bool first = true;
+	int part_id;
+
+	if (json)
+		fprintf(outfile, ",\"io_classes\":[");
+
+	for (part_id = 0; part_id < OCF_USER_IO_CLASS_MAX; part_id++) {
+		if (!part_exists[part_id])
+			continue;
+
+		if (json) {
+			fprintf(outfile, "%s{\"IO class Id\":%d,",
+				first ? "" : ",", part_id);
+		}
+		if (bulk_stats_print(ctrl_fd, cache_id, core_id, part_id, 0,
+					output_format, outfile))
+			return FAILURE;
+		if (json)
+			fprintf(outfile, "}");
+		first = false;
+	}
+
+	if (json)
+		fprintf(outfile, "]");
+
+	return SUCCESS;
+}
+
+/**
+ * @brief print statistics of single cache, all its cores and
+ *	  all configured IO classes of each of them
+ */
+static int bulk_stats_cache(int ctrl_fd, unsigned int cache_id,
+		unsigned int output_format, bool *first, FILE *outfile)
+{
+	struct kcas_cache_info cache_info = {};
+	struct kcas_io_class io_class;
+	bool part_exists[OCF_USER_IO_CLASS_MAX] = {};
+	bool json = (OUTPUT_FORMAT_JSON == output_format);
+	int i, part_id;
+
+	cache_info.cache_id = cache_id;
+	/* Cache could have been stopped since it was listed */
+	if (ioctl(ctrl_fd, KCAS_IOCTL_CACHE_INFO, &cache_info) < 0)
+		return SUCCESS;
+
+	/* There are no statistics for a cache in standby state */
+	if (cache_info.info.state & (1 << ocf_cache_state_standby))
+		return SUCCESS;
+
+	/* IO class configuration is common for cache and all its cores */
+	for (part_id = 0; part_id < OCF_USER_IO_CLASS_MAX; part_id++) {
+		memset(&io_class, 0, sizeof(io_class));
+		io_class.cache_id = cache_id;
+		io_class.class_id = part_id;
+
+		if (ioctl(ctrl_fd, KCAS_IOCTL_PARTITION_INFO, &io_class)) {
+			if (io_class.ext_err_code == OCF_ERR_IO_CLASS_NOT_EXIST)
+				continue;
+			print_err(io_class.ext_err_code);
+			return FAILURE;
+		}
+		part_exists[part_id] = true;
+	}
+
+	if (json)
+		fprintf(outfile, "%s{\"Cache Id\":%u,", *first ? "" : ",", cache_id);
+	*first = false;
+
+	for (i = -1; i < (int)cache_info.info.core_count; i++) {
+		unsigned int core_id = (i < 0) ? OCF_CORE_ID_INVALID :
+				cache_info.core_id[i];
+		float flush_progress = 0;
+
+		if (json && core_id != OCF_CORE_ID_INVALID) {
+			fprintf(outfile, "%s{\"Core Id\":%u,", i ? "," : "",
+				core_id);
+			flush_progress = bulk_core_flush_progress(ctrl_fd,
+					cache_id, core_id);
+		} else if (json) {
+			flush_progress = calculate_flush_progress(
+					cache_info.info.dirty,
+					cache_info.info.flushed);
+		}
+
+		if (bulk_stats_print(ctrl_fd, cache_id, core_id,
+					OCF_IO_CLASS_INVALID, flush_progress,
+					output_format, outfile))
+			return FAILURE;
+
+		if (bulk_stats_ioclasses(ctrl_fd, cache_id, core_id, part_exists,
+					output_format, outfile))
+			return FAILURE;
+
+		if (json)
+			fprintf(outfile, (i < 0) ? ",\"cores\":[" : "}");
+	}
+
+	if (json)
+		fprintf(outfile, "]}");
+
+	return SUCCESS;
+}
+
+/**
+ * @brief print statistics of all caches, cores and IO classes at once
+ *
+ * this routine implements --stats-all subcommand of casadm. In CSV every
+ * cache/core/IO class combination is printed as a single row with ids
+ * in leading columns ("-" stands for totals of a given level). In JSON
+ * cores are nested in caches and IO classes in caches and cores.
+ *
+ * @return SUCCESS upon successful printing of statistic. FAILURE if any error happens
+ */
+int cache_status_all(unsigned int output_format)
+{
+	struct kcas_cache_list cache_list;
+	int ctrl_fd, i;
+	int ret = SUCCESS;
+	const int chunk_size = CACHE_LIST_ID_LIMIT;
+	bool first = true;
+
+	ctrl_fd = open_ctrl_device();
+	if (ctrl_fd < 0) {
+		print_err(KCAS_ERR_SYSTEM);
+		return FAILURE;
+	}
+
+	if (OUTPUT_FORMAT_JSON == output_format) {
+		fprintf(stdout, "[");
+	} else {
+		for (i = 0; i < ARRAY_SIZE(bulk_stats_columns); i++) {
+			fprintf(stdout, "%s%s", bulk_stats_columns[i],
+				i + 1 < ARRAY_SIZE(bulk_stats_columns) ? "," : "\n");
+		}
+	}
+
+	memset(&cache_list, 0, sizeof(cache_list));
+	cache_list.id_position = 0;
+	cache_list.in_out_num = chunk_size;
+	do {
+		if (ioctl(ctrl_fd, KCAS_IOCTL_LIST_CACHE, &cache_list) < 0) {
+			if (errno != EINVAL) {
+				cas_printf(LOG_ERR, "Error while retrieving cache list\n");
+				ret = FAILURE;
+				break;
+			}
+		}
+
+		for (i = 0; i < cache_list.in_out_num; i++) {
+			ret = bulk_stats_cache(ctrl_fd, cache_list.cache_id_tab[i],
+					output_format, &first, stdout);
+			if (ret)
+				goto out;
+		}
+		cache_list.id_position += chunk_size;
+	} while (cache_list.in_out_num >= chunk_size);
+
+	if (OUTPUT_FORMAT_JSON == output_format)
+		fprintf(stdout, "]\n");
+
+out:
+	close(ctrl_fd);
+	return ret;
+}
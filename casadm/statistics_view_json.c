@@ -0,0 +1,326 @@
+/*
+* Copyright(c) 2026 Huawei Technologies Co., Ltd.
+* SPDX-License-Identifier: BSD-3-Clause
+*/
+
+#define _GNU_SOURCE
+#include <stdio.h>
+#include <string.h>
+#include <stdlib.h>
+#include <stdbool.h>
+#include <ctype.h>
+#include "statistics_view.h"
+#include "statistics_view_structs.h"
+#include "statistics_view_json.h"
+
+#define MAX_KEY_LEN 256
+
+/**
+ * private data of JSON output formatter
+ *
+ * Output is always a JSON array. Depending on the tags in the input its
+ * elements are:
+ *  - one object per RECORD for statistics, with keys built the same way
+ *    as CSV column headers ("Title [unit]"),
+ *  - one object per TABLE_ROW outside of records, keyed by TABLE_HEADER
+ *    columns,
+ *  - one object per TREE_BRANCH, keyed by TREE_HEADER columns, with
+ *    TREE_LEAF objects nested in its "cores" array.
+ */
+struct json_out_prv {
+	char **header; /* columns of current table/tree header */
+	int header_len;
+	int items; /* number of elements of top level array */
+	int fields; /* number of fields in currently open object */
+	int leaves; /* number of leaves in currently open branch */
+	bool in_record;
+	bool in_branch;
+};
+
+static inline bool json_is_unit_string(const char *s)
+{
+	return NULL != s && '[' == s[0];
+}
+
+static void json_print_string(FILE *outfile, const char *s)
+{
+	putc('"', outfile);
+	for (; *s; s++) {
+		switch (*s) {
+		case '"':
+			fputs("\\\"", outfile);
+			break;
+		case '\\':
+			fputs("\\\\", outfile);
+			break;
+		default:
+			if ((unsigned char)*s < 0x20)
+				fprintf(outfile, "\\u%04x", *s);
+			else
+				putc(*s, outfile);
+		}
+	}
+	putc('"', outfile);
+}
+
+static const char *json_skip_digits(const char *s)
+{
+	while (isdigit(*s))
+		s++;
+	return s;
+}
+
+/* check if string is a number in JSON notation: -?(0|[1-9]\d*)(\.\d+)? */
+static bool json_is_number(const char *s)
+{
+	if (*s == '-')
+		s++;
+
+	if (*s == '0')
+		s++;
+	else if (isdigit(*s))
+		s = json_skip_digits(s);
+	else
+		return false;
+
+	if (*s == '.') {
+		if (!isdigit(*++s))
+			return false;
+		s = json_skip_digits(s);
+	}
+
+	return *s == '\0';
+}
+
+/**
+ * print value with its natural type: numbers as JSON numbers,
+ * "-" and empty values (not applicable) as null, anything else as string
+ */
+static void json_print_value(FILE *outfile, const char *s)
+{
+	if (!*s || !strcmp(s, "-"))
+		fputs("null", outfile);
+	else if (json_is_number(s))
+		fputs(s, outfile);
+	else
+		json_print_string(outfile, s);
+}
+
+static void json_print_field(struct view_t *this, const char *title,
+			     const char *unit, const char *value)
+{
+	struct json_out_prv *prv = this->ctx.json_prv;
+	char key[MAX_KEY_LEN];
+
+	if (prv->fields++)
+		putc(',', this->outfile);
+
+	if (!unit)
+		snprintf(key, sizeof(key), "%s", title);
+	else if (json_is_unit_string(unit))
+		snprintf(key, sizeof(key), "%s %s", title, unit);
+	else
+		snprintf(key, sizeof(key), "%s [%s]", title, unit);
+
+	json_print_string(this->outfile, key);
+	putc(':', this->outfile);
+	json_print_value(this->outfile, value);
+}
+
+static void json_begin_item(struct view_t *this)
+{
+	struct json_out_prv *prv = this->ctx.json_prv;
+
+	putc(prv->items++ ? ',' : '[', this->outfile);
+	putc('{', this->outfile);
+	prv->fields = 0;
+}
+
+static void json_end_item(struct view_t *this)
+{
+	struct json_out_prv *prv = this->ctx.json_prv;
+
+	if (prv->in_branch)
+		fputs("]", this->outfile);
+	if (prv->in_record || prv->in_branch)
+		putc('}', this->outfile);
+
+	prv->in_record = false;
+	prv->in_branch = false;
+}
+
+static void json_free_header(struct view_t *this)
+{
+	struct json_out_prv *prv = this->ctx.json_prv;
+	int i;
+
+	for (i = 0; i < prv->header_len; i++)
+		free(prv->header[i]);
+	free(prv->header);
+	prv->header = NULL;
+	prv->header_len = 0;
+}
+
+static int json_store_header(struct view_t *this, int num_fields,
+			     char *fields[])
+{
+	struct json_out_prv *prv = this->ctx.json_prv;
+	int i;
+
+	json_free_header(this);
+
+	prv->header = calloc(num_fields, sizeof(char *));
+	if (!prv->header)
+		return 1;
+
+	for (i = 0; i < num_fields; i++) {
+		prv->header[i] = strdup(fields[i]);
+		if (!prv->header[i])
+			return 1;
+		prv->header_len++;
+	}
+
+	return 0;
+}
+
+static const char *json_header(struct view_t *this, int i)
+{
+	struct json_out_prv *prv = this->ctx.json_prv;
+
+	return (i < prv->header_len) ? prv->header[i] : NULL;
+}
+
+/**
+ * For KV pair assume that values are interleaved with units:
+ * KV_PAIR,Cache Size,10347970,[4KiB Blocks],39.47,[GiB]
+ * will result in:
+ * "Cache Size [4KiB Blocks]":10347970,"Cache Size [GiB]":39.47
+ */
+static void json_kv_pair(struct view_t *this, int num_fields, char *fields[])
+{
+	int i;
+
+	for (i = 1; i < num_fields; i += 2) {
+		json_print_field(this, fields[0],
+				 (i + 1 < num_fields) ? fields[i + 1] : NULL,
+				 fields[i]);
+	}
+}
+
+/**
+ * Table row of statistics record:
+ * TABLE_{ROW,SECTION},Title,value1,value2,...,unit
+ * will result in:
+ * "Title [unit]":value1,"Title [col2_title]":value2,...
+ */
+static void json_stats_row(struct view_t *this, int num_fields, char *fields[])
+{
+	const char *unit = NULL;
+	const char *title;
+	int i;
+
+	if (json_is_unit_string(fields[num_fields - 1]))
+		unit = fields[num_fields - 1];
+
+	json_print_field(this, fields[0], unit, fields[1]);
+	for (i = 2; i < num_fields; i++) {
+		title = json_header(this, i);
+		if (title && !json_is_unit_string(title))
+			json_print_field(this, fields[0], title, fields[i]);
+	}
+}
+
+static void json_object(struct view_t *this, int num_fields, char *fields[])
+{
+	const char *title;
+	int i;
+
+	for (i = 0; i < num_fields; i++) {
+		title = json_header(this, i);
+		if (title)
+			json_print_field(this, title, NULL, fields[i]);
+	}
+}
+
+int json_process_row(struct view_t *this, int type, int num_fields, char *fields[])
+{
+	struct json_out_prv *prv = this->ctx.json_prv;
+
+	switch (type) {
+	case RECORD:
+		json_end_item(this);
+		json_begin_item(this);
+		prv->in_record = true;
+		break;
+	case KV_PAIR:
+		if (!prv->in_record) {
+			json_end_item(this);
+			json_begin_item(this);
+			prv->in_record = true;
+		}
+		json_kv_pair(this, num_fields, fields);
+		break;
+	case TABLE_HEADER:
+	case TREE_HEADER:
+		return json_store_header(this, num_fields, fields);
+	case TABLE_SECTION:
+	case TABLE_ROW:
+		if (prv->in_record) {
+			json_stats_row(this, num_fields, fields);
+		} else {
+			json_end_item(this);
+			json_begin_item(this);
+			json_object(this, num_fields, fields);
+			putc('}', this->outfile);
+		}
+		break;
+	case TREE_BRANCH:
+		json_end_item(this);
+		json_begin_item(this);
+		json_object(this, num_fields, fields);
+		fputs(prv->fields ? ",\"cores\":[" : "\"cores\":[", this->outfile);
+		prv->in_branch = true;
+		prv->leaves = 0;
+		break;
+	case TREE_LEAF:
+		if (!prv->in_branch)
+			return 1;
+		if (prv->leaves++)
+			putc(',', this->outfile);
+		putc('{', this->outfile);
+		prv->fields = 0;
+		json_object(this, num_fields, fields);
+		putc('}', this->outfile);
+		break;
+	}
+	return 0;
+}
+
+int json_end_input(struct view_t *this)
+{
+	struct json_out_prv *prv = this->ctx.json_prv;
+
+	json_end_item(this);
+	fputs(prv->items ? "]\n" : "[]\n", this->outfile);
+	fflush(this->outfile);
+	return 0;
+}
+
+int json_construct(struct view_t *this)
+{
+	struct json_out_prv *prv = calloc(sizeof(struct json_out_prv), 1);
+
+	if (!prv) {
+		return 1;
+	}
+	this->ctx.json_prv = prv;
+
+	return 0;
+}
+
+int json_destruct(struct view_t *this)
+{
+	json_free_header(this);
+	free(this->ctx.json_prv);
+	return 0;
+}
@@ -0,0 +1,18 @@
+/*
+* Copyright(c) 2026 Huawei Technologies Co., Ltd.
+* SPDX-License-Identifier: BSD-3-Clause
+*/
+
+#ifndef __STATS_VIEW_JSON
+#define __STATS_VIEW_JSON
+
+int json_process_row(struct view_t *this, int type, int num_fields, char *fields[]);
+
+int json_end_input(struct view_t *this);
+
+int json_construct(struct view_t *this);
+
+int json_destruct(struct view_t *this);
+
+
+#endif
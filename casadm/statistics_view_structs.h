@@ -10,12 +10,15 @@ struct csv_out_prv;
 
 struct text_out_prv;
 
+struct json_out_prv;
+
 struct view_t
 {
 	FILE *outfile;
 	union {
 		struct csv_out_prv *csv_prv;
 		struct text_out_prv *text_prv;
+		struct json_out_prv *json_prv;
 	} ctx;
 	/* type specific init */
 	int (*construct)(struct view_t *this);
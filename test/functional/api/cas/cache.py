@@ -50,7 +50,7 @@ class Cache:
         if not cache:
             return None
 
-        if cache["device_path"] == "-":
+        if cache["device_path"] is None:
             return None
 
         return Device(path=cache["device_path"])
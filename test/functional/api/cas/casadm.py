@@ -470,6 +470,14 @@ def print_statistics(
     return output
 
 
+def print_statistics_all(output_format: OutputFormat = None) -> Output:
+    _output_format = output_format.name if output_format else None
+    output = TestRun.executor.run(print_statistics_all_cmd(output_format=_output_format))
+    if output.exit_code != 0:
+        raise CmdException("Printing statistics failed.", output)
+    return output
+
+
 def reset_counters(cache_id: int, core_id: int = None, shortcut: bool = False) -> Output:
     _core_id = str(core_id) if core_id is not None else None
     output = TestRun.executor.run(
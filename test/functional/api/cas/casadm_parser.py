@@ -5,8 +5,6 @@
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
-import csv
-import io
 import json
 
 from datetime import timedelta, datetime
@@ -47,7 +45,7 @@ def get_caches() -> list:
     for cache in caches_dict.values():
         caches_list.append(
             Cache(
-                device=(Device(cache["device_path"]) if cache["device_path"] != "-" else None),
+                device=(Device(cache["device_path"]) if cache["device_path"] else None),
                 cache_id=cache["id"],
             )
         )
@@ -92,63 +90,69 @@ def get_detached_cores(cache_id: int) -> list:
 
 
 def get_cas_devices_dict() -> dict:
-    device_list = list(csv.DictReader(casadm.list_caches(OutputFormat.csv).stdout.split("\n")))
+    device_list = json.loads(casadm.list_caches(OutputFormat.json).stdout)
     devices = {"caches": {}, "cores": {}, "core_pool": {}}
-    cache_id = -1
-    core_pool = False
     for device in device_list:
         if device["type"] == "cache":
-            cache_id = int(device["id"])
-            core_pool = False
-            params = [
-                ("id", cache_id),
-                ("device_path", device["disk"]),
-                ("status", CacheStatus(device["status"].lower())),
-            ]
-            devices["caches"][cache_id] = dict([(key, value) for key, value in params])
-
-        elif device["type"] == "core":
-            params = [
-                ("cache_id", cache_id),
-                ("core_id", (int(device["id"]) if device["id"] != "-" else device["id"])),
-                ("device_path", device["disk"]),
-                ("status", CoreStatus(device["status"].lower())),
-                ("exp_obj", device["device"]),
-            ]
-            if core_pool:
-                devices["core_pool"][device["disk"]] = dict([
-                    (key, value) for key, value in params]
-                )
+            cache_id = device["id"]
+            devices["caches"][cache_id] = {
+                "id": cache_id,
+                "device_path": device["disk"],
+                "status": CacheStatus(device["status"].lower()),
+            }
+        else:
+            cache_id = -1
+
+        for core in device["cores"]:
+            params = {
+                "cache_id": cache_id,
+                "core_id": core["id"],
+                "device_path": core["disk"],
+                "status": CoreStatus(core["status"].lower()),
+                "exp_obj": core["device"],
+            }
+            if device["type"] == "core pool":
+                devices["core_pool"][core["disk"]] = params
             else:
-                devices["cores"][(cache_id, int(device["id"]))] = dict(
-                    [(key, value) for key, value in params]
-                )
-
-        elif device["type"] == "core pool":
-            core_pool = True
+                devices["cores"][(cache_id, core["id"])] = params
 
     return devices
 
 
+def get_all_stats() -> dict:
+    """
+    Parse statistics of all caches, cores and IO classes printed by single casadm call.
+    Keys are (cache_id, core_id, io_class_id) tuples, with None in place of core or
+    IO class id for aggregated statistics.
+    """
+    stats = {}
+
+    def add_stats(cache_id, core_id, device):
+        stats[(cache_id, core_id, None)] = Stats(device["stats"])
+        for io_class in device["io_classes"]:
+            stats[(cache_id, core_id, io_class["IO class Id"])] = Stats(io_class["stats"])
+
+    for cache in json.loads(casadm.print_statistics_all(OutputFormat.json).stdout):
+        add_stats(cache["Cache Id"], None, cache)
+        for core in cache["cores"]:
+            add_stats(cache["Cache Id"], core["Core Id"], core)
+
+    return stats
+
+
 def get_flushing_progress(cache_id: int, core_id: int = None):
-    casadm_output = casadm.list_caches(OutputFormat.csv)
-    lines = casadm_output.stdout.splitlines()
-    for line in lines:
-        line_elements = line.split(",")
-        if (
-            core_id is not None
-            and line_elements[0] == "core"
-            and int(line_elements[1]) == core_id
-            or core_id is None
-            and line_elements[0] == "cache"
-            and int(line_elements[1]) == cache_id
-        ):
-            try:
-                flush_line_elements = line_elements[3].split()
-                flush_percent = flush_line_elements[1][1:]
-                return float(flush_percent)
-            except Exception:
-                break
+    casadm_output = casadm.list_caches(OutputFormat.json)
+    for cache in json.loads(casadm_output.stdout):
+        if cache["type"] != "cache" or cache["id"] != cache_id:
+            continue
+        device = cache
+        if core_id is not None:
+            device = next((core for core in cache["cores"] if core["id"] == core_id), {})
+        # Status of flushing device is "Flushing (xx.x %)"
+        status = device.get("status", "").split()
+        if len(status) > 1 and status[0] == "Flushing":
+            return float(status[1][1:])
+        break
     raise CmdException(
         f"There is no flushing progress in casadm list output. (cache {cache_id}"
         f"{' core ' + str(core_id) if core_id is not None else ''})",
@@ -167,85 +171,78 @@ def wait_for_flushing(cache, core, timeout: timedelta = timedelta(seconds=30)):
     TestRun.fail("Flush not started!")
 
 
+def get_params_dict(output) -> dict:
+    return {param["Parameter name"]: param["Value"] for param in json.loads(output.stdout)}
+
+
 def get_flush_parameters_alru(cache_id: int):
-    casadm_output = casadm.get_param_cleaning_alru(
-        cache_id, casadm.OutputFormat.csv
-    ).stdout.splitlines()
+    params = get_params_dict(casadm.get_param_cleaning_alru(cache_id, OutputFormat.json))
     flush_parameters = FlushParametersAlru()
-    for line in casadm_output:
-        if "max buffers" in line:
-            flush_parameters.flush_max_buffers = int(line.split(",")[1])
-        if "Activity threshold" in line:
-            flush_parameters.activity_threshold = Time(milliseconds=int(line.split(",")[1]))
-        if "Stale buffer time" in line:
-            flush_parameters.staleness_time = Time(seconds=int(line.split(",")[1]))
-        if "Wake up time" in line:
-            flush_parameters.wake_up_time = Time(seconds=int(line.split(",")[1]))
-        if "trigger threshold" in line:
-            flush_parameters.dirty_ratio_threshold = int(line.split(",")[1])
-        if "trigger inertia" in line:
-            flush_parameters.dirty_ratio_inertia = Size(int(line.split(",")[1]), Unit.MebiByte)
+    flush_parameters.flush_max_buffers = params["Flush max buffers"]
+    flush_parameters.activity_threshold = Time(milliseconds=params["Activity threshold [ms]"])
+    flush_parameters.staleness_time = Time(seconds=params["Stale buffer time [s]"])
+    flush_parameters.wake_up_time = Time(seconds=params["Wake up time [s]"])
+    flush_parameters.dirty_ratio_threshold = params["Dirty ratio trigger threshold [%]"]
+    flush_parameters.dirty_ratio_inertia = Size(
+        params["Dirty ratio trigger inertia [MiB]"], Unit.MebiByte
+    )
     return flush_parameters
 
 
 def get_flush_parameters_acp(cache_id: int):
-    casadm_output = casadm.get_param_cleaning_acp(
-        cache_id, casadm.OutputFormat.csv
-    ).stdout.splitlines()
+    params = get_params_dict(casadm.get_param_cleaning_acp(cache_id, OutputFormat.json))
     flush_parameters = FlushParametersAcp()
-    for line in casadm_output:
-        if "max buffers" in line:
-            flush_parameters.flush_max_buffers = int(line.split(",")[1])
-        if "Wake up time" in line:
-            flush_parameters.wake_up_time = Time(milliseconds=int(line.split(",")[1]))
+    flush_parameters.flush_max_buffers = params["Flush max buffers"]
+    flush_parameters.wake_up_time = Time(milliseconds=params["Wake up time [ms]"])
     return flush_parameters
 
 
 def get_seq_cut_off_parameters(cache_id: int, core_id: int):
-    casadm_output = casadm.get_param_cutoff(
-        cache_id, core_id, casadm.OutputFormat.csv
-    ).stdout.splitlines()
+    params = get_params_dict(casadm.get_param_cutoff(cache_id, core_id, OutputFormat.json))
     seq_cut_off_params = SeqCutOffParameters()
-    for line in casadm_output:
-        if "Sequential cutoff threshold" in line:
-            seq_cut_off_params.threshold = Size(int(line.split(",")[1]), Unit.KibiByte)
-        if "Sequential cutoff policy" in line:
-            seq_cut_off_params.policy = SeqCutOffPolicy.from_name(line.split(",")[1])
-        if "Sequential cutoff promotion request count threshold" in line:
-            seq_cut_off_params.promotion_count = int(line.split(",")[1])
+    seq_cut_off_params.threshold = Size(
+        params["Sequential cutoff threshold [KiB]"], Unit.KibiByte
+    )
+    seq_cut_off_params.policy = SeqCutOffPolicy.from_name(params["Sequential cutoff policy"])
+    seq_cut_off_params.promotion_count = params[
+        "Sequential cutoff promotion request count threshold"
+    ]
     return seq_cut_off_params
 
 
 def get_casadm_version():
-    casadm_output = casadm.print_version(OutputFormat.csv).stdout.split("\n")
-    version_str = casadm_output[1].split(",")[-1]
+    casadm_output = json.loads(casadm.print_version(OutputFormat.json).stdout)
+    version_str = casadm_output[-1]["Version"]
     return CasVersion.from_version_string(version_str)
 
 
 def get_io_class_list(cache_id: int) -> list:
     ret = []
-    casadm_output = casadm.list_io_classes(cache_id, OutputFormat.csv).stdout.splitlines()
-    casadm_output.pop(0)  # Remove header
-    for line in casadm_output:
-        values = line.split(",")
-        ioclass = IoClass(int(values[0]), values[1], int(values[2]), values[3])
-        ret.append(ioclass)
+    casadm_output = json.loads(casadm.list_io_classes(cache_id, OutputFormat.json).stdout)
+    for io_class in casadm_output:
+        ret.append(
+            IoClass(
+                io_class["IO class id"],
+                io_class["IO class name"],
+                io_class["Eviction priority"],
+                f"{io_class['Allocation']:.2f}",
+            )
+        )
     return ret
 
 
 def get_core_info_for_cache_by_path(core_disk_path: str, target_cache_id: int) -> dict | None:
-    output = casadm.list_caches(OutputFormat.csv, by_id_path=True)
-    reader = csv.DictReader(io.StringIO(output.stdout))
-    cache_id = -1
-    for row in reader:
-        if row["type"] == "cache":
-            cache_id = int(row["id"])
-        if row["type"] == "core" and row["disk"] == core_disk_path and target_cache_id == cache_id:
-            return {
-                "core_id": row["id"],
-                "core_device": row["disk"],
-                "status": row["status"],
-                "exp_obj": row["device"],
-            }
+    output = casadm.list_caches(OutputFormat.json, by_id_path=True)
+    for device in json.loads(output.stdout):
+        if device["type"] != "cache" or device["id"] != target_cache_id:
+            continue
+        for core in device["cores"]:
+            if core["disk"] == core_disk_path:
+                return {
+                    "core_id": core["id"],
+                    "core_device": core["disk"],
+                    "status": core["status"],
+                    "exp_obj": core["device"],
+                }
 
     return None
@@ -324,6 +324,13 @@ def print_statistics_cmd(
     return casadm_bin + command
 
 
+def print_statistics_all_cmd(output_format: str = None) -> str:
+    command = " --stats-all"
+    if output_format:
+        command += " --output-format " + output_format
+    return casadm_bin + command
+
+
 def reset_counters_cmd(cache_id: str, core_id: str = None, shortcut: bool = False) -> str:
     command = " -Z" if shortcut else " --reset-counters"
     command += (" -i " if shortcut else " --cache-id ") + cache_id
@@ -41,10 +41,10 @@ class Core(Device):
         self.path = None
         self.cache_id = cache_id
         core_info = self.__get_core_info()
-        # "-" is special case for cores in core pool
-        if core_info["core_id"] != "-":
-            self.core_id = int(core_info["core_id"])
-        if core_info["exp_obj"] != "-":
+        # cores in core pool have neither id nor exported object
+        if core_info["core_id"] is not None:
+            self.core_id = core_info["core_id"]
+        if core_info["exp_obj"] is not None:
             Device.__init__(self, core_info["exp_obj"])
         self.partitions = []
         self.block_size = None
@@ -6,7 +6,7 @@
 #
 
 import copy
-import csv
+import json
 
 from datetime import timedelta
 from enum import Enum
@@ -835,18 +835,15 @@ def get_stats_dict(
     core_id: int = None,
     io_class_id: int = None,
 ):
-    csv_stats = casadm.print_statistics(
-        cache_id=cache_id,
-        core_id=core_id,
-        io_class_id=io_class_id,
-        filter=filter,
-        output_format=casadm.OutputFormat.csv,
-    ).stdout.splitlines()
-    stat_keys, stat_values = csv.reader(csv_stats)
-    # Unify names in block stats for core and cache to easier compare
-    # cache vs core stats using unified key
-    # cache stats: Reads from core(s)
-    # core stats: Reads from core
-    stat_keys = [x.replace("(s)", "") for x in stat_keys]
-    stats_dict = dict(zip(stat_keys, stat_values))
-    return stats_dict
+    # Block stats in json output are named the same way for cache and core,
+    # e.g. "Reads from core" instead of "Reads from core(s)" for cache
+    records = json.loads(
+        casadm.print_statistics(
+            cache_id=cache_id,
+            core_id=core_id,
+            io_class_id=io_class_id,
+            filter=filter,
+            output_format=casadm.OutputFormat.json,
+        ).stdout
+    )
+    return records[0]
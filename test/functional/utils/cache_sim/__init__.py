@@ -0,0 +1,35 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Trace driven cache simulator. Replays fio iolog or blkparse traces through
+a model of cache line size, promotion, sequential cutoff and cache mode
+policies to compare configurations before deploying them:
+
+    python3 -m utils.cache_sim compile trace.blkparse -f blkparse -o trace.npy
+    python3 -m utils.cache_sim sweep trace.npy --cache-size 64G --jobs 8
+
+IO class configuration can be evaluated offline the same way, using trace
+annotated with classifier fields (file, process, etc.):
+
+    python3 -m utils.cache_sim classify annotated.csv -i ioclass-config.csv --cache-size 64G
+"""
+
+from utils.cache_sim.ioclass import Classifier, ClassifierRuleError, IoClass, parse_rule
+from utils.cache_sim.model import CacheModel, Simulator, SimulationResult
+from utils.cache_sim.trace import TRACE_DTYPE, read_trace, save_trace
+
+__all__ = [
+    "CacheModel",
+    "Classifier",
+    "ClassifierRuleError",
+    "IoClass",
+    "SimulationResult",
+    "Simulator",
+    "TRACE_DTYPE",
+    "parse_rule",
+    "read_trace",
+    "save_trace",
+]
@@ -0,0 +1,167 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import argparse
+import os
+import sys
+import tempfile
+
+from utils.cache_sim.ioclass import Classifier, predict
+from utils.cache_sim.model import CacheModel
+from utils.cache_sim.sweep import (
+    CACHE_LINE_SIZES,
+    CACHE_MODES,
+    PROMOTION_POLICIES,
+    SEQ_CUTOFF_POLICIES,
+    format_table,
+    sweep,
+    table_row,
+)
+from utils.cache_sim.trace import parsers, read_trace, save_trace
+
+size_units = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def parse_size(value: str) -> int:
+    """Size in bytes with optional binary unit suffix, e.g. 512M or 64GiB"""
+    number = value.upper().rstrip("IB") if value[-1:].isalpha() else value
+    unit = number[-1:] if number[-1:].isalpha() else ""
+    try:
+        return int(float(number[:len(number) - len(unit)]) * size_units[unit])
+    except (KeyError, ValueError):
+        raise argparse.ArgumentTypeError(f"invalid size: {value}")
+
+
+line_size_choices = [str(size // 1024) for size in CACHE_LINE_SIZES]
+
+
+def compile_trace(args):
+    count = save_trace(read_trace(args.trace, args.format, args.chunk_size), args.output)
+    print(f"{count} requests saved to {args.output}")
+
+
+def run_sweep(args):
+    trace = args.trace
+    temporary = None
+    if not trace.endswith(".npy"):
+        # Parse text trace once for all configurations
+        temporary = tempfile.NamedTemporaryFile(suffix=".npy", delete=False)
+        temporary.close()
+        save_trace(read_trace(trace, args.format, args.chunk_size), temporary.name)
+        trace = temporary.name
+
+    try:
+        results = sweep(
+            trace, args.format, args.cache_size,
+            cache_line_sizes=[int(value) * 1024 for value in args.cache_line_size or []],
+            cache_modes=args.cache_mode,
+            promotion_policies=args.promotion_policy,
+            seq_cutoff_policies=args.seq_cutoff_policy,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
+            nhit_threshold=args.nhit_threshold,
+            nhit_trigger=args.nhit_trigger,
+            seq_cutoff_threshold=args.seq_cutoff_threshold,
+        )
+        rows = [table_row(model, result) for model, result in results]
+    finally:
+        if temporary:
+            os.unlink(temporary.name)
+
+    sys.stdout.write(format_table(rows, args.output_format))
+
+
+def run_classify(args):
+    classifier = Classifier.from_file(args.ioclass_config)
+    model = CacheModel(
+        cache_size=args.cache_size,
+        cache_line_size=int(args.cache_line_size) * 1024,
+        cache_mode=args.cache_mode,
+        seq_cutoff_policy="never",
+    )
+    report, result = predict(classifier, args.trace, model, args.chunk_size)
+
+    rows = [[
+        str(entry["io_class"].id),
+        entry["io_class"].name,
+        "" if entry["io_class"].priority is None else str(entry["io_class"].priority),
+        f"{100 * entry['io_class'].allocation:.1f}",
+        f"{entry['requests']:.1f}",
+        f"{entry['bytes']:.1f}",
+        f"{entry['occupancy']:.1f}",
+        "yes" if entry["over_allocation"] else "no",
+    ] for entry in report]
+    sys.stdout.write(format_table(rows, args.output_format, [
+        "IO class id",
+        "IO class name",
+        "Eviction priority",
+        "Allocation [%]",
+        "Requests [%]",
+        "Bytes [%]",
+        "Occupancy [%]",
+        "Over allocation",
+    ]))
+    if args.output_format == "table":
+        print(f"Hit ratio: {result.hit_ratio:.1f}%, "
+              f"occupancy: {100.0 * result.occupancy / model.cache_lines:.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m utils.cache_sim",
+        description="Trace driven Open CAS configuration simulator",
+    )
+    parser.add_argument("--chunk-size", type=int, default=1 << 20,
+                        help="number of requests simulated at once")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser("compile", help="convert text trace to numpy format")
+    compile_parser.add_argument("trace")
+    compile_parser.add_argument("-f", "--format", choices=list(parsers), default="fio")
+    compile_parser.add_argument("-o", "--output", required=True)
+    compile_parser.set_defaults(func=compile_trace)
+
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="simulate trace with combinations of policies and compare results")
+    sweep_parser.add_argument("trace", help="text trace or one compiled to .npy")
+    sweep_parser.add_argument("-f", "--format", choices=list(parsers), default="fio")
+    sweep_parser.add_argument("--cache-size", type=parse_size, required=True)
+    sweep_parser.add_argument("--cache-line-size", nargs="+", choices=line_size_choices,
+                              help="cache line sizes in KiB (default: all)")
+    sweep_parser.add_argument("--cache-mode", nargs="+", choices=CACHE_MODES,
+                              help="cache modes (default: all)")
+    sweep_parser.add_argument("--promotion-policy", nargs="+", choices=PROMOTION_POLICIES,
+                              help="promotion policies (default: all)")
+    sweep_parser.add_argument("--seq-cutoff-policy", nargs="+", choices=SEQ_CUTOFF_POLICIES,
+                              help="sequential cutoff policies (default: all)")
+    sweep_parser.add_argument("--seq-cutoff-threshold", type=parse_size, default="1M")
+    sweep_parser.add_argument("--nhit-threshold", type=int, default=3)
+    sweep_parser.add_argument("--nhit-trigger", type=int, default=80,
+                              help="occupancy [%%] above which nhit is applied")
+    sweep_parser.add_argument("-j", "--jobs", type=int, default=1)
+    sweep_parser.add_argument("-o", "--output-format", choices=["table", "csv"], default="table")
+    sweep_parser.set_defaults(func=run_sweep)
+
+    classify_parser = subparsers.add_parser(
+        "classify", help="classify annotated trace with IO class configuration "
+                         "and predict per class occupancy")
+    classify_parser.add_argument("trace", help="CSV trace annotated with classifier fields")
+    classify_parser.add_argument("-i", "--ioclass-config", required=True)
+    classify_parser.add_argument("--cache-size", type=parse_size, required=True)
+    classify_parser.add_argument("--cache-line-size", choices=line_size_choices, default="4")
+    classify_parser.add_argument("--cache-mode", choices=CACHE_MODES, default="wt")
+    classify_parser.add_argument("-o", "--output-format", choices=["table", "csv"],
+                                 default="table")
+    classify_parser.set_defaults(func=run_classify)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import csv
+import itertools
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+from utils.cache_sim.model import CacheModel, Simulator
+from utils.cache_sim.trace import DEFAULT_CHUNK_SIZE, SECTOR_SIZE
+
+# Same limits as in modules/cas_cache/classifier.c
+MAX_STRING_SPECIFIER_LEN = 256
+CORE_ID_MAX = 4095
+U64_MAX = 2**64 - 1
+
+UNKNOWN_CONDITION = "Unexpected classification rule condition"
+INVALID_SYNTAX = "Invalid classification rule syntax"
+
+NUMERIC_OPERATORS = {
+    "eq": np.equal,
+    "ne": np.not_equal,
+    "lt": np.less,
+    "gt": np.greater,
+    "le": np.less_equal,
+    "ge": np.greater_equal,
+}
+
+# Columns of annotated trace, missing values are -1 (numbers) or "" (strings)
+NUMERIC_COLUMNS = ["core_id", "lba", "request_size", "pid", "file_size", "file_offset", "wlth"]
+FLAG_COLUMNS = ["metadata", "direct"]
+STRING_COLUMNS = ["process_name", "file"]
+DIRECTIONS = {"read": 0, "r": 0, "write": 1, "w": 1}
+
+
+class ClassifierRuleError(ValueError):
+    pass
+
+
+@dataclass
+class Condition:
+    token: str
+    # Combine with result of previous conditions using "and" (otherwise "or")
+    logical_and: bool
+    # Evaluate condition for all requests: test(columns, current io classes)
+    test: Callable
+    # "done" stops evaluation of further conditions and rules
+    stop: bool = False
+
+
+def _numeric_operand(data: Optional[str]):
+    """Parse "value" or "operator:value" operand of numeric condition"""
+    if not data:
+        raise ClassifierRuleError(INVALID_SYNTAX)
+    operator, _, value = data.partition(":") if ":" in data else ("eq", "", data)
+    if operator not in NUMERIC_OPERATORS or not re.fullmatch(r"\+?[0-9]+", value):
+        raise ClassifierRuleError(INVALID_SYNTAX)
+    value = int(value)
+    if value > U64_MAX:
+        raise ClassifierRuleError(INVALID_SYNTAX)
+    return NUMERIC_OPERATORS[operator], value
+
+
+def _string_operand(data: Optional[str]) -> str:
+    if data is None or not 0 < len(data) < MAX_STRING_SPECIFIER_LEN:
+        raise ClassifierRuleError(INVALID_SYNTAX)
+    return data
+
+
+def _column_test(column, operator, value):
+    def test(columns, io_class):
+        values = columns.get(column)
+        if values is None:
+            return np.zeros(len(io_class), dtype=bool)
+        return (values >= 0) & operator(values, value)
+    return test
+
+
+def _string_test(column, predicate):
+    """Evaluate predicate once per distinct value of categorical column"""
+    def test(columns, io_class):
+        if column not in columns:
+            return np.zeros(len(io_class), dtype=bool)
+        codes, values = columns[column]
+        matches = np.array([bool(value) and predicate(value) for value in values] + [False])
+        return matches[codes]
+    return test
+
+
+def _flag_test(column):
+    def test(columns, io_class):
+        return columns.get(column, np.zeros(len(io_class), dtype=bool)).copy()
+    return test
+
+
+def _generic(token, data):
+    if data is not None:
+        raise ClassifierRuleError(INVALID_SYNTAX)
+    if token == "done":
+        return lambda columns, io_class: np.ones(len(io_class), dtype=bool)
+    return _flag_test(token)
+
+
+def _numeric(token, data):
+    operator, value = _numeric_operand(data)
+    return _column_test(token, operator, value)
+
+
+def _io_class(token, data):
+    operator, value = _numeric_operand(data)
+    return lambda columns, io_class: operator(io_class, value)
+
+
+def _core_id(token, data):
+    operator, value = _numeric_operand(data)
+    if value > CORE_ID_MAX:
+        raise ClassifierRuleError(INVALID_SYNTAX)
+    return _column_test(token, operator, value)
+
+
+def _direction(token, data):
+    if data not in ("read", "write"):
+        raise ClassifierRuleError(INVALID_SYNTAX)
+    return _column_test("io_direction", np.equal, DIRECTIONS[data])
+
+
+def _directory(token, data):
+    if not data:
+        raise ClassifierRuleError(INVALID_SYNTAX)
+    # Any ancestor directory of accessed file matches
+    prefix = os.path.normpath(data).rstrip("/") + "/"
+    return _string_test("file", lambda path: path.startswith(prefix))
+
+
+def _extension(token, data):
+    extension = _string_operand(data)
+    return _string_test(
+        "file", lambda path: os.path.basename(path).rpartition(".")[1:] == (".", extension)
+    )
+
+
+def _file_name_prefix(token, data):
+    prefix = _string_operand(data)
+    return _string_test("file", lambda path: os.path.basename(path).startswith(prefix))
+
+
+def _process_name(token, data):
+    name = _string_operand(data)
+    return _string_test("process_name", lambda comm: comm == name)
+
+
+condition_handlers = {
+    "done": _generic,
+    "metadata": _generic,
+    "direct": _generic,
+    "io_class": _io_class,
+    "file_size": _numeric,
+    "directory": _directory,
+    "core_id": _core_id,
+    "extension": _extension,
+    "file_name_prefix": _file_name_prefix,
+    "lba": _numeric,
+    "pid": _numeric,
+    "process_name": _process_name,
+    "file_offset": _numeric,
+    "request_size": _numeric,
+    "io_direction": _direction,
+    "wlth": _numeric,
+}
+
+
+def parse_rule(rule: str) -> list:
+    """
+    Parse IO class name into list of conditions the same way kernel
+    classifier does: conditions are evaluated left to right, each combined
+    with the result so far by the operator preceding it, without precedence.
+    """
+    conditions = []
+    logical_and = False
+    while rule:
+        match = re.match(r"([^:&|]*)(?::([^&|]*))?([&|]?)", rule)
+        token, operand, operator = match.groups()
+        handler = condition_handlers.get(token)
+        if not handler:
+            raise ClassifierRuleError(UNKNOWN_CONDITION)
+        conditions.append(
+            Condition(token, logical_and, handler(token, operand), stop=token == "done")
+        )
+        logical_and = operator != "|"
+        rule = rule[match.end():]
+    return conditions
+
+
+@dataclass
+class IoClass:
+    id: int
+    name: str
+    priority: Optional[int] = None
+    allocation: float = 1.0
+
+
+class Classifier:
+    """
+    Offline equivalent of kernel IO classifier. Rules are evaluated in order
+    of IO class id for whole trace chunks at once; request gets id of the
+    last matching class, unless a matching rule with "done" stops
+    the evaluation.
+    """
+
+    def __init__(self, io_classes):
+        self.io_classes = {io_class.id: io_class for io_class in io_classes}
+        self.rules = []
+        for io_class in sorted(self.io_classes.values(), key=lambda io_class: io_class.id):
+            if io_class.id == 0 or not io_class.name:
+                continue
+            try:
+                self.rules.append((io_class.id, parse_rule(io_class.name)))
+            except ClassifierRuleError as e:
+                raise ClassifierRuleError(f"IO class {io_class.id} ({io_class.name}): {e}")
+
+    @classmethod
+    def from_file(cls, path: str):
+        """Load IO classes from casadm --io-class --load-config file"""
+        io_classes = []
+        with open(path) as file:
+            for row in csv.DictReader(file):
+                try:
+                    priority = (row.get("Eviction priority") or "").strip()
+                    io_classes.append(IoClass(
+                        int(row["IO class id"]),
+                        row["IO class name"].strip(),
+                        int(priority) if priority else None,
+                        float(row.get("Allocation") or 1),
+                    ))
+                except (KeyError, ValueError, AttributeError):
+                    raise ValueError(f"Invalid io class entry {row}")
+        return cls(io_classes)
+
+    def classify(self, columns: dict, count: int) -> np.ndarray:
+        io_class = np.zeros(count, dtype=np.int64)
+        stopped = np.zeros(count, dtype=bool)
+
+        for class_id, conditions in self.rules:
+            result = np.zeros(count, dtype=bool)
+            stop = np.zeros(count, dtype=bool)
+            # Requests still evaluating this rule
+            active = ~stopped
+            for condition in conditions:
+                if condition.logical_and:
+                    active &= result
+                if not active.any():
+                    break
+                matches = condition.test(columns, io_class)
+                if condition.logical_and:
+                    result = np.where(active, matches & result, result)
+                else:
+                    result = np.where(active, matches | result, result)
+                if condition.stop:
+                    stop |= active
+                    active = np.zeros(count, dtype=bool)
+
+            io_class[result & ~stopped] = class_id
+            stopped |= stop
+
+        return io_class
+
+
+def _categorical(values: np.ndarray):
+    """Encode strings as codes into list of distinct values, "" is -1"""
+    distinct, codes = np.unique(values, return_inverse=True)
+    distinct = distinct.tolist()
+    if "" in distinct:
+        missing = distinct.index("")
+        codes = np.where(codes == missing, -1, codes)
+    return codes, distinct
+
+
+def read_annotated_trace(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Read CSV trace with header naming columns after classifier conditions:
+    core_id, io_direction (read/write), lba (sectors), request_size (bytes),
+    pid, process_name, file (path), file_size, file_offset, metadata,
+    direct and wlth. Only lba and request_size are required, other columns
+    may be skipped or left empty where not applicable.
+
+    Each chunk is parsed at once into a table of strings, which is converted
+    column by column. Yields (columns, count) chunks, with columns ready for
+    classification.
+    """
+    with open(path) as file:
+        fieldnames = next(csv.reader(file), [])
+        missing = {"lba", "request_size"} - set(fieldnames)
+        if missing:
+            raise ValueError(f"Missing trace columns: {', '.join(sorted(missing))}")
+        while True:
+            lines = [line for line in itertools.islice(file, chunk_size) if line.strip()]
+            if not lines:
+                break
+            table = np.loadtxt(lines, dtype=str, delimiter=",", quotechar='"', comments=None,
+                               ndmin=2)
+            if table.shape[1] != len(fieldnames):
+                raise ValueError(f"Expected {len(fieldnames)} trace columns, "
+                                 f"got {table.shape[1]}")
+            yield _columns(dict(zip(fieldnames, table.T))), len(table)
+
+
+def _columns(table):
+    columns = {}
+    for name in NUMERIC_COLUMNS:
+        if name in table:
+            values = table[name]
+            missing = values == ""
+            if missing.any():
+                values = np.where(missing, "-1", values)
+            columns[name] = values.astype(np.int64)
+    for name in FLAG_COLUMNS:
+        if name in table:
+            columns[name] = np.isin(np.char.lower(table[name]), ["1", "true", "yes"])
+    for name in STRING_COLUMNS:
+        if name in table:
+            columns[name] = _categorical(table[name])
+    if "io_direction" in table:
+        directions = np.char.lower(table["io_direction"])
+        columns["io_direction"] = np.full(len(directions), -1, dtype=np.int64)
+        for direction, value in DIRECTIONS.items():
+            columns["io_direction"][directions == direction] = value
+    return columns
+
+
+def predict(classifier: Classifier, trace_path: str, model: CacheModel,
+            chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Classify annotated trace and simulate it with given cache configuration.
+    Returns per IO class dicts with request and byte share, and occupancy
+    predicted without allocation limits compared with the allocation.
+    """
+    simulator = Simulator(model)
+    requests = {}
+    data = {}
+    for columns, count in read_annotated_trace(trace_path, chunk_size):
+        io_class = classifier.classify(columns, count)
+        length = np.maximum(columns["request_size"], 0)
+        classes, inverse = np.unique(io_class, return_inverse=True)
+        for class_id, class_requests, class_bytes in zip(
+                classes.tolist(), np.bincount(inverse).tolist(),
+                np.bincount(inverse, weights=length).tolist()):
+            requests[class_id] = requests.get(class_id, 0) + class_requests
+            data[class_id] = data.get(class_id, 0) + int(class_bytes)
+
+        simulator.process(
+            columns.get("core_id", np.zeros(count, dtype=np.int64)).clip(0),
+            columns.get("io_direction", np.zeros(count, dtype=np.int64)) == 1,
+            columns["lba"].clip(0) * SECTOR_SIZE,
+            length,
+            io_class,
+        )
+
+    total_requests = sum(requests.values()) or 1
+    total_bytes = sum(data.values()) or 1
+    occupancy = simulator.result.class_occupancy
+    report = []
+    for class_id in sorted(set(classifier.io_classes) | set(requests)):
+        io_class = classifier.io_classes.get(class_id, IoClass(class_id, ""))
+        occupied = 100.0 * occupancy.get(class_id, 0) / model.cache_lines
+        report.append({
+            "io_class": io_class,
+            "requests": 100.0 * requests.get(class_id, 0) / total_requests,
+            "bytes": 100.0 * data.get(class_id, 0) / total_bytes,
+            "occupancy": occupied,
+            "over_allocation": occupied > 100.0 * io_class.allocation,
+        })
+    return report, simulator.result
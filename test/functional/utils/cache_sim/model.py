@@ -0,0 +1,497 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Cache line key is core index in upper bits and line number in lower bits
+CORE_SHIFT = 47
+# Number of sequential streams remembered between chunks
+MAX_STREAMS = 4096
+
+
+@dataclass
+class CacheModel:
+    """
+    Simulated cache configuration. Sizes are in bytes, policy names are the
+    same as casadm parameter values.
+    """
+
+    cache_size: int
+    cache_line_size: int = 4096
+    cache_mode: str = "wt"
+    promotion_policy: str = "always"
+    nhit_threshold: int = 3
+    nhit_trigger: int = 80
+    seq_cutoff_policy: str = "full"
+    seq_cutoff_threshold: int = 1024 * 1024
+
+    @property
+    def cache_lines(self) -> int:
+        return self.cache_size // self.cache_line_size
+
+    def inserts(self, write: bool) -> bool:
+        if write:
+            return self.cache_mode in ("wt", "wb", "wo")
+        return self.cache_mode in ("wt", "wb", "wa")
+
+
+@dataclass
+class SimulationResult:
+    """Request and cache line counters in OCF statistics terms"""
+
+    read_hits: int = 0
+    read_partial_misses: int = 0
+    read_full_misses: int = 0
+    write_hits: int = 0
+    write_partial_misses: int = 0
+    write_full_misses: int = 0
+    pass_through_reads: int = 0
+    pass_through_writes: int = 0
+    line_hits: int = 0
+    line_accesses: int = 0
+    inserted_lines: int = 0
+    evicted_lines: int = 0
+    occupancy: int = 0
+    # Cached lines per IO class, if requests were classified
+    class_occupancy: dict = field(default_factory=dict)
+
+    @property
+    def reads(self) -> int:
+        return self.read_hits + self.read_partial_misses + self.read_full_misses
+
+    @property
+    def writes(self) -> int:
+        return self.write_hits + self.write_partial_misses + self.write_full_misses
+
+    @property
+    def requests(self) -> int:
+        return self.reads + self.writes + self.pass_through_reads + self.pass_through_writes
+
+    @staticmethod
+    def _ratio(part, total):
+        return 100.0 * part / total if total else 0.0
+
+    @property
+    def read_hit_ratio(self) -> float:
+        return self._ratio(self.read_hits, self.reads + self.pass_through_reads)
+
+    @property
+    def write_hit_ratio(self) -> float:
+        return self._ratio(self.write_hits, self.writes + self.pass_through_writes)
+
+    @property
+    def hit_ratio(self) -> float:
+        return self._ratio(self.read_hits + self.write_hits, self.requests)
+
+    @property
+    def line_hit_ratio(self) -> float:
+        return self._ratio(self.line_hits, self.line_accesses)
+
+    @property
+    def pass_through_ratio(self) -> float:
+        return self._ratio(self.pass_through_reads + self.pass_through_writes, self.requests)
+
+
+def _group_starts(*sorted_keys: np.ndarray) -> np.ndarray:
+    """
+    For each position of arrays sorted by keys return position where its
+    group of equal keys starts
+    """
+    starts = np.zeros(len(sorted_keys[0]), dtype=np.int64)
+    changed = np.zeros(max(len(starts) - 1, 0), dtype=bool)
+    for keys in sorted_keys:
+        changed |= keys[1:] != keys[:-1]
+    boundaries = np.flatnonzero(changed) + 1
+    starts[boundaries] = boundaries
+    return np.maximum.accumulate(starts) if len(starts) else starts
+
+
+def _group_ends(sorted_keys: np.ndarray) -> np.ndarray:
+    """Mask of last positions of groups of equal keys in sorted array"""
+    if not len(sorted_keys):
+        return np.zeros(0, dtype=bool)
+    return np.append(sorted_keys[1:] != sorted_keys[:-1], True)
+
+
+def _previous_in_group(order: np.ndarray, starts: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    For elements grouped by order (stable, so groups keep index order) find
+    index of the previous element of the same group with mask set, -1 if none
+    """
+    positions = np.where(mask[order], np.arange(len(order)), -1)
+    last = np.maximum.accumulate(positions) if len(positions) else positions
+    previous = np.concatenate(([-1], last[:-1]))
+    previous = np.where(previous >= starts, previous, -1)
+
+    result = np.empty(len(order), dtype=np.int64)
+    result[order] = np.where(previous >= 0, order[np.maximum(previous, 0)], -1)
+    return result
+
+
+def _dominance_sums(y: np.ndarray, weights: np.ndarray, queries: np.ndarray,
+                    query_y: np.ndarray) -> np.ndarray:
+    """
+    For each query index i sum weights of points j < i with y[j] < query_y.
+    Points with y < -1 are ignored.
+
+    Bottom-up divide and conquer: prefix [0, i) is split into dyadic blocks
+    (one per set bit of i) and each level counts points of one block with
+    binary search in points sorted by (block, y). Every level is a handful
+    of vectorized passes, O(n log^2 n) in total.
+    """
+    points = np.flatnonzero(y >= -1)
+    span = len(y) + 1
+    y_points = y[points] + 1
+    weights = weights[points]
+    result = np.zeros(len(queries), dtype=np.int64)
+    if not len(points) or not len(queries):
+        return result
+
+    order = np.arange(len(points))
+    level = 0
+    while (1 << level) <= queries.max():
+        keys = (points >> level) * span + y_points
+        # Blocks of previous level are already sorted, stable sort merges runs
+        order = order[np.argsort(keys[order], kind="stable")]
+        sorted_keys = keys[order]
+        cumulative = np.concatenate(([0], np.cumsum(weights[order])))
+
+        selected = np.flatnonzero((queries >> level) & 1)
+        block = (queries[selected] >> level) - 1
+        low = np.searchsorted(sorted_keys, block * span)
+        high = np.searchsorted(sorted_keys, block * span + query_y[selected] + 1)
+        result[selected] += cumulative[high] - cumulative[low]
+        level += 1
+
+    return result
+
+
+class Simulator:
+    """
+    Trace driven model of a single cache with LRU eviction.
+
+    Requests are expanded to cache line accesses and processed in chunks.
+    Everything but the chunk loop is vectorized: a cache line access is a
+    hit if the line was inserted or hit before and fewer than cache_lines
+    distinct lines were inserted or hit since then (LRU stack distance).
+    Between chunks the cache content is carried as lines with their last
+    access time.
+
+    Model simplifications compared to OCF:
+     - accesses which don't insert (e.g. read misses in WO, not promoted
+       nhit accesses) hit cached lines without refreshing them in LRU,
+     - pass-through writes invalidate cached lines, which still take their
+       LRU slot until evicted,
+     - nhit counts all insert candidate accesses of a line, without hash
+       collisions and without forgetting old lines,
+     - sequential streams are tracked per core and direction without
+       a limit on the number of concurrent streams within a chunk.
+    """
+
+    def __init__(self, model: CacheModel):
+        self.model = model
+        self.result = SimulationResult()
+        self.time = 0
+        self.state_lines = np.zeros(0, dtype=np.int64)
+        self.state_time = np.zeros(0, dtype=np.int64)
+        self.state_ghost = np.zeros(0, dtype=bool)
+        self.state_class = np.zeros(0, dtype=np.int64)
+        self.nhit_lines = np.zeros(0, dtype=np.int64)
+        self.nhit_counts = np.zeros(0, dtype=np.int64)
+        self.streams = (np.zeros(0, dtype=np.int64),) * 3
+        self.trigger_reached = model.promotion_policy != "nhit"
+        self.full = False
+
+    def _seq_cutoff_candidates(self, key, start, length):
+        """Return requests continuing a stream which reached the threshold"""
+        stream_key, stream_end, stream_bytes = self.streams
+        carried = len(stream_key)
+        key = np.concatenate((stream_key, key))
+        end = np.concatenate((stream_end, start + length))
+        start = np.concatenate((stream_end - stream_bytes, start))
+        length = np.concatenate((stream_bytes, length))
+        count = len(key)
+        index = np.arange(count)
+
+        # Match request starts with ends of earlier requests of the same stream.
+        # Events are interleaved (end of each request, then its start), so
+        # stable sort keeps them in order within each position.
+        event_key = np.repeat(key, 2)
+        event_pos = np.stack((end, start), axis=1).ravel()
+        event_index = np.repeat(index, 2)
+        event_type = np.tile(np.array([0, 1], dtype=np.int8), count)
+        order = np.lexsort((event_pos, event_key))
+        starts = _group_starts(event_key[order], event_pos[order])
+        positions = np.where(event_type[order] == 0, np.arange(len(order)), -1)
+        last = np.maximum.accumulate(positions)
+        last = np.where(last >= starts, last, -1)
+        queries = event_type[order] == 1
+        predecessor = np.full(count, -1, dtype=np.int64)
+        matched = queries & (last >= 0)
+        successor = event_index[order][matched]
+        predecessor_index = event_index[order][last[matched]]
+        # Stream is continued once, further requests from its old end start a new one
+        first = np.lexsort((successor, predecessor_index))
+        first = first[_group_starts(predecessor_index[first]) == np.arange(len(first))]
+        predecessor[successor[first]] = predecessor_index[first]
+
+        # Resolve stream roots by pointer jumping, then sum bytes along them
+        root = np.where(predecessor >= 0, predecessor, index)
+        while True:
+            next_root = root[root]
+            if np.array_equal(next_root, root):
+                break
+            root = next_root
+        order = np.argsort(root, kind="stable")
+        sizes = np.cumsum(length[order])
+        starts = _group_starts(root[order])
+        stream_total = np.empty(count, dtype=np.int64)
+        stream_total[order] = sizes - np.concatenate(([0], sizes))[starts]
+
+        # Remember ends of the most recent streams for the next chunk
+        tails = np.sort(order[_group_ends(root[order])])[-MAX_STREAMS:]
+        self.streams = (key[tails], end[tails], stream_total[tails])
+
+        candidates = (predecessor >= 0) & (stream_total >= self.model.seq_cutoff_threshold)
+        return candidates[carried:]
+
+    def _first_reaching(self, lines, touching, target):
+        """
+        Index of the access after which number of lines in cache (including
+        ones inserted by touching accesses) reaches target
+        """
+        needed = target - len(self.state_lines)
+        if needed <= 0:
+            return 0
+        new = np.flatnonzero(touching & ~np.isin(lines, self.state_lines))
+        _, first = np.unique(lines[new], return_index=True)
+        first = np.sort(new[first])
+        return first[needed - 1] + 1 if len(first) >= needed else len(lines)
+
+    def _nhit_promoted(self, lines, candidates, update):
+        """Accesses reaching nhit threshold of their line"""
+        order = np.argsort(lines, kind="stable")
+        sorted_lines = lines[order]
+        starts = _group_starts(sorted_lines)
+        counted = np.cumsum(candidates[order])
+        before = np.concatenate(([0], counted))[starts]
+        in_chunk = counted - before
+
+        carried = 0
+        if len(self.nhit_lines):
+            position = np.searchsorted(self.nhit_lines, sorted_lines)
+            position = np.minimum(position, len(self.nhit_lines) - 1)
+            carried = np.where(self.nhit_lines[position] == sorted_lines,
+                               self.nhit_counts[position], 0)
+
+        promoted = np.empty(len(lines), dtype=bool)
+        promoted[order] = carried + in_chunk >= self.model.nhit_threshold
+
+        if not update:
+            return promoted
+
+        chunk_lines, chunk_counts = np.unique(lines[candidates], return_counts=True)
+        all_lines = np.concatenate((self.nhit_lines, chunk_lines))
+        all_counts = np.concatenate((self.nhit_counts, chunk_counts))
+        self.nhit_lines, inverse = np.unique(all_lines, return_inverse=True)
+        self.nhit_counts = np.bincount(inverse, weights=all_counts).astype(np.int64)
+        return promoted
+
+    def _promoted(self, lines, candidates, update):
+        """Select insert candidates passing promotion policy"""
+        model = self.model
+        if model.promotion_policy != "nhit":
+            return candidates
+
+        promoted = candidates & self._nhit_promoted(lines, candidates, update)
+        if not self.trigger_reached:
+            target = model.cache_lines * model.nhit_trigger // 100
+            trigger = self._first_reaching(lines, candidates, target)
+            promoted[:trigger] = candidates[:trigger]
+            if update:
+                self.trigger_reached = trigger < len(lines)
+        return promoted
+
+    def _prefix(self, lines):
+        """
+        Cached lines accessed in this chunk as pseudo accesses ordered from
+        least recently used, separated by fillers standing for cached lines
+        not accessed in this chunk
+        """
+        cached = np.isin(self.state_lines, lines)
+        prefix_lines = self.state_lines[cached]
+        prefix_time = self.state_time[cached]
+        prefix_ghost = self.state_ghost[cached]
+        order = np.argsort(prefix_time)
+        prefix_lines, prefix_time, prefix_ghost = (
+            prefix_lines[order], prefix_time[order], prefix_ghost[order])
+
+        sorted_time = np.sort(self.state_time)
+        newer = len(sorted_time) - np.searchsorted(sorted_time, prefix_time, side="right")
+        gaps = newer - np.concatenate((newer[1:], [0])) - 1
+        gaps[-1:] = newer[-1:]
+
+        count = len(prefix_lines)
+        # Per cached line: its access, kill for invalidated ones and filler
+        prefix = np.empty(3 * count, dtype=np.int64)
+        prefix[0::3] = prefix_lines
+        prefix[1::3] = prefix_lines
+        prefix[2::3] = -1 - np.arange(count)
+        touching = np.zeros(3 * count, dtype=bool)
+        touching[0::3] = True
+        touching[2::3] = True
+        kill = np.zeros(3 * count, dtype=bool)
+        kill[1::3] = prefix_ghost
+        weights = np.zeros(3 * count, dtype=np.int64)
+        weights[0::3] = 1
+        weights[2::3] = gaps
+        return prefix, touching, kill, weights
+
+    def _hits(self, lines, touching, kill):
+        """Return hit flag of each access"""
+        prefix, prefix_touching, prefix_kill, weights = self._prefix(lines)
+        offset = len(prefix)
+        all_lines = np.concatenate((prefix, lines))
+        all_touching = np.concatenate((prefix_touching, touching))
+        all_kill = np.concatenate((prefix_kill, kill))
+        all_weights = np.concatenate((weights, np.ones(len(lines), dtype=np.int64)))
+
+        order = np.argsort(all_lines, kind="stable")
+        starts = _group_starts(all_lines[order])
+        last_touch = _previous_in_group(order, starts, all_touching)
+        last_kill = _previous_in_group(order, starts, all_kill)
+
+        queries = np.arange(offset, len(all_lines))
+        previous = last_touch[offset:]
+        candidate = (previous >= 0) & (last_kill[offset:] < previous)
+
+        # Distinct lines (weighted) touched between previous access and now
+        touched = np.concatenate(([0], np.cumsum(np.where(all_touching, all_weights, 0))))
+        upper_bound = touched[queries] - touched[previous + 1]
+        capacity = self.model.cache_lines
+        check = np.flatnonzero(candidate & (upper_bound >= capacity))
+
+        hits = candidate.copy()
+        if len(check):
+            y = np.where(all_touching, last_touch, -2)
+            sums = _dominance_sums(y, all_weights, queries[check], previous[check])
+            distance = sums - touched[previous[check] + 1]
+            hits[check] = distance < capacity
+
+        return hits
+
+    def _update_state(self, lines, touching, kill, line_class):
+        time = self.time + np.arange(len(lines))
+        touched_lines = lines[touching]
+        touched_time = time[touching]
+        killed_lines = lines[kill]
+        killed_time = time[kill]
+
+        all_lines = np.concatenate((self.state_lines, touched_lines))
+        all_time = np.concatenate((self.state_time, touched_time))
+        all_ghost = np.concatenate((self.state_ghost, np.zeros(len(touched_lines), dtype=bool)))
+        all_class = np.concatenate((self.state_class, line_class[touching]))
+        order = np.lexsort((all_time, all_lines))
+        last = order[_group_ends(all_lines[order])]
+        lines_, time_ = all_lines[last], all_time[last]
+        ghost, class_ = all_ghost[last], all_class[last]
+
+        # Lines invalidated after their last access don't hit anymore
+        if len(killed_lines):
+            order = np.lexsort((killed_time, killed_lines))
+            last = order[_group_ends(killed_lines[order])]
+            killed_lines, killed_time = killed_lines[last], killed_time[last]
+            position = np.minimum(np.searchsorted(killed_lines, lines_), len(killed_lines) - 1)
+            ghost |= (killed_lines[position] == lines_) & (killed_time[position] > time_)
+
+        capacity = self.model.cache_lines
+        if len(lines_) > capacity:
+            keep = np.sort(np.argpartition(time_, len(time_) - capacity)[-capacity:])
+            lines_, time_, ghost, class_ = lines_[keep], time_[keep], ghost[keep], class_[keep]
+
+        self.state_lines, self.state_time, self.state_ghost = lines_, time_, ghost
+        self.state_class = class_
+        self.time += len(lines)
+
+    def process(self, core, write, offset, length, io_class=None):
+        """
+        Simulate a chunk of requests given as numpy arrays. Optional IO class
+        of each request is used to break down occupancy.
+        """
+        model = self.model
+        core = np.asarray(core, dtype=np.int64)
+        write = np.asarray(write, dtype=bool)
+        offset = np.asarray(offset, dtype=np.int64)
+        length = np.asarray(length, dtype=np.int64)
+        io_class = np.zeros(len(core), dtype=np.int64) if io_class is None else np.asarray(io_class)
+        valid = length > 0
+        core, write, offset, length = core[valid], write[valid], offset[valid], length[valid]
+        io_class = io_class[valid]
+        if not len(core):
+            return
+
+        # Expand requests to cache line accesses
+        first = offset // model.cache_line_size
+        counts = (offset + length - 1) // model.cache_line_size - first + 1
+        request = np.repeat(np.arange(len(core)), counts)
+        request_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        lines = (core[request] << CORE_SHIFT) | (
+            first[request] + np.arange(len(request)) - request_start[request])
+        line_write = write[request]
+
+        pass_through = np.full(len(core), model.cache_mode == "pt")
+        candidates = np.where(line_write, model.inserts(True), model.inserts(False))
+
+        if model.seq_cutoff_policy != "never" and model.cache_mode != "pt":
+            cutoff = self._seq_cutoff_candidates(core * 2 + write, offset, length)
+            if model.seq_cutoff_policy == "full" and not self.full:
+                # Until the cache fills up cutoff doesn't apply
+                touching = self._promoted(lines, candidates & ~pass_through[request], False)
+                full = self._first_reaching(lines, touching, model.cache_lines)
+                cutoff &= request_start >= full
+            pass_through |= cutoff
+
+        line_pt = pass_through[request]
+        touching = self._promoted(lines, candidates & ~line_pt, True)
+        kill = line_pt & line_write
+        hits = self._hits(lines, touching, kill)
+
+        # Statistics
+        result = self.result
+        serviced = ~line_pt
+        request_hits = np.bincount(request, weights=hits & serviced, minlength=len(core))
+        full_hit = (request_hits == counts) & ~pass_through
+        no_hit = (request_hits == 0) & ~pass_through
+        partial = ~full_hit & ~no_hit & ~pass_through
+        result.read_hits += int(np.sum(full_hit & ~write))
+        result.read_partial_misses += int(np.sum(partial & ~write))
+        result.read_full_misses += int(np.sum(no_hit & ~write))
+        result.write_hits += int(np.sum(full_hit & write))
+        result.write_partial_misses += int(np.sum(partial & write))
+        result.write_full_misses += int(np.sum(no_hit & write))
+        result.pass_through_reads += int(np.sum(pass_through & ~write))
+        result.pass_through_writes += int(np.sum(pass_through & write))
+        result.line_hits += int(np.sum(hits & serviced))
+        result.line_accesses += int(np.sum(serviced))
+
+        occupancy_before = int(np.sum(~self.state_ghost))
+        inserted = int(np.sum(touching & ~hits))
+        invalidated = int(np.sum(kill & hits))
+        self._update_state(lines, touching, kill, io_class[request])
+        result.occupancy = int(np.sum(~self.state_ghost))
+        classes, occupancy = np.unique(self.state_class[~self.state_ghost], return_counts=True)
+        result.class_occupancy = dict(zip(classes.tolist(), occupancy.tolist()))
+        self.full = self.full or len(self.state_lines) >= model.cache_lines
+        result.inserted_lines += inserted
+        result.evicted_lines += inserted - invalidated - (result.occupancy - occupancy_before)
+
+    def run(self, chunks) -> SimulationResult:
+        """Simulate all chunks of trace records (see trace.TRACE_DTYPE)"""
+        for chunk in chunks:
+            self.process(chunk["core"], chunk["write"], chunk["offset"], chunk["length"],
+                         chunk["io_class"] if "io_class" in chunk.dtype.names else None)
+        return self.result
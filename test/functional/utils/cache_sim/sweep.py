@@ -0,0 +1,117 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.cache_sim.model import CacheModel, Simulator, SimulationResult
+from utils.cache_sim.trace import DEFAULT_CHUNK_SIZE, read_trace
+
+# Values swept by default, the same as of CacheLineSize, CacheMode,
+# PromotionPolicy and SeqCutOffPolicy of functional test API
+CACHE_LINE_SIZES = [4096, 8192, 16384, 32768, 65536]
+CACHE_MODES = ["wt", "wb", "wa", "pt", "wo"]
+PROMOTION_POLICIES = ["always", "nhit"]
+SEQ_CUTOFF_POLICIES = ["full", "always", "never"]
+
+TABLE_HEADER = [
+    "Cache line size [KiB]",
+    "Cache mode",
+    "Promotion policy",
+    "Seq cutoff policy",
+    "Requests",
+    "Read hit [%]",
+    "Write hit [%]",
+    "Hit [%]",
+    "Pass-Through [%]",
+    "Line hit [%]",
+    "Evicted lines",
+    "Occupancy [%]",
+]
+
+
+def cache_model(cache_size: int, cache_line_size, cache_mode, promotion_policy,
+                seq_cutoff_policy, **params) -> CacheModel:
+    """
+    Build simulated cache configuration from casadm parameter values or
+    functional test API enums (CacheLineSize, CacheMode, PromotionPolicy,
+    SeqCutOffPolicy). Enums are not imported, so that the simulator runs
+    without the test framework.
+    """
+    return CacheModel(
+        cache_size=cache_size,
+        cache_line_size=int(cache_line_size),
+        cache_mode=getattr(cache_mode, "name", cache_mode).lower(),
+        promotion_policy=getattr(promotion_policy, "value", promotion_policy),
+        seq_cutoff_policy=getattr(seq_cutoff_policy, "value", seq_cutoff_policy),
+        **params,
+    )
+
+
+def simulate(model: CacheModel, trace_path: str, trace_format: str,
+             chunk_size: int = DEFAULT_CHUNK_SIZE) -> SimulationResult:
+    return Simulator(model).run(read_trace(trace_path, trace_format, chunk_size))
+
+
+def sweep(trace_path: str, trace_format: str, cache_size: int,
+          cache_line_sizes=None, cache_modes=None, promotion_policies=None,
+          seq_cutoff_policies=None, jobs: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+          **params):
+    """
+    Simulate trace with every combination of given policies (all values by
+    default), given as values or enums accepted by cache_model(). Yields
+    (model, result) pairs in combination order.
+    """
+    combinations = itertools.product(
+        cache_line_sizes or CACHE_LINE_SIZES,
+        cache_modes or CACHE_MODES,
+        promotion_policies or PROMOTION_POLICIES,
+        seq_cutoff_policies or SEQ_CUTOFF_POLICIES,
+    )
+    models = [cache_model(cache_size, *combination, **params) for combination in combinations]
+
+    if jobs == 1:
+        for model in models:
+            yield model, simulate(model, trace_path, trace_format, chunk_size)
+        return
+
+    with ProcessPoolExecutor(jobs) as executor:
+        futures = [
+            executor.submit(simulate, model, trace_path, trace_format, chunk_size)
+            for model in models
+        ]
+        for model, future in zip(models, futures):
+            yield model, future.result()
+
+
+def table_row(model: CacheModel, result: SimulationResult) -> list:
+    occupancy = 100.0 * result.occupancy / model.cache_lines if model.cache_lines else 0.0
+    return [
+        str(model.cache_line_size // 1024),
+        model.cache_mode,
+        model.promotion_policy,
+        model.seq_cutoff_policy,
+        str(result.requests),
+        f"{result.read_hit_ratio:.1f}",
+        f"{result.write_hit_ratio:.1f}",
+        f"{result.hit_ratio:.1f}",
+        f"{result.pass_through_ratio:.1f}",
+        f"{result.line_hit_ratio:.1f}",
+        str(result.evicted_lines),
+        f"{occupancy:.1f}",
+    ]
+
+
+def format_table(rows, output_format: str = "table", header=TABLE_HEADER) -> str:
+    """Format comparison table as aligned text or CSV"""
+    rows = [header] + list(rows)
+    if output_format == "csv":
+        return "".join(",".join(row) + "\n" for row in rows)
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "".join(
+        " | ".join(value.rjust(width) for value, width in zip(row, widths)).rstrip() + "\n"
+        for row in rows
+    )
@@ -0,0 +1,186 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import numpy as np
+import pytest
+
+from utils.cache_sim.ioclass import (
+    Classifier,
+    ClassifierRuleError,
+    IoClass,
+    parse_rule,
+    read_annotated_trace,
+)
+
+
+def classify(rules, **columns):
+    classifier = Classifier([IoClass(class_id, rule) for class_id, rule in rules])
+    count = len(next(iter(columns.values())))
+    columns = {name: np.array(values, dtype=np.int64) for name, values in columns.items()}
+    return classifier.classify(columns, count).tolist()
+
+
+def test_parse_rule():
+    conditions = parse_rule("core_id:1|lba:gt:8&done")
+
+    assert [(condition.token, condition.logical_and, condition.stop)
+            for condition in conditions] == [
+        ("core_id", False, False),
+        ("lba", False, False),
+        ("done", True, True),
+    ]
+
+
+def test_no_operator_precedence():
+    # Evaluated left to right as (core 1 or core 2) and small request
+    io_class = classify(
+        [(1, "core_id:1|core_id:2&request_size:lt:4096")],
+        core_id=[1, 2, 1, 3],
+        request_size=[8192, 512, 512, 512],
+    )
+
+    assert io_class == [0, 1, 1, 0]
+
+    # Like in kernel, rule fails once result is false before "&", even if
+    # later "|" condition matches
+    io_class = classify(
+        [(1, "request_size:lt:4096&core_id:1|core_id:2")],
+        core_id=[1, 2, 1, 2],
+        request_size=[8192, 8192, 512, 512],
+    )
+    assert io_class == [0, 0, 1, 1]
+
+
+def test_done_after_failed_and():
+    rules = [(1, "core_id:1&done"), (2, "request_size:gt:0")]
+
+    io_class = classify(rules, core_id=[1, 2], request_size=[512, 512])
+
+    # Failed condition before "done" doesn't stop evaluation
+    assert io_class == [1, 2]
+
+    rules = [(1, "core_id:1"), (2, "request_size:gt:0")]
+    assert classify(rules, core_id=[1, 2], request_size=[512, 512]) == [2, 2]
+
+
+def test_io_class_condition():
+    rules = [
+        (1, "core_id:1"),
+        (2, "io_class:1&request_size:gt:4096"),
+        (3, "io_class:lt:2&lba:eq:0"),
+    ]
+
+    io_class = classify(
+        rules,
+        core_id=[1, 1, 2, 2, 1],
+        request_size=[8192, 512, 8192, 512, 8192],
+        lba=[8, 8, 8, 0, 0],
+    )
+
+    # io_class refers to class assigned by earlier rules
+    assert io_class == [2, 1, 0, 3, 2]
+
+
+def test_missing_columns():
+    io_class = classify([(1, "pid:5"), (2, "metadata")], core_id=[1, 2])
+
+    assert io_class == [0, 0]
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        "core_id:4096",
+        "core_id:",
+        "lba",
+        "lba:xx:1",
+        "lba:eq:-1",
+        "lba:eq:18446744073709551616",
+        "io_direction:up",
+        "extension:",
+        "process_name:" + "x" * 256,
+        "directory:",
+        "metadata:1",
+        "done:1",
+    ],
+)
+def test_invalid_operand(rule):
+    with pytest.raises(ClassifierRuleError, match="Invalid classification rule syntax"):
+        parse_rule(rule)
+
+
+def test_unknown_condition():
+    with pytest.raises(ClassifierRuleError, match="Unexpected classification rule condition"):
+        parse_rule("core_id:1&size:1")
+
+    with pytest.raises(ClassifierRuleError, match=r"IO class 3 \(unknown\)"):
+        Classifier([IoClass(0, "unclassified"), IoClass(3, "unknown")])
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "ioclass-config.csv"
+    path.write_text(
+        "IO class id,IO class name,Eviction priority,Allocation\n"
+        "0,unclassified,22,1.00\n"
+        "1,metadata&done,0,0.25\n"
+        "2, file_size:le:4096&done ,,\n"
+    )
+
+    classifier = Classifier.from_file(str(path))
+
+    assert [(io_class.id, io_class.name, io_class.priority, io_class.allocation)
+            for io_class in classifier.io_classes.values()] == [
+        (0, "unclassified", 22, 1.0),
+        (1, "metadata&done", 0, 0.25),
+        (2, "file_size:le:4096&done", None, 1.0),
+    ]
+    assert [class_id for class_id, _ in classifier.rules] == [1, 2]
+
+    path.write_text("IO class id,IO class name\nx,metadata\n")
+    with pytest.raises(ValueError, match="Invalid io class entry"):
+        Classifier.from_file(str(path))
+
+
+def test_read_annotated_trace(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text(
+        "core_id,io_direction,lba,request_size,pid,process_name,file,metadata\n"
+        '1,read,8,4096,100,dd,"/data/a,b.db",1\n'
+        ",W,16,512,,,,\n"
+        "\n"
+        "2,x,0,8192,5,fio,/data/c.log,no\n"
+    )
+
+    chunks = list(read_annotated_trace(str(path), chunk_size=2))
+
+    assert [count for _, count in chunks] == [2, 1]
+    columns, _ = chunks[0]
+    assert columns["core_id"].tolist() == [1, -1]
+    assert columns["io_direction"].tolist() == [0, 1]
+    assert columns["pid"].tolist() == [100, -1]
+    assert columns["metadata"].tolist() == [True, False]
+    codes, values = columns["file"]
+    assert [values[code] if code >= 0 else None for code in codes] == ["/data/a,b.db", None]
+    assert chunks[1][0]["io_direction"].tolist() == [-1]
+
+    classifier = Classifier([
+        IoClass(1, "extension:db"),
+        IoClass(2, "directory:/data&io_direction:write"),
+        IoClass(3, "process_name:fio&file_name_prefix:c."),
+    ])
+    assert [classifier.classify(columns, count).tolist() for columns, count in chunks] == [
+        [1, 0], [3]
+    ]
+
+
+def test_read_annotated_trace_invalid(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text("core_id,lba\n1,8\n")
+    with pytest.raises(ValueError, match="Missing trace columns: request_size"):
+        list(read_annotated_trace(str(path)))
+
+    path.write_text("lba,request_size\n8,4096\n8\n")
+    with pytest.raises(ValueError):
+        list(read_annotated_trace(str(path)))
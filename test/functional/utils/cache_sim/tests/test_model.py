@@ -0,0 +1,173 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from utils.cache_sim.model import CacheModel, Simulator
+
+KiB = 1024
+
+
+def naive_lru(model, core, write, offset, length):
+    """Reference LRU cache inserting every accessed line, one access at a time"""
+    cache = OrderedDict()
+    hits = evicted = 0
+    request_hits = []
+    for core_, offset_, length_ in zip(core, offset, length):
+        first = offset_ // model.cache_line_size
+        last = (offset_ + length_ - 1) // model.cache_line_size
+        request_hit = 0
+        for line in range(first, last + 1):
+            key = (core_, line)
+            if key in cache:
+                cache.move_to_end(key)
+                request_hit += 1
+                continue
+            cache[key] = True
+            if len(cache) > model.cache_lines:
+                cache.popitem(last=False)
+                evicted += 1
+        hits += request_hit
+        request_hits.append(request_hit == last - first + 1)
+    return hits, evicted, len(cache), request_hits
+
+
+def simulate(model, chunk_size, core, write, offset, length):
+    simulator = Simulator(model)
+    for start in range(0, len(core), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        simulator.process(core[chunk], write[chunk], offset[chunk], length[chunk])
+    return simulator.result
+
+
+def random_trace(seed, count, lines, cache_line_size):
+    rng = np.random.default_rng(seed)
+    core = rng.integers(0, 2, count)
+    write = rng.random(count) < 0.3
+    # Skewed offsets, so that some lines are reused within cache capacity
+    offset = (rng.zipf(1.3, count) % lines) * cache_line_size + rng.integers(0, 2, count) * 512
+    length = rng.integers(1, 3 * cache_line_size, count)
+    return core, write, offset, length
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 5000])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_lru_matches_naive(seed, chunk_size):
+    model = CacheModel(cache_size=32 * 4 * KiB, seq_cutoff_policy="never")
+    trace = random_trace(seed, 2000, 200, model.cache_line_size)
+
+    hits, evicted, occupancy, request_hits = naive_lru(model, *trace)
+    result = simulate(model, chunk_size, *trace)
+
+    assert result.line_hits == hits
+    assert result.evicted_lines == evicted
+    assert result.occupancy == occupancy
+    assert result.read_hits + result.write_hits == sum(request_hits)
+    assert result.line_accesses == result.inserted_lines + hits
+
+
+def requests(offsets, write=False, length=4 * KiB):
+    count = len(offsets)
+    return (np.zeros(count, dtype=np.int64), np.full(count, write),
+            np.array(offsets, dtype=np.int64), np.full(count, length))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_nhit_threshold(chunk_size):
+    model = CacheModel(cache_size=16 * 4 * KiB, promotion_policy="nhit", nhit_threshold=3,
+                       nhit_trigger=0, seq_cutoff_policy="never")
+
+    result = simulate(model, chunk_size, *requests([0, 0, 0, 0, 4 * KiB]))
+
+    # Line is inserted on the third access and hit on the fourth
+    assert result.inserted_lines == 1
+    assert result.read_hits == 1
+    assert result.read_full_misses == 4
+    assert result.occupancy == 1
+
+
+def test_nhit_trigger():
+    model = CacheModel(cache_size=4 * 4 * KiB, promotion_policy="nhit", nhit_threshold=2,
+                       nhit_trigger=50, seq_cutoff_policy="never")
+
+    # Until half of the cache is occupied lines are inserted on first access
+    result = simulate(model, 100, *requests([0, 4 * KiB, 8 * KiB, 0, 4 * KiB, 8 * KiB]))
+
+    assert result.read_hits == 2
+    # Then only on nhit_threshold access
+    assert result.read_full_misses == 4
+    assert result.occupancy == 3
+
+    model = CacheModel(cache_size=4 * 4 * KiB, promotion_policy="always",
+                       seq_cutoff_policy="never")
+    result = simulate(model, 100, *requests([0, 4 * KiB, 8 * KiB, 0, 4 * KiB, 8 * KiB]))
+    assert result.read_hits == 3
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_seq_cutoff_always(chunk_size):
+    model = CacheModel(cache_size=64 * 4 * KiB, seq_cutoff_policy="always",
+                       seq_cutoff_threshold=8 * KiB)
+
+    result = simulate(model, chunk_size, *requests([i * 4 * KiB for i in range(6)]))
+
+    # Stream reaches threshold with its second request
+    assert result.pass_through_reads == 5
+    assert result.occupancy == 1
+
+
+def test_seq_cutoff_full():
+    sequential = requests([i * 4 * KiB for i in range(8)])
+
+    model = CacheModel(cache_size=4 * 4 * KiB, seq_cutoff_policy="full",
+                       seq_cutoff_threshold=8 * KiB)
+    result = simulate(model, 100, *sequential)
+    # Cutoff applies only once the cache is full
+    assert result.pass_through_reads == 4
+    assert result.occupancy == 4
+
+    model = CacheModel(cache_size=4 * 4 * KiB, seq_cutoff_policy="never",
+                       seq_cutoff_threshold=8 * KiB)
+    result = simulate(model, 100, *sequential)
+    assert result.pass_through_reads == 0
+    assert result.evicted_lines == 4
+
+
+@pytest.mark.parametrize(
+    "cache_mode,write_inserts,read_inserts",
+    [
+        ("wt", True, True),
+        ("wb", True, True),
+        ("wa", False, True),
+        ("wo", True, False),
+    ],
+)
+def test_mode_insert_rules(cache_mode, write_inserts, read_inserts):
+    model = CacheModel(cache_size=16 * 4 * KiB, cache_mode=cache_mode,
+                       seq_cutoff_policy="never")
+    simulator = Simulator(model)
+
+    simulator.process(*requests([0], write=True))
+    simulator.process(*requests([0]))
+    simulator.process(*requests([4 * KiB]))
+    simulator.process(*requests([4 * KiB]))
+
+    result = simulator.result
+    # Read after write hits if write inserted, second read if the first one did
+    assert result.read_hits == write_inserts + read_inserts
+    assert result.write_full_misses == 1
+
+
+def test_mode_pass_through():
+    model = CacheModel(cache_size=16 * 4 * KiB, cache_mode="pt")
+
+    result = simulate(model, 100, *requests([0, 0, 0]))
+
+    assert result.pass_through_reads == 3
+    assert result.read_hits == 0
+    assert result.occupancy == 0
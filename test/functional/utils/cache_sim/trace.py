@@ -0,0 +1,135 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import shutil
+import tempfile
+from typing import Iterator, TextIO
+
+import numpy as np
+
+TRACE_DTYPE = np.dtype([
+    ("core", np.uint16),
+    ("write", np.bool_),
+    ("offset", np.uint64),
+    ("length", np.uint32),
+])
+
+SECTOR_SIZE = 512
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class TraceParser:
+    """
+    Base of text trace parsers. Every distinct device (file name) of the trace
+    is simulated as separate core, numbered in order of appearance.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.devices = {}
+
+    def device_index(self, name: str) -> int:
+        return self.devices.setdefault(name, len(self.devices))
+
+    def parse_line(self, fields: list):
+        """Return (device, is_write, offset, length) or None to skip the line"""
+        raise NotImplementedError()
+
+    def parse(self, file: TextIO) -> Iterator[np.ndarray]:
+        chunk = np.empty(self.chunk_size, dtype=TRACE_DTYPE)
+        count = 0
+        for line in file:
+            request = self.parse_line(line.split())
+            if request is None:
+                continue
+            device, write, offset, length = request
+            chunk[count] = (self.device_index(device), write, offset, length)
+            count += 1
+            if count == self.chunk_size:
+                yield chunk
+                chunk = np.empty(self.chunk_size, dtype=TRACE_DTYPE)
+                count = 0
+        if count:
+            yield chunk[:count]
+
+
+class FioIologParser(TraceParser):
+    """
+    fio iolog version 2 and 3 (with leading timestamp), as written with
+    write_iolog. Only read and write actions are simulated.
+    """
+
+    def parse_line(self, fields):
+        if len(fields) == 6:
+            fields = fields[1:]
+        if len(fields) != 4 or fields[1] not in ("read", "write"):
+            return None
+        return fields[0], fields[1] == "write", int(fields[2]), int(fields[3])
+
+
+class BlkparseParser(TraceParser):
+    """
+    blkparse default text output. Only read and write requests of a single
+    action (queue by default) are simulated, so each request is counted once.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, action: str = "Q"):
+        super().__init__(chunk_size)
+        self.action = action
+
+    def parse_line(self, fields):
+        # 8,0 3 1 0.000000000 697 Q WS 223490 + 8 [kworker]
+        if len(fields) < 10 or fields[5] != self.action or fields[8] != "+":
+            return None
+        rwbs = fields[6]
+        if "R" not in rwbs and "W" not in rwbs:
+            return None
+        try:
+            sector, sectors = int(fields[7]), int(fields[9])
+        except ValueError:
+            return None
+        return fields[0], "W" in rwbs, sector * SECTOR_SIZE, sectors * SECTOR_SIZE
+
+
+parsers = {
+    "fio": FioIologParser,
+    "blkparse": BlkparseParser,
+}
+
+
+def read_trace(path: str, trace_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yield chunks of trace records. Trace compiled with save_trace() (.npy) is
+    memory mapped, text traces are parsed on the fly.
+    """
+    if path.endswith(".npy"):
+        records = np.load(path, mmap_mode="r")
+        for start in range(0, len(records), chunk_size):
+            yield records[start:start + chunk_size]
+        return
+
+    with open(path) as file:
+        yield from parsers[trace_format](chunk_size).parse(file)
+
+
+def save_trace(chunks, path: str) -> int:
+    """
+    Store trace in numpy format, so that it is parsed only once for all
+    simulated configurations. Return number of records.
+    """
+    count = 0
+    with tempfile.TemporaryFile() as records:
+        for chunk in chunks:
+            records.write(np.ascontiguousarray(chunk, dtype=TRACE_DTYPE).tobytes())
+            count += len(chunk)
+        records.seek(0)
+        with open(path, "wb") as file:
+            np.lib.format.write_array_header_1_0(file, {
+                "descr": np.lib.format.dtype_to_descr(TRACE_DTYPE),
+                "fortran_order": False,
+                "shape": (count,),
+            })
+            shutil.copyfileobj(records, file)
+    return count
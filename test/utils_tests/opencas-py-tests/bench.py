@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Startup/hotplug latency benchmark for casctl and open-cas-loader.py.
+
+Entry points are run in-process against a mock casadm and a mock device
+tree: paths under /dev, /etc/opencas, /run/opencas and /sys/module/cas_cache
+are redirected to a temporary directory and subprocess calls are answered
+by MockCasadm. For every phase wall time, number of subprocess invocations
+and number of filesystem syscalls issued by the tooling are reported.
+
+    python3 bench.py --caches 4 --cores 64 --stacked 2
+"""
+
+import argparse
+import builtins
+import collections
+import contextlib
+import io
+import json
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import helpers
+
+utils_dir = os.path.join(helpers.find_repo_root(), "utils")
+if utils_dir not in sys.path:
+    sys.path.append(utils_dir)
+
+import opencas  # noqa: E402
+
+redirected_dirs = ("/dev", "/etc/opencas", "/run/opencas", "/sys/module/cas_cache")
+
+
+class MockCasadm(object):
+    """
+    Stateful stand-in for casadm (and other tools called by opencas.py).
+    Exported objects are created as files in the mock tree so stacked
+    cores show up only when the device below them is running.
+    """
+
+    def __init__(self, env):
+        self.env = env
+        self.caches = collections.OrderedDict()
+        self.core_pool = collections.OrderedDict()
+        # Cache metadata persisted on cache device, keyed by device realpath
+        self.metadata = {}
+        self.calls = collections.Counter()
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def _result(args, exit_code=0, stdout="", stderr=""):
+        return subprocess.CompletedProcess(args, exit_code, stdout, stderr)
+
+    def _exp_obj(self, cache_id, core_id):
+        return f"/dev/cas{cache_id}-{core_id}"
+
+    def _set_exp_obj(self, cache_id, core_id, present):
+        path = self.env.map(self._exp_obj(cache_id, core_id))
+        if present:
+            open(path, "w").close()
+        elif os.path.exists(path):
+            os.unlink(path)
+
+    def _exists(self, path):
+        return os.path.exists(self.env.map(path))
+
+    def _realpath(self, path):
+        return self.env.unmap(os.path.realpath(self.env.map(path)))
+
+    def __call__(self, cmd, *args, **kwargs):
+        cmd = list(cmd)
+        program = os.path.basename(cmd[0])
+        with self.env.lock:
+            self.calls[program] += 1
+
+        # Filesystem access of the mock itself isn't accounted
+        self.env.local.uncounted = True
+        try:
+            with self.lock:
+                return self._run(program, cmd)
+        finally:
+            self.env.local.uncounted = False
+
+    def _run(self, program, cmd):
+        if program != "casadm":
+            # lsblk, udevadm, modprobe
+            stdout = "dev\n" if program == "lsblk" else ""
+            return self._result(cmd, stdout=stdout)
+
+        options = {}
+        flags = set()
+        i = 1
+        while i < len(cmd):
+            if i + 1 < len(cmd) and not cmd[i + 1].startswith("--"):
+                options[cmd[i]] = cmd[i + 1]
+                i += 2
+            else:
+                flags.add(cmd[i])
+                i += 1
+
+        try:
+            return self._result(cmd, stdout=self.handle(options, flags))
+        except ValueError as e:
+            return self._result(cmd, exit_code=1, stderr=str(e))
+
+    def handle(self, options, flags):
+        if "--list-caches" in flags:
+            return self.list_caches()
+        if "--version" in flags:
+            return json.dumps([
+                {"Name": "CAS Cache Kernel Module", "Version": "0.0.0"},
+                {"Name": "CAS CLI Utility", "Version": "0.0.0"},
+            ])
+        if "--check-cache-device" in flags:
+            device = self._realpath(options["--cache-device"])
+            is_cache = "yes" if device in self.metadata else "no"
+            return f"Is cache,Cache dirty\n{is_cache},no\n"
+        if "--start-cache" in flags:
+            return self.start_cache(options, "--load" in flags)
+        if "--add-core" in flags:
+            return self.add_core(options, "--try-add" in flags)
+        if "--remove-core" in flags:
+            return self.remove_core(options, "--detach" in flags)
+        if "--stop-cache" in flags:
+            return self.stop_cache(int(options["--cache-id"]))
+        if "--set-param" in flags or "--io-class" in flags:
+            return ""
+        raise ValueError(f"Unsupported casadm call {options} {flags}")
+
+    def list_caches(self):
+        def entry(type, id, disk, status, mode=None, device=None):
+            return {"type": type, "id": id, "disk": disk, "status": status,
+                    "write policy": mode, "device": device}
+
+        out = []
+        if self.core_pool:
+            pool = entry("core pool", None, None, None)
+            pool["cores"] = [entry("core", None, device, "Detached") for device in self.core_pool]
+            out.append(pool)
+        for cache_id, cache in self.caches.items():
+            branch = entry("cache", cache_id, cache["device"], "Running", cache["mode"])
+            branch["cores"] = []
+            for core_id, core in cache["cores"].items():
+                exp_obj = self._exp_obj(cache_id, core_id) if core["status"] == "Active" else None
+                branch["cores"].append(entry("core", core_id, core["device"], core["status"],
+                                             device=exp_obj))
+            out.append(branch)
+        return json.dumps(out)
+
+    def start_cache(self, options, load):
+        device = options["--cache-device"]
+        if not self._exists(device):
+            raise ValueError(f"Device {device} not found")
+
+        if load:
+            metadata = self.metadata.get(self._realpath(device))
+            if metadata is None:
+                raise ValueError("No metadata to load")
+            cache_id, mode, cores = metadata["id"], metadata["mode"], metadata["cores"]
+        else:
+            cache_id = int(options["--cache-id"])
+            mode, cores = options.get("--cache-mode", "wt"), {}
+
+        if cache_id in self.caches:
+            raise ValueError(f"Cache {cache_id} is already running")
+
+        self.caches[cache_id] = {"device": device, "mode": mode, "cores": {}}
+        for core_id, core_device in cores.items():
+            active = self._exists(core_device)
+            self.caches[cache_id]["cores"][core_id] = {
+                "device": core_device,
+                "status": "Active" if active else "Inactive",
+            }
+            self.core_pool.pop(core_device, None)
+            self._set_exp_obj(cache_id, core_id, active)
+
+        self.metadata[self._realpath(device)] = {"id": cache_id, "mode": mode, "cores": cores}
+        return ""
+
+    def add_core(self, options, try_add):
+        device = options["--core-device"]
+        cache_id = int(options["--cache-id"])
+        core_id = int(options.get("--core-id", 0))
+        if not self._exists(device):
+            raise ValueError(f"Device {device} not found")
+
+        cache = self.caches.get(cache_id)
+        if cache is None:
+            if not try_add:
+                raise ValueError(f"Cache {cache_id} is not running")
+            self.core_pool[device] = None
+            return ""
+
+        core = cache["cores"].get(core_id)
+        if try_add:
+            if core is None:
+                raise ValueError("Core is not present in cache metadata")
+        elif core is not None:
+            raise ValueError(f"Core {core_id} already added")
+
+        cache["cores"][core_id] = {"device": device, "status": "Active"}
+        self.metadata[self._realpath(cache["device"])]["cores"][core_id] = device
+        self._set_exp_obj(cache_id, core_id, True)
+        return ""
+
+    def remove_core(self, options, detach):
+        cache_id, core_id = int(options["--cache-id"]), int(options["--core-id"])
+        cache = self.caches.get(cache_id)
+        if cache is None or core_id not in cache["cores"]:
+            raise ValueError("No such core")
+        self._check_unused(cache_id, core_id)
+
+        if detach:
+            cache["cores"][core_id]["status"] = "Detached"
+        else:
+            del cache["cores"][core_id]
+            del self.metadata[self._realpath(cache["device"])]["cores"][core_id]
+        self._set_exp_obj(cache_id, core_id, False)
+        return ""
+
+    def stop_cache(self, cache_id):
+        cache = self.caches.get(cache_id)
+        if cache is None:
+            raise ValueError(f"Cache {cache_id} is not running")
+        for core_id in cache["cores"]:
+            self._check_unused(cache_id, core_id)
+
+        for core_id in cache["cores"]:
+            self._set_exp_obj(cache_id, core_id, False)
+        del self.caches[cache_id]
+        return ""
+
+    def _check_unused(self, cache_id, core_id):
+        exp_obj = self._exp_obj(cache_id, core_id)
+        for upper_id, upper in self.caches.items():
+            if upper["device"] == exp_obj:
+                raise ValueError(f"{exp_obj} is used by cache {upper_id}")
+            for core in upper["cores"].values():
+                if core["device"] == exp_obj and core["status"] == "Active":
+                    raise ValueError(f"{exp_obj} is used by cache {upper_id}")
+
+
+class BenchEnv(object):
+    """
+    Mock device tree and config for N caches x M cores each. The last
+    `stacked` caches get an extra core stacked on the exported object of
+    the previous cache's first core.
+    """
+
+    def __init__(self, caches, cores, stacked=0):
+        self.stacked = []
+        self.tmp = tempfile.TemporaryDirectory(prefix="opencas-bench-")
+        self.root = self.tmp.name
+        self.casadm = MockCasadm(self)
+        self.syscalls = collections.Counter()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.devices = []
+
+        os.makedirs(self.map("/dev/disk/by-id"))
+        os.makedirs(self.map("/etc/opencas"))
+        os.makedirs(self.root + "/run")
+        # cas_cache module is loaded, native transport is not used
+        os.makedirs(self.map("/sys/module/cas_cache"))
+        open(self.map("/dev/cas_ctrl"), "w").close()
+
+        lines = ["version=19.3.0", "[caches]"]
+        core_lines = []
+        for cache_id in range(1, caches + 1):
+            lines.append(f"{cache_id}\t{self._device(f'cache{cache_id}')}\tWB")
+            for core_id in range(1, cores + 1):
+                core = self._device(f"core{cache_id}-{core_id}")
+                core_lines.append(f"{cache_id}\t{core_id}\t{core}")
+            if cache_id > caches - stacked and cache_id > 1:
+                self.stacked.append(f"/dev/cas{cache_id - 1}-1")
+                core_lines.append(f"{cache_id}\t{cores + 1}\t{self.stacked[-1]}")
+
+        with open(self.map(opencas.cas_config.default_location), "w") as conf:
+            conf.write("\n".join(lines + ["[cores]"] + core_lines) + "\n")
+
+    def _device(self, name):
+        node = f"/dev/bench-{name}"
+        link = f"/dev/disk/by-id/wwn-bench-{name}"
+        open(self.map(node), "w").close()
+        os.symlink(f"../../bench-{name}", self.map(link))
+        self.devices.append((node, link))
+        return link
+
+    def map(self, path):
+        if isinstance(path, str) and any(
+            path == d or path.startswith(d + "/") for d in redirected_dirs
+        ):
+            return self.root + path
+        return path
+
+    def unmap(self, path):
+        if isinstance(path, str) and path.startswith(self.root + "/"):
+            return path[len(self.root):]
+        return path
+
+    def cleanup(self):
+        self.tmp.cleanup()
+
+    def _wrap(self, name, func, paths=1, unmap=False):
+        def wrapper(*args, **kwargs):
+            if not getattr(self.local, "uncounted", False):
+                with self.lock:
+                    self.syscalls[name] += 1
+            args = [self.map(a) if i < paths else a for i, a in enumerate(args)]
+            result = func(*args, **kwargs)
+            return self.unmap(result) if unmap else result
+        return wrapper
+
+    @contextlib.contextmanager
+    def patched(self):
+        wrapped = {
+            "os.stat": self._wrap("stat", os.stat),
+            "os.lstat": self._wrap("lstat", os.lstat),
+            "os.readlink": self._wrap("readlink", os.readlink),
+            "os.listdir": self._wrap("listdir", os.listdir),
+            "os.scandir": self._wrap("scandir", os.scandir),
+            "os.open": self._wrap("open", os.open),
+            "os.mkdir": self._wrap("mkdir", os.mkdir),
+            "os.unlink": self._wrap("unlink", os.unlink),
+            "os.chmod": self._wrap("chmod", os.chmod),
+            "os.replace": self._wrap("rename", os.replace, paths=2),
+            "builtins.open": self._wrap("open", builtins.open),
+        }
+
+        def check_block_device(path):
+            # Mock tree holds regular files in place of block devices
+            if not os.path.exists(path) and not path.startswith("/dev/cas"):
+                raise ValueError(f"{path} not found")
+
+        with contextlib.ExitStack() as stack:
+            for target, func in wrapped.items():
+                stack.enter_context(mock.patch(target, func))
+            stack.enter_context(mock.patch("subprocess.run", self.casadm))
+            stack.enter_context(mock.patch("subprocess.call", self.casadm))
+            stack.enter_context(
+                mock.patch("opencas.cas_config.check_block_device", check_block_device)
+            )
+            stack.enter_context(mock.patch("opencas.cas_ctrl.is_supported", lambda: False))
+            stack.enter_context(
+                mock.patch("opencas.LoaderDaemon.socket_path", self.map("/run/opencas/none"))
+            )
+            stack.enter_context(mock.patch.dict(os.environ))
+            yield
+
+    def run_script(self, script, args, env=None):
+        path = os.path.join(utils_dir, script)
+        with mock.patch.object(sys, "argv", [path] + args), mock.patch.dict(os.environ, env or {}):
+            with contextlib.redirect_stdout(io.StringIO()), \
+                    contextlib.redirect_stderr(io.StringIO()) as stderr:
+                try:
+                    runpy.run_path(path, run_name="__main__")
+                    exit_code = 0
+                except SystemExit as e:
+                    exit_code = e.code or 0
+        return exit_code, stderr.getvalue()
+
+    def phase(self, name, runs):
+        """Run list of (script, args, env) and return phase statistics"""
+        self.syscalls.clear()
+        self.casadm.calls.clear()
+        errors = []
+
+        start = time.perf_counter()
+        with self.patched():
+            for script, args, env in runs:
+                exit_code, stderr = self.run_script(script, args, env)
+                if exit_code != 0:
+                    errors.append(f"{script} {' '.join(args)}: {exit_code}: {stderr.strip()}")
+        wall = time.perf_counter() - start
+
+        return {
+            "phase": name,
+            "runs": len(runs),
+            "failures": len(errors),
+            "errors": errors,
+            "wall_s": wall,
+            "subprocesses": sum(self.casadm.calls.values()),
+            "subprocess_calls": dict(self.casadm.calls),
+            "syscalls": sum(self.syscalls.values()),
+            "syscall_calls": dict(self.syscalls),
+        }
+
+    def loader_events(self):
+        """Events for all disks, followed by exported objects used as cores"""
+        return [
+            ("open-cas-loader.py", [node], {"DEVLINKS": link})
+            for node, link in self.devices
+        ] + [
+            ("open-cas-loader.py", [exp_obj], {"DEVLINKS": ""})
+            for exp_obj in self.stacked
+        ]
+
+
+def import_time():
+    """Interpreter start and `import opencas` cost, measured in fresh processes"""
+    env = dict(os.environ, PYTHONPATH=utils_dir)
+
+    def wall(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        return time.perf_counter() - start
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import opencas"],
+        env=env, stderr=subprocess.PIPE, universal_newlines=True, check=True,
+    )
+    opencas_us = None
+    for line in result.stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == "opencas":
+            opencas_us = int(fields[1])
+
+    return {
+        "interpreter_s": wall("pass"),
+        "import_opencas_s": wall("import opencas"),
+        "opencas_cumulative_us": opencas_us,
+    }
+
+
+def run(caches, cores, stacked=0, jobs=1):
+    env = BenchEnv(caches, cores, stacked)
+    jobs = ["--jobs", str(jobs)]
+    try:
+        return [
+            env.phase("init", [("casctl", ["init"] + jobs, None)]),
+            env.phase("stop", [("casctl", ["stop"] + jobs, None)]),
+            env.phase("start", [("casctl", ["start"] + jobs, None)]),
+            env.phase("stop", [("casctl", ["stop"] + jobs, None)]),
+            env.phase(
+                "settle",
+                [("casctl", ["settle", "--timeout", "10", "--interval", "1"], None)],
+            ),
+            env.phase("stop", [("casctl", ["stop"] + jobs, None)]),
+            env.phase("loader", env.loader_events()),
+            env.phase("stop", [("casctl", ["stop"] + jobs, None)]),
+        ]
+    finally:
+        env.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--caches", type=int, default=4)
+    parser.add_argument("--cores", type=int, default=16, help="Cores per cache")
+    parser.add_argument("--stacked", type=int, default=1, help="Caches with a stacked core")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {
+        "config": vars(args),
+        "import": import_time(),
+        "phases": run(args.caches, args.cores, args.stacked, args.jobs),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    imports = results["import"]
+    print(f"interpreter start {imports['interpreter_s'] * 1000:.1f} ms, "
+          f"python -c 'import opencas' {imports['import_opencas_s'] * 1000:.1f} ms, "
+          f"opencas import {imports['opencas_cumulative_us']} us")
+    print(f"{'phase':<8} {'runs':>5} {'fail':>5} {'wall [ms]':>10} {'subproc':>8} "
+          f"{'syscalls':>9}  subprocess breakdown")
+    for phase in results["phases"]:
+        breakdown = " ".join(f"{k}={v}" for k, v in sorted(phase["subprocess_calls"].items()))
+        print(f"{phase['phase']:<8} {phase['runs']:>5} {phase['failures']:>5} "
+              f"{phase['wall_s'] * 1000:>10.1f} {phase['subprocesses']:>8} "
+              f"{phase['syscalls']:>9}  {breakdown}")
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,18 @@ def get_mock_os_exists(existing_files):
     return lambda x: x in existing_files
 
 
+def get_dev_entry(type, id, disk, status, mode=None, device=None):
+    """Entry of casadm --list-caches output, as returned by opencas.get_caches_list()"""
+    return {
+        "type": type,
+        "id": id,
+        "disk": disk,
+        "status": status,
+        "write policy": mode,
+        "device": device,
+    }
+
+
 def get_hashed_config_list(conf):
     """
     Convert list of config lines to list of config lines hashes,
@@ -0,0 +1,168 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import opencas
+import opencas_aio
+
+
+def _process(stdout="", stderr="", returncode=0, delay=0):
+    process = MagicMock()
+    process.returncode = returncode
+    process.wait = AsyncMock(return_value=returncode)
+
+    async def communicate():
+        await asyncio.sleep(delay)
+        return stdout.encode(), stderr.encode()
+
+    process.communicate = communicate
+    return process
+
+
+@pytest.fixture(autouse=True)
+def no_transport():
+    with patch.object(opencas.casadm, "transport", None):
+        opencas_aio._locks.clear()
+        yield
+
+
+@patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+def test_commands(mock_exec):
+    mock_exec.return_value = _process()
+
+    asyncio.run(opencas_aio.add_core("/dev/dummy_core", 1, 2))
+    asyncio.run(opencas_aio.set_param("seq-cutoff", 1, core_id=2, policy="never"))
+    asyncio.run(opencas_aio.flush(1))
+
+    assert [call.args for call in mock_exec.call_args_list] == [
+        ("/sbin/casadm", "--script", "--add-core", "--core-device", "/dev/dummy_core",
+         "--cache-id", "1", "--core-id", "2"),
+        ("/sbin/casadm", "--set-param", "--name", "seq-cutoff", "--cache-id", "1",
+         "--core-id", "2", "--policy", "never"),
+        ("/sbin/casadm", "--flush-cache", "--cache-id", "1"),
+    ]
+
+
+@patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+def test_casadm_error(mock_exec):
+    mock_exec.return_value = _process(stderr="No such cache", returncode=1)
+
+    with pytest.raises(opencas.casadm.CasadmError) as e:
+        asyncio.run(opencas_aio.stop_cache(1))
+    assert e.value.result.stderr == "No such cache"
+
+
+@patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+def test_listing(mock_exec):
+    mock_exec.side_effect = [
+        _process(json.dumps([{
+            "type": "cache", "id": 1, "disk": "/dev/dummy_cache", "status": "Running",
+            "write policy": "wt", "device": None,
+            "cores": [{"type": "core", "id": 1, "disk": "/dev/dummy_core",
+                       "status": "Active", "write policy": None, "device": "/dev/cas1-1"}],
+        }])),
+        _process(json.dumps([{
+            "Cache Id": 1, "stats": {"Dirty [4KiB Blocks]": 0},
+            "cores": [{"Core Id": 1, "stats": {"Dirty [4KiB Blocks]": 0}}],
+        }])),
+    ]
+
+    topology = asyncio.run(opencas_aio.get_topology())
+    assert topology.cores[(1, 1)]["exp_obj"] == "/dev/cas1-1"
+    assert set(asyncio.run(opencas_aio.get_all_stats())) == {(1, None, None), (1, 1, None)}
+
+
+def test_native_transport():
+    transport = MagicMock()
+    transport.Unsupported = type("Unsupported", (Exception,), {})
+    transport.is_supported.return_value = True
+    transport.set_param.return_value = "native"
+
+    with patch.object(opencas.casadm, "transport", transport), \
+            patch("asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_exec:
+        assert asyncio.run(opencas_aio.set_param("cleaning", 1, policy="acp")) == "native"
+        transport.set_param.assert_called_once_with("cleaning", 1, policy="acp")
+        mock_exec.assert_not_called()
+
+        # Not handled natively
+        mock_exec.return_value = _process()
+        transport.set_param.side_effect = transport.Unsupported
+        asyncio.run(opencas_aio.set_param("cleaning", 1, policy="acp"))
+        mock_exec.assert_called_once()
+
+
+@patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+def test_cache_lock(mock_exec):
+    running = {1: 0, 2: 0}
+    overlapped = []
+
+    async def create(*cmd, **kwargs):
+        cache_id = int(cmd[cmd.index("--cache-id") + 1])
+        running[cache_id] += 1
+        overlapped.append(dict(running))
+        await asyncio.sleep(0.01)
+        running[cache_id] -= 1
+        return _process()
+
+    mock_exec.side_effect = create
+
+    async def manage():
+        await asyncio.gather(
+            opencas_aio.add_core("/dev/dummy_core1", 1),
+            opencas_aio.add_core("/dev/dummy_core2", 1),
+            opencas_aio.add_core("/dev/dummy_core3", 2),
+        )
+
+    asyncio.run(manage())
+
+    # Cores of different caches are added concurrently, of the same one in turn
+    assert max(state[1] for state in overlapped) == 1
+    assert any(state[1] and state[2] for state in overlapped)
+
+    # Locks aren't shared with another event loop
+    overlapped.clear()
+    asyncio.run(manage())
+    assert max(state[1] for state in overlapped) == 1
+
+
+@patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+def test_cancel_kills_casadm(mock_exec):
+    process = _process(delay=10)
+    mock_exec.return_value = process
+
+    async def cancel():
+        task = asyncio.ensure_future(opencas_aio.stop_cache(1))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+
+    process.kill.assert_called_once_with()
+    process.wait.assert_awaited_once_with()
+
+
+@patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+def test_flush_progress(mock_exec):
+    stats = json.dumps([{"Cache Id": 1, "stats": {"Dirty [4KiB Blocks]": 100}}])
+
+    def create(*cmd, **kwargs):
+        if "--flush-cache" in cmd:
+            return _process(delay=0.05)
+        return _process(stats)
+
+    mock_exec.side_effect = create
+    reports = []
+
+    asyncio.run(opencas_aio.flush(1, report=reports.append, interval=0.01))
+
+    assert reports
+    assert reports[0] == {"Dirty [4KiB Blocks]": 100}
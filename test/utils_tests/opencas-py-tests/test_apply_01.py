@@ -0,0 +1,157 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from unittest.mock import patch, call
+
+import opencas
+from helpers import get_dev_entry
+
+
+def _config(cache_params=None):
+    config = opencas.cas_config()
+    config.insert_cache(
+        opencas.cas_config.cache_config(1, "/dev/dummy_cache", "WT", **(cache_params or {}))
+    )
+    config.insert_core(opencas.cas_config.core_config(1, 1, "/dev/dummy_core1"))
+    config.insert_core(opencas.cas_config.core_config(1, 2, "/dev/dummy_core2"))
+    return config
+
+
+running_list = [
+    get_dev_entry("cache", 1, "/dev/dummy_cache", "Running", "wt"),
+    get_dev_entry("core", 1, "/dev/dummy_core1", "Active", device="/dev/cas1-1"),
+    get_dev_entry("core", 2, "/dev/dummy_core2", "Active", device="/dev/cas1-2"),
+]
+
+
+def _steps(plan):
+    return [str(step) for steps in plan.values() for step in steps]
+
+
+@patch("opencas.get_param_values")
+def test_apply_plan_nothing_to_do(mock_params):
+    mock_params.return_value = {"Cleaning policy type": "acp"}
+    topology = opencas.Topology(running_list)
+
+    plan, notes = opencas.get_apply_plan(_config({"cleaning_policy": "acp"}), topology)
+
+    assert _steps(plan) == []
+    assert notes == []
+    mock_params.assert_called_once_with("cleaning", 1)
+
+
+@patch("opencas.get_param_values")
+def test_apply_plan_changes(mock_params):
+    mock_params.return_value = {"Promotion policy type": "always"}
+    topology = opencas.Topology([
+        get_dev_entry("cache", 1, "/dev/dummy_cache", "Running", "wb"),
+        get_dev_entry("core", 1, "/dev/dummy_core1", "Active", device="/dev/cas1-1"),
+    ])
+
+    plan, notes = opencas.get_apply_plan(_config({"promotion_policy": "nhit"}), topology)
+
+    assert _steps(plan) == [
+        "Set cache 1 mode wb -> wt",
+        "Set cache 1 promotion policy always -> nhit",
+        "Add core /dev/dummy_core2 to cache 1 as core 2",
+    ]
+    assert notes == []
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.casadm.set_cache_mode")
+@patch("opencas.casadm.add_core")
+def test_apply_plan_run(mock_add, mock_mode, mock_list):
+    topology = opencas.Topology([
+        get_dev_entry("cache", 1, "/dev/dummy_cache", "Running", "wb->wt"),
+        get_dev_entry("core", 1, "/dev/dummy_core1", "Active", device="/dev/cas1-1"),
+        get_dev_entry("core", 2, "/dev/dummy_core2", "Inactive"),
+    ])
+    config = _config()
+    config.caches[1].cache_mode = "pt"
+
+    with patch("os.path.exists", return_value=True):
+        plan, _ = opencas.get_apply_plan(config, topology)
+    for steps in plan.values():
+        for step in steps:
+            step.run()
+
+    assert _steps(plan) == [
+        "Set cache 1 mode wt -> pt",
+        "Attach core /dev/dummy_core2 to cache 1 as core 2",
+    ]
+    mock_mode.assert_called_once_with(1, "pt", None)
+    mock_add.assert_called_once_with(
+        device="/dev/dummy_core2", cache_id=1, core_id=2, try_add=True
+    )
+    assert topology.is_active(1, 2)
+    mock_list.assert_not_called()
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.check_cache_device")
+@patch("opencas.start_cache")
+@patch("opencas.casadm.set_cache_mode")
+@patch("opencas.casadm.add_core")
+def test_apply_start_cache(mock_add, mock_mode, mock_start, mock_check, mock_list):
+    mock_list.side_effect = [[], [
+        get_dev_entry("cache", 1, "/dev/dummy_cache", "Running", "wb"),
+        get_dev_entry("core", 1, "/dev/dummy_core1", "Active", device="/dev/cas1-1"),
+    ]]
+    mock_check.return_value = {"Is cache": "yes", "Cache dirty": "no"}
+    config = _config()
+
+    plan, _ = opencas.get_apply_plan(config)
+    results = opencas.run_dependency_graph(
+        opencas.get_start_dependencies(config),
+        lambda device: [step.run() for step in plan[device]],
+    )
+
+    assert len(results) == 3
+    mock_start.assert_called_once_with(config.caches[1], load=True)
+    mock_mode.assert_called_once_with(1, "wt", True)
+    # Core 1 came back with the cache, only core 2 is added
+    mock_add.assert_called_once_with(
+        device="/dev/dummy_core2", cache_id=1, core_id=2, try_add=False
+    )
+
+
+@patch("opencas.get_param_values")
+def test_apply_plan_notes(mock_params):
+    topology = opencas.Topology([
+        get_dev_entry("cache", 1, "/dev/other_cache", "Running", "wt"),
+        get_dev_entry("core", 1, "/dev/other_core", "Active", device="/dev/cas1-1"),
+        get_dev_entry("core", 2, "/dev/dummy_core2", "Active", device="/dev/cas1-2"),
+    ])
+
+    plan, notes = opencas.get_apply_plan(_config(), topology)
+
+    assert _steps(plan) == []
+    assert notes == [
+        "Cache 1 is running on /dev/other_cache instead of /dev/dummy_cache, "
+        "restart is required",
+        "Core 1 of cache 1 is /dev/other_core instead of /dev/dummy_core1, remove it first",
+    ]
+
+
+@patch("opencas.casadm.run_cmd")
+def test_io_classes_compare(mock_run, tmp_path):
+    ioclass_file = tmp_path / "ioclass.csv"
+    ioclass_file.write_text(
+        "IO class id,IO class name,Eviction priority,Allocation\n"
+        "0,unclassified,22,1\n"
+        "1,metadata&done,,0.5\n"
+    )
+    mock_run.return_value.stdout = (
+        '[{"IO class id":0,"IO class name":"unclassified",'
+        '"Eviction priority":22,"Allocation":1.00},'
+        '{"IO class id":1,"IO class name":"metadata&done",'
+        '"Eviction priority":null,"Allocation":0.50}]\n'
+    )
+
+    assert opencas.get_io_classes(1) == opencas.read_io_class_file(str(ioclass_file))
+    assert mock_run.call_args == call(
+        ["/sbin/casadm", "--io-class", "--list", "--cache-id", "1", "--output-format", "json"]
+    )
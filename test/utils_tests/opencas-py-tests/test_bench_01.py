@@ -0,0 +1,27 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import bench
+
+
+def test_bench_phases():
+    """
+    Benchmark harness keeps working: all entry points succeed against the mock
+    environment and the counters match the configuration (2 caches x 2 cores,
+    one stacked core).
+    """
+    phases = {}
+    for phase in bench.run(caches=2, cores=2, stacked=1, jobs=2):
+        assert phase["errors"] == [], phase["phase"]
+        phases.setdefault(phase["phase"], phase)
+
+    # One listing, five cores detached and two caches stopped
+    assert phases["stop"]["subprocess_calls"] == {"casadm": 8}
+    # Two caches loaded, cores come back from metadata
+    assert phases["start"]["subprocess_calls"] == {"casadm": 2}
+    # One casadm call per hotplug event, compiled index avoids config parsing
+    assert phases["loader"]["runs"] == 7
+    assert phases["loader"]["subprocess_calls"] == {"casadm": 7}
+    assert "readlink" not in phases["loader"]["syscall_calls"]
@@ -0,0 +1,87 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import os
+import pytest
+import time
+from unittest.mock import patch
+
+import opencas
+
+
+def write_config(path, caches, cores_per_cache):
+    with open(path, "w") as conf:
+        conf.write("version=3.8.0\n[caches]\n")
+        for cache_id in range(1, caches + 1):
+            conf.write(f"{cache_id}\t/dev/bench-cache{cache_id}\tWT\n")
+        conf.write("[cores]\n")
+        for cache_id in range(1, caches + 1):
+            for core_id in range(cores_per_cache):
+                conf.write(f"{cache_id}\t{core_id}\t/dev/bench-core{cache_id}-{core_id}\n")
+
+
+def test_load_realpath_calls_linear(tmp_path):
+    path = tmp_path / "opencas.conf"
+    write_config(path, 10, 1000)
+
+    with patch("os.path.realpath", wraps=os.path.realpath) as mock_realpath:
+        config = opencas.cas_config.from_file(str(path), allow_incomplete=True)
+
+    assert len(config.cores) == 10000
+    assert mock_realpath.call_count <= 10010
+
+
+def test_duplicate_core_in_file(tmp_path):
+    path = tmp_path / "opencas.conf"
+    write_config(path, 2, 3)
+    with open(path, "a") as conf:
+        conf.write("2\t7\t/dev/bench-core1-1\n")
+
+    with pytest.raises(opencas.cas_config.ConflictingConfigException):
+        opencas.cas_config.from_file(str(path), allow_incomplete=True)
+
+
+def test_index_follows_direct_modification():
+    config = opencas.cas_config()
+    config.insert_cache(opencas.cas_config.cache_config(1, "/dev/dummy_cache", "WT"))
+    core = opencas.cas_config.core_config(1, 1, "/dev/dummy_core")
+    config.caches[1].cores[1] = core
+    config.cores.append(core)
+    config.invalidate_index()
+
+    with pytest.raises(opencas.cas_config.ConflictingConfigException):
+        config.insert_cache(opencas.cas_config.cache_config(2, "/dev/dummy_core", "WT"))
+
+
+def test_index_follows_replacement():
+    config = opencas.cas_config()
+    config.insert_cache(opencas.cas_config.cache_config(1, "/dev/dummy_cache1", "WT"))
+    config.insert_core(opencas.cas_config.core_config(1, 1, "/dev/dummy_core1"))
+
+    # Same number of caches and cores as before, different devices
+    config.remove_core(1, 1)
+    config.remove_cache(1)
+    config.insert_cache(opencas.cas_config.cache_config(1, "/dev/dummy_cache2", "WT"))
+    config.insert_core(opencas.cas_config.core_config(1, 1, "/dev/dummy_core2"))
+
+    assert [core.device for core in config.cores] == ["/dev/dummy_core2"]
+    config.insert_core(opencas.cas_config.core_config(1, 2, "/dev/dummy_core1"))
+    with pytest.raises(opencas.cas_config.ConflictingConfigException):
+        config.insert_core(opencas.cas_config.core_config(1, 3, "/dev/dummy_core2"))
+    with pytest.raises(opencas.cas_config.ConflictingConfigException):
+        config.insert_cache(opencas.cas_config.cache_config(2, "/dev/dummy_cache2", "WT"))
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: python3 test_cas_config_load_01.py
+    import tempfile
+
+    for caches, cores in [(10, 100), (10, 1000), (100, 100)]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "opencas.conf")
+            write_config(path, caches, cores)
+            start = time.perf_counter()
+            opencas.cas_config.from_file(path, allow_incomplete=True)
+            print(f"{caches * (cores + 1)} lines: {time.perf_counter() - start:.3f} s")
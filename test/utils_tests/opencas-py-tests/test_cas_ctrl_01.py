@@ -0,0 +1,220 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import ctypes
+import json
+import pytest
+import subprocess
+from unittest.mock import patch
+
+import opencas
+from opencas import casadm, cas_ctrl
+from helpers import get_process_mock
+
+
+@pytest.mark.parametrize(
+    "struct,size",
+    [
+        (cas_ctrl.kcas_stop_cache, 8),
+        (cas_ctrl.kcas_insert_core, 4108),
+        (cas_ctrl.kcas_remove_core, 12),
+        (cas_ctrl.kcas_cache_check_device, 4104),
+        (cas_ctrl.kcas_set_core_param, 16),
+        (cas_ctrl.kcas_set_cache_param, 16),
+        (cas_ctrl.kcas_cache_list, 52),
+        (cas_ctrl.kcas_core_pool_count, 8),
+        (cas_ctrl.kcas_cache_info, 12432),
+        (cas_ctrl.kcas_core_info, 4160),
+        (cas_ctrl.kcas_get_stats, 560),
+    ],
+)
+def test_struct_layout(struct, size):
+    assert ctypes.sizeof(struct) == size
+
+
+def test_ioctl_code():
+    # _IOWR(0xBA, 22, struct kcas_insert_core)
+    assert cas_ctrl.ioctl_code(3, 22, cas_ctrl.kcas_insert_core) == 0xD00CBA16
+
+
+@patch("subprocess.run")
+@patch("opencas.cas_ctrl.is_supported")
+def test_fallback_when_unsupported(mock_supported, mock_run):
+    mock_supported.return_value = False
+    mock_run.return_value = get_process_mock(0, "", "")
+
+    casadm.stop_cache(1)
+
+    mock_run.assert_called_once_with(
+        [casadm.casadm_path, "--stop-cache", "--cache-id", "1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+@patch("subprocess.run")
+@patch("opencas.cas_ctrl.ioctl")
+@patch("opencas.cas_ctrl.is_supported")
+def test_fallback_on_ioctl_error(mock_supported, mock_ioctl, mock_run):
+    mock_supported.return_value = True
+    mock_ioctl.side_effect = cas_ctrl.Unsupported
+    mock_run.return_value = get_process_mock(1, "", "Error while removing core")
+
+    with pytest.raises(casadm.CasadmError):
+        casadm.remove_core(1, 2, detach=True)
+
+    mock_ioctl.assert_called_once()
+    mock_run.assert_called_once()
+
+
+@patch("subprocess.run")
+@patch("opencas.cas_ctrl.ioctl")
+@patch("opencas.cas_ctrl.is_supported")
+def test_stacked_core_goes_through_casadm(mock_supported, mock_ioctl, mock_run):
+    mock_supported.return_value = True
+    mock_run.return_value = get_process_mock(0, "", "")
+
+    casadm.add_core("/dev/cas1-1", 2, 1)
+
+    mock_ioctl.assert_not_called()
+    mock_run.assert_called_once()
+
+
+@patch("subprocess.run")
+@patch("opencas.cas_ctrl.ioctl")
+@patch("opencas.cas_ctrl.is_supported")
+def test_set_param_native(mock_supported, mock_ioctl, mock_run):
+    mock_supported.return_value = True
+
+    casadm.set_param("cleaning-alru", 3, wake_up=20, dirty_ratio_inertia=2)
+
+    requests = [c[0][2] for c in mock_ioctl.call_args_list]
+    assert [(r.cache_id, r.param_id, r.param_value) for r in requests] == [
+        (3, 1, 20),
+        (3, 6, 2 * 1024 * 1024),
+    ]
+    mock_run.assert_not_called()
+
+
+@patch("subprocess.run")
+@patch("opencas.cas_ctrl.ioctl")
+@patch("opencas.cas_ctrl.is_supported")
+def test_set_param_invalid_value(mock_supported, mock_ioctl, mock_run):
+    mock_supported.return_value = True
+    mock_run.return_value = get_process_mock(0, "", "")
+
+    casadm.set_param("seq-cutoff", 1, core_id=1, policy="sometimes")
+
+    mock_ioctl.assert_not_called()
+    mock_run.assert_called_once()
+
+
+@patch("opencas.cas_ctrl.ioctl")
+@patch("opencas.cas_ctrl.is_supported")
+def test_get_params_json(mock_supported, mock_ioctl):
+    mock_supported.return_value = True
+    values = {0: 1024 * 1024, 1: 1, 2: 8}
+
+    def ioctl(direction, nr, request):
+        assert nr == 31
+        request.param_value = values[request.param_id]
+        return request
+
+    mock_ioctl.side_effect = ioctl
+
+    result = casadm.get_params("seq-cutoff", 1, core_id=2)
+
+    assert json.loads(result.stdout) == [
+        {"Parameter name": "Sequential cutoff threshold [KiB]", "Value": 1024},
+        {"Parameter name": "Sequential cutoff policy", "Value": "full"},
+        {"Parameter name": "Sequential cutoff promotion request count threshold", "Value": 8},
+    ]
+
+
+def running_cache_ioctl(core_pool=0, io_classes=(0,)):
+    """ioctl() mock of running write-back cache 1 with active core 1 and inactive core 2"""
+    def ioctl(direction, nr, request):
+        if nr == 26:
+            request.core_pool_count = core_pool
+        elif nr == 17:
+            request.in_out_num = 1 if request.id_position == 0 else 0
+            request.cache_id_tab[0] = 1
+        elif nr == 24:
+            request.cache_path_name = b"/dev/disk/by-id/nvme-cache"
+            request.info.state = 1 << 0
+            request.info.cache_mode = 1
+            request.info.core_count = 2
+            request.core_id[0], request.core_id[1] = 1, 2
+        elif nr == 40:
+            request.core_path_name = f"/dev/disk/by-id/core{request.core_id}".encode()
+            request.state = request.core_id - 1
+            request.exp_obj_exists = request.core_id == 1
+        elif nr == 34:
+            if request.part_id != cas_ctrl.OCF_IO_CLASS_INVALID and \
+                    request.part_id not in io_classes:
+                raise cas_ctrl.NotFound()
+            request.usage.occupancy.value = 10 * request.core_id + request.part_id
+            request.req.rd_hits.value = 7
+        else:
+            raise AssertionError(f"Unexpected ioctl {nr}")
+        return request
+
+    return ioctl
+
+
+@patch("subprocess.run")
+@patch("opencas.cas_ctrl.ioctl")
+@patch("opencas.cas_ctrl.is_supported")
+def test_list_caches_native(mock_supported, mock_ioctl, mock_run):
+    mock_supported.return_value = True
+    mock_ioctl.side_effect = running_cache_ioctl()
+
+    assert opencas.get_caches_list() == [
+        {"type": "cache", "id": 1, "disk": "/dev/disk/by-id/nvme-cache", "status": "Running",
+         "write policy": "wb", "device": None},
+        {"type": "core", "id": 1, "disk": "/dev/disk/by-id/core1", "status": "Active",
+         "write policy": None, "device": "/dev/cas1-1"},
+        {"type": "core", "id": 2, "disk": "/dev/disk/by-id/core2", "status": "Inactive",
+         "write policy": None, "device": None},
+    ]
+    mock_run.assert_not_called()
+
+
+@patch("subprocess.run")
+@patch("opencas.cas_ctrl.ioctl")
+@patch("opencas.cas_ctrl.is_supported")
+def test_list_caches_core_pool_goes_through_casadm(mock_supported, mock_ioctl, mock_run):
+    mock_supported.return_value = True
+    mock_ioctl.side_effect = running_cache_ioctl(core_pool=1)
+    mock_run.return_value = get_process_mock(0, "[]\n", "")
+
+    assert opencas.get_caches_list() == []
+    mock_run.assert_called_once()
+
+
+@patch("subprocess.run")
+@patch("opencas.cas_ctrl.ioctl")
+@patch("opencas.cas_ctrl.is_supported")
+def test_stats_all_native(mock_supported, mock_ioctl, mock_run):
+    mock_supported.return_value = True
+    mock_ioctl.side_effect = running_cache_ioctl(io_classes=(0, 3))
+
+    stats = opencas.get_all_stats()
+
+    # Mock reports occupancy of 10 * core id + IO class id
+    cache_core_id = cas_ctrl.OCF_CORE_ID_INVALID
+    assert sorted(stats, key=str) == sorted([
+        (1, None, None), (1, None, 0), (1, None, 3),
+        (1, 1, None), (1, 1, 0), (1, 1, 3),
+        (1, 2, None), (1, 2, 0), (1, 2, 3),
+    ], key=str)
+    assert stats[(1, None, 3)]["Occupancy [4KiB Blocks]"] == 10 * cache_core_id + 3
+    assert stats[(1, 2, None)]["Occupancy [4KiB Blocks]"] == 20 + cas_ctrl.OCF_IO_CLASS_INVALID
+    assert stats[(1, 1, 0)]["Read hits [Requests]"] == 7
+    assert "Free [4KiB Blocks]" in stats[(1, 1, None)]
+    assert "Free [4KiB Blocks]" not in stats[(1, 1, 0)]
+    assert "Total errors [Requests]" not in stats[(1, 1, 0)]
+    mock_run.assert_not_called()
@@ -43,7 +43,7 @@ def test_get_version_01(mock_run):
     assert result.stdout == "0.0.1"
     assert result.stderr == "errors"
     mock_run.assert_called_once_with(
-        [casadm.casadm_path, "--version", "--output-format", "csv"],
+        [casadm.casadm_path, "--version", "--output-format", "json"],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         universal_newlines=mock.ANY,
@@ -0,0 +1,105 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import pytest
+import threading
+import time
+
+import opencas
+
+
+def _config(caches, cores):
+    config = opencas.cas_config()
+    for cache in caches:
+        config.caches[cache.cache_id] = cache
+    for core in cores:
+        config.caches[core.cache_id].cores[core.core_id] = core
+        config.cores.append(core)
+    return config
+
+
+def test_start_dependencies_stacked():
+    cache1 = opencas.cas_config.cache_config(1, "/dev/nvme0n1", "wt")
+    cache2 = opencas.cas_config.cache_config(2, "/dev/nvme1n1", "wt")
+    core1 = opencas.cas_config.core_config(1, 1, "/dev/sda")
+    core2 = opencas.cas_config.core_config(2, 1, "/dev/cas1-1")
+    config = _config([cache1, cache2], [core1, core2])
+
+    dependencies = opencas.get_start_dependencies(config)
+
+    assert dependencies == {
+        cache1: [],
+        cache2: [],
+        core1: [cache1],
+        core2: [cache2, core1],
+    }
+
+
+def test_start_dependencies_caches_only():
+    cache1 = opencas.cas_config.cache_config(1, "/dev/nvme0n1", "wt")
+    cache2 = opencas.cas_config.cache_config(2, "/dev/cas1-1", "wt")
+    core1 = opencas.cas_config.core_config(1, 1, "/dev/sda")
+    config = _config([cache1, cache2], [core1])
+
+    dependencies = opencas.get_start_dependencies(config, with_cores=False)
+
+    assert dependencies == {cache1: [], cache2: [cache1]}
+
+
+def test_start_dependencies_cycle():
+    cache1 = opencas.cas_config.cache_config(1, "/dev/nvme0n1", "wt")
+    cache2 = opencas.cas_config.cache_config(2, "/dev/nvme1n1", "wt")
+    core1 = opencas.cas_config.core_config(1, 1, "/dev/cas2-1")
+    core2 = opencas.cas_config.core_config(2, 1, "/dev/cas1-1")
+    config = _config([cache1, cache2], [core1, core2])
+
+    with pytest.raises(opencas.DependencyCycleError) as e:
+        opencas.get_start_dependencies(config)
+
+    assert set(e.value.nodes) == {core1, core2}
+
+
+def test_run_dependency_graph_order():
+    dependencies = {"a": [], "b": ["c"], "c": ["a"], "d": []}
+    order = []
+
+    results = opencas.run_dependency_graph(dependencies, lambda n: order.append(n) or n, jobs=1)
+
+    assert order == ["a", "c", "b", "d"]
+    assert results == {"a": "a", "b": "b", "c": "c", "d": "d"}
+
+
+def test_run_dependency_graph_concurrency_limit():
+    dependencies = {i: [] for i in range(8)}
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def action(node):
+        with lock:
+            running.append(node)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(node)
+
+    opencas.run_dependency_graph(dependencies, action, jobs=3)
+
+    assert max(peak) == 3
+
+
+def test_run_dependency_graph_errors_collected():
+    dependencies = {"a": [], "b": ["a"]}
+    done = []
+
+    def action(node):
+        done.append(node)
+        if node == "a":
+            raise Exception("failed")
+
+    with pytest.raises(opencas.CompoundException):
+        opencas.run_dependency_graph(dependencies, action, jobs=2)
+
+    assert done == ["a", "b"]
@@ -0,0 +1,146 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import struct
+import time
+from unittest.mock import patch, Mock
+
+import opencas
+
+
+def _properties(**kwargs):
+    return b"".join(f"{k}={v}".encode() + b"\0" for k, v in kwargs.items())
+
+
+def test_parse_kernel_uevent():
+    message = b"add@/devices/virtual/block/sdb\0" + _properties(
+        ACTION="add", DEVPATH="/devices/virtual/block/sdb", SUBSYSTEM="block", DEVNAME="sdb"
+    )
+
+    assert opencas.DeviceEvents.parse_uevent(message) == ["/dev/sdb"]
+
+
+def test_parse_udev_uevent():
+    properties = _properties(
+        ACTION="add",
+        SUBSYSTEM="block",
+        DEVNAME="/dev/sdb",
+        DEVLINKS="/dev/disk/by-id/wwn-0x1 /dev/disk/by-id/ata-disk",
+    )
+    header = (
+        b"libudev\0" + struct.pack(">I", 0xFEEDCAFE)
+        + struct.pack("=III", 40, 40, len(properties))
+    )
+    message = header + bytes(40 - len(header)) + properties
+
+    assert opencas.DeviceEvents.parse_uevent(message) == [
+        "/dev/sdb",
+        "/dev/disk/by-id/wwn-0x1",
+        "/dev/disk/by-id/ata-disk",
+    ]
+
+
+def test_parse_uevent_ignored():
+    remove = b"remove@/block/sdb\0" + _properties(ACTION="remove", SUBSYSTEM="block", DEVNAME="sdb")
+    net = b"add@/net/eth0\0" + _properties(ACTION="add", SUBSYSTEM="net", INTERFACE="eth0")
+
+    assert opencas.DeviceEvents.parse_uevent(remove) == []
+    assert opencas.DeviceEvents.parse_uevent(net) == []
+
+
+def test_parse_inotify():
+    name = b"wwn-0x1\0\0\0\0\0\0\0\0\0"
+    data = struct.pack("iIII", 1, 0x100, 0, len(name)) + name
+
+    assert opencas.DeviceEvents.parse_inotify(data) == ["/dev/disk/by-id/wwn-0x1"]
+
+
+@patch("opencas.DeviceEvents")
+@patch("opencas.cas_config.from_file")
+@patch("opencas.get_caches_list")
+@patch("subprocess.run")
+@patch("os.path.exists")
+@patch("opencas.add_core")
+def test_cas_settle_starts_on_event(
+    mock_add, mock_exists, mock_run, mock_list, mock_config, mock_events
+):
+    """
+    Core is added as soon as its device shows up instead of after interval
+    """
+    core = opencas.cas_config.core_config(1, 1, "/dev/dummy")
+    mock_config.return_value = Mock(spec_set=opencas.cas_config(), caches={}, cores=[core])
+    mock_exists.side_effect = lambda path: appeared
+    appeared = False
+
+    def wait(timeout):
+        nonlocal appeared
+        appeared = True
+        return {"/dev/dummy"}
+
+    events = mock_events.return_value.__enter__.return_value
+    events.wait.side_effect = wait
+    mock_list.side_effect = [
+        [],
+        [],
+        [
+            {"type": "cache", "id": 1, "disk": "/dev/cache", "status": "Running",
+             "write policy": "wt", "device": None},
+            {"type": "core", "id": 1, "disk": "/dev/dummy", "status": "Active",
+             "write policy": None, "device": "/dev/cas1-1"},
+        ],
+    ]
+
+    time_start = time.time()
+    result = opencas.wait_for_startup(timeout=30, interval=10)
+
+    assert time.time() - time_start < 5
+    assert result == []
+    events.wait.assert_called_once()
+    mock_add.assert_called_once_with(core, attach=True)
+
+
+@patch("opencas.DeviceEvents")
+@patch("opencas.cas_config.from_file")
+@patch("opencas.get_caches_list")
+@patch("subprocess.run")
+@patch("os.path.exists")
+@patch("opencas.add_core")
+def test_cas_settle_checks_appeared_only(
+    mock_add, mock_exists, mock_run, mock_list, mock_config, mock_events
+):
+    """
+    After an event only devices it was about are checked again
+    """
+    core1 = opencas.cas_config.core_config(1, 1, "/dev/dummy1")
+    core2 = opencas.cas_config.core_config(1, 2, "/dev/dummy2")
+    mock_config.return_value = Mock(
+        spec_set=opencas.cas_config(), caches={}, cores=[core1, core2]
+    )
+    present = set()
+    mock_exists.side_effect = lambda path: path in present
+
+    def wait(timeout):
+        device = f"/dev/dummy{len(present) + 1}"
+        present.add(device)
+        return {device}
+
+    events = mock_events.return_value.__enter__.return_value
+    events.wait.side_effect = wait
+    cache = {"type": "cache", "id": 1, "disk": "/dev/cache", "status": "Running",
+             "write policy": "wt", "device": None}
+
+    def core(core_id):
+        return {"type": "core", "id": core_id, "disk": f"/dev/dummy{core_id}",
+                "status": "Active", "write policy": None, "device": f"/dev/cas1-{core_id}"}
+
+    mock_list.side_effect = [[], [], [cache, core(1)], [cache, core(1), core(2)]]
+
+    with patch("opencas._get_uninitialized_devices",
+               wraps=opencas._get_uninitialized_devices) as mock_check:
+        result = opencas.wait_for_startup(timeout=30, interval=10)
+
+    assert result == []
+    assert [c.args[1:] for c in mock_check.call_args_list] == [(), (), ([core1],), ([core2],)]
+    assert mock_add.call_args_list == [((core1,), {"attach": True}), ((core2,), {"attach": True})]
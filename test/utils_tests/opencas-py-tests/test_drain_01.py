@@ -0,0 +1,171 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import threading
+from unittest.mock import patch, call
+
+import pytest
+
+import opencas
+import opencas_drain
+from helpers import get_dev_entry
+
+
+topology_list = [
+    get_dev_entry("cache", 1, "/dev/dummy_cache1", "Running", "wb"),
+    get_dev_entry("cache", 2, "/dev/dummy_cache2", "Running", "wt"),
+    get_dev_entry("cache", 3, "/dev/dummy_cache3", "Running", "wo->wt"),
+    get_dev_entry("cache", 4, "/dev/dummy_cache4", "Standby"),
+]
+
+param_values = {
+    "cleaning": {"Cleaning policy type": "acp"},
+    "cleaning-alru": {
+        "Wake up time [s]": 20,
+        "Stale buffer time [s]": 120,
+        "Flush max buffers": 100,
+        "Activity threshold [ms]": 10000,
+        "Dirty ratio trigger threshold [%]": 100,
+        "Dirty ratio trigger inertia [MiB]": 128,
+    },
+}
+
+
+def _stats(**dirty):
+    return {(int(cache_id), None, None): {"Dirty [4KiB Blocks]": blocks}
+            for cache_id, blocks in dirty.items()}
+
+
+@patch("opencas.get_param_values")
+def test_get_param_options(mock_params):
+    mock_params.side_effect = lambda namespace, cache_id, **kwargs: param_values[namespace]
+
+    assert opencas.get_param_options("cleaning-alru", 1) == {
+        "wake_up": 20,
+        "staleness_time": 120,
+        "flush_max_buffers": 100,
+        "activity_threshold": 10000,
+        "dirty_ratio_threshold": 100,
+        "dirty_ratio_inertia": 128,
+    }
+    assert opencas.get_param_options("cleaning", 1) == {"policy": "acp"}
+
+
+def test_drain_default_caches():
+    drain = opencas_drain.Drain(topology=opencas.Topology(topology_list))
+    assert drain.cache_ids == [1, 3]
+
+    drain = opencas_drain.Drain([2], topology=opencas.Topology(topology_list))
+    assert drain.cache_ids == [2]
+
+    with pytest.raises(ValueError):
+        opencas_drain.Drain([4], topology=opencas.Topology(topology_list))
+
+
+@patch("opencas.get_param_values")
+@patch("opencas.casadm.set_cache_mode")
+@patch("opencas.casadm.set_param")
+def test_drain_start_restore(mock_set_param, mock_set_mode, mock_params):
+    mock_params.side_effect = lambda namespace, cache_id, **kwargs: param_values[namespace]
+    drain = opencas_drain.Drain([1], switch_mode=True, topology=opencas.Topology(topology_list))
+
+    drain.start()
+
+    assert mock_set_param.call_args_list == [
+        call("cleaning-alru", 1, wake_up=0, staleness_time=1, flush_max_buffers=10000,
+             activity_threshold=0),
+        call("cleaning", 1, policy="alru"),
+    ]
+    mock_set_mode.assert_called_once_with(1, "wt", False)
+
+    mock_set_param.reset_mock()
+    mock_set_mode.reset_mock()
+    order = []
+    mock_set_mode.side_effect = lambda *args: order.append("mode")
+    mock_set_param.side_effect = lambda namespace, *args, **kwargs: order.append(namespace)
+
+    drain.restore()
+
+    assert order == ["mode", "cleaning", "cleaning-alru"]
+    mock_set_mode.assert_called_once_with(1, "wb")
+    assert mock_set_param.call_args_list == [
+        call("cleaning", 1, policy="acp"),
+        call("cleaning-alru", 1, wake_up=20, staleness_time=120, flush_max_buffers=100,
+             activity_threshold=10000),
+    ]
+
+    # Nothing left to restore
+    mock_set_param.reset_mock()
+    drain.restore()
+    mock_set_param.assert_not_called()
+
+
+@patch("opencas.get_param_values")
+@patch("opencas.casadm.set_param")
+def test_drain_restore_after_failure(mock_set_param, mock_params):
+    mock_params.side_effect = lambda namespace, cache_id, **kwargs: param_values[namespace]
+    mock_set_param.side_effect = [None, Exception("policy"), Exception("alru")]
+    drain = opencas_drain.Drain([1], topology=opencas.Topology(topology_list))
+
+    with pytest.raises(Exception, match="policy"):
+        drain.start()
+
+    # Only ALRU parameters were changed
+    with pytest.raises(opencas.CompoundException):
+        drain.restore()
+    assert mock_set_param.call_args_list[-1] == call(
+        "cleaning-alru", 1, wake_up=20, staleness_time=120, flush_max_buffers=100,
+        activity_threshold=10000
+    )
+    assert drain.undo == []
+
+
+def test_drain_progress():
+    drain = opencas_drain.Drain([1, 3], topology=opencas.Topology(topology_list))
+    drain.rate_window = 10
+
+    assert drain.progress(_stats(**{"1": 1000, "3": 0}), 100.0) == {
+        1: (1000, None, None),
+        3: (0, None, 0.0),
+    }
+    assert drain.progress(_stats(**{"1": 800, "3": 0}), 105.0)[1] == (800, 40.0, 20.0)
+    # Rate is averaged over samples from last 10 s
+    assert drain.progress(_stats(**{"1": 700, "3": 0}), 115.0)[1] == (700, 10.0, 70.0)
+    assert drain.progress(_stats(**{"1": 700, "3": 0}), 125.0)[1] == (700, None, None)
+
+    with pytest.raises(ValueError):
+        drain.progress(_stats(**{"1": 0}), 130.0)
+
+
+@patch("time.sleep")
+@patch("time.time")
+@patch("opencas.get_all_stats")
+def test_drain_run(mock_stats, mock_time, mock_sleep):
+    mock_stats.side_effect = [_stats(**{"1": 100}), _stats(**{"1": 50}), _stats(**{"1": 0})]
+    mock_time.side_effect = [0.0, 5.0, 10.0]
+    drain = opencas_drain.Drain([1], topology=opencas.Topology(topology_list))
+    reports = []
+
+    assert drain.run(interval=5, report=reports.append)
+    assert [progress[1][0] for progress in reports] == [100, 50, 0]
+    assert mock_sleep.call_args_list == [call(5), call(5)]
+
+    mock_stats.side_effect = [_stats(**{"1": 100}), _stats(**{"1": 50})]
+    mock_time.side_effect = [0.0, 3.0]
+    mock_sleep.reset_mock()
+
+    assert not drain.run(deadline=3.0, interval=5)
+    assert mock_sleep.call_args_list == [call(3.0)]
+
+
+@patch("opencas.get_all_stats")
+def test_drain_run_stopped(mock_stats):
+    mock_stats.return_value = _stats(**{"1": 100})
+    drain = opencas_drain.Drain([1], topology=opencas.Topology(topology_list))
+    stop = threading.Event()
+    stop.set()
+
+    assert not drain.run(interval=60, stop=stop)
+    mock_stats.assert_called_once_with()
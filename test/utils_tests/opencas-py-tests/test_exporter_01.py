@@ -0,0 +1,110 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from unittest.mock import patch, Mock
+
+import opencas
+import opencas_exporter
+
+
+running_list = [
+    {"type": "cache", "id": 1, "disk": "/dev/sdc", "status": "Running",
+     "write policy": "wt", "device": None},
+    {"type": "core", "id": 2, "disk": "/dev/sda", "status": "Active",
+     "write policy": None, "device": "/dev/cas1-2"},
+]
+
+all_stats = {
+    (1, None, None): {"Occupancy [4KiB Blocks]": 100, "Read hits [Requests]": 7},
+    (1, None, 0): {"Occupancy [4KiB Blocks]": 60},
+    (1, 2, None): {"Occupancy [4KiB Blocks]": 40, "Total to/from core [4KiB Blocks]": 3},
+    (1, 2, 0): {"Occupancy [4KiB Blocks]": 40},
+}
+
+
+@patch("opencas.get_io_classes")
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+def test_collect(mock_stats, mock_list, mock_io_classes):
+    mock_stats.return_value = all_stats
+    mock_list.return_value = running_list
+    mock_io_classes.return_value = {(0, 'un"classified', 22, 1.0)}
+
+    lines = opencas_exporter.MetricsExporter().collect().splitlines()
+
+    assert 'opencas_cache_info{cache="1",device="/dev/sdc",mode="wt",status="Running"} 1' in lines
+    assert 'opencas_ioclass_info{cache="1",ioclass="0",name="un\\"classified"} 1' in lines
+    assert ('opencas_core_info{cache="1",core="2",device="/dev/sda",exp_obj="/dev/cas1-2",'
+            'status="Active"} 1') in lines
+    assert "# TYPE opencas_cache_occupancy_bytes gauge" in lines
+    assert 'opencas_cache_occupancy_bytes{cache="1"} 409600' in lines
+    assert "# TYPE opencas_cache_read_hits_total counter" in lines
+    assert 'opencas_cache_read_hits_total{cache="1"} 7' in lines
+    assert 'opencas_ioclass_occupancy_bytes{cache="1",ioclass="0"} 245760' in lines
+    assert 'opencas_core_total_to_from_core_bytes_total{cache="1",core="2"} 12288' in lines
+    assert not any(line.startswith("opencas_core_ioclass_") for line in lines)
+    assert "opencas_up 1" in lines
+
+
+@patch("opencas.get_io_classes")
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+def test_topology_cached(mock_stats, mock_list, mock_io_classes):
+    mock_stats.return_value = all_stats
+    mock_list.return_value = running_list
+    mock_io_classes.return_value = set()
+    exporter = opencas_exporter.MetricsExporter(core_io_classes=True)
+
+    exporter.collect()
+    lines = exporter.collect().splitlines()
+
+    assert mock_list.call_count == 1
+    assert 'opencas_core_ioclass_occupancy_bytes{cache="1",core="2",ioclass="0"} 163840' in lines
+
+    # New core shows up in statistics
+    mock_stats.return_value = {**all_stats, (1, 3, None): {"Occupancy [4KiB Blocks]": 0}}
+    exporter.collect()
+
+    assert mock_list.call_count == 2
+
+
+@patch("opencas.get_all_stats")
+def test_collect_failure(mock_stats):
+    mock_stats.side_effect = opencas.casadm.CasadmError(Mock(stderr="error"))
+
+    lines = opencas_exporter.MetricsExporter().collect().splitlines()
+
+    assert "opencas_up 0" in lines
+    assert not any(line.startswith("opencas_cache_") for line in lines)
+
+
+@patch("opencas.get_io_classes")
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+def test_write_textfile(mock_stats, mock_list, mock_io_classes, tmp_path):
+    mock_stats.return_value = all_stats
+    mock_list.return_value = running_list
+    mock_io_classes.return_value = set()
+
+    opencas_exporter.MetricsExporter().write_textfile(str(tmp_path / "opencas.prom"))
+
+    assert [p.name for p in tmp_path.iterdir()] == ["opencas.prom"]
+    assert 'opencas_cache_read_hits_total{cache="1"} 7' in (tmp_path / "opencas.prom").read_text()
+
+
+@patch("opencas.get_io_classes")
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+def test_collect_not_applicable_labels(mock_stats, mock_list, mock_io_classes):
+    mock_stats.return_value = {}
+    mock_list.return_value = [
+        {"type": "cache", "id": 1, "disk": "/dev/sdc", "status": "Standby",
+         "write policy": None, "device": None},
+    ]
+    mock_io_classes.return_value = set()
+
+    lines = opencas_exporter.MetricsExporter().collect().splitlines()
+
+    assert 'opencas_cache_info{cache="1",device="/dev/sdc",mode="",status="Standby"} 1' in lines
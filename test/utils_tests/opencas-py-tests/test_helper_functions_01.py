@@ -73,11 +73,11 @@ def test_cas_settle_cores_didnt_start_02(mock_add, mock_exists, mock_run, mock_l
     mock_list.return_value = [
         {
             "type": "cache",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/dummy_cache",
             "status": "Standby",
             "write policy": "wt",
-            "device": "-",
+            "device": None,
         }
     ]
 
@@ -107,34 +107,34 @@ def test_cas_settle_cores_didnt_start_03(mock_add, mock_exists, mock_run, mock_l
     mock_list.return_value = [
         {
             "type": "core pool",
-            "id": "-",
-            "disk": "-",
-            "status": "-",
-            "write policy": "-",
-            "device": "-",
+            "id": None,
+            "disk": None,
+            "status": None,
+            "write policy": None,
+            "device": None,
         },
         {
             "type": "core",
-            "id": "-",
+            "id": None,
             "disk": "/dev/dummy",
             "status": "Detached",
-            "write policy": "-",
-            "device": "-",
+            "write policy": None,
+            "device": None,
         },
         {
             "type": "cache",
-            "id": "2",
+            "id": 2,
             "disk": "/dev/dummy_cache",
             "status": "Running",
             "write policy": "wt",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "42",
+            "id": 42,
             "disk": "/dev/other_core",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas2-42",
         },
     ]
@@ -165,50 +165,50 @@ def test_cas_settle_cores_didnt_start_04(mock_add, mock_exists, mock_run, mock_l
     mock_list.return_value = [
         {
             "type": "core pool",
-            "id": "-",
-            "disk": "-",
-            "status": "-",
-            "write policy": "-",
-            "device": "-",
+            "id": None,
+            "disk": None,
+            "status": None,
+            "write policy": None,
+            "device": None,
         },
         {
             "type": "core",
-            "id": "-",
+            "id": None,
             "disk": "/dev/other_core",
             "status": "Detached",
-            "write policy": "-",
-            "device": "-",
+            "write policy": None,
+            "device": None,
         },
         {
             "type": "cache",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/dummy_cache",
             "status": "Incomplete",
             "write policy": "wt",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "42",
+            "id": 42,
             "disk": "/dev/dummy",
             "status": "Inactive",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-42",
         },
         {
             "type": "cache",
-            "id": "2",
+            "id": 2,
             "disk": "/dev/dummy_cache2",
             "status": "Running",
             "write policy": "wb",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "3",
+            "id": 3,
             "disk": "/dev/dummy2",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-42",
         },
     ]
@@ -242,42 +242,42 @@ def test_cas_settle_cores_didnt_start_05(mock_add, mock_exists, mock_run, mock_l
     mock_list.return_value = [
         {
             "type": "cache",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/dummy_cache",
             "status": "Incomplete",
             "write policy": "wt",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/dummy",
             "status": "Inactive",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-1",
         },
         {
             "type": "core",
-            "id": "2",
+            "id": 2,
             "disk": "/dev/dummy3",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-2",
         },
         {
             "type": "cache",
-            "id": "2",
+            "id": 2,
             "disk": "/dev/dummy_cache2",
             "status": "Running",
             "write policy": "wb",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "3",
+            "id": 3,
             "disk": "/dev/dummy2",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas2-3",
         },
     ]
@@ -340,11 +340,11 @@ def test_cas_settle_caches_didnt_start_02(
     mock_list.return_value = [
         {
             "type": "cache",
-            "id": "3",
+            "id": 3,
             "disk": "/dev/dummy_cache",
             "status": "Active",
             "write policy": "wt",
-            "device": "-",
+            "device": None,
         }
     ]
 
@@ -379,42 +379,42 @@ def test_cas_settle_caches_didnt_start_03(
     mock_list.return_value = [
         {
             "type": "cache",
-            "id": "8",
+            "id": 8,
             "disk": "/dev/dummy_cache",
             "status": "Incomplete",
             "write policy": "wt",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/yes",
             "status": "Inactive",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-1",
         },
         {
             "type": "core",
-            "id": "2",
+            "id": 2,
             "disk": "/dev/dummy3",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-2",
         },
         {
             "type": "cache",
-            "id": "2",
+            "id": 2,
             "disk": "/dev/dummy_cache2",
             "status": "Running",
             "write policy": "wb",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "3",
+            "id": 3,
             "disk": "/dev/dummy2",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas2-3",
         },
     ]
@@ -448,50 +448,50 @@ def test_cas_settle_core_started_01(mock_add, mock_exists, mock_run, mock_list,
     mock_list.return_value = [
         {
             "type": "core pool",
-            "id": "-",
-            "disk": "-",
-            "status": "-",
-            "write policy": "-",
-            "device": "-",
+            "id": None,
+            "disk": None,
+            "status": None,
+            "write policy": None,
+            "device": None,
         },
         {
             "type": "core",
-            "id": "-",
+            "id": None,
             "disk": "/dev/other_core",
             "status": "Detached",
-            "write policy": "-",
-            "device": "-",
+            "write policy": None,
+            "device": None,
         },
         {
             "type": "cache",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/dummy_cache",
             "status": "Incomplete",
             "write policy": "wt",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/dummy",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-1",
         },
         {
             "type": "cache",
-            "id": "2",
+            "id": 2,
             "disk": "/dev/dummy_cache2",
             "status": "Running",
             "write policy": "wb",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "3",
+            "id": 3,
             "disk": "/dev/dummy2",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-42",
         },
     ]
@@ -525,66 +525,66 @@ def test_cas_settle_core_started_02(mock_add, mock_exists, mock_run, mock_list,
     mock_list.return_value = [
         {
             "type": "core pool",
-            "id": "-",
-            "disk": "-",
-            "status": "-",
-            "write policy": "-",
-            "device": "-",
+            "id": None,
+            "disk": None,
+            "status": None,
+            "write policy": None,
+            "device": None,
         },
         {
             "type": "core",
-            "id": "-",
+            "id": None,
             "disk": "/dev/other_core",
             "status": "Detached",
-            "write policy": "-",
-            "device": "-",
+            "write policy": None,
+            "device": None,
         },
         {
             "type": "cache",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/dummy_cache",
             "status": "Running",
             "write policy": "wt",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "1",
+            "id": 1,
             "disk": "/dev/dummy",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-42",
         },
         {
             "type": "cache",
-            "id": "2",
+            "id": 2,
             "disk": "/dev/dummy_cache2",
             "status": "Running",
             "write policy": "wb",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "3",
+            "id": 3,
             "disk": "/dev/dummy2",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas1-42",
         },
         {
             "type": "cache",
-            "id": "4",
+            "id": 4,
             "disk": "/dev/dummy_cache4",
             "status": "Running",
             "write policy": "wb",
-            "device": "-",
+            "device": None,
         },
         {
             "type": "core",
-            "id": "44",
+            "id": 44,
             "disk": "/dev/dosko",
             "status": "Active",
-            "write policy": "-",
+            "write policy": None,
             "device": "/dev/cas4-44",
         },
     ]
@@ -621,120 +621,120 @@ def test_cas_settle_core_started_03(mock_add, mock_exists, mock_run, mock_list,
         [
             {
                 "type": "cache",
-                "id": "2",
+                "id": 2,
                 "disk": "/dev/dummy_cache4",
                 "status": "Incomplete",
                 "write policy": "wb",
-                "device": "-",
+                "device": None,
             },
             {
                 "type": "core",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dosko",
                 "status": "Inactive",
-                "write policy": "-",
+                "write policy": None,
                 "device": "/dev/cas2-1",
             },
         ],
         [
             {
                 "type": "cache",
-                "id": "2",
+                "id": 2,
                 "disk": "/dev/dummy_cache4",
                 "status": "Incomplete",
                 "write policy": "wb",
-                "device": "-",
+                "device": None,
             },
             {
                 "type": "core",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dosko",
                 "status": "Inactive",
-                "write policy": "-",
+                "write policy": None,
                 "device": "/dev/cas2-1",
             },
             {
                 "type": "cache",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dummy_cache",
                 "status": "Incomplete",
                 "write policy": "wt",
-                "device": "-",
+                "device": None,
             },
             {
                 "type": "core",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dummy",
                 "status": "Active",
-                "write policy": "-",
+                "write policy": None,
                 "device": "/dev/cas1-1",
             },
         ],
         [
             {
                 "type": "cache",
-                "id": "2",
+                "id": 2,
                 "disk": "/dev/dummy_cache4",
                 "status": "Running",
                 "write policy": "wb",
-                "device": "-",
+                "device": None,
             },
             {
                 "type": "core",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dosko",
                 "status": "Active",
-                "write policy": "-",
+                "write policy": None,
                 "device": "/dev/cas2-1",
             },
             {
                 "type": "cache",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dummy_cache",
                 "status": "Incomplete",
                 "write policy": "wt",
-                "device": "-",
+                "device": None,
             },
             {
                 "type": "core",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dummy",
                 "status": "Inactive",
-                "write policy": "-",
+                "write policy": None,
                 "device": "/dev/cas1-1",
             },
         ],
         [
             {
                 "type": "cache",
-                "id": "2",
+                "id": 2,
                 "disk": "/dev/dummy_cache4",
                 "status": "Running",
                 "write policy": "wb",
-                "device": "-",
+                "device": None,
             },
             {
                 "type": "core",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dosko",
                 "status": "Active",
-                "write policy": "-",
+                "write policy": None,
                 "device": "/dev/cas2-1",
             },
             {
                 "type": "cache",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dummy_cache",
                 "status": "Running",
                 "write policy": "wt",
-                "device": "-",
+                "device": None,
             },
             {
                 "type": "core",
-                "id": "1",
+                "id": 1,
                 "disk": "/dev/dummy",
                 "status": "Active",
-                "write policy": "-",
+                "write policy": None,
                 "device": "/dev/cas1-1",
             },
         ],
@@ -1015,3 +1015,28 @@ def test_start_cache(mock_run, load, force, failover):
         assert "--cache-id" not in casadm_call
         assert "--cache-mode" not in casadm_call
         assert "--cache-line-size" not in casadm_call
+
+
+@patch("opencas.casadm.run_cmd")
+def test_get_caches_list_json(mock_run):
+    """
+    Check if nested casadm json listing is flattened into typed table rows
+    """
+    mock_run.return_value = Mock(
+        stdout='[{"type":"core pool","id":null,"disk":null,"status":null,'
+        '"write policy":null,"device":null,"cores":[{"type":"core","id":null,'
+        '"disk":"/dev/sdb","status":"Detached","write policy":null,"device":null}]},'
+        '{"type":"cache","id":1,"disk":"/dev/sdc","status":"Running",'
+        '"write policy":"wt","device":null,"cores":[{"type":"core","id":2,'
+        '"disk":"/dev/sda","status":"Active","write policy":null,"device":"/dev/cas1-2"}]}]\n'
+    )
+
+    devices = opencas.get_caches_list()
+
+    assert [(d["type"], d["id"], d["disk"], d["device"]) for d in devices] == [
+        ("core pool", None, None, None),
+        ("core", None, "/dev/sdb", None),
+        ("cache", 1, "/dev/sdc", None),
+        ("core", 2, "/dev/sda", "/dev/cas1-2"),
+    ]
+    assert devices[2]["write policy"] == "wt"
@@ -0,0 +1,131 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import json
+import socket
+import threading
+from unittest.mock import patch, call, Mock
+
+import opencas
+
+
+def _daemon():
+    loader = opencas.LoaderDaemon(config_file="/dummy/opencas.conf")
+    config = opencas.cas_config()
+    config.insert_cache(opencas.cas_config.cache_config(1, "/dev/disk/by-id/cache", "WT"))
+    config.insert_core(opencas.cas_config.core_config(1, 1, "/dev/disk/by-id/core1"))
+    config.insert_core(opencas.cas_config.core_config(1, 2, "/dev/disk/by-id/core2"))
+    loader.config = config
+    loader._by_path = {
+        "/dev/disk/by-id/cache": config.caches[1],
+        "/dev/disk/by-id/core1": config.caches[1].cores[1],
+        "/dev/disk/by-id/core2": config.caches[1].cores[2],
+    }
+    return loader
+
+
+running_list = [
+    {"type": "cache", "id": 1, "disk": "/dev/sdc", "status": "Running",
+     "write policy": "wt", "device": None},
+    {"type": "core", "id": 1, "disk": "/dev/sda", "status": "Active",
+     "write policy": None, "device": "/dev/cas1-1"},
+]
+
+
+@patch("opencas.LoaderDaemon.load_config")
+@patch("opencas.wait_for_cas_ctrl")
+@patch("opencas.get_caches_list")
+@patch("opencas.add_core")
+@patch("opencas.start_cache")
+def test_batch_skips_running_devices(mock_start, mock_add, mock_list, mock_wait, mock_load):
+    loader = _daemon()
+    mock_list.return_value = running_list
+
+    results = loader.handle_batch([
+        ("/dev/sdb", ["/dev/disk/by-id/core2"]),
+        ("/dev/sda", ["/dev/disk/by-id/core1"]),
+        ("/dev/sdc", ["/dev/disk/by-id/cache"]),
+    ])
+
+    assert results == [(0, "")] * 3
+    mock_list.assert_called_once()
+    mock_start.assert_not_called()
+    mock_add.assert_called_once_with(loader.config.caches[1].cores[2], True)
+
+
+@patch("opencas.LoaderDaemon.load_config")
+@patch("opencas.wait_for_cas_ctrl")
+@patch("opencas.get_caches_list")
+@patch("opencas.add_core")
+@patch("opencas.start_cache")
+def test_batch_caches_first(mock_start, mock_add, mock_list, mock_wait, mock_load):
+    loader = _daemon()
+    mock_list.side_effect = [[], running_list]
+    order = []
+    mock_start.side_effect = lambda dev, load: order.append(dev)
+    mock_add.side_effect = lambda dev, attach: order.append(dev)
+
+    loader.handle_batch([
+        ("/dev/sdb", ["/dev/disk/by-id/core2"]),
+        ("/dev/sdc", ["/dev/disk/by-id/cache"]),
+    ])
+
+    assert order == [loader.config.caches[1], loader.config.caches[1].cores[2]]
+
+
+@patch("opencas.LoaderDaemon.load_config")
+@patch("opencas.wait_for_cas_ctrl")
+@patch("opencas.get_caches_list")
+@patch("os.path.realpath")
+@patch("opencas.start_cache")
+def test_batch_realpath_fallback(mock_start, mock_realpath, mock_list, mock_wait, mock_load):
+    mock_realpath.side_effect = lambda path: "/dev/sdc" if path.endswith("cache") else path
+    loader = _daemon()
+    mock_list.return_value = []
+    mock_start.side_effect = opencas.casadm.CasadmError(
+        Mock(exit_code=3, stdout="", stderr="no metadata")
+    )
+
+    results = loader.handle_batch([("/dev/sdc", []), ("/dev/sdx", [])])
+
+    assert results == [
+        (3, "Unable to load cache 1 (/dev/disk/by-id/cache). Reason: no metadata"),
+        (0, ""),
+    ]
+
+
+@patch("opencas.LoaderDaemon.load_config")
+@patch("opencas.get_caches_list")
+def test_batch_not_configured(mock_list, mock_load):
+    loader = _daemon()
+
+    assert loader.handle_batch([("/dev/sdx", [])]) == [(0, "")]
+    mock_list.assert_not_called()
+
+
+@patch("opencas.LoaderDaemon.handle_batch")
+def test_socket_roundtrip(mock_batch, tmp_path):
+    loader = opencas.LoaderDaemon(socket_path=str(tmp_path / "loader.sock"))
+    mock_batch.side_effect = lambda requests: [(2, "failed")] * len(requests)
+    started = threading.Thread(target=loader.serve_forever, daemon=True)
+    started.start()
+
+    try:
+        for _ in range(100):
+            if (tmp_path / "loader.sock").exists():
+                break
+            threading.Event().wait(0.01)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(tmp_path / "loader.sock"))
+            sock.sendall(json.dumps({"device": "/dev/sdb", "links": ["/dev/x"]}).encode() + b"\n")
+            response = json.loads(sock.makefile().readline())
+    finally:
+        loader.shutdown()
+        started.join(5)
+
+    assert response == {"exit_code": 2, "message": "failed"}
+    assert mock_batch.call_args == call([("/dev/sdb", ["/dev/x"])])
+    assert not (tmp_path / "loader.sock").exists()
@@ -0,0 +1,60 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import json
+import os
+from textwrap import dedent
+
+import opencas
+
+
+def _write_config(path):
+    path.write_text(
+        dedent(
+            """
+            version=19.3.0
+            [caches]
+            1   /dev/disk/by-id/dummy-cache WT  cleaning_policy=nop
+            [cores]
+            1   1   /dev/disk/by-id/dummy-core  lazy_startup=true
+            """
+        ).lstrip()
+    )
+
+
+def test_compile_loader_index(tmp_path):
+    config_file = tmp_path / "opencas.conf"
+    index_file = tmp_path / "run" / "loader-index.json"
+    _write_config(config_file)
+
+    opencas.compile_loader_index(str(config_file), str(index_file))
+
+    index = json.loads(index_file.read_text())
+    assert index["stamp"] == opencas.get_config_stamp(str(config_file))
+    assert index["by_devt"] == {}
+    assert set(index["by_path"]) == {"/dev/disk/by-id/dummy-cache", "/dev/disk/by-id/dummy-core"}
+
+    core = index["by_path"]["/dev/disk/by-id/dummy-core"]
+    assert core["type"] == "core"
+    core_config = opencas.cas_config.core_config.from_line(core["line"], allow_incomplete=True)
+    assert (core_config.cache_id, core_config.core_id) == (1, 1)
+    assert core_config.is_lazy()
+
+    cache = index["by_path"]["/dev/disk/by-id/dummy-cache"]
+    cache_config = opencas.cas_config.cache_config.from_line(cache["line"], allow_incomplete=True)
+    assert cache_config.params == {"cleaning_policy": "nop"}
+
+
+def test_loader_index_stale_after_change(tmp_path):
+    config_file = tmp_path / "opencas.conf"
+    index_file = tmp_path / "loader-index.json"
+    _write_config(config_file)
+
+    index = opencas.compile_loader_index(str(config_file), str(index_file))
+    with open(config_file, "a") as conf:
+        conf.write("1   2   /dev/disk/by-id/dummy-core2\n")
+
+    assert index["stamp"] != opencas.get_config_stamp(str(config_file))
+    assert not [f for f in os.listdir(tmp_path) if f.startswith("loader-index.json.")]
@@ -0,0 +1,228 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import csv
+import time
+from unittest.mock import patch, call
+
+import pytest
+
+import opencas
+import opencas_mode_policy
+from helpers import get_dev_entry
+
+
+def _local(day, hour, minute=0):
+    # 2026-10-19 is Monday
+    return time.mktime((2026, 10, 19 + day, hour, minute, 0, 0, 0, -1))
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "1 wb",
+        "1 wt always",
+        "2 wo time=08:00-20:00,days=mon-fri",
+        "3 pt days=sat+sun,writes>100.5,for=600",
+        "4 wa dirty<=10,read_hit>=50",
+    ],
+)
+def test_mode_rule_valid(line):
+    rule = opencas_mode_policy.ModeRule.from_line(line)
+    assert str(rule).split()[:2] == line.split()[:2]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "1",
+        "1 wb always extra",
+        "0 wb",
+        "1 xx",
+        "1 wb time=8-20",
+        "1 wb time=08:00-25:00",
+        "1 wb time=24:30-08:00",
+        "1 wb time=20:00-24:59",
+        "1 wb time=24:00-08:00",
+        "1 wb days=mon-xyz",
+        "1 wb for=soon",
+        "1 wb latency>10",
+        "1 wb writes=10",
+        "1 wb writes>1.2.3",
+    ],
+)
+def test_mode_rule_invalid(line):
+    with pytest.raises(ValueError):
+        opencas_mode_policy.ModeRule.from_line(line)
+
+
+def test_mode_rule_time():
+    rule = opencas_mode_policy.ModeRule(1, "wb", "time=08:00-20:00,days=mon-fri")
+    assert rule.holds(_local(0, 8), {})
+    assert rule.holds(_local(4, 19, 59), {})
+    assert not rule.holds(_local(0, 20), {})
+    assert not rule.holds(_local(5, 12), {})
+
+    rule = opencas_mode_policy.ModeRule(1, "wt", "time=20:00-08:00,days=fri-mon")
+    assert rule.holds(_local(4, 23), {})
+    assert rule.holds(_local(6, 7, 59), {})
+    assert not rule.holds(_local(1, 23), {})
+    assert not rule.holds(_local(0, 12), {})
+
+    rule = opencas_mode_policy.ModeRule(1, "wb", "time=20:00-24:00")
+    assert rule.holds(_local(0, 23, 59), {})
+    assert not rule.holds(_local(1, 0), {})
+
+    rule = opencas_mode_policy.ModeRule(1, "wt", "days=sat+sun")
+    assert rule.holds(_local(6, 12), {})
+    assert not rule.holds(_local(4, 12), {})
+
+
+def test_mode_rule_metrics():
+    rule = opencas_mode_policy.ModeRule(1, "wt", "writes>100,dirty<=50,for=60")
+
+    assert not rule.holds(0, {"Writes [MiB/s]": 200, "Dirty [%]": 10})
+    assert not rule.holds(30, {"Writes [MiB/s]": 200, "Dirty [%]": 50})
+    assert rule.holds(60, {"Writes [MiB/s]": 200, "Dirty [%]": 50})
+    # Must hold again for the whole time after breaking
+    assert not rule.holds(70, {"Writes [MiB/s]": 50, "Dirty [%]": 50})
+    assert not rule.holds(80, {"Writes [MiB/s]": 200, "Dirty [%]": 50})
+    assert not rule.holds(90, {"Writes [MiB/s]": None, "Dirty [%]": 50})
+
+
+def test_mode_policy_from_file(tmp_path):
+    config = tmp_path / "mode-policy.conf"
+    config.write_text(
+        "# Business hours\n"
+        "1 wb time=08:00-20:00  # comment\n"
+        "\n"
+        "1 wt always\n"
+    )
+    policy = opencas_mode_policy.ModePolicy.from_file(str(config), dry_run=True)
+    assert [str(rule) for rule in policy.rules] == [
+        "1 wb time=08:00-20:00", "1 wt always"
+    ]
+    assert policy.dry_run
+
+    with pytest.raises(Exception):
+        opencas_mode_policy.ModePolicy.from_file(str(tmp_path / "missing.conf"))
+
+
+def test_mode_policy_decide():
+    rules = [
+        opencas_mode_policy.ModeRule(1, "wb", "time=08:00-20:00"),
+        opencas_mode_policy.ModeRule(1, "wt"),
+        opencas_mode_policy.ModeRule(2, "wt", "writes>100"),
+        opencas_mode_policy.ModeRule(3, "wt"),
+        opencas_mode_policy.ModeRule(4, "pt"),
+    ]
+    policy = opencas_mode_policy.ModePolicy(rules)
+    topology = opencas.Topology([
+        get_dev_entry("cache", 1, "/dev/dummy_cache1", "Running", "wb"),
+        get_dev_entry("cache", 2, "/dev/dummy_cache2", "Running", "wb"),
+        get_dev_entry("cache", 3, "/dev/dummy_cache3", "Running", "wb->wt"),
+        get_dev_entry("cache", 4, "/dev/dummy_cache4", "Standby"),
+    ])
+    delta = {
+        (1, None, None): {},
+        (2, None, None): {"Writes to exported object [4KiB Blocks]": 256 * 600},
+        (3, None, None): {},
+        (4, None, None): {},
+    }
+
+    switches = policy.decide(topology, delta, 1, _local(0, 12))
+    assert [switch[:3] for switch in switches] == [(2, "wb", "wt")]
+    assert switches[0][3] is rules[2]
+
+    switches = policy.decide(topology, delta, 1, _local(0, 22))
+    assert [switch[:3] for switch in switches] == [(1, "wb", "wt"), (2, "wb", "wt")]
+    assert switches[0][3] is rules[1]
+
+    # Already switching
+    policy.switching[1] = None
+    assert [switch[0] for switch in policy.decide(topology, delta, 1, _local(0, 22))] == [2]
+
+
+@patch("opencas.set_cache_mode")
+@patch("opencas_drain.Drain")
+@patch("opencas.get_all_stats")
+def test_mode_policy_switch(mock_stats, mock_drain, mock_set_mode, tmp_path):
+    mock_stats.return_value = {(1, None, None): {"Dirty [4KiB Blocks]": 2560}}
+    mock_drain.return_value.run.return_value = True
+    policy = opencas_mode_policy.ModePolicy(
+        [], drain_timeout=60, history_path=str(tmp_path / "history.csv")
+    )
+    rule = opencas_mode_policy.ModeRule(1, "wt")
+
+    record = policy.switch(1, "wb", "wt", rule)
+
+    mock_drain.assert_called_once_with([1])
+    drain = mock_drain.return_value
+    assert drain.method_calls[0] == call.start()
+    assert drain.method_calls[-1] == call.restore()
+    mock_set_mode.assert_called_once_with(1, "wb", "wt")
+    assert record["Dirty before [MiB]"] == 10.0
+    assert record["Drained"] is True
+    assert record["Switch [s]"] != ""
+    assert record["Error"] == ""
+
+    # Nothing to drain towards lazy mode
+    mock_drain.reset_mock()
+    record = policy.switch(1, "wt", "wb", rule)
+    mock_drain.assert_not_called()
+    assert record["Drain [s]"] == ""
+
+    # Parameters are restored even if switch fails
+    mock_drain.reset_mock()
+    mock_set_mode.side_effect = Exception("switch failed")
+    record = policy.switch(1, "wb", "pt", rule)
+    assert record["Error"] == "switch failed"
+    mock_drain.return_value.restore.assert_called_once_with()
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+def test_mode_policy_dry_run(mock_stats, mock_list, tmp_path):
+    mock_list.return_value = [get_dev_entry("cache", 1, "/dev/dummy_cache", "Running", "wb")]
+    mock_stats.return_value = {(1, None, None): {"Total requests [Requests]": 0}}
+    history = tmp_path / "history.csv"
+    policy = opencas_mode_policy.ModePolicy([opencas_mode_policy.ModeRule(1, "wt")], dry_run=True,
+                                history_path=str(history))
+    reports = []
+
+    assert policy.step(reports.append, now=0) == []
+    assert [switch[:3] for switch in policy.step(reports.append, now=1)] == [(1, "wb", "wt")]
+    assert [switch[:3] for switch in policy.step(reports.append, now=2)] == [(1, "wb", "wt")]
+
+    # Reported once
+    assert [(record["Cache id"], record["To"]) for record in reports] == [(1, "wt")]
+    assert policy.switching == {}
+    assert not history.exists()
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+@patch("opencas.set_cache_mode")
+def test_mode_policy_history(mock_set_mode, mock_stats, mock_list, tmp_path):
+    mock_list.return_value = [get_dev_entry("cache", 1, "/dev/dummy_cache", "Running", "wt")]
+    mock_stats.return_value = {(1, None, None): {"Total requests [Requests]": 0}}
+    history = tmp_path / "history.csv"
+    policy = opencas_mode_policy.ModePolicy(
+        [opencas_mode_policy.ModeRule(1, "wb")], history_path=str(history)
+    )
+    reports = []
+
+    policy.step(reports.append, now=0)
+    policy.step(reports.append, now=1)
+    policy.switching[1].result()
+    policy.step(reports.append, now=2)
+
+    mock_set_mode.assert_called_once_with(1, "wt", "wb")
+    assert [(record["From"], record["To"]) for record in reports] == [("wt", "wb")]
+    with open(history) as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["Cache id"], row["From"], row["To"], row["Rule"]) for row in rows] == [
+        ("1", "wt", "wb", "1 wb always")
+    ]
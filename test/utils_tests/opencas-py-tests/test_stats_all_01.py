@@ -0,0 +1,43 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from unittest.mock import patch, call
+
+import opencas
+
+
+@patch("opencas.casadm.run_cmd")
+def test_get_all_stats(mock_run):
+    mock_run.return_value.stdout = (
+        '[{"Cache Id":1,'
+        '"stats":{"Occupancy [4KiB Blocks]":100,"Free [4KiB Blocks]":28,'
+        '"Read hits [Requests]":7,"Total errors [Requests]":0},'
+        '"io_classes":[{"IO class Id":0,'
+        '"stats":{"Occupancy [4KiB Blocks]":60,"Read hits [Requests]":5}}],'
+        '"cores":[{"Core Id":2,'
+        '"stats":{"Occupancy [4KiB Blocks]":40,"Free [4KiB Blocks]":28,'
+        '"Read hits [Requests]":2,"Total errors [Requests]":1},'
+        '"io_classes":[{"IO class Id":1,'
+        '"stats":{"Occupancy [4KiB Blocks]":40,"Read hits [Requests]":2}}]}]}]\n'
+    )
+
+    stats = opencas.get_all_stats()
+
+    assert mock_run.call_args == call(["/sbin/casadm", "--stats-all", "--output-format", "json"])
+    assert list(stats) == [(1, None, None), (1, None, 0), (1, 2, None), (1, 2, 1)]
+    assert stats[(1, 2, None)] == {
+        "Occupancy [4KiB Blocks]": 40,
+        "Free [4KiB Blocks]": 28,
+        "Read hits [Requests]": 2,
+        "Total errors [Requests]": 1,
+    }
+    assert stats[(1, None, 0)] == {"Occupancy [4KiB Blocks]": 60, "Read hits [Requests]": 5}
+
+
+@patch("opencas.casadm.run_cmd")
+def test_get_all_stats_no_caches(mock_run):
+    mock_run.return_value.stdout = "[]\n"
+
+    assert opencas.get_all_stats() == {}
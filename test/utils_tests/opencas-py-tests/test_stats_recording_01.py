@@ -0,0 +1,128 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import pytest
+
+import opencas
+import opencas_recording
+
+
+def _stats(i):
+    return {
+        (1, None, None): {
+            "Occupancy [4KiB Blocks]": 100,
+            "Read hits [Requests]": 5 * i,
+            "Read total [Requests]": 10 * i,
+        },
+        (1, 2, None): {"Read total [Requests]": i},
+    }
+
+
+def test_recording_ring(tmp_path):
+    path = str(tmp_path / "stats.rec")
+    recording = opencas_recording.StatsRecording.create(path, 70000, 1.0, 2)
+    capacity = recording.capacity
+    for i in range(capacity + 5):
+        recording.append(_stats(i), 1000.0 + i)
+    recording.close()
+
+    recording = opencas_recording.StatsRecording(path)
+    assert recording.count == capacity + 5
+    assert recording.series == [(1, None, None), (1, 2, None)]
+
+    first, last, delta = recording.window()
+    assert (first, last) == (1005.0, 1000.0 + capacity + 4)
+
+    first, last, delta = recording.window(1009.5, 1012.0)
+    assert (first, last) == (1010.0, 1012.0)
+    assert delta[(1, None, None)] == {
+        "Occupancy [4KiB Blocks]": 100,
+        "Read hits [Requests]": 10,
+        "Read total [Requests]": 20,
+    }
+    assert delta[(1, 2, None)] == {"Read total [Requests]": 2}
+    assert recording.window(0.0, 1004.0) is None
+
+
+def test_recording_oldest_slot_overwritten(tmp_path):
+    path = str(tmp_path / "stats.rec")
+    writer = opencas_recording.StatsRecording.create(path, 70000, 1.0, 2)
+    capacity = writer.capacity
+    for i in range(capacity):
+        writer.append(_stats(i), 1000.0 + i)
+    reader = opencas_recording.StatsRecording(path)
+
+    # Writer wrapped around and is in the middle of writing the next sample
+    # into slot of the oldest one
+    offset = writer._offset(capacity)
+    writer.slot_header.pack_into(writer._mm, offset, 2 * capacity + 1, 0.0)
+
+    first, last, _ = reader.window()
+    assert (first, last) == (1001.0, 1000.0 + capacity - 1)
+    first, _, _ = reader.window(999.0)
+    assert first == 1001.0
+
+    # Completed, but not published yet
+    writer.sequence.pack_into(writer._mm, offset, 2 * capacity + 2)
+    first, _, _ = reader.window()
+    assert first == 1001.0
+
+
+def test_recording_default_interval():
+    size = 256 * 2**20
+    assert opencas_recording.StatsRecording.default_interval(size, 1) == 1
+    assert opencas_recording.StatsRecording.default_interval(size, 16) == 5
+
+    interval = opencas_recording.StatsRecording.default_interval(size, 101)
+    capacity = (size - opencas_recording.StatsRecording.meta_size) // \
+        opencas_recording.StatsRecording.slot_size(101)
+    assert capacity * interval >= opencas_recording.StatsRecording.default_retention
+
+
+def test_recording_max_series(tmp_path):
+    path = str(tmp_path / "stats.rec")
+    recording = opencas_recording.StatsRecording.create(path, 70000, 1.0, 1)
+    recording.append(_stats(1), 1.0)
+    recording.append(_stats(2), 2.0)
+
+    _, _, delta = recording.window()
+    assert list(delta) == [(1, None, None)]
+
+
+def test_recording_invalid_file(tmp_path):
+    path = tmp_path / "stats.rec"
+    path.write_bytes(b"not a recording")
+
+    with pytest.raises(ValueError):
+        opencas_recording.StatsRecording(str(path))
+
+
+def test_stats_delta_reset():
+    before = {(1, None, None): {"Read total [Requests]": 10, "Dirty [4KiB Blocks]": 5}}
+    after = {
+        (1, None, None): {"Read total [Requests]": 4, "Dirty [4KiB Blocks]": 3},
+        (2, None, None): {"Read total [Requests]": 4},
+    }
+
+    assert opencas.get_stats_delta(before, after) == {
+        (1, None, None): {"Read total [Requests]": None, "Dirty [4KiB Blocks]": 3},
+        (2, None, None): {"Read total [Requests]": None},
+    }
+
+
+def test_summarize_stats():
+    summary = opencas.summarize_stats({
+        "Read hits [Requests]": 30,
+        "Read total [Requests]": 40,
+        "Total requests [Requests]": 50,
+        "Writes to core [4KiB Blocks]": 512,
+        "Occupancy [4KiB Blocks]": 0,
+    }, 2.0)
+
+    assert summary["Read hit [%]"] == 75.0
+    assert summary["Write hit [%]"] is None
+    assert summary["Requests [1/s]"] == 25.0
+    assert summary["Core writes [MiB/s]"] == 1.0
+    assert summary["Dirty [%]"] is None
@@ -0,0 +1,74 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import runpy
+from unittest.mock import patch
+
+import helpers
+
+casctl = runpy.run_path(helpers.find_repo_root() + "/utils/casctl", run_name="casctl")
+
+
+def _stats(i, flushing=False):
+    stats = {
+        (1, None, None): {
+            "Read hits [Requests]": 50 * i,
+            "Read total [Requests]": 100 * i,
+            "Total requests [Requests]": 100 * i,
+        },
+        (1, 2, None): {"Total requests [Requests]": 300 * i},
+        (1, 2, 0): {"Total requests [Requests]": 10 * i},
+    }
+    if flushing:
+        stats[(1, 2, None)]["Flush progress [%]"] = 42.5
+    return stats
+
+
+def test_stats_rows():
+    header, rows = casctl["stats_rows"](_stats(1), _stats(3, True), 2.0, False)
+
+    assert [key for key, _ in rows] == [(1, None, None), (1, 2, None)]
+    row = dict(zip(header, rows[0][1]))
+    assert row["Device"] == "cache 1"
+    assert row["Read hit [%]"] == 50.0
+    assert row["Requests [1/s]"] == 100.0
+    assert dict(zip(header, rows[1][1]))["Flush [%]"] == 42.5
+
+
+def test_sort_rows():
+    header, rows = casctl["stats_rows"](None, _stats(1), 1.0, True)
+    column = casctl["find_column"](header, "read hit")
+
+    # Nothing to compare with yet, rates are unknown
+    assert all(row[column] is None for _, row in rows)
+
+    header, rows = casctl["stats_rows"](_stats(1), _stats(2), 1.0, True)
+    column = casctl["find_column"](header, "requests")
+    assert [key for key, _ in casctl["sort_rows"](rows, column, True)] == [
+        (1, 2, None), (1, None, None), (1, 2, 0)
+    ]
+    column = casctl["find_column"](header, "read hit")
+    assert [key for key, _ in casctl["sort_rows"](rows, column, False)] == [
+        (1, None, None), (1, 2, None), (1, 2, 0)
+    ]
+    assert [key for key, _ in casctl["sort_rows"](rows, 0, False)] == [
+        (1, None, None), (1, 2, None), (1, 2, 0)
+    ]
+
+
+@patch("time.sleep")
+@patch("opencas.get_all_stats")
+def test_batch_baseline(mock_stats, mock_sleep, capsys):
+    mock_stats.side_effect = [_stats(1), _stats(2)]
+    view = casctl["TopView"](2, "requests", False)
+
+    view.batch(1)
+
+    # Single refresh is already compared with baseline taken interval before
+    mock_sleep.assert_called_once_with(2)
+    assert mock_stats.call_count == 2
+    rows = [line.split() for line in capsys.readouterr().out.splitlines()[2:] if line]
+    assert [row[:2] for row in rows] == [["core", "1-2"], ["cache", "1"]]
+    assert "50.00" in rows[1]
@@ -0,0 +1,142 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import pytest
+from unittest.mock import patch, call
+
+import opencas
+from helpers import get_dev_entry
+
+
+stacked_list = [
+    get_dev_entry("core pool", None, None, None),
+    get_dev_entry("core", None, "/dev/pooled", "Detached"),
+    get_dev_entry("cache", 1, "/dev/nvme0n1", "Running"),
+    get_dev_entry("core", 1, "/dev/sda", "Active", device="/dev/cas1-1"),
+    get_dev_entry("core", 2, "/dev/sdb", "Inactive"),
+    get_dev_entry("cache", 2, "/dev/nvme1n1", "Running"),
+    get_dev_entry("core", 1, "/dev/cas1-1", "Active", device="/dev/cas2-1"),
+    get_dev_entry("cache", 3, "/dev/nvme2n1", "Running"),
+    get_dev_entry("core", 1, "/dev/cas2-1", "Active", device="/dev/cas3-1"),
+]
+
+
+def test_topology_indexes():
+    topology = opencas.Topology(stacked_list)
+
+    assert set(topology.caches) == {1, 2, 3}
+    assert set(topology.cores) == {(1, 1), (1, 2), (2, 1), (3, 1)}
+    assert list(topology.core_pool) == ["/dev/pooled"]
+    assert topology.lower == {(2, 1): (1, 1), (3, 1): (2, 1)}
+    assert topology.upper_cores(1, 1) == [(2, 1)]
+    assert topology.cache_cores(1) == [(1, 1), (1, 2)]
+    assert not topology.is_active(1, 2)
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.casadm.remove_core")
+def test_detach_all_cores_stacked(mock_remove, mock_list):
+    mock_list.return_value = stacked_list
+
+    opencas.detach_all_cores(flush=True)
+
+    mock_list.assert_called_once()
+    assert mock_remove.call_args_list == [
+        call(3, 1, detach=True, force=False),
+        call(2, 1, detach=True, force=False),
+        call(1, 1, detach=True, force=False),
+    ]
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.casadm.remove_core")
+def test_detach_all_cores_error_resyncs(mock_remove, mock_list):
+    resynced_list = stacked_list[:-1] + [get_dev_entry("core", 1, "/dev/cas2-1", "Detached")]
+    mock_list.side_effect = [stacked_list, resynced_list]
+    mock_remove.side_effect = [None, Exception("busy"), None]
+
+    with pytest.raises(opencas.CompoundException):
+        opencas.detach_all_cores(flush=False)
+
+    assert mock_list.call_count == 2
+    assert mock_remove.call_args_list == [
+        call(3, 1, detach=True, force=True),
+        call(2, 1, detach=True, force=True),
+        call(2, 1, detach=True, force=True),
+    ]
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.casadm.remove_core")
+@patch("opencas.casadm.stop_cache")
+def test_stop_lists_once(mock_stop, mock_remove, mock_list):
+    mock_list.return_value = stacked_list
+
+    opencas.stop(flush=False)
+
+    mock_list.assert_called_once()
+    assert mock_remove.call_count == 3
+    assert mock_stop.call_args_list == [call(1, True), call(2, True), call(3, True)]
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.casadm.add_core")
+def test_topology_add_core(mock_add, mock_list):
+    topology = opencas.Topology(stacked_list)
+
+    topology.add_core(opencas.cas_config.core_config(1, 3, "/dev/sdc"), False)
+    topology.add_core(opencas.cas_config.core_config(5, 1, "/dev/sdd"), True)
+
+    assert opencas.is_core_added(opencas.cas_config.core_config(1, 3, "/dev/sdc"), topology)
+    assert "/dev/sdd" in topology.core_pool
+    mock_list.assert_not_called()
+
+
+def test_stop_dependencies():
+    device_list = stacked_list + [get_dev_entry("cache", 4, "/dev/cas1-2", "Running")]
+    topology = opencas.Topology(device_list)
+
+    dependencies = opencas.get_stop_dependencies(topology)
+
+    assert dependencies == {
+        ("core", 1, 1): [("core", 2, 1)],
+        ("core", 2, 1): [("core", 3, 1)],
+        ("core", 3, 1): [],
+        ("cache", 1): [("core", 1, 1)],
+        ("cache", 2): [("core", 2, 1)],
+        ("cache", 3): [("core", 3, 1)],
+        ("cache", 4): [],
+    }
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.casadm.remove_core")
+@patch("opencas.casadm.stop_cache")
+def test_stop_parallel_reports(mock_stop, mock_remove, mock_list):
+    mock_list.return_value = stacked_list
+    reported = []
+
+    opencas.stop(flush=True, jobs=4, report=lambda *args: reported.append(args[:2]))
+
+    assert mock_remove.call_args_list == [
+        call(3, 1, detach=True, force=False),
+        call(2, 1, detach=True, force=False),
+        call(1, 1, detach=True, force=False),
+    ]
+    assert sorted(reported) == [(1, "/dev/nvme0n1"), (2, "/dev/nvme1n1"), (3, "/dev/nvme2n1")]
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.casadm.remove_core")
+@patch("opencas.casadm.stop_cache")
+def test_stop_errors_collected(mock_stop, mock_remove, mock_list):
+    mock_list.return_value = stacked_list
+    mock_stop.side_effect = [None, Exception("busy"), None]
+
+    with pytest.raises(opencas.CompoundException) as e:
+        opencas.stop(flush=False, jobs=1)
+
+    assert len(e.value.exception_list) == 1
+    assert mock_stop.call_count == 3
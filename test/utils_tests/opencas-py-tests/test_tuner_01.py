@@ -0,0 +1,410 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+import opencas
+import opencas_tuners
+from helpers import get_dev_entry
+
+
+topology_list = [
+    get_dev_entry("cache", 1, "/dev/dummy_cache", "Running", "wb"),
+    get_dev_entry("core", 1, "/dev/dummy_core", "Active", device="/dev/cas1-1"),
+]
+
+alru_values = {"wake_up": 20, "staleness_time": 120, "flush_max_buffers": 100,
+               "activity_threshold": 10000}
+
+
+def _stats(requests, dirty):
+    return {
+        (1, None, None): {"Total requests [Requests]": requests, "Dirty [4KiB Blocks]": dirty,
+                          "Occupancy [4KiB Blocks]": 1000},
+    }
+
+
+def _block_stat(ios, ticks, io_ticks):
+    stat = dict.fromkeys(opencas_tuners.block_stat_fields, 0)
+    stat.update(read_ios=ios, read_ticks=ticks, io_ticks=io_ticks)
+    return stat
+
+
+class DummyTuner(opencas_tuners.Tuner):
+    default_state_path = "/nonexistent/state.json"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values = []
+
+    def tune(self, topology, delta, elapsed):
+        state = self.device_state("/dev/dummy_cache", 1)
+        state["steps"] = state.get("steps", 0) + 1
+        return [self.change("cleaning-alru", 1, "test", {"Value": 1}, **self.values.pop(0))]
+
+
+def test_get_block_stat():
+    with patch("builtins.open") as mock_open, patch("os.path.realpath") as mock_realpath:
+        mock_realpath.return_value = "/dev/sdb1"
+        mock_open.return_value.__enter__.return_value.read.return_value = (
+            "  100 0 800 40 50 0 400 60 0 70 100 0 0 0 0\n"
+        )
+        stat = opencas_tuners.get_block_stat("/dev/disk/by-id/dummy")
+
+    mock_open.assert_called_once_with("/sys/class/block/sdb1/stat")
+    assert stat["read_ios"] == 100
+    assert stat["write_ticks"] == 60
+    assert stat["time_in_queue"] == 100
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+@patch("opencas.get_param_options")
+@patch("opencas.casadm.set_param")
+def test_tuner_step(mock_set_param, mock_params, mock_stats, mock_list, tmp_path):
+    mock_list.return_value = topology_list
+    mock_params.side_effect = lambda *args, **kwargs: dict(alru_values)
+    mock_stats.side_effect = [_stats(10, 0), _stats(20, 0), _stats(30, 0), _stats(5, 0)]
+    state_path = str(tmp_path / "state.json")
+    tuner = DummyTuner(state_path=state_path)
+    tuner.values = [
+        {"wake_up": 20, "staleness_time": 60},
+        {"staleness_time": 60},
+        {"staleness_time": 60},
+    ]
+    reports = []
+
+    # Nothing to compare with yet
+    assert tuner.step(reports.append, now=0) == []
+
+    changes = tuner.step(reports.append, now=10)
+    assert [change.params for change in changes] == [{"staleness_time": 60}]
+    assert str(changes[0]) == "Set cache 1 cleaning-alru staleness_time=60: test (Value 1)"
+    mock_set_param.assert_called_once_with("cleaning-alru", 1, staleness_time=60)
+    assert reports == changes
+    with open(state_path) as f:
+        assert json.load(f) == {"1": {"device": "/dev/dummy_cache", "steps": 1}}
+
+    # Already applied
+    assert tuner.step(reports.append, now=20) == []
+    mock_params.assert_called_once_with("cleaning-alru", 1)
+
+    # Counters went back, cache was restarted and parameters are read again
+    changes = tuner.step(reports.append, now=30)
+    assert [change.params for change in changes] == [{"staleness_time": 60}]
+    assert mock_params.call_count == 2
+
+    # State is picked up after restart
+    tuner = DummyTuner(state_path=state_path)
+    assert tuner.device_state("/dev/dummy_cache", 1)["steps"] == 3
+    assert tuner.device_state("/dev/other_cache", 1) == {"device": "/dev/other_cache"}
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+@patch("opencas.get_param_options")
+@patch("opencas.casadm.set_param")
+def test_tuner_dry_run_and_errors(mock_set_param, mock_params, mock_stats, mock_list, tmp_path):
+    mock_list.return_value = topology_list
+    mock_params.side_effect = lambda *args, **kwargs: dict(alru_values)
+    mock_stats.side_effect = [_stats(10, 0), _stats(20, 0), _stats(30, 0), _stats(40, 0)]
+    state_path = tmp_path / "state.json"
+    tuner = DummyTuner(dry_run=True, state_path=str(state_path))
+    tuner.values = [{"wake_up": 5}, {"wake_up": 5}]
+
+    tuner.step(now=0)
+    assert [change.params for change in tuner.step(now=1)] == [{"wake_up": 5}]
+    # Reported once, as if applied
+    assert tuner.step(now=2) == []
+    mock_set_param.assert_not_called()
+    assert not state_path.exists()
+
+    tuner = DummyTuner(state_path=str(state_path))
+    tuner.values = [{"wake_up": 5}]
+    mock_stats.side_effect = [_stats(10, 0), _stats(20, 0)]
+    mock_set_param.side_effect = Exception("error")
+    tuner.step(now=0)
+    changes = tuner.step(now=1)
+    assert changes[0].error == "error"
+    # Failed change is tried again next time
+    assert tuner.get_params("cleaning-alru", 1)["wake_up"] == 20
+
+
+def test_cleaning_tuner_bounds():
+    tuner = opencas_tuners.CleaningTuner(
+        state_path="/nonexistent", bounds={"cleaning-alru": {"dirty_ratio_threshold": (100, 50)}}
+    )
+    assert tuner.bounds["cleaning-alru"]["dirty_ratio_threshold"] == (100, 50)
+    assert tuner.bounds["cleaning-alru"]["wake_up"] == (20, 1)
+
+    with pytest.raises(ValueError):
+        opencas_tuners.CleaningTuner(
+            state_path="/nonexistent", bounds={"cleaning-alru": {"foo": (1, 2)}}
+        )
+
+    interpolate = opencas_tuners.CleaningTuner.interpolate
+    assert interpolate((100, 10000), 0) == 100
+    assert interpolate((100, 10000), 0.5) == 1000
+    assert interpolate((100, 10000), 1) == 10000
+    assert interpolate((10000, 0), 0.25) == 7500
+
+
+@patch("opencas_tuners.get_block_stat")
+@patch("opencas.get_param_values")
+def test_cleaning_tuner_tune(mock_params, mock_block_stat):
+    mock_params.side_effect = lambda namespace, cache_id, **kwargs: {
+        "cleaning": {"Cleaning policy type": "alru"},
+        "cleaning-alru": {
+            "Wake up time [s]": 20,
+            "Stale buffer time [s]": 120,
+            "Flush max buffers": 100,
+            "Activity threshold [ms]": 10000,
+        },
+    }[namespace]
+    topology = opencas.Topology(topology_list)
+    tuner = opencas_tuners.CleaningTuner(state_path="/nonexistent", latency_target=10,
+                                  idle_utilization=50)
+    delta = {(1, None, None): {"Dirty [4KiB Blocks]": 256, "Occupancy [4KiB Blocks]": 1024}}
+
+    block_stats = {}
+    mock_block_stat.side_effect = lambda device: block_stats[device]
+
+    # No core load known yet
+    block_stats["/dev/cas1-1"] = _block_stat(0, 0, 0)
+    block_stats["/dev/dummy_core"] = _block_stat(0, 0, 0)
+    assert tuner.tune(topology, delta, 10) == [None]
+
+    # Idle exported object, flush harder even though cleaning keeps core device busy
+    block_stats["/dev/cas1-1"] = _block_stat(100, 100, 1000)
+    block_stats["/dev/dummy_core"] = _block_stat(1000, 50000, 9000)
+    changes = tuner.tune(topology, delta, 10)
+    assert changes[0].params == {
+        "wake_up": 15, "staleness_time": 74, "flush_max_buffers": 158, "activity_threshold": 9000
+    }
+    assert changes[0].metrics["Foreground utilization [%]"] == 10.0
+    assert changes[0].metrics["Foreground latency [ms]"] == 1.0
+    assert changes[0].metrics["Core utilization [%]"] == 90.0
+    assert changes[0].reason == "foreground idle, dirty data left"
+    tuner.get_params("cleaning-alru", 1).update(changes[0].params)
+
+    # Busy exported object, but latency is fine
+    block_stats["/dev/cas1-1"] = _block_stat(200, 200, 9000)
+    assert tuner.tune(topology, delta, 10) == [None]
+
+    # Slow foreground IO, back off
+    block_stats["/dev/cas1-1"] = _block_stat(300, 2200, 10000)
+    changes = tuner.tune(topology, delta, 10)
+    assert changes[0].metrics["Level"] == 0.05
+    assert changes[0].reason == "foreground latency above target"
+    assert tuner.state["1"]["level"] == 0.05
+
+
+def _core_stats(requests, blocks, hits=0):
+    return {
+        "Total requests [Requests]": requests,
+        "Read hits [Requests]": hits,
+        "Write hits [Requests]": 0,
+        "Reads from exported object [4KiB Blocks]": blocks,
+        "Writes to exported object [4KiB Blocks]": 0,
+        "Pass-Through reads [Requests]": 0,
+        "Pass-Through writes [Requests]": 0,
+    }
+
+
+def test_seq_cutoff_pick_profile():
+    tuner = opencas_tuners.SeqCutoffTuner(state_path="/nonexistent")
+
+    assert tuner.pick_profile(1, 20) == 1
+    assert tuner.pick_profile(1, 8) == 0
+    assert tuner.pick_profile(0, 20) == 0
+    assert tuner.pick_profile(0, 32) == 1
+    assert tuner.pick_profile(0, 1024) == 2
+    assert tuner.pick_profile(2, 130) == 2
+    assert tuner.pick_profile(2, 100) == 1
+    assert tuner.pick_profile(2, 4) == 0
+
+
+@patch("opencas.get_param_options")
+def test_seq_cutoff_tuner_tune(mock_params):
+    mock_params.return_value = {"threshold": 1024, "policy": "full", "promotion_count": 8}
+    topology = opencas.Topology(topology_list)
+    tuner = opencas_tuners.SeqCutoffTuner(state_path="/nonexistent", settle=2, min_requests=10)
+
+    def tune(requests, blocks):
+        return tuner.tune(topology, {(1, 1, None): _core_stats(requests, blocks)}, 10)
+
+    # 4 KiB requests, random profile after two steps
+    assert tune(100, 100) == [None]
+    changes = tune(100, 100)
+    mock_params.assert_called_once_with("seq-cutoff", 1, core_id=1)
+    assert changes[0].core_id == 1
+    assert changes[0].params == {"threshold": 16384}
+    assert changes[0].reason == "random profile"
+    assert changes[0].metrics["Average request size [KiB]"] == 4.0
+    tuner.get_params("seq-cutoff", 1, 1).update(changes[0].params)
+
+    # Too few requests to tell, interrupted streak
+    assert tune(5, 1000) == [None]
+    assert tune(100, 10000) == [None]
+    assert tune(100, 100) == [None]
+    assert tune(100, 10000) == [None]
+    changes = tune(100, 10000)
+    assert changes[0].params == {"threshold": 128, "policy": "always", "promotion_count": 4}
+    assert tuner.state["1-1"]["profile"] == "streaming"
+
+    # Profile is applied only when switched
+    tuner.get_params("seq-cutoff", 1, 1).update(threshold=1024, policy="full")
+    assert tune(100, 10000) == [None]
+
+
+@patch("opencas.get_param_options")
+def test_seq_cutoff_tuner_keeps_configured(mock_params):
+    mock_params.return_value = {"threshold": 2048, "policy": "full", "promotion_count": 8}
+    topology = opencas.Topology(topology_list)
+    tuner = opencas_tuners.SeqCutoffTuner(state_path="/nonexistent", settle=1, min_requests=10)
+
+    def tune(requests, blocks):
+        return tuner.tune(topology, {(1, 1, None): _core_stats(requests, blocks)}, 10)
+
+    # No profile matches, mixed sized requests stay in the initial one
+    assert tune(100, 500) == [None]
+    assert tune(100, 500) == [None]
+    assert tuner.state["1-1"]["profile"] == "mixed"
+
+    changes = tune(100, 10000)
+    assert changes[0].reason == "streaming profile"
+
+    # Running parameters match streaming profile
+    mock_params.return_value = {"threshold": 128, "policy": "always", "promotion_count": 4}
+    tuner = opencas_tuners.SeqCutoffTuner(state_path="/nonexistent", settle=1, min_requests=10)
+    assert tune(100, 10000) == [None]
+    assert tuner.state["1-1"]["profile"] == "streaming"
+
+
+@patch("opencas.get_caches_list")
+@patch("opencas.get_all_stats")
+@patch("opencas.get_param_options")
+@patch("opencas.casadm.set_param")
+def test_tuner_impact(mock_set_param, mock_params, mock_stats, mock_list, tmp_path):
+    mock_list.return_value = topology_list
+    mock_params.side_effect = lambda *args, **kwargs: dict(alru_values)
+    requests = [0, 100, 200, 300, 400, 500]
+    hits = [0, 10, 20, 80, 140, 200]
+    mock_stats.side_effect = [
+        {(1, None, None): _core_stats(r, 0, h)} for r, h in zip(requests, hits)
+    ]
+    tuner = DummyTuner(state_path=str(tmp_path / "state.json"))
+    tuner.impact_steps = 2
+    tuner.values = [{}, {"wake_up": 5}, {}, {}, {}]
+
+    tuner.step(now=0)
+    tuner.step(now=1)
+    changes = tuner.step(now=2)
+    assert [type(change) for change in changes] == [opencas_tuners.TuningChange]
+    assert tuner.step(now=3) == []
+
+    impacts = tuner.step(now=4)
+    assert [type(impact) for impact in impacts] == [opencas_tuners.TuningImpact]
+    assert (impacts[0].before, impacts[0].after) == (10.0, 60.0)
+    assert str(impacts[0]) == (
+        "Hit ratio of cache 1 after setting cleaning-alru wake_up=5: 10.0% -> 60.0%"
+    )
+    assert tuner.step(now=5) == []
+
+
+def _cache_stats(requests, hits, misses, blocks, occupancy, free=0, pass_through=0):
+    return {
+        "Total requests [Requests]": requests,
+        "Read hits [Requests]": hits,
+        "Write hits [Requests]": 0,
+        "Read partial misses [Requests]": 0,
+        "Read full misses [Requests]": misses,
+        "Write partial misses [Requests]": 0,
+        "Write full misses [Requests]": 0,
+        "Pass-Through reads [Requests]": pass_through,
+        "Pass-Through writes [Requests]": 0,
+        "Reads from exported object [4KiB Blocks]": blocks,
+        "Writes to exported object [4KiB Blocks]": 0,
+        "Occupancy [4KiB Blocks]": occupancy,
+        "Free [4KiB Blocks]": free,
+    }
+
+
+@patch("opencas.get_param_values")
+def test_promotion_tuner_tune(mock_params):
+    mock_params.side_effect = lambda namespace, cache_id, **kwargs: {
+        "promotion": {"Promotion policy type": "nhit"},
+        "promotion-nhit": {"Insertion threshold": 5, "Policy trigger [%]": 90},
+    }[namespace]
+    topology = opencas.Topology(topology_list)
+    tuner = opencas_tuners.PromotionTuner(state_path="/nonexistent", settle=2, min_requests=100)
+    tuner.stats = {(1, None, None): _cache_stats(0, 0, 0, 0, 1000)}
+
+    def tune(*args, **kwargs):
+        return tuner.tune(topology, {(1, None, None): _cache_stats(*args, **kwargs)}, 10)
+
+    # Scan while evicting, running threshold is rounded up to level 2 but
+    # configured parameters are kept until the level changes
+    assert tune(1000, 100, 900, 1000, 1000) == [None]
+    assert tuner.state["1"]["level"] == 2
+
+    changes = tune(1000, 100, 900, 1000, 1000)
+    assert changes[0].params == {"threshold": 12, "trigger": 80}
+    assert changes[1] is None
+    assert changes[0].reason == "hit ratio below low threshold while evicting"
+    assert changes[0].metrics["Hit ratio [%]"] == 10.0
+    assert changes[0].metrics["Inserts [1/s]"] == 90.0
+    assert round(changes[0].metrics["Evictions [MiB/s]"], 3) == round(900 * 4096 / 2**20 / 10, 3)
+    tuner.get_params("promotion-nhit", 1).update(changes[0].params)
+
+    # Top level already
+    assert tune(1000, 100, 900, 1000, 1000) == [None]
+    assert tune(1000, 100, 900, 1000, 1000) == [None]
+
+    # Hot set hits again, back down one level at a time
+    assert tune(1000, 900, 100, 1000, 1000) == [None]
+    changes = tune(1000, 900, 100, 1000, 1000)
+    assert changes[0].params == {"threshold": 6}
+    assert changes[0].reason == "hit ratio above high threshold"
+    tuner.get_params("promotion-nhit", 1).update(changes[0].params)
+
+    # Not full, nhit doesn't apply
+    assert tune(1000, 100, 900, 1000, 500, free=500) == [None]
+    changes = tune(1000, 100, 900, 1000, 500, free=500)
+    assert changes[0].params == {"threshold": 3}
+    assert changes[0].reason == "occupancy below nhit trigger"
+    tuner.get_params("promotion-nhit", 1).update(changes[0].params)
+    assert tune(1000, 100, 900, 1000, 500, free=500) == [None]
+    changes = tune(1000, 100, 900, 1000, 500, free=500)
+    assert len(changes) == 1
+    assert changes[0].params == {"policy": "always"}
+    tuner.get_params("promotion", 1).update(changes[0].params)
+
+    # Too few requests to tell
+    assert tune(10, 0, 10, 10, 1000) == [None]
+    assert (tuner.state["1"]["level"], tuner.state["1"]["count"]) == (0, 0)
+
+    with pytest.raises(ValueError):
+        opencas_tuners.PromotionTuner(
+            state_path="/nonexistent", low_hit_ratio=60, high_hit_ratio=30
+        )
+
+
+def test_promotion_tuner_evictions():
+    tuner = opencas_tuners.PromotionTuner(state_path="/nonexistent")
+    tuner.stats = {(1, None, None): _cache_stats(0, 0, 0, 0, 1000)}
+
+    def evictions(*args, **kwargs):
+        return tuner._metrics(1, _cache_stats(*args, **kwargs), 1)["Evictions [MiB/s]"]
+
+    # 8 KiB requests, inserted misses fill the free space first
+    assert evictions(1000, 500, 500, 2000, 1500, free=500) == 500 * 4096 / 2**20
+    assert evictions(1000, 500, 500, 2000, 2000) == 0
+    # Passed through misses don't insert
+    assert evictions(1000, 500, 500, 2000, 1000, pass_through=500) == 0
+    assert evictions(0, 0, 0, 0, 1000) is None
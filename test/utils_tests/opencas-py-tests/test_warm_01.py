@@ -0,0 +1,264 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import os
+import threading
+from unittest.mock import MagicMock, patch, call
+
+import pytest
+
+import opencas
+import opencas_warm
+from helpers import get_dev_entry
+
+
+def _topology(exp_obj="/dev/cas1-1"):
+    return opencas.Topology([
+        get_dev_entry("cache", 1, "/dev/dummy_cache1", "Running", "wt"),
+        get_dev_entry("core", 1, "/dev/dummy_core1", "Active", device=exp_obj),
+        get_dev_entry("core", 2, "/dev/dummy_core2", "Inactive"),
+        get_dev_entry("cache", 2, "/dev/dummy_cache2", "Running", "pt"),
+        get_dev_entry("core", 1, "/dev/dummy_core3", "Active", device="/dev/cas2-1"),
+        get_dev_entry("cache", 3, "/dev/dummy_cache3", "Running", "wb->wa"),
+        get_dev_entry("core", 1, "/dev/dummy_core4", "Active", device="/dev/cas3-1"),
+    ])
+
+
+def _hot_set(tmp_path, text):
+    path = tmp_path / "hot-set"
+    path.write_text(text)
+    return str(path)
+
+
+def test_read_hot_set(tmp_path):
+    path = _hot_set(
+        tmp_path,
+        "# Captured before stop\n"
+        "core 1 1 /dev/dummy_core1\n"
+        "0 8\n"
+        "\n"
+        "16 1\n"
+        "core 1 2 /dev/dummy_core2\n"
+        "0 8\n",
+    )
+
+    assert list(opencas_warm.read_hot_set(path)) == [
+        (1, 1, "/dev/dummy_core1", 0, 8),
+        (1, 1, "/dev/dummy_core1", 16, 1),
+        (1, 2, "/dev/dummy_core2", 0, 8),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "0 8\n",
+        "core 1 /dev/dummy_core1\n",
+        "core 1 1 /dev/dummy_core1\n0\n",
+        "core 1 1 /dev/dummy_core1\n0 x\n",
+        "core 1 1 /dev/dummy_core1\n0 0\n",
+        "core 1 1 /dev/dummy_core1\n8 8\n0 8\n",
+        "core 1 1 /dev/dummy_core1\n0 16\n8 8\n",
+    ],
+)
+def test_read_hot_set_invalid(tmp_path, text):
+    with pytest.raises(ValueError):
+        list(opencas_warm.read_hot_set(_hot_set(tmp_path, text)))
+
+
+def test_warmer_cores(tmp_path):
+    path = _hot_set(
+        tmp_path,
+        "core 1 1 /dev/dummy_core1\n"
+        # Aligned to 4 KiB and merged
+        "1 2\n"
+        "7 2\n"
+        "24 8\n"
+        "core 1 2 /dev/dummy_core2\n"
+        "0 8\n"
+        "core 2 1 /dev/dummy_core3\n"
+        "0 8\n"
+        "core 3 1 /dev/other\n"
+        "0 8\n"
+        "core 4 1 /dev/dummy_core5\n"
+        "0 8\n",
+    )
+
+    warmer = opencas_warm.Warmer(path, topology=_topology())
+
+    assert warmer.cores == {(1, 1): {"exp_obj": "/dev/cas1-1", "done": 0, "total": 12288}}
+    assert [key for key, _ in warmer.skipped] == [(1, 2), (2, 1), (3, 1), (4, 1)]
+
+    with pytest.raises(ValueError):
+        opencas_warm.Warmer(path, io_size=1000, topology=_topology())
+
+
+@patch("opencas.get_param_values")
+@patch("opencas.casadm.set_param")
+def test_warmer_start_restore(mock_set_param, mock_params, tmp_path):
+    params = {
+        "promotion": {"Promotion policy type": "nhit"},
+        "promotion-nhit": {"Insertion threshold": 3, "Policy trigger [%]": 80},
+        "seq-cutoff": {"Sequential cutoff policy": "full"},
+    }
+    mock_params.side_effect = lambda namespace, cache_id, **kwargs: params[namespace]
+    path = _hot_set(tmp_path, "core 1 1 /dev/dummy_core1\n0 8\n")
+    warmer = opencas_warm.Warmer(path, topology=_topology())
+
+    warmer.start()
+
+    assert warmer.repeats == {1: 3}
+    mock_set_param.assert_called_once_with("seq-cutoff", 1, core_id=1, policy="never")
+
+    mock_set_param.reset_mock()
+    warmer.restore()
+    mock_set_param.assert_called_once_with("seq-cutoff", 1, core_id=1, policy="full")
+
+    params["promotion"]["Promotion policy type"] = "always"
+    mock_set_param.reset_mock()
+    warmer = opencas_warm.Warmer(path, keep_seq_cutoff=True, topology=_topology())
+    warmer.start()
+    assert warmer.repeats == {1: 1}
+    mock_set_param.assert_not_called()
+
+
+@patch("opencas.get_all_stats")
+def test_warmer_run(mock_stats, tmp_path):
+    exp_obj = tmp_path / "cas1-1"
+    exp_obj.write_bytes(os.urandom(1 << 20))
+    mock_stats.return_value = {
+        (1, None, None): {"Occupancy [4KiB Blocks]": 64, "Free [4KiB Blocks]": 192},
+        (1, 1, None): {"Occupancy [4KiB Blocks]": 32},
+    }
+    path = _hot_set(
+        tmp_path,
+        "core 1 1 /dev/dummy_core1\n"
+        "0 8\n"
+        "64 200\n"
+        "2040 16\n",
+    )
+    warmer = opencas_warm.Warmer(path, jobs=2, io_size=32768, topology=_topology(str(exp_obj)))
+    warmer.open_flags = os.O_RDONLY
+    warmer.repeats = {1: 2}
+    reads = []
+    preadv = os.preadv
+
+    def read(fd, buffers, offset):
+        reads.append((offset, len(buffers[0])))
+        return preadv(fd, buffers, offset)
+
+    reports = []
+    with patch("os.preadv", side_effect=read):
+        assert warmer.run(interval=1, report=reports.append)
+
+    expected = [(0, 4096), (32768, 32768), (65536, 32768), (98304, 32768), (131072, 4096),
+                (1044480, 8192)]
+    assert sorted(reads) == sorted(expected * 2)
+    assert reports[-1] == {(1, 1): (114688, 114688, 12.5)}
+
+
+def test_warmer_run_stopped(tmp_path):
+    exp_obj = tmp_path / "cas1-1"
+    exp_obj.write_bytes(bytes(1 << 16))
+    path = _hot_set(tmp_path, "core 1 1 /dev/dummy_core1\n0 128\n")
+    warmer = opencas_warm.Warmer(path, io_size=4096, topology=_topology(str(exp_obj)))
+    warmer.open_flags = os.O_RDONLY
+    stop = threading.Event()
+    stop.set()
+
+    assert not warmer.run(stop=stop)
+    assert warmer.cores[(1, 1)]["done"] == 0
+
+
+def test_rate_limiter():
+    limiter = opencas_warm.RateLimiter(1000)
+    with patch("time.monotonic", return_value=10.0), patch("time.sleep") as mock_sleep:
+        limiter.acquire(500)
+        limiter.acquire(500)
+        limiter.acquire(500)
+    assert mock_sleep.call_args_list == [call(0.5), call(1.0)]
+
+
+def test_write_hot_set(tmp_path):
+    path = str(tmp_path / "opencas" / "hot-set")
+    cores = [
+        (1, 1, "/dev/dummy_core1", [(0, 128), (1024, 256)]),
+        (1, 2, "/dev/dummy_core2", []),
+    ]
+
+    opencas_warm.write_hot_set(cores, path)
+
+    assert list(opencas_warm.read_hot_set(path)) == [
+        (1, 1, "/dev/dummy_core1", 0, 128),
+        (1, 1, "/dev/dummy_core1", 1024, 256),
+    ]
+    assert os.listdir(tmp_path / "opencas") == ["hot-set"]
+
+
+def test_hot_set_capture_parse():
+    capture = opencas_warm.HotSetCapture(granularity=4096, topology=_topology())
+    assert set(capture.cores) == {(1, 1), (2, 1), (3, 1)}
+
+    capture.parse(
+        [
+            "252 0 R 0 8\n",
+            "252 0 WS 6 4\n",
+            "252 0 R 80 8\n",
+            "252 0 D 16 8\n",
+            "252 0 FWS 0 0\n",
+            "252 1 R 0 8\n",
+            "CPU0 (252,0):\n",
+            "252 0 RA 32 8\n",
+        ],
+        {(252, 0): (1, 1)},
+    )
+
+    assert capture.counts[(1, 1)] == {0: 2, 1: 1, 4: 1, 10: 1}
+    assert capture.extents((1, 1)) == [(0, 16), (32, 8), (80, 8)]
+    # Most accessed first, then lower offsets
+    assert capture.extents((1, 1), limit=8192) == [(0, 16)]
+    assert capture.extents((1, 1), limit=12288) == [(0, 16), (32, 8)]
+
+
+@patch("opencas.get_all_stats")
+def test_hot_set_capture_result(mock_stats):
+    mock_stats.return_value = {
+        (1, 1, None): {"Occupancy [4KiB Blocks]": 1},
+    }
+    capture = opencas_warm.HotSetCapture([1], granularity=4096, topology=_topology())
+    capture.add((1, 1), 0, 8)
+    capture.add((1, 1), 0, 16)
+
+    assert capture.result() == [(1, 1, "/dev/dummy_core1", [(0, 8)])]
+
+    capture = opencas_warm.HotSetCapture([1], granularity=4096, max_size=8192, topology=_topology())
+    capture.add((1, 1), 0, 16)
+    assert capture.result() == [(1, 1, "/dev/dummy_core1", [(0, 16)])]
+    mock_stats.assert_called_once_with()
+
+
+@patch("subprocess.Popen")
+def test_hot_set_capture_trace(mock_popen):
+    blktrace, blkparse = MagicMock(), MagicMock()
+    mock_popen.side_effect = [blktrace, blkparse]
+    blktrace.returncode = 0
+    blktrace.communicate.return_value = (b"", b"")
+    blkparse.stdout.__iter__.return_value = iter(["252 0 R 0 8\n"])
+    capture = opencas_warm.HotSetCapture([1], granularity=4096, topology=_topology())
+
+    with patch.object(capture, "_device_numbers", return_value={(252, 0): (1, 1)}):
+        capture.trace(30)
+
+    assert mock_popen.call_args_list[0][0][0] == [
+        capture.blktrace_path, "-a", "queue", "-w", "30", "-o", "-", "-d", "/dev/cas1-1"
+    ]
+    assert capture.counts[(1, 1)] == {0: 1}
+    blkparse.wait.assert_called_once_with()
+
+    blktrace.returncode = 1
+    mock_popen.side_effect = [blktrace, blkparse]
+    with patch.object(capture, "_device_numbers", return_value={(252, 0): (1, 1)}):
+        with pytest.raises(Exception, match="blktrace failed"):
+            capture.trace(30)
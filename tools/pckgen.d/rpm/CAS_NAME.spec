@@ -159,6 +159,13 @@ fi
 /lib/opencas/casctl
 /lib/opencas/open-cas-loader.py
 /lib/opencas/opencas.py
+/lib/opencas/opencas_aio.py
+/lib/opencas/opencas_drain.py
+/lib/opencas/opencas_exporter.py
+/lib/opencas/opencas_mode_policy.py
+/lib/opencas/opencas_recording.py
+/lib/opencas/opencas_tuners.py
+/lib/opencas/opencas_warm.py
 /lib/udev/rules.d/60-persistent-storage-cas-load.rules
 /lib/udev/rules.d/60-persistent-storage-cas.rules
 /sbin/casadm
@@ -172,6 +179,20 @@ fi
 %ghost /var/log/opencas.log
 %ghost /lib/opencas/opencas.pyc
 %ghost /lib/opencas/opencas.pyo
+%ghost /lib/opencas/opencas_aio.pyc
+%ghost /lib/opencas/opencas_aio.pyo
+%ghost /lib/opencas/opencas_drain.pyc
+%ghost /lib/opencas/opencas_drain.pyo
+%ghost /lib/opencas/opencas_exporter.pyc
+%ghost /lib/opencas/opencas_exporter.pyo
+%ghost /lib/opencas/opencas_mode_policy.pyc
+%ghost /lib/opencas/opencas_mode_policy.pyo
+%ghost /lib/opencas/opencas_recording.pyc
+%ghost /lib/opencas/opencas_recording.pyo
+%ghost /lib/opencas/opencas_tuners.pyc
+%ghost /lib/opencas/opencas_tuners.pyo
+%ghost /lib/opencas/opencas_warm.pyc
+%ghost /lib/opencas/opencas_warm.pyo
 %ghost /lib/opencas/__pycache__
 
 %files  modules_%{kver_filename}
@@ -6,43 +6,136 @@
 #
 
 import subprocess
-import opencas
+import socket
+import json
 import sys
 import os
 import syslog as sl
 
-try:
-    subprocess.call(['/sbin/modprobe', 'cas_cache'])
-except Exception:
-    sl.syslog(sl.LOG_ERR, 'Unable to probe cas_cache module')
-    exit(1)
+# Keep in sync with opencas.LoaderDaemon.socket_path, opencas.loader_index_path
+# and opencas.cas_config.default_location
+daemon_socket = '/run/opencas/loader.sock'
+index_path = '/run/opencas/loader-index.json'
+config_path = '/etc/opencas/opencas.conf'
+
+
+def request_daemon(device):
+    """
+    Pass the device to open-cas daemon. Return its response or None if the
+    daemon isn't running.
+    """
+    request = {"device": device, "links": os.environ.get("DEVLINKS", "").split()}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(daemon_socket)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            return json.loads(sock.makefile().readline())
+    except (OSError, ValueError):
+        return None
+
+
+def lookup_index(device):
+    """
+    Find the device in index compiled by casctl. Return (True, entry) if the
+    index is up to date - entry is None if the device isn't configured -
+    or (False, None) if config file has to be parsed.
+    """
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        st = os.stat(config_path)
+        if index["stamp"] != [st.st_ino, st.st_size, st.st_mtime_ns]:
+            return False, None
+        rdev = os.stat(device).st_rdev
+    except (OSError, ValueError, KeyError):
+        return False, None
+
+    # Device numbers are reused, so make sure configured path still points here
+    entry = index["by_devt"].get(f"{os.major(rdev)}:{os.minor(rdev)}")
+    if entry:
+        try:
+            if os.stat(entry["device"]).st_rdev == rdev:
+                return True, entry
+        except OSError:
+            pass
+
+    for path in [device] + os.environ.get("DEVLINKS", "").split():
+        if path in index["by_path"]:
+            return True, index["by_path"][path]
+
+    # Without udev provided links configured path may be an unknown symlink
+    if "DEVLINKS" not in os.environ:
+        return False, None
+
+    return True, None
+
+
+def load_device(dev):
+    try:
+        opencas.wait_for_cas_ctrl()
+        if type(dev) is opencas.cas_config.cache_config:
+            opencas.start_cache(dev, True)
+        else:
+            opencas.add_core(dev, True)
+    except opencas.casadm.CasadmError as e:
+        if type(dev) is opencas.cas_config.cache_config:
+            sl.syslog(sl.LOG_WARNING,
+                      f'Unable to load cache {dev.cache_id} ({dev.device}). '
+                      f'Reason: {e.result.stderr}')
+        else:
+            sl.syslog(sl.LOG_WARNING,
+                      f'Unable to attach core {dev.device} from cache {dev.cache_id}. '
+                      f'Reason: {e.result.stderr}')
+        exit(e.result.exit_code)
+    exit(0)
+
+
+response = request_daemon(sys.argv[1])
+if response is not None:
+    if response["message"]:
+        sl.syslog(sl.LOG_WARNING, response["message"])
+    exit(response["exit_code"])
+
+indexed, entry = lookup_index(sys.argv[1])
+if indexed and not entry:
+    exit(0)
+
+import opencas
+
+if not os.path.exists('/sys/module/cas_cache'):
+    try:
+        subprocess.call(['/sbin/modprobe', 'cas_cache'])
+    except Exception:
+        sl.syslog(sl.LOG_ERR, 'Unable to probe cas_cache module')
+        exit(1)
+
+if indexed:
+    try:
+        if entry["type"] == "cache":
+            dev = opencas.cas_config.cache_config.from_line(entry["line"], allow_incomplete=True)
+        else:
+            dev = opencas.cas_config.core_config.from_line(entry["line"], allow_incomplete=True)
+    except Exception as e:
+        sl.syslog(sl.LOG_ERR, f'Unable to load opencas config. Reason: {str(e)}')
+        exit(1)
+    load_device(dev)
 
 try:
-    config = opencas.cas_config.from_file('/etc/opencas/opencas.conf',
-                                          allow_incomplete=True)
+    stamp = opencas.get_config_stamp(config_path)
+    config = opencas.cas_config.from_file(config_path, allow_incomplete=True)
 except Exception as e:
     sl.syslog(sl.LOG_ERR, f'Unable to load opencas config. Reason: {str(e)}')
     exit(1)
 
+# Refresh the index for subsequent events
+try:
+    opencas.compile_loader_index(config_path, index_path, config, stamp)
+except Exception:
+    pass
+
 for cache in config.caches.values():
     if sys.argv[1] == os.path.realpath(cache.device):
-        try:
-            opencas.wait_for_cas_ctrl()
-            opencas.start_cache(cache, True)
-        except opencas.casadm.CasadmError as e:
-            sl.syslog(sl.LOG_WARNING,
-                      f'Unable to load cache {cache.cache_id} ({cache.device}). '
-                      f'Reason: {e.result.stderr}')
-            exit(e.result.exit_code)
-        exit(0)
+        load_device(cache)
     for core in cache.cores.values():
         if sys.argv[1] == os.path.realpath(core.device):
-            try:
-                opencas.wait_for_cas_ctrl()
-                opencas.add_core(core, True)
-            except opencas.casadm.CasadmError as e:
-                sl.syslog(sl.LOG_WARNING,
-                          f'Unable to attach core {core.device} from cache {cache.cache_id}. '
-                          f'Reason: {e.result.stderr}')
-                exit(e.result.exit_code)
-            exit(0)
+            load_device(core)
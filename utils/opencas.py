@@ -5,11 +5,22 @@
 # SPDX-License-Identifier: BSD-3-Clause
 #
 import subprocess
+import ctypes
+import fcntl
 import csv
+import errno
+import json
+import queue
 import re
 import os
+import select
+import socket
+import socketserver
 import stat
+import struct
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Casadm functionality
 
@@ -30,6 +41,10 @@ class casadm:
             super(casadm.CasadmError, self).__init__('casadm error: {}'.format(result.stderr))
             self.result = result
 
+    # Transport used to issue requests without forking casadm binary.
+    # Set to None to always go through casadm.
+    transport = None
+
     @classmethod
     def run_cmd(cls, cmd):
         result = cls.result(cmd)
@@ -37,23 +52,52 @@ class casadm:
             raise cls.CasadmError(result)
         return result
 
+    @classmethod
+    def run_native(cls, request, *args, **kwargs):
+        if cls.transport is None or not cls.transport.is_supported():
+            return None
+
+        try:
+            return getattr(cls.transport, request)(*args, **kwargs)
+        except cls.transport.Unsupported:
+            return None
+
     @classmethod
     def get_version(cls):
         cmd = [cls.casadm_path,
                '--version',
-               '--output-format', 'csv']
+               '--output-format', 'json']
         return cls.run_cmd(cmd)
 
     @classmethod
     def list_caches(cls):
+        result = cls.run_native('list_caches')
+        if result:
+            return result
+
         cmd = [cls.casadm_path,
                '--list-caches',
-               '--output-format', 'csv',
+               '--output-format', 'json',
                '--by-id-path']
         return cls.run_cmd(cmd)
 
+    @classmethod
+    def stats_all(cls):
+        result = cls.run_native('stats_all')
+        if result:
+            return result
+
+        cmd = [cls.casadm_path,
+               '--stats-all',
+               '--output-format', 'json']
+        return cls.run_cmd(cmd)
+
     @classmethod
     def check_cache_device(cls, device):
+        result = cls.run_native('check_cache_device', device)
+        if result:
+            return result
+
         cmd = [cls.casadm_path,
                '--script',
                '--check-cache-device',
@@ -97,6 +141,10 @@ class casadm:
 
     @classmethod
     def add_core(cls, device, cache_id, core_id=None, try_add=False):
+        result = cls.run_native('add_core', device, cache_id, core_id, try_add)
+        if result:
+            return result
+
         cmd = [cls.casadm_path,
                '--script',
                '--add-core',
@@ -110,6 +158,10 @@ class casadm:
 
     @classmethod
     def stop_cache(cls, cache_id, no_flush=False):
+        result = cls.run_native('stop_cache', cache_id, no_flush)
+        if result:
+            return result
+
         cmd = [cls.casadm_path,
                '--stop-cache',
                '--cache-id', str(cache_id)]
@@ -119,6 +171,10 @@ class casadm:
 
     @classmethod
     def remove_core(cls, cache_id, core_id, detach=False, force=False):
+        result = cls.run_native('remove_core', cache_id, core_id, detach, force)
+        if result:
+            return result
+
         cmd = [cls.casadm_path,
                '--script',
                '--remove-core',
@@ -132,6 +188,10 @@ class casadm:
 
     @classmethod
     def set_param(cls, namespace, cache_id, **kwargs):
+        result = cls.run_native('set_param', namespace, cache_id, **kwargs)
+        if result:
+            return result
+
         cmd = [cls.casadm_path,
                '--set-param', '--name', namespace,
                '--cache-id', str(cache_id)]
@@ -143,6 +203,10 @@ class casadm:
 
     @classmethod
     def get_params(cls, namespace, cache_id, **kwargs):
+        result = cls.run_native('get_params', namespace, cache_id, **kwargs)
+        if result:
+            return result
+
         cmd = [cls.casadm_path,
                '--get-param', '--name', namespace,
                '--cache-id', str(cache_id)]
@@ -150,7 +214,7 @@ class casadm:
         for param, value in kwargs.items():
             cmd += ['--'+param.replace('_', '-'), str(value)]
 
-        cmd += ['-o', 'csv']
+        cmd += ['-o', 'json']
 
         return cls.run_cmd(cmd)
 
@@ -171,6 +235,778 @@ class casadm:
                '--file', ioclass_file]
         return cls.run_cmd(cmd)
 
+    @classmethod
+    def io_class_list(cls, cache_id):
+        cmd = [cls.casadm_path,
+               '--io-class',
+               '--list',
+               '--cache-id', str(cache_id),
+               '--output-format', 'json']
+        return cls.run_cmd(cmd)
+
+    @classmethod
+    def flush_cache(cls, cache_id, core_id=None):
+        cmd = [cls.casadm_path,
+               '--flush-cache',
+               '--cache-id', str(cache_id)]
+        if core_id is not None:
+            cmd += ['--core-id', str(core_id)]
+        return cls.run_cmd(cmd)
+
+    @classmethod
+    def set_cache_mode(cls, cache_id, cache_mode, flush=None):
+        cmd = [cls.casadm_path,
+               '--set-cache-mode',
+               '--cache-id', str(cache_id),
+               '--cache-mode', cache_mode]
+        if flush is not None:
+            cmd += ['--flush-cache', 'yes' if flush else 'no']
+        return cls.run_cmd(cmd)
+
+
+# Native /dev/cas_ctrl transport
+
+# OCF structures embedded in KCAS_IOCTL_* requests, mirrored from ocf/inc of
+# the same build (ocf_stats.h, ocf_cache.h and ocf_core.h)
+
+
+class ocf_stat(ctypes.Structure):
+    _fields_ = [
+        ('value', ctypes.c_uint64),
+        ('fraction', ctypes.c_uint64),
+    ]
+
+
+class ocf_stats_usage(ctypes.Structure):
+    _fields_ = [
+        ('occupancy', ocf_stat),
+        ('free', ocf_stat),
+        ('clean', ocf_stat),
+        ('dirty', ocf_stat),
+    ]
+
+
+class ocf_stats_requests(ctypes.Structure):
+    _fields_ = [
+        ('rd_hits', ocf_stat),
+        ('rd_deferred', ocf_stat),
+        ('rd_partial_misses', ocf_stat),
+        ('rd_full_misses', ocf_stat),
+        ('rd_total', ocf_stat),
+        ('wr_hits', ocf_stat),
+        ('wr_deferred', ocf_stat),
+        ('wr_partial_misses', ocf_stat),
+        ('wr_full_misses', ocf_stat),
+        ('wr_total', ocf_stat),
+        ('rd_pt', ocf_stat),
+        ('wr_pt', ocf_stat),
+        ('serviced', ocf_stat),
+        ('total', ocf_stat),
+    ]
+
+
+class ocf_stats_blocks(ctypes.Structure):
+    _fields_ = [
+        ('core_volume_rd', ocf_stat),
+        ('core_volume_wr', ocf_stat),
+        ('core_volume_total', ocf_stat),
+        ('cache_volume_rd', ocf_stat),
+        ('cache_volume_wr', ocf_stat),
+        ('cache_volume_total', ocf_stat),
+        ('volume_rd', ocf_stat),
+        ('volume_wr', ocf_stat),
+        ('volume_total', ocf_stat),
+    ]
+
+
+class ocf_stats_errors(ctypes.Structure):
+    _fields_ = [
+        ('core_volume_rd', ocf_stat),
+        ('core_volume_wr', ocf_stat),
+        ('core_volume_total', ocf_stat),
+        ('cache_volume_rd', ocf_stat),
+        ('cache_volume_wr', ocf_stat),
+        ('cache_volume_total', ocf_stat),
+        ('total', ocf_stat),
+    ]
+
+
+class ocf_cache_info_inactive(ctypes.Structure):
+    _fields_ = [
+        ('occupancy', ocf_stat),
+        ('clean', ocf_stat),
+        ('dirty', ocf_stat),
+    ]
+
+
+class ocf_cache_info_fallback_pt(ctypes.Structure):
+    _fields_ = [
+        ('error_counter', ctypes.c_int),
+        ('status', ctypes.c_bool),
+    ]
+
+
+class ocf_cache_info(ctypes.Structure):
+    _fields_ = [
+        ('attached', ctypes.c_bool),
+        ('volume_type', ctypes.c_uint8),
+        ('state', ctypes.c_uint8),
+        ('size', ctypes.c_uint32),
+        ('inactive', ocf_cache_info_inactive),
+        ('occupancy', ctypes.c_uint32),
+        ('dirty', ctypes.c_uint32),
+        ('dirty_for', ctypes.c_uint64),
+        ('dirty_initial', ctypes.c_uint32),
+        ('cache_mode', ctypes.c_int),
+        ('fallback_pt', ocf_cache_info_fallback_pt),
+        ('cleaning_policy', ctypes.c_int),
+        ('promotion_policy', ctypes.c_int),
+        ('cache_line_size', ctypes.c_int),
+        ('flushed', ctypes.c_uint32),
+        ('core_count', ctypes.c_uint32),
+        ('metadata_footprint', ctypes.c_uint64),
+        ('metadata_end_offset', ctypes.c_uint32),
+        ('standby_detached', ctypes.c_bool),
+    ]
+
+
+class ocf_core_info(ctypes.Structure):
+    _fields_ = [
+        ('core_size', ctypes.c_uint64),
+        ('core_size_bytes', ctypes.c_uint64),
+        ('flushed', ctypes.c_uint32),
+        ('dirty', ctypes.c_uint32),
+        ('dirty_for', ctypes.c_uint32),
+        ('seq_cutoff_threshold', ctypes.c_uint32),
+        ('seq_cutoff_policy', ctypes.c_int),
+    ]
+
+
+class cas_ctrl:
+    """
+    Issues KCAS_IOCTL_* requests directly on /dev/cas_ctrl.
+
+    Only requests whose ioctl structures are fully described by
+    modules/include/cas_ioctl_codes.h and the OCF structures above are handled
+    here. Anything else, as well as any request that casadm would have to
+    validate or report an error for, raises Unsupported so that the caller
+    falls back to casadm binary, which stays the only source of error messages.
+    Size of the structure is part of ioctl number, so the module rejects
+    requests whose layout doesn't match its own, and casadm takes over.
+    """
+    ctrl_device = '/dev/cas_ctrl'
+    module_version_path = '/sys/module/cas_cache/version'
+    installed_version_path = '/var/lib/opencas/cas_version'
+    mtab_path = '/etc/mtab'
+    by_id_dir = '/dev/disk/by-id'
+
+    MAX_STR_LEN = 4096
+    OCF_CORE_ID_INVALID = 4096
+    OCF_USER_IO_CLASS_MAX = 33
+    OCF_IO_CLASS_INVALID = 33
+    CACHE_LIST_ID_LIMIT = 20
+    KiB = 1024
+    MiB = 1024 * 1024
+
+    _IOC_WRITE = 1
+    _IOC_READ = 2
+    IOCTL_MAGIC = 0xBA
+
+    _supported = None
+
+    class Unsupported(Exception):
+        pass
+
+    class NotFound(Unsupported):
+        """Cache, core or IO class the request refers to doesn't exist"""
+        pass
+
+    class result:
+        def __init__(self, stdout=''):
+            self.exit_code = 0
+            self.stdout = stdout
+            self.stderr = ''
+
+    class kcas_stop_cache(ctypes.Structure):
+        _fields_ = [
+            ('cache_id', ctypes.c_uint16),
+            ('flush_data', ctypes.c_uint8),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_insert_core(ctypes.Structure):
+        _fields_ = [
+            ('cache_id', ctypes.c_uint16),
+            ('core_id', ctypes.c_uint16),
+            ('core_path_name', ctypes.c_char * 4096),
+            ('try_add', ctypes.c_bool),
+            ('update_path', ctypes.c_bool),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_remove_core(ctypes.Structure):
+        _fields_ = [
+            ('cache_id', ctypes.c_uint16),
+            ('core_id', ctypes.c_uint16),
+            ('force_no_flush', ctypes.c_bool),
+            ('detach', ctypes.c_bool),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_cache_check_device(ctypes.Structure):
+        _fields_ = [
+            ('path_name', ctypes.c_char * 4096),
+            ('is_cache_device', ctypes.c_bool),
+            ('metadata_compatible', ctypes.c_bool),
+            ('clean_shutdown', ctypes.c_bool),
+            ('cache_dirty', ctypes.c_bool),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_set_core_param(ctypes.Structure):
+        _fields_ = [
+            ('cache_id', ctypes.c_uint16),
+            ('core_id', ctypes.c_uint16),
+            ('param_id', ctypes.c_int),
+            ('param_value', ctypes.c_uint32),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_set_cache_param(ctypes.Structure):
+        _fields_ = [
+            ('cache_id', ctypes.c_uint16),
+            ('param_id', ctypes.c_int),
+            ('param_value', ctypes.c_uint32),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_cache_list(ctypes.Structure):
+        _fields_ = [
+            ('id_position', ctypes.c_uint32),
+            ('in_out_num', ctypes.c_uint32),
+            ('cache_id_tab', ctypes.c_uint16 * 20),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_core_pool_count(ctypes.Structure):
+        _fields_ = [
+            ('core_pool_count', ctypes.c_int),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_cache_info(ctypes.Structure):
+        _fields_ = [
+            ('cache_id', ctypes.c_uint16),
+            ('cache_path_name', ctypes.c_char * 4096),
+            ('core_id', ctypes.c_uint16 * 4096),
+            ('info', ocf_cache_info),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_core_info(ctypes.Structure):
+        _fields_ = [
+            ('core_path_name', ctypes.c_char * 4096),
+            ('cache_id', ctypes.c_uint16),
+            ('core_id', ctypes.c_uint16),
+            ('info', ocf_core_info),
+            ('state', ctypes.c_int),
+            ('exp_obj_exists', ctypes.c_bool),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    class kcas_get_stats(ctypes.Structure):
+        _fields_ = [
+            ('cache_id', ctypes.c_uint16),
+            ('core_id', ctypes.c_uint16),
+            ('part_id', ctypes.c_uint16),
+            ('usage', ocf_stats_usage),
+            ('req', ocf_stats_requests),
+            ('blocks', ocf_stats_blocks),
+            ('errors', ocf_stats_errors),
+            ('ext_err_code', ctypes.c_int),
+        ]
+
+    # Indexed by ocf_cache_mode_t, ocf_cache_state_t and ocf_core_state_t
+    cache_modes = ['wt', 'wb', 'wa', 'pt', 'wi', 'wo']
+    cache_states = ['Running', 'Stopping', 'Detached', 'Incomplete', 'Standby']
+    core_states = ['Active', 'Inactive']
+    CACHE_STATE_DETACHED = 2
+    CACHE_STATE_STANDBY = 4
+
+    # (casadm --stats-all column, kcas_get_stats field, ocf_stats_* field)
+    stats_columns = [
+        ('Occupancy [4KiB Blocks]', 'usage', 'occupancy'),
+        ('Free [4KiB Blocks]', 'usage', 'free'),
+        ('Clean [4KiB Blocks]', 'usage', 'clean'),
+        ('Dirty [4KiB Blocks]', 'usage', 'dirty'),
+        ('Read hits [Requests]', 'req', 'rd_hits'),
+        ('Read deferred [Requests]', 'req', 'rd_deferred'),
+        ('Read partial misses [Requests]', 'req', 'rd_partial_misses'),
+        ('Read full misses [Requests]', 'req', 'rd_full_misses'),
+        ('Read total [Requests]', 'req', 'rd_total'),
+        ('Write hits [Requests]', 'req', 'wr_hits'),
+        ('Write deferred [Requests]', 'req', 'wr_deferred'),
+        ('Write partial misses [Requests]', 'req', 'wr_partial_misses'),
+        ('Write full misses [Requests]', 'req', 'wr_full_misses'),
+        ('Write total [Requests]', 'req', 'wr_total'),
+        ('Pass-Through reads [Requests]', 'req', 'rd_pt'),
+        ('Pass-Through writes [Requests]', 'req', 'wr_pt'),
+        ('Serviced requests [Requests]', 'req', 'serviced'),
+        ('Total requests [Requests]', 'req', 'total'),
+        ('Reads from core [4KiB Blocks]', 'blocks', 'core_volume_rd'),
+        ('Writes to core [4KiB Blocks]', 'blocks', 'core_volume_wr'),
+        ('Total to/from core [4KiB Blocks]', 'blocks', 'core_volume_total'),
+        ('Reads from cache [4KiB Blocks]', 'blocks', 'cache_volume_rd'),
+        ('Writes to cache [4KiB Blocks]', 'blocks', 'cache_volume_wr'),
+        ('Total to/from cache [4KiB Blocks]', 'blocks', 'cache_volume_total'),
+        ('Reads from exported object [4KiB Blocks]', 'blocks', 'volume_rd'),
+        ('Writes to exported object [4KiB Blocks]', 'blocks', 'volume_wr'),
+        ('Total to/from exported object [4KiB Blocks]', 'blocks', 'volume_total'),
+        ('Cache read errors [Requests]', 'errors', 'cache_volume_rd'),
+        ('Cache write errors [Requests]', 'errors', 'cache_volume_wr'),
+        ('Cache total errors [Requests]', 'errors', 'cache_volume_total'),
+        ('Core read errors [Requests]', 'errors', 'core_volume_rd'),
+        ('Core write errors [Requests]', 'errors', 'core_volume_wr'),
+        ('Core total errors [Requests]', 'errors', 'core_volume_total'),
+        ('Total errors [Requests]', 'errors', 'total'),
+    ]
+
+    # (casadm option, param id, casadm param name, value names, scale)
+    core_params = {
+        'seq-cutoff': [
+            ('threshold', 0, 'Sequential cutoff threshold [KiB]', None, KiB),
+            ('policy', 1, 'Sequential cutoff policy', ['always', 'full', 'never'], 1),
+            ('promotion_count', 2, 'Sequential cutoff promotion request count threshold',
+             None, 1),
+        ],
+    }
+
+    cache_params = {
+        'cleaning': [
+            ('policy', 0, 'Cleaning policy type', ['nop', 'alru', 'acp'], 1),
+        ],
+        'cleaning-alru': [
+            ('wake_up', 1, 'Wake up time [s]', None, 1),
+            ('staleness_time', 2, 'Stale buffer time [s]', None, 1),
+            ('flush_max_buffers', 3, 'Flush max buffers', None, 1),
+            ('activity_threshold', 4, 'Activity threshold [ms]', None, 1),
+            ('dirty_ratio_threshold', 5, 'Dirty ratio trigger threshold [%]', None, 1),
+            ('dirty_ratio_inertia', 6, 'Dirty ratio trigger inertia [MiB]', None, MiB),
+        ],
+        'cleaning-acp': [
+            ('wake_up', 7, 'Wake up time [ms]', None, 1),
+            ('flush_max_buffers', 8, 'Flush max buffers', None, 1),
+        ],
+        'promotion': [
+            ('policy', 9, 'Promotion policy type', ['always', 'nhit'], 1),
+        ],
+        'promotion-nhit': [
+            ('threshold', 10, 'Insertion threshold', None, 1),
+            ('trigger', 11, 'Policy trigger [%]', None, 1),
+        ],
+    }
+
+    @classmethod
+    def ioctl_code(cls, direction, nr, struct):
+        return (direction << 30) | (ctypes.sizeof(struct) << 16) | (cls.IOCTL_MAGIC << 8) | nr
+
+    @classmethod
+    def _read_version(cls, path):
+        with open(path, 'r') as f:
+            content = f.read()
+
+        for line in content.splitlines():
+            if line.startswith('CAS_VERSION='):
+                return line.split('=', 1)[1].strip()
+
+        return content.strip()
+
+    @classmethod
+    def is_supported(cls):
+        """
+        Structures mirrored here are only trusted when the running module comes
+        from the same build as installed utils.
+        """
+        if cls._supported is None:
+            try:
+                fd = os.open(cls.ctrl_device, os.O_RDWR)
+                os.close(fd)
+                cls._supported = (cls._read_version(cls.module_version_path)
+                                  == cls._read_version(cls.installed_version_path))
+            except Exception:
+                cls._supported = False
+
+        return cls._supported
+
+    @classmethod
+    def ioctl(cls, direction, nr, request):
+        try:
+            fd = os.open(cls.ctrl_device, os.O_RDWR)
+        except OSError:
+            raise cls.Unsupported()
+
+        try:
+            fcntl.ioctl(fd, cls.ioctl_code(direction, nr, type(request)), request)
+        except OSError as e:
+            if e.errno == errno.ENODEV:
+                raise cls.NotFound()
+            # Let casadm retry the request and report the error
+            raise cls.Unsupported()
+        finally:
+            os.close(fd)
+
+        return request
+
+    @classmethod
+    def check_mounts(cls, prefix):
+        try:
+            with open(cls.mtab_path, 'r') as mtab:
+                for line in mtab:
+                    if line.startswith(prefix):
+                        raise cls.Unsupported()
+        except IOError:
+            pass
+
+    @classmethod
+    def device_path(cls, path):
+        """Mirror of casadm set_device_path() for paths accepted without errors"""
+        path = os.path.join(os.path.realpath(os.path.dirname(path)), os.path.basename(path))
+
+        if path.startswith(cls.by_id_dir) or re.match(
+                r'^/dev/(ram\d+|nullb\d+|drbd\d+)(p\d+)?$', path):
+            return path.encode()
+
+        raise cls.Unsupported()
+
+    @staticmethod
+    def encode_value(value_names, scale, value):
+        try:
+            if value_names:
+                return value_names.index(str(value))
+            return int(value) * scale
+        except ValueError:
+            raise cas_ctrl.Unsupported()
+
+    @staticmethod
+    def format_value(name, value_names, scale, value):
+        # Same object as print_param() in casadm with json output format
+        if value_names:
+            return {'Parameter name': name, 'Value': value_names[value]}
+        return {'Parameter name': name, 'Value': value // scale}
+
+    @classmethod
+    def check_cache_device(cls, device):
+        request = cls.kcas_cache_check_device()
+        request.path_name = cls.device_path(device)
+
+        cls.ioctl(cls._IOC_READ | cls._IOC_WRITE, 29, request)
+
+        if request.is_cache_device and request.metadata_compatible:
+            row = 'yes,{},{}'.format('yes' if request.clean_shutdown else 'no',
+                                     'yes' if request.cache_dirty else 'no')
+        else:
+            row = 'no,-,-'
+
+        return cls.result(f'Is cache,Clean Shutdown,Cache dirty\n{row}\n')
+
+    @classmethod
+    def add_core(cls, device, cache_id, core_id=None, try_add=False):
+        # Core ids are assigned and stacked devices are checked by casadm
+        if core_id is None or device.startswith('/dev/cas'):
+            raise cls.Unsupported()
+
+        try:
+            if not stat.S_ISBLK(os.stat(device).st_mode):
+                raise cls.Unsupported()
+        except OSError:
+            raise cls.Unsupported()
+
+        request = cls.kcas_insert_core()
+        request.cache_id = int(cache_id)
+        request.core_id = int(core_id)
+        request.core_path_name = cls.device_path(device)
+        request.try_add = try_add
+
+        cls.ioctl(cls._IOC_READ | cls._IOC_WRITE, 22, request)
+
+        if try_add:
+            return cls.result(f'Successfully added device in try add mode {device}\n')
+        return cls.result(
+            f'Successfully added core {request.core_id} to cache instance {cache_id}\n')
+
+    @classmethod
+    def stop_cache(cls, cache_id, no_flush=False):
+        cls.check_mounts(f'/dev/cas{cache_id}')
+
+        request = cls.kcas_stop_cache()
+        request.cache_id = int(cache_id)
+        request.flush_data = not no_flush
+
+        cls.ioctl(cls._IOC_READ | cls._IOC_WRITE, 2, request)
+
+        return cls.result(f'Successfully stopped cache {cache_id}\n')
+
+    @classmethod
+    def remove_core(cls, cache_id, core_id, detach=False, force=False):
+        cls.check_mounts(f'/dev/cas{cache_id}-{core_id}')
+
+        request = cls.kcas_remove_core()
+        request.cache_id = int(cache_id)
+        request.core_id = int(core_id)
+        request.force_no_flush = force
+        request.detach = detach
+
+        cls.ioctl(cls._IOC_READ, 23, request)
+
+        return cls.result()
+
+    @classmethod
+    def _get_param_requests(cls, namespace, cache_id, kwargs):
+        """Returns params of namespace, request factory and (set, get) ioctl numbers"""
+        core_id = kwargs.pop('core_id', None)
+        if namespace in cls.core_params and core_id is not None:
+            params = cls.core_params[namespace]
+            request_type = cls.kcas_set_core_param
+            ioctl_nrs = (30, 31)
+        elif namespace in cls.cache_params and core_id is None:
+            params = cls.cache_params[namespace]
+            request_type = cls.kcas_set_cache_param
+            ioctl_nrs = (32, 33)
+        else:
+            raise cls.Unsupported()
+
+        def make_request(param_id):
+            request = request_type()
+            request.cache_id = int(cache_id)
+            request.param_id = param_id
+            if core_id is not None:
+                request.core_id = int(core_id)
+            return request
+
+        return params, make_request, ioctl_nrs
+
+    @classmethod
+    def set_param(cls, namespace, cache_id, **kwargs):
+        params, make_request, (nr, _) = cls._get_param_requests(namespace, cache_id, kwargs)
+
+        requests = []
+        for option, value in kwargs.items():
+            param = next((p for p in params if p[0] == option), None)
+            if param is None:
+                raise cls.Unsupported()
+
+            _, param_id, _, value_names, scale = param
+            request = make_request(param_id)
+            request.param_value = cls.encode_value(value_names, scale, value)
+            requests.append(request)
+
+        if not requests:
+            raise cls.Unsupported()
+
+        for request in requests:
+            cls.ioctl(cls._IOC_WRITE, nr, request)
+
+        return cls.result()
+
+    @classmethod
+    def get_params(cls, namespace, cache_id, **kwargs):
+        params, make_request, (_, nr) = cls._get_param_requests(namespace, cache_id, kwargs)
+
+        if kwargs:
+            raise cls.Unsupported()
+
+        values = []
+        for _, param_id, name, value_names, scale in params:
+            request = cls.ioctl(cls._IOC_WRITE, nr, make_request(param_id))
+            values.append(cls.format_value(name, value_names, scale, request.param_value))
+
+        return cls.result(json.dumps(values) + '\n')
+
+    @classmethod
+    def value_name(cls, names, value):
+        if not 0 <= value < len(names):
+            raise cls.Unsupported()
+        return names[value]
+
+    @staticmethod
+    def flush_progress(dirty, flushed):
+        # Same as calculate_flush_progress() in casadm
+        if not flushed:
+            return 0
+        return 100 * flushed / (dirty + flushed)
+
+    @classmethod
+    def cache_state_name(cls, info):
+        # Same as get_cache_state_name() in casadm, combined states like
+        # "running&stopping" are described by the latter one
+        if info.standby_detached:
+            return 'Standby detached'
+        for state in reversed(range(len(cls.cache_states))):
+            if info.state & (1 << state):
+                return cls.cache_states[state]
+        return 'Not running'
+
+    @classmethod
+    def cache_ids(cls):
+        request = cls.kcas_cache_list()
+        ids = []
+        while True:
+            cls.ioctl(cls._IOC_READ | cls._IOC_WRITE, 17, request)
+            ids += request.cache_id_tab[:request.in_out_num]
+            if request.in_out_num < cls.CACHE_LIST_ID_LIMIT:
+                return ids
+            request.id_position += cls.CACHE_LIST_ID_LIMIT
+
+    @classmethod
+    def cache_info(cls, cache_id):
+        request = cls.kcas_cache_info()
+        request.cache_id = cache_id
+        return cls.ioctl(cls._IOC_READ | cls._IOC_WRITE, 24, request)
+
+    @classmethod
+    def core_info(cls, cache_id, core_id):
+        request = cls.kcas_core_info()
+        request.cache_id = cache_id
+        request.core_id = core_id
+        return cls.ioctl(cls._IOC_READ | cls._IOC_WRITE, 40, request)
+
+    @classmethod
+    def _list_core(cls, cache_id, core_id, cache_progress):
+        request = cls.core_info(cache_id, core_id)
+        progress = cls.flush_progress(request.info.dirty, request.info.flushed)
+        if not progress and cache_progress:
+            progress = 0 if request.info.dirty else 100
+
+        if progress or cache_progress:
+            status = f'Flushing ({progress:3.1f} %)'
+        else:
+            status = cls.value_name(cls.core_states, request.state)
+
+        return {
+            'type': 'core',
+            'id': core_id,
+            'disk': request.core_path_name.decode() or None,
+            'status': status,
+            'write policy': None,
+            'device': f'/dev/cas{cache_id}-{core_id}' if request.exp_obj_exists else None,
+        }
+
+    @classmethod
+    def list_caches(cls):
+        """Same JSON as casadm --list-caches --output-format json --by-id-path"""
+        if cls.ioctl(cls._IOC_READ, 26, cls.kcas_core_pool_count()).core_pool_count:
+            # Paths of core pool are returned through user pointer
+            raise cls.Unsupported()
+
+        caches = []
+        for cache_id in cls.cache_ids():
+            request = cls.cache_info(cache_id)
+            info = request.info
+            standby = info.state & (1 << cls.CACHE_STATE_STANDBY)
+            detached = info.state & (1 << cls.CACHE_STATE_DETACHED)
+            progress = cls.flush_progress(info.dirty, info.flushed)
+            mode, device = None, None
+
+            if progress:
+                status = f'Flushing ({progress:3.1f} %)'
+                mode = 'wb->' + cls.value_name(cls.cache_modes, info.cache_mode)
+            else:
+                status = cls.cache_state_name(info)
+                if not standby:
+                    mode = cls.value_name(cls.cache_modes, info.cache_mode)
+                elif not info.standby_detached:
+                    device = f'/dev/cas-cache-{cache_id}'
+
+            caches.append({
+                'type': 'cache',
+                'id': cache_id,
+                'disk': None if standby or detached else request.cache_path_name.decode(),
+                'status': status,
+                'write policy': mode,
+                'device': device,
+                'cores': [cls._list_core(cache_id, core_id, progress)
+                          for core_id in request.core_id[:info.core_count]],
+            })
+
+        return cls.result(json.dumps(caches) + '\n')
+
+    @classmethod
+    def get_stats(cls, cache_id, core_id=None, io_class_id=None, flush_progress=0):
+        """Statistics in the same format as in casadm --stats-all JSON output"""
+        request = cls.kcas_get_stats()
+        request.cache_id = cache_id
+        request.core_id = cls.OCF_CORE_ID_INVALID if core_id is None else core_id
+        request.part_id = cls.OCF_IO_CLASS_INVALID if io_class_id is None else io_class_id
+
+        cls.ioctl(cls._IOC_READ, 34, request)
+
+        stats = {}
+        for name, group, field in cls.stats_columns:
+            # Free space and errors are not accounted per IO class
+            if io_class_id is not None and (group == 'errors' or field == 'free'):
+                continue
+            stats[name] = getattr(getattr(request, group), field).value
+        if flush_progress:
+            stats['Flush progress [%]'] = round(flush_progress, 1)
+
+        return stats
+
+    @classmethod
+    def stats_all(cls):
+        """Same JSON as casadm --stats-all --output-format json"""
+        caches = []
+        for cache_id in cls.cache_ids():
+            try:
+                request = cls.cache_info(cache_id)
+            except cls.NotFound:
+                # Cache could have been stopped since it was listed
+                continue
+
+            info = request.info
+            # There are no statistics for a cache in standby state
+            if info.state & (1 << cls.CACHE_STATE_STANDBY):
+                continue
+
+            io_classes = {}
+            for io_class_id in range(cls.OCF_USER_IO_CLASS_MAX):
+                try:
+                    io_classes[io_class_id] = cls.get_stats(cache_id, io_class_id=io_class_id)
+                except cls.NotFound:
+                    pass
+
+            cores = []
+            for core_id in request.core_id[:info.core_count]:
+                core = cls.core_info(cache_id, core_id).info
+                cores.append({
+                    'Core Id': core_id,
+                    'stats': cls.get_stats(
+                        cache_id, core_id,
+                        flush_progress=cls.flush_progress(core.dirty, core.flushed)
+                    ),
+                    'io_classes': [
+                        {'IO class Id': io_class_id,
+                         'stats': cls.get_stats(cache_id, core_id, io_class_id)}
+                        for io_class_id in io_classes
+                    ],
+                })
+
+            caches.append({
+                'Cache Id': cache_id,
+                'stats': cls.get_stats(
+                    cache_id, flush_progress=cls.flush_progress(info.dirty, info.flushed)
+                ),
+                'io_classes': [
+                    {'IO class Id': io_class_id, 'stats': stats}
+                    for io_class_id, stats in io_classes.items()
+                ],
+                'cores': cores,
+            })
+
+        return cls.result(json.dumps(caches) + '\n')
+
+
+casadm.transport = cas_ctrl
+
 
 # Configuration file parser
 
@@ -434,6 +1270,36 @@ class cas_config(object):
 
         self.version_tag = version_tag
 
+        # realpath -> cache_config/core_config, kept up to date by
+        # insert_cache()/insert_core() and rebuilt after removals or
+        # invalidate_index()
+        self._devices = None
+        # realpath cache, only kept while loading config file
+        self._realpaths = None
+
+    def _realpath(self, path):
+        if self._realpaths is None:
+            return os.path.realpath(path)
+
+        if path not in self._realpaths:
+            self._realpaths[path] = os.path.realpath(path)
+
+        return self._realpaths[path]
+
+    def _device_index(self):
+        if self._devices is None:
+            self._devices = dict()
+            for cache in self.caches.values():
+                self._devices.setdefault(self._realpath(cache.device), cache)
+                for core in cache.cores.values():
+                    self._devices.setdefault(self._realpath(core.device), core)
+
+        return self._devices
+
+    def invalidate_index(self):
+        """Drop device index after caches or cores were modified directly"""
+        self._devices = None
+
     @classmethod
     def from_file(cls, config_file, allow_incomplete=False):
         section_caches = False
@@ -446,6 +1312,7 @@ class cas_config(object):
                     raise ValueError('No version tag found!')
 
                 config = cls(version_tag=version_tag)
+                config._realpaths = dict()
 
                 for line in conf:
                     line = line.split('#')[0].rstrip()
@@ -467,6 +1334,8 @@ class cas_config(object):
                     elif section_cores:
                         core = cas_config.core_config.from_line(line, allow_incomplete)
                         config.insert_core(core)
+
+                config._realpaths = None
         except ValueError:
             raise
         except IOError:
@@ -477,27 +1346,24 @@ class cas_config(object):
         return config
 
     def insert_cache(self, new_cache_config):
+        devices = self._device_index()
+        device = self._realpath(new_cache_config.device)
+
         if new_cache_config.cache_id in self.caches:
-            if (os.path.realpath(self.caches[new_cache_config.cache_id].device)
-                    != os.path.realpath(new_cache_config.device)):
+            if self._realpath(self.caches[new_cache_config.cache_id].device) != device:
                 raise cas_config.ConflictingConfigException(
                         'Other cache device configured under this id')
             else:
                 raise cas_config.AlreadyConfiguredException(
                                 'Cache already configured')
 
-        for cache_id, cache in self.caches.items():
-            if cache_id != new_cache_config.cache_id:
-                if (os.path.realpath(new_cache_config.device)
-                        == os.path.realpath(cache.device)):
-                    raise cas_config.ConflictingConfigException(
-                            'This cache device is already configured as a cache')
-
-            for _, core in cache.cores.items():
-                if (os.path.realpath(core.device)
-                        == os.path.realpath(new_cache_config.device)):
-                    raise cas_config.ConflictingConfigException(
-                            'This cache device is already configured as a core')
+        configured = devices.get(device)
+        if type(configured) is cas_config.cache_config:
+            raise cas_config.ConflictingConfigException(
+                    'This cache device is already configured as a cache')
+        elif configured is not None:
+            raise cas_config.ConflictingConfigException(
+                    'This cache device is already configured as a core')
 
         try:
             new_cache_config.device = cas_config.get_by_id_path(new_cache_config.device)
@@ -505,35 +1371,31 @@ class cas_config(object):
             pass
 
         self.caches[new_cache_config.cache_id] = new_cache_config
+        devices[device] = new_cache_config
 
     def insert_core(self, new_core_config):
         if new_core_config.cache_id not in self.caches:
             raise KeyError(f'Cache id {new_core_config.cache_id} doesn\'t exist')
 
-        try:
-            for cache_id, cache in self.caches.items():
-                if (os.path.realpath(cache.device)
-                        == os.path.realpath(new_core_config.device)):
-                    raise cas_config.ConflictingConfigException(
-                            'Core device already configured as a cache')
-
-                for core_id, core in cache.cores.items():
-                    if (cache_id == new_core_config.cache_id
-                            and core_id == new_core_config.core_id):
-                        if (os.path.realpath(core.device)
-                                == os.path.realpath(new_core_config.device)):
-                            raise cas_config.AlreadyConfiguredException(
-                                    'Core already configured')
-                        else:
-                            raise cas_config.ConflictingConfigException(
-                                    'Other core device configured under this id')
-                    else:
-                        if (os.path.realpath(core.device)
-                                == os.path.realpath(new_core_config.device)):
-                            raise cas_config.ConflictingConfigException(
-                                    'This core device is already configured as a core')
-        except KeyError:
-            pass
+        devices = self._device_index()
+        device = self._realpath(new_core_config.device)
+
+        configured = devices.get(device)
+        if type(configured) is cas_config.cache_config:
+            raise cas_config.ConflictingConfigException(
+                    'Core device already configured as a cache')
+
+        core = self.caches[new_core_config.cache_id].cores.get(new_core_config.core_id)
+        if core is not None:
+            if self._realpath(core.device) == device:
+                raise cas_config.AlreadyConfiguredException(
+                        'Core already configured')
+            else:
+                raise cas_config.ConflictingConfigException(
+                        'Other core device configured under this id')
+        elif configured is not None:
+            raise cas_config.ConflictingConfigException(
+                    'This core device is already configured as a core')
 
         try:
             new_core_config.device = cas_config.get_by_id_path(new_core_config.device)
@@ -542,6 +1404,19 @@ class cas_config(object):
 
         self.caches[new_core_config.cache_id].cores[new_core_config.core_id] = new_core_config
         self.cores += [new_core_config]
+        devices[device] = new_core_config
+
+    def remove_cache(self, cache_id):
+        cache = self.caches.pop(cache_id)
+        self.cores = [core for core in self.cores if core.cache_id != cache_id]
+        self.invalidate_index()
+        return cache
+
+    def remove_core(self, cache_id, core_id):
+        core = self.caches[cache_id].cores.pop(core_id)
+        self.cores = [c for c in self.cores if (c.cache_id, c.core_id) != (cache_id, core_id)]
+        self.invalidate_index()
+        return core
 
     def is_empty(self):
         if len(self.caches) > 0 or len(self.cores) > 0:
@@ -614,33 +1489,128 @@ def add_core(core, attach):
 # Another helper functions
 
 
-def is_cache_started(cache_config):
-    dev_list = get_caches_list()
-    for dev in dev_list:
-        if dev['type'] == 'cache' and int(dev['id']) == cache_config.cache_id:
-            return True
-
-    return False
+def is_cache_started(cache_config, topology=None):
+    topology = topology or Topology()
 
+    return cache_config.cache_id in topology.caches
 
-def is_core_added(core_config):
-    dev_list = get_caches_list()
-    cache_id = 0
-    for dev in dev_list:
-        if dev['type'] == 'cache':
-            cache_id = int(dev['id'])
 
-        if (dev['type'] == 'core' and
-                cache_id == core_config.cache_id and
-                int(dev['id']) == core_config.core_id):
-            return True
+def is_core_added(core_config, topology=None):
+    topology = topology or Topology()
 
-    return False
+    return (core_config.cache_id, core_config.core_id) in topology.cores
 
 
 def get_caches_list():
-    result = casadm.list_caches()
-    return list(csv.DictReader(result.stdout.split('\n')))
+    """
+    Get flat list of caches, cores and core pool the same way casadm prints
+    them in table format - cores follow their cache. Values keep their JSON
+    types - ids are integers and not applicable values are None.
+    """
+    return parse_caches_list(casadm.list_caches().stdout)
+
+
+def parse_caches_list(output):
+    """get_caches_list() result from casadm --list-caches JSON output"""
+    devices = []
+    for branch in json.loads(output):
+        cores = branch.pop('cores', [])
+        devices.append(branch)
+        devices += cores
+
+    return devices
+
+
+def get_all_stats():
+    """
+    Get statistics of all caches, cores and IO classes with one casadm call.
+    Return dict keyed by (cache_id, core_id, io_class_id) where core_id and
+    io_class_id are None for totals of the cache or core.
+    """
+    return parse_all_stats(casadm.stats_all().stdout)
+
+
+def parse_all_stats(output):
+    """get_all_stats() result from casadm --stats-all JSON output"""
+    stats = {}
+
+    def add(cache_id, core_id, entry):
+        stats[(cache_id, core_id, None)] = entry['stats']
+        for io_class in entry.get('io_classes', []):
+            stats[(cache_id, core_id, io_class['IO class Id'])] = io_class['stats']
+
+    for cache in json.loads(output):
+        add(cache['Cache Id'], None, cache)
+        for core in cache.get('cores', []):
+            add(cache['Cache Id'], core['Core Id'], core)
+
+    return stats
+
+
+# Usage statistics and flush progress are current values, all the others
+# are counters
+usage_stats = ('Occupancy', 'Free', 'Clean', 'Dirty', 'Flush progress')
+
+
+def is_usage_stat(name):
+    return name.partition(' [')[0] in usage_stats
+
+
+def get_stats_delta(before, after):
+    """
+    Compare two get_all_stats() results. Return dict with the same keys as
+    after, where counters are increments since before and usage statistics
+    are taken from after. Counters of devices missing in before or reset in
+    the meantime (e.g. cache restarted) are None.
+    """
+    delta = {}
+    for key, values in after.items():
+        previous = before.get(key, {})
+        delta[key] = {}
+        for name, value in values.items():
+            if is_usage_stat(name):
+                delta[key][name] = value
+            elif name in previous and previous[name] <= value:
+                delta[key][name] = value - previous[name]
+            else:
+                delta[key][name] = None
+    return delta
+
+
+def summarize_stats(delta, elapsed):
+    """
+    Derive hit ratios, rates and dirty level of single cache, core or
+    IO class from get_stats_delta() values collected over elapsed seconds.
+    Values which can't be computed are None.
+    """
+    def get(name, unit='Requests'):
+        return delta.get(f'{name} [{unit}]')
+
+    def ratio(part, total):
+        if part is None or not total:
+            return None
+        return 100.0 * part / total
+
+    def rate(*values):
+        if None in values or not elapsed:
+            return None
+        return sum(values) / elapsed
+
+    def mib(blocks):
+        return None if blocks is None else blocks * 4096 / 2**20
+
+    return {
+        'Read hit [%]': ratio(get('Read hits'), get('Read total')),
+        'Write hit [%]': ratio(get('Write hits'), get('Write total')),
+        'Requests [1/s]': rate(get('Total requests')),
+        'Pass-Through [1/s]': rate(get('Pass-Through reads'), get('Pass-Through writes')),
+        'Dirty [%]': ratio(get('Dirty', '4KiB Blocks'), get('Occupancy', '4KiB Blocks')),
+        'Dirty [MiB]': mib(get('Dirty', '4KiB Blocks')),
+        'Core reads [MiB/s]': mib(rate(get('Reads from core', '4KiB Blocks'))),
+        'Core writes [MiB/s]': mib(rate(get('Writes to core', '4KiB Blocks'))),
+        'Errors': get('Total errors'),
+        'Flush [%]': get('Flush progress', '%'),
+    }
 
 
 def check_cache_device(device):
@@ -650,16 +1620,160 @@ def check_cache_device(device):
 
 def get_cas_version():
     version = casadm.get_version()
+    return {row['Name']: row['Version'] for row in json.loads(version.stdout)}
+
+
+# Runtime topology
+
+
+class Topology(object):
+    """
+    In-memory snapshot of running caches, cores and core pool built from
+    a single casadm --list-caches call.
+
+    caches - cache_id -> {"device", "status", "mode"}
+    cores - (cache_id, core_id) -> {"device", "status", "cache_id", "exp_obj"}
+    core_pool - real path of core device -> {"device", "status"}
+    lower - (cache_id, core_id) -> (cache_id, core_id) of exported object
+            the core is stacked on
+
+    Not applicable values are None, e.g. mode of standby cache, device of
+    detached cache or exp_obj of inactive core.
+
+    Mutating helpers keep the snapshot up to date without re-listing, the
+    runtime state is only listed again after a failed casadm call. They may
+    be called concurrently from multiple threads.
+    """
+    exp_obj_pattern = re.compile(r'/dev/cas(\d+)-(\d+)$')
+
+    def __init__(self, device_list=None):
+        self.lock = threading.RLock()
+        self.sync(device_list)
+
+    def sync(self, device_list=None):
+        if device_list is None:
+            device_list = get_caches_list()
+
+        with self.lock:
+            self._build(device_list)
 
-    ret = {}
-    for line in version.stdout.split('\n')[1:]:
+    def _build(self, device_list):
+        self.caches = {}
+        self.cores = {}
+        self.core_pool = {}
+        self.lower = {}
+
+        core_pool = False
+        cache_id = -1
+
+        for device in device_list:
+            if device["type"] == "core pool":
+                core_pool = True
+                continue
+
+            if device["type"] == "cache":
+                core_pool = False
+                cache_id = device["id"]
+                self.caches[cache_id] = {
+                    "device": device["disk"],
+                    "status": device["status"],
+                    "mode": device.get("write policy"),
+                }
+            elif device["type"] == "core":
+                core = {"device": device["disk"], "status": device["status"]}
+                if core_pool:
+                    self.core_pool[self._realpath(core["device"])] = core
+                else:
+                    core["cache_id"] = cache_id
+                    core["exp_obj"] = device.get("device")
+                    self._insert_core(cache_id, device["id"], core)
+
+    @staticmethod
+    def _realpath(path):
         try:
-            component, version = line.split(',')
-        except Exception:
-            continue
-        ret[component] = version
+            return os.path.realpath(path)
+        except ValueError:
+            return path
+
+    def _insert_core(self, cache_id, core_id, core):
+        self.cores[(cache_id, core_id)] = core
+
+        match = self.exp_obj_pattern.search(core["device"])
+        if match:
+            self.lower[(cache_id, core_id)] = tuple(int(i) for i in match.groups())
 
-    return ret
+    def _remove_core(self, cache_id, core_id):
+        self.cores.pop((cache_id, core_id), None)
+        self.lower.pop((cache_id, core_id), None)
+
+    def cache_cores(self, cache_id):
+        return [key for key in self.cores if key[0] == cache_id]
+
+    def upper_cores(self, cache_id, core_id):
+        """Cores stacked directly on exported object /dev/cas<cache_id>-<core_id>"""
+        return [key for key, lower in self.lower.items() if lower == (cache_id, core_id)]
+
+    def upper_caches(self, cache_id, core_id):
+        """Caches using exported object /dev/cas<cache_id>-<core_id> as cache device"""
+        return [
+            upper_id for upper_id, cache in self.caches.items()
+            if _exp_obj_ids(cache["device"]) == (cache_id, core_id)
+        ]
+
+    def is_active(self, cache_id, core_id):
+        core = self.cores.get((cache_id, core_id))
+        return core is not None and core["status"] == "Active"
+
+    def _run(self, func, *args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            try:
+                self.sync()
+            except Exception:
+                pass
+            raise e
+
+    def add_core(self, core, attach):
+        self._run(add_core, core, attach)
+
+        with self.lock:
+            if attach and core.cache_id not in self.caches:
+                self.core_pool[self._realpath(core.device)] = {
+                    "device": core.device,
+                    "status": "Detached",
+                }
+            else:
+                self._insert_core(core.cache_id, core.core_id, {
+                    "device": core.device,
+                    "status": "Active",
+                    "cache_id": core.cache_id,
+                    "exp_obj": f"/dev/cas{core.cache_id}-{core.core_id}",
+                })
+
+    def remove_core(self, cache_id, core_id, detach=False, force=False):
+        self._run(casadm.remove_core, cache_id, core_id, detach=detach, force=force)
+
+        with self.lock:
+            if detach and (cache_id, core_id) in self.cores:
+                self.cores[(cache_id, core_id)].update({"status": "Detached", "exp_obj": None})
+            else:
+                self._remove_core(cache_id, core_id)
+
+    def stop_cache(self, cache_id, no_flush=False):
+        self._run(casadm.stop_cache, cache_id, no_flush)
+
+        with self.lock:
+            for key in self.cache_cores(cache_id):
+                self._remove_core(*key)
+            self.caches.pop(cache_id, None)
+
+    def devices_state(self):
+        return {
+            "core_pool": self.core_pool,
+            "caches": self.caches,
+            "cores": self.cores,
+        }
 
 
 class CompoundException(Exception):
@@ -691,131 +1805,859 @@ class CompoundException(Exception):
             raise self
 
 
-def detach_core_recursive(cache_id, core_id, flush):
+def get_topology():
+    try:
+        return Topology()
+    except casadm.CasadmError as e:
+        raise Exception(f'Unable to list caches. Reason:\n{e.result.stderr}')
+    except Exception:
+        raise Exception('Unable to list caches.')
+
+
+def detach_core_recursive(cache_id, core_id, flush, topology=None):
     # Catching exceptions is left to uppermost caller of detach_core_recursive
     # as the immediate caller that made a recursive call depends on the callee
     # to remove core and thus release reference to lower level cache volume.
-    l_cache_id = ''
-    for dev in get_caches_list():
-        if dev['type'] == 'cache':
-            l_cache_id = dev['id']
-        elif dev['type'] == 'core' and dev['status'] == 'Active':
-            if f'/dev/cas{cache_id}-{core_id}' in dev['disk']:
-                detach_core_recursive(l_cache_id, dev['id'], flush)
-        elif l_cache_id == cache_id and dev['id'] == core_id and dev['status'] != 'Active':
-            return
+    topology = topology or Topology()
+    cache_id, core_id = int(cache_id), int(core_id)
+
+    if not topology.is_active(cache_id, core_id):
+        return
+
+    for upper in topology.upper_cores(cache_id, core_id):
+        detach_core_recursive(*upper, flush, topology)
 
-    casadm.remove_core(cache_id, core_id, detach=True, force=not flush)
+    topology.remove_core(cache_id, core_id, detach=True, force=not flush)
 
 
-def detach_all_cores(flush):
+def detach_all_cores(flush, topology=None):
     error = CompoundException()
 
-    try:
-        dev_list = get_caches_list()
-    except casadm.CasadmError as e:
-        raise Exception(f'Unable to list caches. Reason:\n{e.result.stderr}')
-    except Exception:
-        raise Exception('Unable to list caches.')
+    topology = topology or get_topology()
 
-    for dev in dev_list:
-        if dev['type'] == 'cache':
-            cache_id = dev['id']
-        elif dev['type'] == 'core' and dev['status'] == "Active":
-            # In case of exception we proceed with detaching remaining core instances
-            # to gracefully shutdown as many cache instances as possible.
-            try:
-                detach_core_recursive(cache_id, dev['id'], flush)
-            except casadm.CasadmError as e:
-                error.add_exception(Exception(
-                    f"Unable to detach core {dev['disk']}. Reason:\n{e.result.stderr}"))
-            except Exception:
-                error.add_exception(Exception(f"Unable to detach core {dev['disk']}."))
+    for cache_id, core_id in list(topology.cores):
+        core = topology.cores.get((cache_id, core_id))
+        if not core or core["status"] != "Active":
+            continue
+
+        # In case of exception we proceed with detaching remaining core instances
+        # to gracefully shutdown as many cache instances as possible.
+        try:
+            detach_core_recursive(cache_id, core_id, flush, topology)
+        except casadm.CasadmError as e:
+            error.add_exception(Exception(
+                f"Unable to detach core {core['device']}. Reason:\n{e.result.stderr}"))
+        except Exception:
+            error.add_exception(Exception(f"Unable to detach core {core['device']}."))
 
     error.raise_nonempty()
 
 
-def stop_all_caches(flush):
+def stop_all_caches(flush, topology=None):
     error = CompoundException()
 
-    try:
-        dev_list = get_caches_list()
-    except casadm.CasadmError as e:
-        raise Exception(f'Unable to list caches. Reason:\n{e.result.stderr}')
-    except Exception:
-        raise Exception('Unable to list caches.')
+    topology = topology or get_topology()
+
+    for cache_id, cache in list(topology.caches.items()):
+        # In case of exception we proceed with stopping subsequent cache instances
+        # to gracefully shutdown as many cache instances as possible.
+        try:
+            topology.stop_cache(cache_id, not flush)
+        except casadm.CasadmError as e:
+            error.add_exception(Exception(
+                f"Unable to stop cache {cache['device']}. Reason:\n{e.result.stderr}"))
+        except Exception:
+            error.add_exception(Exception(f"Unable to stop cache {cache['device']}."))
 
-    for dev in dev_list:
-        if dev['type'] == 'cache':
-            # In case of exception we proceed with stopping subsequent cache instances
-            # to gracefully shutdown as many cache instances as possible.
+    error.raise_nonempty()
+
+
+def get_stop_dependencies(topology):
+    """
+    Build graph of running devices, mapping every ("core", cache_id, core_id)
+    of active core and ("cache", cache_id) node to nodes that have to be
+    detached or stopped before it. Exported objects are released top-down:
+    cores and caches configured on /dev/casN-M go before core M of cache N,
+    and caches are stopped after all of their active cores are detached.
+    """
+    dependencies = {}
+
+    active_cores = [key for key in topology.cores if topology.is_active(*key)]
+
+    for cache_id, core_id in active_cores:
+        dependencies[("core", cache_id, core_id)] = [
+            ("core",) + upper for upper in topology.upper_cores(cache_id, core_id)
+            if topology.is_active(*upper)
+        ] + [
+            ("cache", upper) for upper in topology.upper_caches(cache_id, core_id)
+        ]
+
+    for cache_id in topology.caches:
+        dependencies[("cache", cache_id)] = [
+            ("core",) + key for key in active_cores if key[0] == cache_id
+        ]
+
+    return dependencies
+
+
+def stop(flush, jobs=1, report=None):
+    """
+    Detach all active cores and stop all caches, running up to jobs
+    independent detach/stop operations at a time. report, if given, is called
+    with cache id, cache device and wall-clock time [s] spent on each stopped
+    cache from its first core detach until cache stop. Errors are collected and
+    raised as CompoundException.
+    """
+    topology = get_topology()
+    dependencies = get_stop_dependencies(topology)
+    devices = {("cache", cache_id): cache["device"] for cache_id, cache in topology.caches.items()}
+    devices.update({("core",) + key: core["device"] for key, core in topology.cores.items()})
+    start_times = {}
+
+    def stop_device(node):
+        start_times.setdefault(node[1], time.time())
+
+        # In case of exception we proceed with detaching remaining core and
+        # stopping remaining cache instances to gracefully shutdown as many
+        # cache instances as possible.
+        device = devices[node]
+        if node[0] == "core":
             try:
-                casadm.stop_cache(dev['id'], not flush)
+                topology.remove_core(node[1], node[2], detach=True, force=not flush)
             except casadm.CasadmError as e:
-                error.add_exception(Exception(
-                    f"Unable to stop cache {dev['disk']}. Reason:\n{e.result.stderr}"))
+                raise Exception(f"Unable to detach core {device}. Reason:\n{e.result.stderr}")
             except Exception:
-                error.add_exception(Exception(f"Unable to stop cache {dev['disk']}."))
+                raise Exception(f"Unable to detach core {device}.")
+        else:
+            try:
+                topology.stop_cache(node[1], no_flush=True)
+            except casadm.CasadmError as e:
+                raise Exception(f"Unable to stop cache {device}. Reason:\n{e.result.stderr}")
+            except Exception:
+                raise Exception(f"Unable to stop cache {device}.")
 
-    error.raise_nonempty()
+            if report:
+                report(node[1], device, time.time() - start_times[node[1]])
 
+    run_dependency_graph(dependencies, stop_device, jobs)
 
-def stop(flush):
-    error = CompoundException()
 
-    try:
-        detach_all_cores(flush)
-    except Exception as e:
-        error.add_exception(e)
+def get_devices_state():
+    return Topology().devices_state()
 
-    try:
-        stop_all_caches(False)
-    except Exception as e:
-        error.add_exception(e)
 
-    error.raise_nonempty()
+# Loader index
 
 
-def get_devices_state():
-    device_list = get_caches_list()
+loader_index_path = '/run/opencas/loader-index.json'
+
+
+def get_config_stamp(config_file=cas_config.default_location):
+    st = os.stat(config_file)
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
 
-    devices = {"core_pool": {}, "caches": {}, "cores": {}}
+def compile_loader_index(config_file=cas_config.default_location, index_path=loader_index_path,
+                         config=None, stamp=None):
+    """
+    Write index of configured devices, so open-cas-loader.py can tell which
+    device an udev event is about without parsing the config file.
 
-    core_pool = False
-    prev_cache_id = -1
+    Devices are keyed by configured path and, for devices present at the
+    moment, by major:minor. Index is stamped with config file inode, size
+    and mtime, and is ignored by the loader once the config file changes.
+    Already parsed config may be passed along with the stamp taken before
+    parsing it.
+    """
+    if config is None:
+        # Take the stamp first, so config modified while compiling makes it stale
+        stamp = get_config_stamp(config_file)
+        config = cas_config.from_file(config_file, allow_incomplete=True)
 
-    for device in device_list:
-        if device["type"] == "core pool":
-            core_pool = True
+    index = {"stamp": stamp, "by_path": {}, "by_devt": {}}
+    devices = list(config.caches.values()) + config.cores
+    for dev in devices:
+        entry = {
+            "type": "cache" if type(dev) is cas_config.cache_config else "core",
+            "device": dev.device,
+            "line": dev.to_line().strip(),
+        }
+        index["by_path"][dev.device] = entry
+        try:
+            st = os.stat(dev.device)
+        except OSError:
             continue
+        if stat.S_ISBLK(st.st_mode):
+            index["by_devt"][f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"] = entry
+
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = f"{index_path}.{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+
+    return index
+
+
+# Hotplug loader daemon
+
+
+class LoaderDaemon(object):
+    """
+    Resident server for open-cas-loader.py requests.
 
-        if device["type"] == "cache":
-            core_pool = False
-            prev_cache_id = int(device["id"])
-            devices["caches"].update(
-                {
-                    int(device["id"]): {
-                        "device": device["disk"],
-                        "status": device["status"],
-                    }
+    Keeps parsed config in memory (re-read only if the file changed) and
+    handles requests from a single worker thread. Requests arriving together
+    are handled as one batch sharing a single runtime topology listing,
+    so caches and cores already set up are not touched again.
+
+    Protocol: client sends one JSON line {"device": ..., "links": [...]}
+    and receives one JSON line {"exit_code": ..., "message": ...}.
+    """
+    socket_path = '/run/opencas/loader.sock'
+    batch_delay = 0.05
+
+    class _handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline())
+                item = {
+                    "device": request["device"],
+                    "links": list(request.get("links", [])),
+                    "done": threading.Event(),
                 }
-            )
-        elif device["type"] == "core":
-            core = {"device": device["disk"], "status": device["status"]}
-            if core_pool:
-                try:
-                    device_path = os.path.realpath(core["device"])
-                except ValueError:
-                    device_path = core["device"]
+            except (ValueError, KeyError, TypeError):
+                return
 
-                devices["core_pool"].update({device_path: core})
+            self.server.loader.requests.put(item)
+            item["done"].wait()
+            self.wfile.write(json.dumps(item["result"]).encode() + b"\n")
+
+    def __init__(self, config_file=cas_config.default_location, socket_path=None):
+        self.config_file = config_file
+        self.socket_path = socket_path or type(self).socket_path
+        self.requests = queue.Queue()
+        self.config = None
+        self.topology = None
+        self._stamp = None
+        self._by_path = {}
+        self._server = None
+
+    def load_config(self):
+        stamp = get_config_stamp(self.config_file)
+        if stamp != self._stamp:
+            self.config = cas_config.from_file(self.config_file, allow_incomplete=True)
+            self._by_path = {}
+            for cache in self.config.caches.values():
+                self._by_path[cache.device] = cache
+                for core in cache.cores.values():
+                    self._by_path[core.device] = core
+            self._stamp = stamp
+
+        return self.config
+
+    def _match(self, requests):
+        matched = [
+            next((self._by_path[p] for p in [device] + links if p in self._by_path), None)
+            for device, links in requests
+        ]
+
+        if None in matched:
+            # Fall back to resolving configured paths, once per batch
+            by_realpath = {os.path.realpath(p): dev for p, dev in self._by_path.items()}
+            matched = [
+                dev or by_realpath.get(device)
+                for dev, (device, _) in zip(matched, requests)
+            ]
+
+        return matched
+
+    def _load(self, dev):
+        try:
+            if type(dev) is cas_config.cache_config:
+                if self.topology and dev.cache_id in self.topology.caches:
+                    return 0, ""
+                start_cache(dev, True)
+                if self.topology:
+                    # Loading cache brings its cores back as well
+                    self.topology.sync()
             else:
-                core.update({"cache_id": prev_cache_id})
-                devices["cores"].update(
-                    {(prev_cache_id, int(device["id"])): core}
-                )
+                if self.topology and self.topology.is_active(dev.cache_id, dev.core_id):
+                    return 0, ""
+                if self.topology:
+                    self.topology.add_core(dev, True)
+                else:
+                    add_core(dev, True)
+        except casadm.CasadmError as e:
+            if type(dev) is cas_config.cache_config:
+                message = (f'Unable to load cache {dev.cache_id} ({dev.device}). '
+                           f'Reason: {e.result.stderr}')
+            else:
+                message = (f'Unable to attach core {dev.device} from cache {dev.cache_id}. '
+                           f'Reason: {e.result.stderr}')
+            return e.result.exit_code, message
 
-    return devices
+        return 0, ""
+
+    def handle_batch(self, requests):
+        """
+        Load caches and attach cores for given (device, links) requests.
+        Return list of (exit_code, message) in the same order.
+        """
+        try:
+            self.load_config()
+        except Exception as e:
+            return [(1, f'Unable to load opencas config. Reason: {str(e)}')] * len(requests)
+
+        results = [(0, "")] * len(requests)
+        targets = [(i, dev) for i, dev in enumerate(self._match(requests)) if dev]
+        if not targets:
+            return results
+
+        wait_for_cas_ctrl()
+        try:
+            self.topology = Topology()
+        except Exception:
+            self.topology = None
+
+        # Caches go first, so cores reported in the same batch can be attached
+        targets.sort(key=lambda target: type(target[1]) is cas_config.core_config)
+        for i, dev in targets:
+            try:
+                results[i] = self._load(dev)
+            except Exception as e:
+                self.topology = None
+                results[i] = (1, str(e))
+
+        return results
+
+    def _worker(self):
+        while True:
+            batch = [self.requests.get()]
+            time.sleep(self.batch_delay)
+            while True:
+                try:
+                    batch.append(self.requests.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.handle_batch([(r["device"], r["links"]) for r in batch])
+            except Exception as e:
+                results = [(1, str(e))] * len(batch)
+
+            for request, (exit_code, message) in zip(batch, results):
+                request["result"] = {"exit_code": exit_code, "message": message}
+                request["done"].set()
+
+    def serve_forever(self):
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, self._handler)
+        self._server.daemon_threads = True
+        self._server.loader = self
+        os.chmod(self.socket_path, 0o600)
+
+        threading.Thread(target=self._worker, daemon=True).start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            os.unlink(self.socket_path)
+
+    def shutdown(self):
+        if self._server:
+            self._server.shutdown()
+
+
+# Dependency graph helpers
+
+
+class DependencyCycleError(ValueError):
+    def __init__(self, nodes):
+        super(DependencyCycleError, self).__init__('Recursive configuration detected')
+        self.nodes = nodes
+
+
+def _exp_obj_ids(path):
+    if path is None:
+        return None
+
+    match = re.match(r"/dev/cas(\d{1,5})-(\d{1,4})$", path)
+    if not match:
+        return None
+
+    return tuple(int(i) for i in match.groups())
+
+
+def get_start_dependencies(config, with_cores=True):
+    """
+    Build graph of configured devices, mapping every cache and core config to
+    configs that have to be started before it. Cores depend on their cache and
+    devices configured on top of exported object /dev/casN-M depend on core M
+    of cache N (or on cache N itself if cores are not part of the graph).
+    """
+    dependencies = {}
+
+    def lower_device(path):
+        ids = _exp_obj_ids(path)
+        if not ids or ids[0] not in config.caches:
+            return []
+
+        lower_cache = config.caches[ids[0]]
+        if not with_cores:
+            return [lower_cache]
+
+        lower_core = lower_cache.cores.get(ids[1])
+        return [lower_core] if lower_core else []
+
+    for cache in config.caches.values():
+        dependencies[cache] = lower_device(cache.device)
+
+    if with_cores:
+        for core in config.cores:
+            dependencies[core] = [config.caches[core.cache_id]] + lower_device(core.device)
+
+    _check_cycles(dependencies)
+
+    return dependencies
+
+
+def _check_cycles(dependencies):
+    pending = {node: set(deps) for node, deps in dependencies.items()}
+
+    while True:
+        ready = [node for node, deps in pending.items() if not deps]
+        if not ready:
+            break
+
+        for node in ready:
+            del pending[node]
+        for deps in pending.values():
+            deps.difference_update(ready)
+
+    if pending:
+        raise DependencyCycleError(list(pending))
+
+
+def run_dependency_graph(dependencies, action, jobs=1):
+    """
+    Run action for every node of dependency graph once all nodes it depends
+    on are done, with up to jobs independent nodes running concurrently.
+    Nodes are started in graph insertion order, so with a single job the
+    order is the same as for plain sequential loop.
+
+    Returns dict mapping each node to value returned by action. Exceptions
+    raised by action are collected and raised as CompoundException after all
+    nodes are processed.
+    """
+    _check_cycles(dependencies)
+
+    pending = {node: set(deps) for node, deps in dependencies.items()}
+    results = {}
+    error = CompoundException()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        running = {}
+        while pending or running:
+            ready = [node for node, deps in pending.items() if not deps]
+            for node in ready[:max(1, jobs) - len(running)]:
+                del pending[node]
+                running[executor.submit(action, node)] = node
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                if future.exception():
+                    error.add_exception(future.exception())
+                    results[node] = None
+                else:
+                    results[node] = future.result()
+
+                for deps in pending.values():
+                    deps.discard(node)
+
+    error.raise_nonempty()
+
+    return results
+
+
+# Applying config to runtime state
+
+
+class PlanStep(object):
+    """Single casadm operation of `casctl apply` plan"""
+
+    def __init__(self, description, func, *args, **kwargs):
+        self.description = description
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        return self.func(*self.args, **self.kwargs)
+
+    def __str__(self):
+        return self.description
+
+
+lazy_write_modes = ('wb', 'wo')
+
+
+def get_param_values(namespace, cache_id, **kwargs):
+    result = casadm.get_params(namespace, cache_id, **kwargs)
+    return {row['Parameter name']: row['Value'] for row in json.loads(result.stdout)}
+
+
+def _io_classes(rows):
+    """Normalize io class rows, so runtime listing compares with config file"""
+    classes = set()
+    for row in rows:
+        try:
+            priority = row['Eviction priority']
+            priority = '' if priority is None else str(priority).strip()
+            classes.add((
+                int(row['IO class id']),
+                row['IO class name'].strip(),
+                int(priority) if priority and priority != 'Pinned' else None,
+                round(float(row.get('Allocation') or 1), 2),
+            ))
+        except (KeyError, ValueError, AttributeError):
+            raise ValueError(f'Invalid io class entry {row}')
+    return classes
+
+
+def get_io_classes(cache_id):
+    result = casadm.io_class_list(cache_id)
+    return _io_classes(json.loads(result.stdout))
+
+
+def read_io_class_file(ioclass_file):
+    with open(ioclass_file) as f:
+        return _io_classes(csv.DictReader(f))
+
+
+def running_mode(mode):
+    # "wb->wt" while flushing after mode change
+    return mode.split('->')[-1]
+
+
+def set_cache_mode(cache_id, current, target):
+    flush = True if current in lazy_write_modes and target not in lazy_write_modes else None
+    casadm.set_cache_mode(cache_id, target, flush)
+
+
+def _apply_cache_params(cache, running):
+    """Steps bringing parameters of running cache in line with config"""
+    steps = []
+    cache_id = cache.cache_id
+
+    mode = running_mode(running['mode'])
+    if mode != cache.cache_mode:
+        steps.append(PlanStep(
+            f'Set cache {cache_id} mode {mode} -> {cache.cache_mode}',
+            set_cache_mode, cache_id, mode, cache.cache_mode
+        ))
+
+    for namespace, param, name in [
+        ('cleaning', 'cleaning_policy', 'Cleaning policy type'),
+        ('promotion', 'promotion_policy', 'Promotion policy type'),
+    ]:
+        if param not in cache.params:
+            continue
+        current = get_param_values(namespace, cache_id).get(name)
+        if current != cache.params[param]:
+            steps.append(PlanStep(
+                f'Set cache {cache_id} {namespace} policy {current} -> {cache.params[param]}',
+                casadm.set_param, namespace, cache_id=cache_id, policy=cache.params[param]
+            ))
+
+    if 'ioclass_file' in cache.params:
+        ioclass_file = cache.params['ioclass_file']
+        if get_io_classes(cache_id) != read_io_class_file(ioclass_file):
+            steps.append(PlanStep(
+                f'Load io classes of cache {cache_id} from {ioclass_file}',
+                casadm.io_class_load_config, cache_id=cache_id, ioclass_file=ioclass_file
+            ))
+
+    return steps
+
+
+def _apply_start_cache(cache, topology):
+    status = check_cache_device(cache.device)
+    start_cache(cache, load=status['Is cache'] == 'yes')
+    topology.sync()
+
+    # Cache loaded from metadata may differ from config
+    for step in _apply_cache_params(cache, topology.caches[cache.cache_id]):
+        step.run()
+
+
+def _apply_add_core(core, topology):
+    running = topology.cores.get((core.cache_id, core.core_id))
+    if running and running['status'] == 'Active':
+        # Brought back with its cache
+        return
+    topology.add_core(core, attach=running is not None)
+
+
+def get_apply_plan(config, topology=None):
+    """
+    Compare config with runtime state and return (plan, notes).
+
+    plan - config device -> list of PlanStep, for every device in config
+           (dependencies between devices are given by get_start_dependencies)
+    notes - differences which can't be applied without stopping the cache
+
+    Running caches and cores are never stopped or removed.
+    """
+    topology = topology or Topology()
+    plan = {}
+    notes = []
+
+    def same_device(a, b):
+        return a is not None and os.path.realpath(a) == os.path.realpath(b)
+
+    for cache in config.caches.values():
+        running = topology.caches.get(cache.cache_id)
+        if running is None:
+            plan[cache] = [PlanStep(
+                f'Start cache {cache.cache_id} ({cache.device})',
+                _apply_start_cache, cache, topology
+            )]
+        elif not same_device(running['device'], cache.device):
+            notes.append(
+                f'Cache {cache.cache_id} is running on {running["device"] or "no device"} '
+                f'instead of {cache.device}, restart is required'
+            )
+            plan[cache] = []
+        elif running['mode'] is None:
+            notes.append(f'Cache {cache.cache_id} is in standby state, skipping')
+            plan[cache] = []
+        else:
+            plan[cache] = _apply_cache_params(cache, running)
+
+    for core in config.cores:
+        running = topology.cores.get((core.cache_id, core.core_id))
+        plan[core] = []
+        if running is None:
+            plan[core].append(PlanStep(
+                f'Add core {core.device} to cache {core.cache_id} as core {core.core_id}',
+                _apply_add_core, core, topology
+            ))
+        elif not same_device(running['device'], core.device):
+            notes.append(
+                f'Core {core.core_id} of cache {core.cache_id} is {running["device"]} '
+                f'instead of {core.device}, remove it first'
+            )
+        elif running['status'] != 'Active' and os.path.exists(core.device):
+            plan[core].append(PlanStep(
+                f'Attach core {core.device} to cache {core.cache_id} as core {core.core_id}',
+                _apply_add_core, core, topology
+            ))
+
+    return plan, notes
+
+
+# Parameter changes
+
+
+def get_param_options(namespace, cache_id, **kwargs):
+    """
+    Same as get_param_values(), but keyed by casadm.set_param() options
+    (e.g. wake_up) instead of parameter names, so that values read can be
+    set back as they are
+    """
+    params = cas_ctrl.core_params if 'core_id' in kwargs else cas_ctrl.cache_params
+    options = {name: option for option, _, name, _, _ in params[namespace]}
+    return {
+        options[name]: value
+        for name, value in get_param_values(namespace, cache_id, **kwargs).items()
+        if name in options
+    }
+
+
+def undo_steps(undo, report=None):
+    """
+    Run undo steps popped from the end of list undo, reporting each with
+    report, if given. Errors are collected and raised as CompoundException.
+    """
+    error = CompoundException()
+
+    while undo:
+        step = undo.pop()
+        try:
+            step.run()
+        except casadm.CasadmError as e:
+            error.add_exception(Exception(f'{step} failed. Reason:\n{e.result.stderr}'))
+            continue
+        except Exception as e:
+            error.add_exception(Exception(f'{step} failed. Reason:\n{e}'))
+            continue
+        if report:
+            report(step)
+
+    error.raise_nonempty()
+
+
+# Block device events
+
+
+class DeviceEvents(object):
+    """
+    Notifications about block devices showing up in the system.
+
+    udev netlink events are preferred as they are sent after udev finished
+    processing the device and created its /dev/disk/by-id links. If netlink
+    is not available, inotify watch on /dev/disk/by-id is used. If neither
+    works wait() simply sleeps, which brings back interval based polling.
+    """
+
+    NETLINK_KOBJECT_UEVENT = 15
+    UDEV_MONITOR_GROUP = 2
+    UDEV_MONITOR_MAGIC = b"libudev\0"
+
+    IN_CREATE = 0x100
+    IN_MOVED_TO = 0x80
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+    by_id_path = "/dev/disk/by-id"
+
+    def __init__(self):
+        self.source = None
+        self.fd = None
+        self._sock = None
+        for source in (self._open_netlink, self._open_inotify):
+            try:
+                source()
+                break
+            except OSError:
+                continue
+
+    def _open_netlink(self):
+        sock = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_DGRAM, self.NETLINK_KOBJECT_UEVENT
+        )
+        try:
+            sock.bind((0, self.UDEV_MONITOR_GROUP))
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self.fd = sock.fileno()
+        self.source = "netlink"
+
+    def _open_inotify(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(
+            fd, self.by_id_path.encode(), self.IN_CREATE | self.IN_MOVED_TO
+        )
+        if wd < 0:
+            os.close(fd)
+            raise OSError(ctypes.get_errno(), f"Unable to watch {self.by_id_path}")
+        self.fd = fd
+        self.source = "inotify"
+
+    @classmethod
+    def parse_uevent(cls, message):
+        """
+        Return device paths (node and its links) added or changed according
+        to netlink message. Both kernel and udev monitor formats are accepted.
+        """
+        if message.startswith(cls.UDEV_MONITOR_MAGIC):
+            # struct udev_monitor_netlink_header, fields in host byte order
+            # except for magic
+            properties_off, properties_len = struct.unpack_from("=II", message, 16)
+            payload = message[properties_off:properties_off + properties_len]
+        else:
+            # "ACTION@DEVPATH" header followed by properties
+            payload = message.partition(b"\0")[2]
+
+        properties = {}
+        for entry in payload.split(b"\0"):
+            key, sep, value = entry.decode(errors="replace").partition("=")
+            if sep:
+                properties[key] = value
+
+        if properties.get("SUBSYSTEM") != "block":
+            return []
+        if properties.get("ACTION") not in ("add", "change", "online"):
+            return []
+        if "DEVNAME" not in properties:
+            return []
+
+        devname = properties["DEVNAME"]
+        if not devname.startswith("/"):
+            devname = f"/dev/{devname}"
+
+        return [devname] + properties.get("DEVLINKS", "").split()
+
+    @classmethod
+    def parse_inotify(cls, data):
+        paths = []
+        offset = 0
+        header = struct.calcsize("iIII")
+        while offset + header <= len(data):
+            _, _, _, length = struct.unpack_from("iIII", data, offset)
+            name = data[offset + header:offset + header + length].rstrip(b"\0")
+            offset += header + length
+            if name:
+                paths.append(os.path.join(cls.by_id_path, name.decode(errors="replace")))
+        return paths
+
+    def _read(self):
+        paths = []
+        while True:
+            try:
+                if self.source == "netlink":
+                    paths += self.parse_uevent(self._sock.recv(65536))
+                else:
+                    paths += self.parse_inotify(os.read(self.fd, 65536))
+            except (BlockingIOError, InterruptedError):
+                return paths
+
+    def wait(self, timeout):
+        """
+        Wait up to timeout seconds for devices to show up. Return set of paths
+        (device nodes and links) that appeared, empty set on timeout.
+        """
+        timeout = max(0, timeout)
+        if self.fd is None:
+            time.sleep(timeout)
+            return set()
+
+        try:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            return set(self._read()) if ready else set()
+        except OSError:
+            # Source broke down - keep going as plain polling
+            self.close()
+            return set()
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+        elif self.fd is not None:
+            os.close(self.fd)
+        self._sock = None
+        self.fd = None
+        self.source = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _device_appeared(dev, paths):
+    return dev.device in paths or os.path.realpath(dev.device) in paths
 
 
 def wait_for_cas_ctrl():
@@ -825,12 +2667,22 @@ def wait_for_cas_ctrl():
         time.sleep(1)
 
 
-def _get_uninitialized_devices(target_dev_state):
+def _get_uninitialized_devices(target_dev_state, devices=None):
+    """
+    Return caches and cores of target_dev_state config which are not running.
+    If devices is given, only those configs are checked.
+    """
     not_initialized = []
 
     runtime_dev_state = get_devices_state()
 
-    for core in target_dev_state.cores:
+    cores = target_dev_state.cores
+    caches = target_dev_state.caches.values()
+    if devices is not None:
+        cores = [dev for dev in cores if dev in devices]
+        caches = [dev for dev in caches if dev in devices]
+
+    for core in cores:
         try:
             runtime_state = (
                 runtime_dev_state["cores"].get((core.cache_id, core.core_id))
@@ -842,7 +2694,7 @@ def _get_uninitialized_devices(target_dev_state):
         if not runtime_state or runtime_state["status"] == "Inactive":
             not_initialized.append(core)
 
-    for cache in target_dev_state.caches.values():
+    for cache in caches:
         runtime_state = runtime_dev_state["caches"].get(cache.cache_id)
 
         if not runtime_state:
@@ -872,22 +2724,44 @@ def wait_for_startup(timeout=300, interval=5):
     if not not_initialized:
         return []
 
-    subprocess.run(["udevadm", "settle"])
-
-    for dev in not_initialized:
-        start_device(dev)
-
-    while stop_time > time.time():
-        not_initialized = _get_uninitialized_devices(config)
-        wait = False
+    # Subscribe before settling udev so no device event is missed in between
+    with DeviceEvents() as events:
+        subprocess.run(["udevadm", "settle"])
 
         for dev in not_initialized:
-            wait = wait or not dev.is_lazy()
             start_device(dev)
 
-        if not wait:
-            break
-
-        time.sleep(interval)
+        while stop_time > time.time():
+            not_initialized = _get_uninitialized_devices(config)
+            wait = False
+
+            for dev in not_initialized:
+                wait = wait or not dev.is_lazy()
+                start_device(dev)
+
+            if not wait:
+                break
+
+            # Wait for the next poll, but bring up devices as soon as they
+            # appear and re-check runtime state of just those devices
+            next_poll = min(time.time() + interval, stop_time)
+            while wait and next_poll > time.time():
+                paths = events.wait(next_poll - time.time())
+                appeared = [
+                    dev for dev in not_initialized if paths and _device_appeared(dev, paths)
+                ]
+                if not appeared:
+                    continue
+
+                for dev in appeared:
+                    start_device(dev)
+                failed = _get_uninitialized_devices(config, appeared)
+                not_initialized = [
+                    dev for dev in not_initialized if dev not in appeared or dev in failed
+                ]
+                wait = any(not dev.is_lazy() for dev in not_initialized)
+
+            if not wait:
+                break
 
     return not_initialized
@@ -0,0 +1,165 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Asyncio counterparts of opencas management helpers, for agents driving
+many caches from single event loop. casadm runs as asyncio subprocess and
+requests handled by native transport (see opencas.cas_ctrl) run in the
+default executor of the loop. Results and errors are the same as of the
+synchronous helpers, failed casadm calls raise opencas.casadm.CasadmError.
+
+Management of each cache is serialized with per cache lock, so concurrent
+calls for different caches run in parallel while those for the same cache
+are issued one after another. Locks are kept per event loop, so helpers may
+be used from several loops, e.g. subsequent asyncio.run() calls. casadm
+started by a cancelled call is killed.
+"""
+
+import asyncio
+import functools
+import json
+import weakref
+
+from opencas import Topology, casadm, parse_all_stats, parse_caches_list
+
+
+class CommandResult(object):
+    """Result of casadm run, with the same fields as opencas.casadm.result"""
+
+    def __init__(self, exit_code, stdout, stderr):
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class _commands(casadm):
+    """casadm returning command lines instead of running them"""
+    transport = None
+
+    @classmethod
+    def run_cmd(cls, cmd):
+        return cmd
+
+
+# Event loop -> {cache_id: asyncio.Lock}, locks are bound to loop they are used in
+_locks = weakref.WeakKeyDictionary()
+
+
+def cache_lock(cache_id):
+    """asyncio.Lock serializing management of cache_id within running event loop"""
+    locks = _locks.setdefault(asyncio.get_running_loop(), {})
+    lock = locks.get(cache_id)
+    if lock is None:
+        lock = locks[cache_id] = asyncio.Lock()
+    return lock
+
+
+async def run_cmd(cmd):
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # Don't leave casadm running behind cancelled caller
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        raise
+    result = CommandResult(process.returncode, stdout.decode(), stderr.decode())
+    if result.exit_code != 0:
+        raise casadm.CasadmError(result)
+    return result
+
+
+async def _run(request, *args, **kwargs):
+    """Run casadm request through native transport if it handles it, casadm otherwise"""
+    if casadm.transport is not None and hasattr(casadm.transport, request):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None, functools.partial(casadm.run_native, request, *args, **kwargs)
+        )
+        if result:
+            return result
+
+    return await run_cmd(getattr(_commands, request)(*args, **kwargs))
+
+
+async def _run_locked(cache_id, request, *args, **kwargs):
+    async with cache_lock(cache_id):
+        return await _run(request, *args, **kwargs)
+
+
+async def get_caches_list():
+    return parse_caches_list((await _run('list_caches')).stdout)
+
+
+async def get_topology():
+    return Topology(await get_caches_list())
+
+
+async def get_all_stats():
+    return parse_all_stats((await _run('stats_all')).stdout)
+
+
+async def get_param_values(namespace, cache_id, **kwargs):
+    result = await _run('get_params', namespace, cache_id, **kwargs)
+    return {row['Parameter name']: row['Value'] for row in json.loads(result.stdout)}
+
+
+async def start_cache(device, cache_id=None, cache_mode=None, cache_line_size=None, load=False,
+                      force=False):
+    args = (device, cache_id, cache_mode, cache_line_size, load, force)
+    if cache_id is None:
+        # Id is picked by casadm, there is nothing to lock yet
+        return await _run('start_cache', *args)
+    return await _run_locked(cache_id, 'start_cache', *args)
+
+
+async def stop_cache(cache_id, no_flush=False):
+    return await _run_locked(cache_id, 'stop_cache', cache_id, no_flush)
+
+
+async def add_core(device, cache_id, core_id=None, try_add=False):
+    return await _run_locked(cache_id, 'add_core', device, cache_id, core_id, try_add)
+
+
+async def remove_core(cache_id, core_id, detach=False, force=False):
+    return await _run_locked(cache_id, 'remove_core', cache_id, core_id, detach, force)
+
+
+async def set_param(namespace, cache_id, **kwargs):
+    return await _run_locked(cache_id, 'set_param', namespace, cache_id, **kwargs)
+
+
+async def set_cache_mode(cache_id, cache_mode, flush=None):
+    return await _run_locked(cache_id, 'set_cache_mode', cache_id, cache_mode, flush)
+
+
+async def flush(cache_id, core_id=None, report=None, interval=1):
+    """
+    Flush dirty data of cache, or only of its core core_id. report, if
+    given, is called every interval seconds with statistics of the flushed
+    device (see get_all_stats()) until flush is done.
+    """
+    async with cache_lock(cache_id):
+        task = asyncio.ensure_future(_run('flush_cache', cache_id, core_id))
+        try:
+            while report:
+                done, _ = await asyncio.wait({task}, timeout=interval)
+                if done:
+                    break
+                try:
+                    stats = (await get_all_stats()).get((cache_id, core_id, None))
+                except casadm.CasadmError:
+                    # Progress is only informative, flush goes on
+                    continue
+                if stats is not None:
+                    report(stats)
+            return await task
+        finally:
+            task.cancel()
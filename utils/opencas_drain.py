@@ -0,0 +1,177 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Background flush of dirty data ahead of planned stop, see `casctl drain`.
+"""
+
+import time
+
+import opencas
+
+
+class Drain(object):
+    """
+    Flush dirty data of caches in background ahead of planned stop, so that
+    final `casctl stop --flush` has (almost) nothing left to do.
+
+    Caches are switched to ALRU cleaning with the most aggressive parameters
+    and, with switch_mode, write-back caches are switched to write-through
+    without flush, so that no new dirty data shows up meanwhile. Original
+    policy and parameters are saved when applied and set back by restore().
+    """
+    alru_params = {
+        'wake_up': 0,
+        'staleness_time': 1,
+        'flush_max_buffers': 10000,
+        'activity_threshold': 0,
+    }
+    # Decline of dirty data is averaged over samples from this many seconds
+    rate_window = 60
+
+    def __init__(self, cache_ids=None, switch_mode=False, topology=None):
+        topology = topology or opencas.get_topology()
+        self.modes = {}
+        for cache_id, cache in topology.caches.items():
+            if cache['mode'] is None:
+                # Standby
+                continue
+            self.modes[cache_id] = cache['mode']
+
+        if cache_ids is None:
+            # Caches in write-back or write-only mode, or still flushing after
+            # switching from one
+            cache_ids = [
+                cache_id for cache_id, mode in self.modes.items()
+                if any(m in opencas.lazy_write_modes for m in mode.split('->'))
+            ]
+        for cache_id in cache_ids:
+            if cache_id not in self.modes:
+                raise ValueError(f'Cache {cache_id} is not running')
+
+        self.cache_ids = sorted(cache_ids)
+        self.switch_mode = switch_mode
+        self.undo = []
+        self.samples = {cache_id: [] for cache_id in self.cache_ids}
+
+    def _steps(self, cache_id):
+        """(step, undo step) pairs draining cache_id, in order of applying"""
+        steps = []
+
+        alru = opencas.get_param_options('cleaning-alru', cache_id)
+        saved = {option: alru[option] for option in self.alru_params}
+        steps.append((
+            opencas.PlanStep(
+                f'Set cache {cache_id} ALRU parameters {self.alru_params}',
+                opencas.casadm.set_param, 'cleaning-alru', cache_id, **self.alru_params
+            ),
+            opencas.PlanStep(
+                f'Restore cache {cache_id} ALRU parameters {saved}',
+                opencas.casadm.set_param, 'cleaning-alru', cache_id, **saved
+            ),
+        ))
+
+        policy = opencas.get_param_options('cleaning', cache_id)['policy']
+        if policy != 'alru':
+            steps.append((
+                opencas.PlanStep(
+                    f'Set cache {cache_id} cleaning policy {policy} -> alru',
+                    opencas.casadm.set_param, 'cleaning', cache_id, policy='alru'
+                ),
+                opencas.PlanStep(
+                    f'Set cache {cache_id} cleaning policy alru -> {policy}',
+                    opencas.casadm.set_param, 'cleaning', cache_id, policy=policy
+                ),
+            ))
+
+        mode = opencas.running_mode(self.modes[cache_id])
+        if self.switch_mode and mode in opencas.lazy_write_modes:
+            # Dirty data is left to the cleaner instead of flushing it at once
+            steps.append((
+                opencas.PlanStep(
+                    f'Set cache {cache_id} mode {mode} -> wt',
+                    opencas.casadm.set_cache_mode, cache_id, 'wt', False
+                ),
+                opencas.PlanStep(
+                    f'Set cache {cache_id} mode wt -> {mode}',
+                    opencas.casadm.set_cache_mode, cache_id, mode
+                ),
+            ))
+
+        return steps
+
+    def start(self, report=None):
+        """
+        Apply drain settings to all caches. report, if given, is called with
+        each PlanStep run. Steps run before a failure are still undone by
+        restore().
+        """
+        for cache_id in self.cache_ids:
+            for step, undo in self._steps(cache_id):
+                step.run()
+                self.undo.append(undo)
+                if report:
+                    report(step)
+
+    def restore(self, report=None):
+        """
+        Set back everything changed by start(), in reverse order. Errors are
+        collected and raised as CompoundException.
+        """
+        opencas.undo_steps(self.undo, report)
+
+    def progress(self, stats, now=None):
+        """
+        Take dirty level of drained caches from get_all_stats() result. Return
+        cache_id -> (dirty 4KiB blocks, decline rate [blocks/s], ETA [s]),
+        where rate and ETA are None until dirty data is seen declining.
+        """
+        now = time.time() if now is None else now
+        progress = {}
+        for cache_id, samples in self.samples.items():
+            cache = stats.get((cache_id, None, None))
+            if cache is None:
+                raise ValueError(f'Cache {cache_id} is not running')
+            dirty = cache['Dirty [4KiB Blocks]']
+
+            samples.append((now, dirty))
+            while len(samples) > 2 and samples[1][0] <= now - self.rate_window:
+                samples.pop(0)
+
+            first_time, first_dirty = samples[0]
+            rate = None
+            if now > first_time and first_dirty > dirty:
+                rate = (first_dirty - dirty) / (now - first_time)
+
+            if dirty == 0:
+                progress[cache_id] = (0, rate, 0.0)
+            else:
+                progress[cache_id] = (dirty, rate, dirty / rate if rate else None)
+
+        return progress
+
+    def run(self, deadline=None, interval=5, report=None, stop=None):
+        """
+        Poll dirty level until all caches are clean or deadline (seconds
+        since epoch) passes. report, if given, is called with progress()
+        result of each poll. Waiting is cut short once stop (threading.Event),
+        if given, is set. Return True if all caches are clean.
+        """
+        while True:
+            now = time.time()
+            progress = self.progress(opencas.get_all_stats(), now)
+            if report:
+                report(progress)
+
+            if all(dirty == 0 for dirty, _, _ in progress.values()):
+                return True
+            if deadline is not None and now >= deadline:
+                return False
+
+            timeout = interval if deadline is None else min(interval, deadline - now)
+            if stop is None:
+                time.sleep(timeout)
+            elif stop.wait(timeout):
+                return False
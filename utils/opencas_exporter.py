@@ -0,0 +1,209 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Prometheus exporter of Open CAS statistics, served by `casctl exporter`.
+"""
+
+import os
+import re
+import socketserver
+import threading
+import time
+
+import opencas
+
+
+class MetricsExporter(object):
+    """
+    Prometheus text exposition of cache, core and IO class statistics.
+
+    Every collection costs a single casadm --stats-all call. Topology (device
+    paths, cache modes, IO class names) is listed again only when unknown
+    caches or cores show up in statistics or when it's older than
+    topology_ttl seconds.
+
+    Series of each level are exported as separate metric families
+    (opencas_cache_*, opencas_core_*, opencas_ioclass_* and optionally
+    opencas_core_ioclass_*), so aggregations don't count anything twice.
+    Block counters are converted to bytes.
+    """
+    listen_address = ('127.0.0.1', 9808)
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+    block_size = 4096
+
+    def __init__(self, topology_ttl=60, core_io_classes=False):
+        self.topology_ttl = topology_ttl
+        self.core_io_classes = core_io_classes
+        self.lock = threading.Lock()
+        self.topology = None
+        self.io_class_names = {}
+        self._synced = None
+        self._metrics = {}
+        self._server = None
+        self._stop = threading.Event()
+
+    def metric(self, stat):
+        """Map statistic name to (metric name, type, scale)"""
+        if stat not in self._metrics:
+            name, _, unit = stat.partition(' [')
+            metric = re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+            scale = self.block_size if unit.startswith('4KiB') else 1
+            if scale != 1:
+                metric += '_bytes'
+            if opencas.is_usage_stat(stat):
+                self._metrics[stat] = (metric, 'gauge', scale)
+            else:
+                self._metrics[stat] = (metric + '_total', 'counter', scale)
+
+        return self._metrics[stat]
+
+    def _sync(self, stats):
+        ids = {(cache_id, core_id) for cache_id, core_id, _ in stats}
+        now = time.monotonic()
+
+        if self.topology is not None and now - self._synced < self.topology_ttl:
+            known = {(cache_id, None) for cache_id in self.topology.caches}
+            if ids <= known | set(self.topology.cores):
+                return
+
+        self.topology = opencas.Topology()
+        self.io_class_names = {}
+        for cache_id in self.topology.caches:
+            try:
+                self.io_class_names[cache_id] = {
+                    io_class[0]: io_class[1] for io_class in opencas.get_io_classes(cache_id)
+                }
+            except Exception:
+                pass
+        self._synced = now
+
+    @staticmethod
+    def _labels(labels):
+        def escape(value):
+            # Not applicable values give empty label, same as absent one
+            value = '' if value is None else str(value)
+            return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+    def _info(self, families):
+        def add(name, help, labels):
+            families.setdefault(name, ('gauge', help, []))[2].append((labels, 1))
+
+        for cache_id, cache in sorted(self.topology.caches.items()):
+            add('opencas_cache_info', 'Cache device, mode and status',
+                {'cache': cache_id, 'device': cache['device'],
+                 'mode': cache['mode'], 'status': cache['status']})
+            for io_class_id, name in sorted(self.io_class_names.get(cache_id, {}).items()):
+                add('opencas_ioclass_info', 'IO class name',
+                    {'cache': cache_id, 'ioclass': io_class_id, 'name': name})
+
+        for (cache_id, core_id), core in sorted(self.topology.cores.items()):
+            add('opencas_core_info', 'Core device, exported object and status',
+                {'cache': cache_id, 'core': core_id, 'device': core['device'],
+                 'exp_obj': core['exp_obj'], 'status': core['status']})
+
+    def _stats(self, families, stats):
+        for (cache_id, core_id, io_class_id), values in stats.items():
+            labels = {'cache': cache_id}
+            if core_id is None:
+                level = 'cache'
+            else:
+                level = 'core'
+                labels['core'] = core_id
+            if io_class_id is not None:
+                if core_id is not None and not self.core_io_classes:
+                    continue
+                level = 'ioclass' if core_id is None else 'core_ioclass'
+                labels['ioclass'] = io_class_id
+
+            for stat, value in values.items():
+                metric, metric_type, scale = self.metric(stat)
+                name = f'opencas_{level}_{metric}'
+                help = f'{stat.partition(" [")[0]} of {level.replace("_", " ")}'
+                families.setdefault(name, (metric_type, help, []))
+                families[name][2].append((labels, value * scale))
+
+    def collect(self):
+        """Return current statistics in Prometheus text format"""
+        with self.lock:
+            start = time.monotonic()
+            families = {}
+            try:
+                stats = opencas.get_all_stats()
+                self._sync(stats)
+                self._info(families)
+                self._stats(families, stats)
+                up = 1
+            except Exception:
+                families = {}
+                self.topology = None
+                up = 0
+
+            families['opencas_up'] = ('gauge', 'Whether statistics were collected', [({}, up)])
+            families['opencas_exporter_collect_duration_seconds'] = (
+                'gauge', 'Time spent collecting statistics', [({}, time.monotonic() - start)]
+            )
+
+        lines = []
+        for name, (metric_type, help, samples) in families.items():
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for labels, value in samples:
+                if labels:
+                    lines.append(f'{name}{{{self._labels(labels)}}} {value}')
+                else:
+                    lines.append(f'{name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """Atomically write statistics for node_exporter textfile collector"""
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.collect())
+        os.replace(tmp_path, path)
+
+    def write_textfile_forever(self, path, interval):
+        while True:
+            self.write_textfile(path)
+            if self._stop.wait(interval):
+                break
+
+    def serve_forever(self, address=None):
+        # http.server is slow to import, keep it out of the udev loader path
+        import http.server
+
+        class handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+
+                body = self.server.exporter.collect().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', MetricsExporter.content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        class server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+            daemon_threads = True
+
+        self._server = server(address or self.listen_address, handler)
+        self._server.exporter = self
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def shutdown(self):
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
@@ -0,0 +1,339 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Cache mode switching driven by time of day and cache metrics, see
+`casctl mode-policy`.
+"""
+
+import csv
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import opencas
+import opencas_drain
+
+
+class ModeRule(object):
+    """
+    Line of cache mode policy config:
+
+        <cache id> <cache mode> <conditions>
+
+    conditions - "always" or comma separated terms which all have to hold:
+        time=HH:MM-HH:MM  local time of day, may wrap around midnight
+        days=mon-fri      days of week, range or list joined with +
+        <metric><op><value>  metric of the cache over the last interval
+                          compared with < > <= or >=
+        for=<seconds>     other terms have to hold for so long first
+    """
+    days = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+    metrics = {
+        'read_hit': 'Read hit [%]',
+        'write_hit': 'Write hit [%]',
+        'requests': 'Requests [1/s]',
+        'pass_through': 'Pass-Through [1/s]',
+        'dirty': 'Dirty [%]',
+        'dirty_mib': 'Dirty [MiB]',
+        'core_reads': 'Core reads [MiB/s]',
+        'core_writes': 'Core writes [MiB/s]',
+        'reads': 'Reads [MiB/s]',
+        'writes': 'Writes [MiB/s]',
+    }
+    operators = {
+        '<=': lambda a, b: a <= b,
+        '>=': lambda a, b: a >= b,
+        '<': lambda a, b: a < b,
+        '>': lambda a, b: a > b,
+    }
+
+    def __init__(self, cache_id, cache_mode, conditions='always'):
+        self.cache_id = int(cache_id)
+        opencas.cas_config.cache_config.check_cache_id_valid(self.cache_id)
+        self.cache_mode = cache_mode.lower()
+        if self.cache_mode not in ['wt', 'pt', 'wa', 'wb', 'wo']:
+            raise ValueError(f'Invalid cache mode {cache_mode}')
+        self.conditions = conditions
+        self.time = None
+        self.weekdays = None
+        self.thresholds = []
+        self.duration = 0
+        # Since when conditions hold
+        self.since = None
+
+        if conditions != 'always':
+            for term in conditions.split(','):
+                self._parse_term(term)
+
+    def _parse_term(self, term):
+        name, _, value = term.partition('=')
+        if name == 'time':
+            match = re.fullmatch(r'(\d\d):(\d\d)-(\d\d):(\d\d)', value)
+            if not match:
+                raise ValueError(f'Invalid time range {value}')
+            start, end = [int(match.group(i)) * 60 + int(match.group(i + 1)) for i in (1, 3)]
+            # 24:00 may only end the range
+            if int(match.group(1)) > 23 or end > 24 * 60 or \
+                    int(match.group(2)) > 59 or int(match.group(4)) > 59:
+                raise ValueError(f'Invalid time range {value}')
+            self.time = (start, end)
+        elif name == 'days':
+            self.weekdays = set()
+            for days in value.split('+'):
+                first, _, last = days.partition('-')
+                if first not in self.days or (last and last not in self.days):
+                    raise ValueError(f'Invalid days {value}')
+                first = self.days.index(first)
+                last = self.days.index(last) if last else first
+                while True:
+                    self.weekdays.add(first)
+                    if first == last:
+                        break
+                    first = (first + 1) % 7
+        elif name == 'for':
+            try:
+                self.duration = float(value)
+            except ValueError:
+                raise ValueError(f'Invalid duration {value}')
+        else:
+            match = re.fullmatch(r'(\w+)(<=|>=|<|>)([0-9.]+)', term)
+            if not match or match.group(1) not in self.metrics:
+                raise ValueError(f'Invalid condition {term}')
+            try:
+                value = float(match.group(3))
+            except ValueError:
+                raise ValueError(f'Invalid condition {term}')
+            self.thresholds.append(
+                (self.metrics[match.group(1)], self.operators[match.group(2)], value)
+            )
+
+    @classmethod
+    def from_line(cls, line):
+        values = line.split()
+        if len(values) < 2:
+            raise ValueError('Invalid mode policy rule (too few columns)')
+        elif len(values) > 3:
+            raise ValueError('Invalid mode policy rule (too many columns)')
+        return cls(*values)
+
+    def _matches(self, now, metrics):
+        local = time.localtime(now)
+        if self.weekdays is not None and local.tm_wday not in self.weekdays:
+            return False
+        if self.time is not None:
+            minute = local.tm_hour * 60 + local.tm_min
+            start, end = self.time
+            if start <= end and not start <= minute < end:
+                return False
+            if start > end and end <= minute < start:
+                return False
+        for name, operator, value in self.thresholds:
+            if metrics.get(name) is None or not operator(metrics[name], value):
+                return False
+        return True
+
+    def holds(self, now, metrics):
+        """Whether rule applies at now (seconds since epoch) given cache metrics"""
+        if not self._matches(now, metrics):
+            self.since = None
+            return False
+        if self.since is None:
+            self.since = now
+        return now - self.since >= self.duration
+
+    def __str__(self):
+        return f'{self.cache_id} {self.cache_mode} {self.conditions}'
+
+
+class ModePolicy(object):
+    """
+    Switches cache modes following rules from config. Rules of each cache
+    are evaluated in order of the config file and the first one which holds
+    gives the mode. Caches without any rule holding are left alone.
+
+    Before switching from write-back or write-only mode to one that doesn't
+    keep dirty data, the cache is drained in background (see Drain) for up
+    to drain_timeout seconds, so that the final flush of the switch itself
+    is short. Each switch is reported and appended to CSV history with
+    durations of drain and switch.
+    """
+    default_path = '/etc/opencas/mode-policy.conf'
+    history_path = '/var/lib/opencas/mode-switches.csv'
+    history_fields = [
+        'Time', 'Cache id', 'From', 'To', 'Rule', 'Dirty before [MiB]',
+        'Drained', 'Drain [s]', 'Switch [s]', 'Error',
+    ]
+    drain_interval = 5
+
+    def __init__(self, rules, dry_run=False, drain_timeout=600, history_path=None, jobs=4):
+        self.rules = rules
+        self.dry_run = dry_run
+        self.drain_timeout = drain_timeout
+        self.history_path = history_path or self.history_path
+        self.executor = ThreadPoolExecutor(max_workers=jobs)
+        self.switching = {}
+        self.stopping = threading.Event()
+        # Last switch reported in dry run mode
+        self.planned = {}
+        self.stats = None
+        self.timestamp = None
+
+    @classmethod
+    def from_file(cls, path=default_path, **kwargs):
+        rules = []
+        try:
+            with open(path) as f:
+                for line in f:
+                    line = line.split('#')[0].strip()
+                    if line:
+                        rules.append(ModeRule.from_line(line))
+        except IOError:
+            raise Exception(f'Couldn\'t open mode policy config {path}')
+        return cls(rules, **kwargs)
+
+    @staticmethod
+    def cache_metrics(stats, elapsed):
+        """Metrics of the cache rules may refer to, from stats delta"""
+        metrics = opencas.summarize_stats(stats, elapsed)
+        for metric, name in [('Reads', 'Reads from'), ('Writes', 'Writes to')]:
+            blocks = stats.get(f'{name} exported object [4KiB Blocks]')
+            metrics[f'{metric} [MiB/s]'] = (
+                None if blocks is None or not elapsed else blocks * 4096 / 2**20 / elapsed
+            )
+        return metrics
+
+    def decide(self, topology, delta, elapsed, now):
+        """Return [(cache_id, current mode, target mode, rule)] of needed switches"""
+        metrics = {}
+        switches = []
+        decided = set()
+        for rule in self.rules:
+            cache = topology.caches.get(rule.cache_id)
+            stats = delta.get((rule.cache_id, None, None))
+            if cache is None or cache['mode'] is None or stats is None:
+                rule.since = None
+                continue
+            if rule.cache_id not in metrics:
+                metrics[rule.cache_id] = self.cache_metrics(stats, elapsed)
+
+            # Keep track of "for" of all rules, even those shadowed
+            if not rule.holds(now, metrics[rule.cache_id]) or rule.cache_id in decided:
+                continue
+            decided.add(rule.cache_id)
+
+            if '->' in cache['mode'] or rule.cache_id in self.switching:
+                # Switch in progress
+                continue
+            if cache['mode'] != rule.cache_mode:
+                switches.append((rule.cache_id, cache['mode'], rule.cache_mode, rule))
+
+        return switches
+
+    def _record(self, cache_id, current, target, rule):
+        record = dict.fromkeys(self.history_fields, '')
+        record.update({
+            'Time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'Cache id': cache_id,
+            'From': current,
+            'To': target,
+            'Rule': str(rule),
+        })
+        return record
+
+    def switch(self, cache_id, current, target, rule):
+        """Drain cache if needed and switch its mode, return history record"""
+        record = self._record(cache_id, current, target, rule)
+
+        flush = current in opencas.lazy_write_modes and target not in opencas.lazy_write_modes
+        drain = None
+        try:
+            if flush:
+                dirty = opencas.get_all_stats()[(cache_id, None, None)]['Dirty [4KiB Blocks]']
+                record['Dirty before [MiB]'] = round(dirty * 4096 / 2**20, 1)
+                if dirty and self.drain_timeout:
+                    start = time.time()
+                    drain = opencas_drain.Drain([cache_id])
+                    drain.start()
+                    record['Drained'] = drain.run(
+                        start + self.drain_timeout, self.drain_interval, stop=self.stopping
+                    )
+                    record['Drain [s]'] = round(time.time() - start, 1)
+                    if self.stopping.is_set():
+                        raise Exception('Interrupted before switch')
+
+            start = time.time()
+            opencas.set_cache_mode(cache_id, current, target)
+            record['Switch [s]'] = round(time.time() - start, 1)
+        except opencas.casadm.CasadmError as e:
+            record['Error'] = e.result.stderr.strip()
+        except Exception as e:
+            record['Error'] = str(e)
+        finally:
+            if drain:
+                try:
+                    drain.restore()
+                except Exception as e:
+                    record['Error'] = f'{record["Error"]} {e}'.strip()
+
+        return record
+
+    def _write_history(self, record):
+        os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+        new = not os.path.exists(self.history_path)
+        with open(self.history_path, 'a', newline='') as f:
+            writer = csv.DictWriter(f, self.history_fields)
+            if new:
+                writer.writeheader()
+            writer.writerow(record)
+
+    def _finished(self, report):
+        for cache_id, future in list(self.switching.items()):
+            if not future.done():
+                continue
+            del self.switching[cache_id]
+            record = future.result()
+            self._write_history(record)
+            if report:
+                report(record)
+
+    def step(self, report=None, now=None):
+        """
+        Evaluate rules and start switches in background. report, if given,
+        is called with history record of every finished switch. In dry run
+        mode it's called with record of each switch once, when it's decided.
+        Return list of decided (cache_id, current, target, rule).
+        """
+        self._finished(report)
+        stats = opencas.get_all_stats()
+        now = time.time() if now is None else now
+
+        switches = []
+        if self.stats is not None and now > self.timestamp:
+            delta = opencas.get_stats_delta(self.stats, stats)
+            switches = self.decide(opencas.Topology(), delta, now - self.timestamp, now)
+            for switch in switches:
+                if not self.dry_run:
+                    self.switching[switch[0]] = self.executor.submit(self.switch, *switch)
+                elif self.planned.get(switch[0]) != switch[2]:
+                    self.planned[switch[0]] = switch[2]
+                    if report:
+                        report(self._record(*switch))
+
+        self.stats, self.timestamp = stats, now
+        return switches
+
+    def run(self, interval, report=None):
+        try:
+            while True:
+                self.step(report)
+                time.sleep(interval)
+        finally:
+            # Cut drains short, but let them restore parameters of caches
+            self.stopping.set()
+            self.executor.shutdown(wait=True)
+            self._finished(report)
@@ -0,0 +1,275 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Ring file of statistics samples, written by `casctl record` and read by
+`casctl replay`.
+"""
+
+import array
+import json
+import mmap
+import struct
+import threading
+import time
+
+import opencas
+
+
+class StatsRecording(object):
+    """
+    Fixed-size ring file of statistics samples, accessed through mmap.
+
+    Layout: header (magic, version, capacity, max series, number of
+    counters, interval), number of samples written, length of JSON metadata
+    with counter names and series ids, metadata itself and, from meta_size
+    on, capacity slots of [sequence, timestamp, max_series * counters values].
+
+    Sequence of a slot is odd while sample is being written into it and
+    2 * (sample index + 1) once it's complete. Readers in other processes
+    check it before and after reading the slot, so they never use a sample
+    torn by the writer wrapping around to the oldest slot.
+
+    Values are absolute counters stored as uint64 (missing ones as all ones),
+    so the delta over any window needs only its first and last sample.
+    Samples are written into a preallocated array, so appending doesn't
+    create per-sample Python objects besides the statistics themselves.
+    """
+    default_path = '/var/lib/opencas/stats.rec'
+    magic = b'OCASREC1'
+    version = 2
+    header = struct.Struct('<8sIIIId')
+    count_offset = 32
+    meta_len_offset = 40
+    meta_offset = 64
+    meta_size = 65536
+    missing = 2**64 - 1
+    # History the default recording size should hold
+    default_retention = 7 * 86400
+    sequence = struct.Struct('<Q')
+    slot_header = struct.Struct('<Qd')
+
+    default_counters = [
+        'Occupancy [4KiB Blocks]', 'Free [4KiB Blocks]',
+        'Clean [4KiB Blocks]', 'Dirty [4KiB Blocks]',
+        'Read hits [Requests]', 'Read total [Requests]',
+        'Write hits [Requests]', 'Write total [Requests]',
+        'Pass-Through reads [Requests]', 'Pass-Through writes [Requests]',
+        'Serviced requests [Requests]', 'Total requests [Requests]',
+        'Reads from core [4KiB Blocks]', 'Writes to core [4KiB Blocks]',
+        'Reads from cache [4KiB Blocks]', 'Writes to cache [4KiB Blocks]',
+        'Total errors [Requests]',
+    ]
+
+    @classmethod
+    def slot_size(cls, max_series, counters=None):
+        return cls.slot_header.size + 8 * max_series * len(counters or cls.default_counters)
+
+    @classmethod
+    def default_interval(cls, size, max_series, retention=default_retention, counters=None):
+        """Shortest whole number of seconds between samples keeping retention in size bytes"""
+        capacity = max((size - cls.meta_size) // cls.slot_size(max_series, counters), 1)
+        return max(1, -(-retention // capacity))
+
+    @classmethod
+    def create(cls, path, size, interval, max_series, counters=None):
+        """Create recording file of given size in bytes"""
+        counters = counters or cls.default_counters
+        slot_size = cls.slot_size(max_series, counters)
+        capacity = (size - cls.meta_size) // slot_size
+        if capacity < 2:
+            raise ValueError(f'Recording size {size} is too small for {max_series} series')
+
+        with open(path, 'wb') as f:
+            f.write(cls.header.pack(
+                cls.magic, cls.version, capacity, max_series, len(counters), interval
+            ))
+            f.truncate(cls.meta_size + capacity * slot_size)
+
+        recording = cls(path, writable=True)
+        recording.counters = list(counters)
+        recording._write_meta()
+        return recording
+
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        with open(path, 'r+b' if writable else 'rb') as f:
+            self._mm = mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            )
+
+        try:
+            magic, version, self.capacity, self.max_series, n_counters, self.interval = \
+                self.header.unpack_from(self._mm)
+        except struct.error:
+            magic, version = None, None
+        if magic != self.magic or version != self.version:
+            self.close()
+            raise ValueError(f'{path} is not Open CAS statistics recording')
+
+        meta_len = struct.unpack_from('<I', self._mm, self.meta_len_offset)[0]
+        meta = json.loads(self._mm[self.meta_offset:self.meta_offset + meta_len] or b'{}')
+        self.counters = meta.get('counters', [])[:n_counters]
+        self.series = [tuple(key) for key in meta.get('series', [])]
+        self._index = {key: i for i, key in enumerate(self.series)}
+
+        n_values = self.max_series * n_counters
+        self._slot = struct.Struct(f'<Qd{n_values}Q')
+        self._values = array.array('Q', [self.missing]) * n_values
+        self._empty = array.array('Q', [self.missing]) * n_values
+
+    def close(self):
+        self._mm.close()
+
+    @property
+    def count(self):
+        """Number of samples written since the file was created"""
+        return struct.unpack_from('<Q', self._mm, self.count_offset)[0]
+
+    def _write_meta(self):
+        meta = json.dumps({'counters': self.counters, 'series': self.series}).encode()
+        if self.meta_offset + len(meta) > self.meta_size:
+            raise ValueError('Too many series in statistics recording')
+        self._mm[self.meta_offset:self.meta_offset + len(meta)] = meta
+        struct.pack_into('<I', self._mm, self.meta_len_offset, len(meta))
+
+    def _series_index(self, key):
+        index = self._index.get(key)
+        if index is None and len(self.series) < self.max_series:
+            index = len(self.series)
+            self.series.append(key)
+            self._index[key] = index
+            self._write_meta()
+        return index
+
+    def _offset(self, index):
+        return self.meta_size + (index % self.capacity) * self._slot.size
+
+    def append(self, stats, timestamp=None):
+        """
+        Append get_all_stats() result. Devices seen for the first time get
+        the next free series, devices exceeding max_series are not recorded.
+        """
+        values = self._values
+        values[:] = self._empty
+        n_counters = len(self.counters)
+
+        for key, counters in stats.items():
+            index = self._series_index(key)
+            if index is None:
+                continue
+            base = index * n_counters
+            for i, name in enumerate(self.counters):
+                value = counters.get(name)
+                if value is not None:
+                    values[base + i] = value
+
+        count = self.count
+        offset = self._offset(count)
+        self.slot_header.pack_into(
+            self._mm, offset, 2 * count + 1, time.time() if timestamp is None else timestamp
+        )
+        self._mm[offset + self.slot_header.size:offset + self._slot.size] = \
+            memoryview(values).cast('B')
+        self.sequence.pack_into(self._mm, offset, 2 * count + 2)
+        # Publish the sample only after it's complete
+        struct.pack_into('<Q', self._mm, self.count_offset, count + 1)
+
+    def record(self, io_classes=False, stop=None):
+        """Append statistics every interval seconds until stop event is set"""
+        stop = stop or threading.Event()
+        next_sample = time.time()
+        while not stop.is_set():
+            stats = opencas.get_all_stats()
+            if not io_classes:
+                stats = {key: value for key, value in stats.items() if key[2] is None}
+            self.append(stats)
+
+            next_sample += self.interval
+            now = time.time()
+            if next_sample < now:
+                # Skip samples we were too slow for instead of catching up
+                next_sample = now + self.interval - (now - next_sample) % self.interval
+            stop.wait(next_sample - now)
+
+    def _read_slot(self, index, slot):
+        """
+        Unpack slot of sample index with slot struct, None if the sample is
+        being overwritten or already was
+        """
+        offset = self._offset(index)
+        sequence = 2 * index + 2
+        if self.sequence.unpack_from(self._mm, offset)[0] != sequence:
+            return None
+        data = slot.unpack_from(self._mm, offset)
+        if self.sequence.unpack_from(self._mm, offset)[0] != sequence:
+            return None
+        return data
+
+    def _timestamp(self, index):
+        data = self._read_slot(index, self.slot_header)
+        return None if data is None else data[1]
+
+    def _sample(self, index):
+        data = self._read_slot(index, self._slot)
+        if data is None:
+            return None
+        _, timestamp, *values = data
+        n_counters = len(self.counters)
+
+        stats = {}
+        for i, key in enumerate(self.series):
+            base = i * n_counters
+            stats[key] = {
+                name: value
+                for name, value in zip(self.counters, values[base:base + n_counters])
+                if value != self.missing
+            }
+        return timestamp, stats
+
+    def _bisect(self, timestamp, after=False):
+        """
+        Find index of first sample not older than timestamp or, with after
+        set, first sample newer than timestamp
+        """
+        count = self.count
+        low, high = max(0, count - self.capacity), count
+        while low < high:
+            middle = (low + high) // 2
+            sample_timestamp = self._timestamp(middle)
+            # Sample overwritten meanwhile was the oldest one
+            if sample_timestamp is None or sample_timestamp < timestamp or \
+                    (after and sample_timestamp == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def window(self, start=None, end=None):
+        """
+        Compare first and last sample recorded between start and end
+        timestamps. Return (first timestamp, last timestamp, delta) with delta
+        as returned by get_stats_delta() or None if there are less than two
+        samples in the window.
+        """
+        count = self.count
+        first = max(0, count - self.capacity) if start is None else self._bisect(start)
+        last = count - 1 if end is None else self._bisect(end, after=True) - 1
+        while first < last:
+            first_sample = self._sample(first)
+            if first_sample is not None:
+                break
+            # Oldest sample is being overwritten by the writer
+            first += 1
+        else:
+            return None
+
+        last_sample = self._sample(last)
+        if last_sample is None:
+            return None
+
+        (first_timestamp, before), (last_timestamp, after) = first_sample, last_sample
+        return first_timestamp, last_timestamp, opencas.get_stats_delta(before, after)
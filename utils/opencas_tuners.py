@@ -0,0 +1,649 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Runtime tuners of cleaning, sequential cutoff and promotion parameters,
+see `casctl tune-cleaning`, `tune-seq-cutoff` and `tune-promotion`.
+"""
+
+import json
+import os
+import time
+
+import opencas
+
+
+class TuningChange(object):
+    """Parameter change decided by Tuner, along with metrics that drove it"""
+
+    def __init__(self, namespace, cache_id, core_id, params, reason, metrics):
+        self.namespace = namespace
+        self.cache_id = cache_id
+        self.core_id = core_id
+        self.params = params
+        self.reason = reason
+        self.metrics = metrics
+        self.error = None
+
+    def run(self):
+        kwargs = dict(self.params)
+        if self.core_id is not None:
+            kwargs['core_id'] = self.core_id
+        opencas.casadm.set_param(self.namespace, self.cache_id, **kwargs)
+
+    def __str__(self):
+        device = f'cache {self.cache_id}'
+        if self.core_id is not None:
+            device += f' core {self.core_id}'
+        params = ', '.join(f'{option}={value}' for option, value in self.params.items())
+        metrics = ', '.join(
+            f'{name} {"-" if value is None else round(value, 2)}'
+            for name, value in self.metrics.items()
+        )
+        return f'Set {device} {self.namespace} {params}: {self.reason} ({metrics})'
+
+
+class TuningImpact(object):
+    """
+    Hit ratio of the whole cache over the same number of steps before and
+    after TuningChange
+    """
+    error = None
+
+    def __init__(self, change, before, after):
+        self.change = change
+        self.before = before
+        self.after = after
+
+    def __str__(self):
+        change = self.change
+        device = '' if change.core_id is None else f'core {change.core_id} '
+        params = ', '.join(f'{option}={value}' for option, value in change.params.items())
+
+        def ratio(value):
+            return '-' if value is None else f'{value:.1f}%'
+
+        return (f'Hit ratio of cache {change.cache_id} after setting {device}'
+                f'{change.namespace} {params}: {ratio(self.before)} -> {ratio(self.after)}')
+
+
+class Tuner(object):
+    """
+    Base of feedback loops adjusting cache parameters at runtime. Each step
+    takes statistics of all devices, lets subclass decide changes from
+    deltas since the previous step and applies them, unless in dry run mode.
+
+    Controller state of each tuned device (see device_state()) is kept in
+    JSON file, so that the loop resumes where it stopped after restart.
+    In dry run mode changes are only reported and the file isn't written.
+
+    With impact_steps set, hit ratio of the cache over that many steps
+    following each applied change is reported compared with the same number
+    of steps before it.
+    """
+    default_state_path = None
+    impact_steps = 0
+    settle = 1
+
+    def __init__(self, cache_ids=None, dry_run=False, state_path=None):
+        self.cache_ids = cache_ids
+        self.dry_run = dry_run
+        self.state_path = state_path or self.default_state_path
+        self.state = self._load_state()
+        self.params = {}
+        self.stats = None
+        self.timestamp = None
+        # cache_id -> [(hits, requests)] of last impact_steps steps
+        self.history = {}
+        # [change, hit ratio before, [(hits, requests)] since]
+        self.pending = []
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            # Start over rather than refuse to run
+            return {}
+        return state if type(state) is dict else {}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f'{self.state_path}.{os.getpid()}'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def is_tuned(self, cache_id):
+        return self.cache_ids is None or cache_id in self.cache_ids
+
+    def device_state(self, device, cache_id, core_id=None):
+        """
+        Persistent state dict of cache or core. It starts empty, and over
+        again when different device shows up under the same id.
+        """
+        name = str(cache_id) if core_id is None else f'{cache_id}-{core_id}'
+        state = self.state.get(name)
+        if state is None or state.get('device') != device:
+            state = self.state[name] = {'device': device}
+        return state
+
+    def get_params(self, namespace, cache_id, core_id=None):
+        """Current values of parameters, read once and updated by applied changes"""
+        key = (namespace, cache_id, core_id)
+        if key not in self.params:
+            kwargs = {} if core_id is None else {'core_id': core_id}
+            self.params[key] = opencas.get_param_options(namespace, cache_id, **kwargs)
+        return self.params[key]
+
+    def change(self, namespace, cache_id, reason, metrics, core_id=None, **params):
+        """TuningChange of params differing from current values, or None"""
+        current = self.get_params(namespace, cache_id, core_id)
+        params = {
+            option: value for option, value in params.items()
+            if str(current.get(option)) != str(value)
+        }
+        if not params:
+            return None
+        return TuningChange(namespace, cache_id, core_id, params, reason, metrics)
+
+    def settled(self, state, current, picked):
+        """
+        Hysteresis over time: return picked once it was picked in settle
+        consecutive calls with the same device state, current otherwise
+        """
+        if picked == current:
+            state['count'] = 0
+            return current
+        if picked == state.get('candidate'):
+            state['count'] = state.get('count', 0) + 1
+        else:
+            state['candidate'] = picked
+            state['count'] = 1
+        if state['count'] < self.settle:
+            return current
+        state['count'] = 0
+        return picked
+
+    def tune(self, topology, delta, elapsed):
+        """Return list of TuningChange (or None) for stats delta over elapsed seconds"""
+        raise NotImplementedError()
+
+    def _apply(self, change):
+        try:
+            if not self.dry_run:
+                change.run()
+        except opencas.casadm.CasadmError as e:
+            change.error = e.result.stderr
+        except Exception as e:
+            change.error = str(e)
+        else:
+            self.get_params(change.namespace, change.cache_id, change.core_id).update(
+                change.params
+            )
+
+    @staticmethod
+    def _hit_ratio(samples):
+        requests = sum(sample[1] for sample in samples)
+        if not requests:
+            return None
+        return 100.0 * sum(sample[0] for sample in samples) / requests
+
+    def _measure_impact(self, delta):
+        """Add step to history of each cache, return TuningImpact of finished changes"""
+        samples = {}
+        for (cache_id, core_id, io_class_id), values in delta.items():
+            if core_id is not None or io_class_id is not None:
+                continue
+            hits = [values.get(f'{name} hits [Requests]') for name in ('Read', 'Write')]
+            requests = values.get('Total requests [Requests]')
+            if None in hits or requests is None:
+                # Restarted, nothing to compare with
+                self.history.pop(cache_id, None)
+                continue
+            samples[cache_id] = (sum(hits), requests)
+            history = self.history.setdefault(cache_id, [])
+            history.append(samples[cache_id])
+            del history[:-self.impact_steps]
+
+        impacts = []
+        for pending in list(self.pending):
+            change, before, since = pending
+            if change.cache_id not in samples:
+                self.pending.remove(pending)
+                continue
+            since.append(samples[change.cache_id])
+            if len(since) == self.impact_steps:
+                impacts.append(TuningImpact(change, before, self._hit_ratio(since)))
+                self.pending.remove(pending)
+
+        return impacts
+
+    def step(self, report=None, now=None):
+        """
+        Take statistics, decide and apply changes. report, if given, is
+        called with each TuningChange, which has error set if it failed, and
+        each TuningImpact. Return list of both.
+        """
+        stats = opencas.get_all_stats()
+        now = time.time() if now is None else now
+        topology = opencas.Topology()
+
+        changes = []
+        if self.stats is not None and now > self.timestamp:
+            delta = opencas.get_stats_delta(self.stats, stats)
+            for key, values in delta.items():
+                if values.get('Total requests [Requests]', 0) is None:
+                    # Restarted, parameters may have been changed meanwhile
+                    for params_key in list(self.params):
+                        if params_key[1:] == key[:2]:
+                            del self.params[params_key]
+
+            impacts = self._measure_impact(delta) if self.impact_steps else []
+            changes = [
+                change for change in self.tune(topology, delta, now - self.timestamp)
+                if change
+            ]
+            for change in changes:
+                self._apply(change)
+                if self.impact_steps and not change.error:
+                    before = self._hit_ratio(self.history.get(change.cache_id, []))
+                    self.pending.append([change, before, []])
+
+            changes = impacts + changes
+            if report:
+                for change in changes:
+                    report(change)
+
+            if not self.dry_run:
+                self._save_state()
+
+        self.stats, self.timestamp = stats, now
+        return changes
+
+    def run(self, interval, report=None):
+        while True:
+            self.step(report)
+            time.sleep(interval)
+
+
+block_stat_fields = (
+    'read_ios', 'read_merges', 'read_sectors', 'read_ticks',
+    'write_ios', 'write_merges', 'write_sectors', 'write_ticks',
+    'in_flight', 'io_ticks', 'time_in_queue',
+)
+
+
+def get_block_stat(device):
+    """Counters of /sys/class/block/<device>/stat (ticks are in ms)"""
+    name = os.path.basename(os.path.realpath(device))
+    with open(f'/sys/class/block/{name}/stat') as f:
+        values = f.read().split()
+    return {field: int(value) for field, value in zip(block_stat_fields, values)}
+
+
+class CleaningTuner(Tuner):
+    """
+    Closed loop of cleaning policy parameters. Aggressiveness level of each
+    cache goes from 0 (gentle bounds) to 1 (aggressive bounds) and drives
+    parameters of its cleaning policy (ALRU or ACP), interpolated between
+    the bounds. As in AIMD congestion control, the level is raised by
+    increase while the cache has dirty data and utilization of all exported
+    objects of its cores is below idle_utilization [%], and cut by decrease
+    factor as soon as average latency of any of them exceeds latency_target
+    [ms]. Exported objects see only foreground IO, so the cleaner doesn't
+    react to its own writes; utilization of core devices is reported as
+    total load.
+    """
+    default_state_path = '/var/lib/opencas/cleaning-tuner.json'
+
+    # (gentle, aggressive) value of each tuned parameter
+    default_bounds = {
+        'cleaning-alru': {
+            'wake_up': (20, 1),
+            'staleness_time': (120, 1),
+            'flush_max_buffers': (100, 10000),
+            'activity_threshold': (10000, 0),
+        },
+        'cleaning-acp': {
+            'wake_up': (10, 0),
+            'flush_max_buffers': (128, 10000),
+        },
+    }
+    increase = 0.1
+    decrease = 0.5
+
+    def __init__(self, cache_ids=None, dry_run=False, state_path=None, bounds=None,
+                 latency_target=20, idle_utilization=50):
+        super(CleaningTuner, self).__init__(cache_ids, dry_run, state_path)
+        self.bounds = {namespace: dict(params) for namespace, params in self.default_bounds.items()}
+        for namespace, params in (bounds or {}).items():
+            options = [param[0] for param in opencas.cas_ctrl.cache_params.get(namespace, [])]
+            if namespace not in self.bounds:
+                raise ValueError(f'Unknown cleaning policy parameters {namespace}')
+            for option, bound in params.items():
+                if option not in options:
+                    raise ValueError(f'Unknown {namespace} parameter {option}')
+                self.bounds[namespace][option] = bound
+        self.latency_target = latency_target
+        self.idle_utilization = idle_utilization
+        self.block_stats = {}
+
+    @staticmethod
+    def interpolate(bound, level):
+        gentle, aggressive = bound
+        if gentle > 0 and aggressive > 0:
+            # Geometric, bounds often differ by orders of magnitude
+            return round(gentle * (aggressive / gentle) ** level)
+        return round(gentle + (aggressive - gentle) * level)
+
+    def _device_load(self, device, elapsed):
+        """Utilization [%] and average latency [ms] of device since previous call"""
+        try:
+            current = get_block_stat(device)
+        except (OSError, ValueError):
+            return None, None
+        previous = self.block_stats.get(device)
+        self.block_stats[device] = current
+        if previous is None:
+            return None, None
+
+        delta = {field: current[field] - previous[field] for field in block_stat_fields}
+        utilization = 100.0 * delta['io_ticks'] / (elapsed * 1000)
+        ios = delta['read_ios'] + delta['write_ios']
+        if ios == 0:
+            return utilization, None
+        return utilization, (delta['read_ticks'] + delta['write_ticks']) / ios
+
+    def _core_load(self, topology, cache_id, elapsed):
+        """
+        Highest utilization [%] and average latency [ms] of exported objects
+        of cache's cores, i.e. of foreground IO, and highest utilization [%]
+        of core devices, which includes writes of the cleaner itself
+        """
+        foreground, total = [], []
+        for key in topology.cache_cores(cache_id):
+            core = topology.cores[key]
+            if core['exp_obj'] is not None:
+                foreground.append(self._device_load(core['exp_obj'], elapsed))
+            total.append(self._device_load(core['device'], elapsed))
+
+        def highest(values):
+            return max((value for value in values if value is not None), default=None)
+
+        return (
+            highest(utilization for utilization, _ in foreground),
+            highest(latency for _, latency in foreground),
+            highest(utilization for utilization, _ in total),
+        )
+
+    def tune(self, topology, delta, elapsed):
+        changes = []
+        for cache_id, cache in topology.caches.items():
+            stats = delta.get((cache_id, None, None))
+            if not self.is_tuned(cache_id) or cache['mode'] is None or stats is None:
+                continue
+
+            utilization, latency, core_utilization = self._core_load(topology, cache_id, elapsed)
+            policy = self.get_params('cleaning', cache_id)['policy']
+            namespace = f'cleaning-{policy}'
+            if namespace not in self.bounds:
+                continue
+
+            state = self.device_state(cache['device'], cache_id)
+            level = state.get('level', 0.0)
+            dirty = stats.get('Dirty [4KiB Blocks]', 0)
+            if latency is not None and latency > self.latency_target:
+                level *= self.decrease
+                reason = 'foreground latency above target'
+            elif dirty and utilization is not None and utilization < self.idle_utilization:
+                level = min(1.0, level + self.increase)
+                reason = 'foreground idle, dirty data left'
+            else:
+                reason = 'applying saved level'
+
+            state['level'] = level
+            summary = opencas.summarize_stats(stats, elapsed)
+            metrics = {
+                'Level': level,
+                'Dirty [MiB]': summary['Dirty [MiB]'],
+                'Core writes [MiB/s]': summary['Core writes [MiB/s]'],
+                'Foreground utilization [%]': utilization,
+                'Foreground latency [ms]': latency,
+                'Core utilization [%]': core_utilization,
+            }
+            params = {
+                option: self.interpolate(bound, level)
+                for option, bound in self.bounds[namespace].items()
+            }
+            changes.append(self.change(namespace, cache_id, reason, metrics, **params))
+
+        return changes
+
+
+class SeqCutoffTuner(Tuner):
+    """
+    Picks sequential cutoff profile of each core from average size of
+    requests to its exported object: large requests of backup streams are
+    cut off early to keep them from polluting the cache, while cores serving
+    small random requests (e.g. databases) keep their moderately long scans
+    cached.
+
+    Profiles are ordered from random to streaming and neighbouring ones are
+    separated by a band of request sizes [KiB]: core moves to the next
+    profile when average size reaches the upper end of the band and back
+    when it falls below the lower end. New profile is applied only after
+    being picked in settle consecutive steps with at least min_requests.
+    Core starts from the profile matching its running parameters, so
+    configured seq-cutoff is left alone until the profile switches.
+    """
+    default_state_path = '/var/lib/opencas/seq-cutoff-tuner.json'
+    impact_steps = 6
+
+    # name, seq-cutoff parameters (threshold in KiB)
+    profiles = [
+        ('random', {'policy': 'full', 'threshold': 16384, 'promotion_count': 8}),
+        ('mixed', {'policy': 'full', 'threshold': 1024, 'promotion_count': 8}),
+        ('streaming', {'policy': 'always', 'threshold': 128, 'promotion_count': 4}),
+    ]
+    # Average request size bands [KiB] between neighbouring profiles
+    bands = [(16, 32), (128, 256)]
+    # Same as casadm defaults
+    initial_profile = 'mixed'
+
+    def __init__(self, cache_ids=None, dry_run=False, state_path=None, settle=3,
+                 min_requests=100):
+        super(SeqCutoffTuner, self).__init__(cache_ids, dry_run, state_path)
+        self.settle = settle
+        self.min_requests = min_requests
+
+    def pick_profile(self, current, size):
+        """Index of profile for average request size [KiB] given current one"""
+        index = current
+        while index < len(self.bands) and size >= self.bands[index][1]:
+            index += 1
+        while index > 0 and size < self.bands[index - 1][0]:
+            index -= 1
+        return index
+
+    def running_profile(self, cache_id, core_id):
+        """Profile matching current parameters of core, initial_profile if none does"""
+        current = self.get_params('seq-cutoff', cache_id, core_id)
+        for name, params in self.profiles:
+            if all(str(current.get(option)) == str(value) for option, value in params.items()):
+                return name
+        return self.initial_profile
+
+    def tune(self, topology, delta, elapsed):
+        names = [name for name, _ in self.profiles]
+        changes = []
+        for (cache_id, core_id), core in topology.cores.items():
+            stats = delta.get((cache_id, core_id, None))
+            if not self.is_tuned(cache_id) or core['status'] != 'Active' or stats is None:
+                continue
+
+            requests = stats.get('Total requests [Requests]')
+            blocks = [stats.get(f'{name} exported object [4KiB Blocks]')
+                      for name in ('Reads from', 'Writes to')]
+            if requests is None or None in blocks:
+                continue
+
+            state = self.device_state(core['device'], cache_id, core_id)
+            if state.get('profile') not in names:
+                state['profile'] = self.running_profile(cache_id, core_id)
+            previous = names.index(state['profile'])
+            current = previous
+            if requests >= self.min_requests:
+                size = sum(blocks) * 4 / requests
+                picked = self.pick_profile(current, size)
+                current = names.index(self.settled(state, names[current], names[picked]))
+                state['profile'] = names[current]
+            else:
+                size = None
+
+            pass_through = [stats.get(f'Pass-Through {name} [Requests]')
+                            for name in ('reads', 'writes')]
+            metrics = {
+                'Requests [1/s]': requests / elapsed,
+                'Average request size [KiB]': size,
+                'Pass-Through [%]': (
+                    100.0 * sum(pass_through) / requests
+                    if requests and None not in pass_through else None
+                ),
+            }
+            if current == previous:
+                changes.append(None)
+                continue
+            changes.append(self.change(
+                'seq-cutoff', cache_id, f'{names[current]} profile', metrics,
+                core_id=core_id, **self.profiles[current][1]
+            ))
+
+        return changes
+
+
+class PromotionTuner(Tuner):
+    """
+    Switches promotion policy of each cache between always and nhit with
+    increasing insertion thresholds, so that one-touch scans don't evict
+    the hot set. Policy gets one level more selective when cache hit ratio
+    falls below low_hit_ratio [%] while the cache is full enough for nhit
+    to apply (occupancy over nhit trigger) and evicts, and one level less
+    selective when hit ratio rises over high_hit_ratio or the cache gets
+    below the trigger. New level is applied after settle consecutive steps
+    with at least min_requests. Cache starts from the level closest to its
+    running parameters, which are left alone until the level changes.
+
+    Evictions aren't counted by casadm, so they are only estimated: misses
+    which weren't passed through insert data of average request size, and
+    whatever of it didn't grow occupancy must have replaced evicted data.
+    """
+    default_state_path = '/var/lib/opencas/promotion-tuner.json'
+    impact_steps = 6
+
+    levels = [
+        {'policy': 'always'},
+        {'policy': 'nhit', 'threshold': 3, 'trigger': 80},
+        {'policy': 'nhit', 'threshold': 6, 'trigger': 80},
+        {'policy': 'nhit', 'threshold': 12, 'trigger': 80},
+    ]
+
+    def __init__(self, cache_ids=None, dry_run=False, state_path=None, settle=3,
+                 min_requests=1000, low_hit_ratio=30, high_hit_ratio=60):
+        if low_hit_ratio >= high_hit_ratio:
+            raise ValueError('Low hit ratio has to be lower than high hit ratio')
+        super(PromotionTuner, self).__init__(cache_ids, dry_run, state_path)
+        self.settle = settle
+        self.min_requests = min_requests
+        self.low_hit_ratio = low_hit_ratio
+        self.high_hit_ratio = high_hit_ratio
+
+    def _metrics(self, cache_id, stats, elapsed):
+        def get(name, unit='Requests'):
+            return stats.get(f'{name} [{unit}]')
+
+        requests = get('Total requests')
+        hits = [get('Read hits'), get('Write hits')]
+        misses = [get(f'{name} {kind} misses') for name in ('Read', 'Write')
+                  for kind in ('partial', 'full')]
+        pass_through = [get(f'Pass-Through {name}') for name in ('reads', 'writes')]
+        blocks = [get(f'{name} exported object', '4KiB Blocks')
+                  for name in ('Reads from', 'Writes to')]
+        occupancy = get('Occupancy', '4KiB Blocks')
+        size = (occupancy or 0) + (get('Free', '4KiB Blocks') or 0)
+        previous = (self.stats or {}).get((cache_id, None, None), {})
+
+        inserts = None if None in misses else sum(misses) - sum(filter(None, pass_through))
+        evicted = None
+        if (inserts is not None and requests and None not in blocks and occupancy is not None
+                and previous.get('Occupancy [4KiB Blocks]') is not None):
+            inserted = max(0, inserts) * sum(blocks) / requests
+            evicted = max(0, inserted - (occupancy - previous['Occupancy [4KiB Blocks]']))
+
+        return {
+            'Hit ratio [%]': (
+                100.0 * sum(hits) / requests if requests and None not in hits else None
+            ),
+            'Inserts [1/s]': None if inserts is None else max(0, inserts) / elapsed,
+            'Evictions [MiB/s]': None if evicted is None else evicted * 4096 / 2**20 / elapsed,
+            'Occupancy [%]': 100.0 * occupancy / size if size else None,
+        }
+
+    def _running_level(self, cache_id):
+        """Level closest to current promotion parameters of the cache"""
+        if self.get_params('promotion', cache_id)['policy'] != 'nhit':
+            return 0
+        threshold = int(self.get_params('promotion-nhit', cache_id)['threshold'])
+        for level, params in enumerate(self.levels):
+            if params.get('threshold', 0) >= threshold:
+                return level
+        return len(self.levels) - 1
+
+    def tune(self, topology, delta, elapsed):
+        changes = []
+        for cache_id, cache in topology.caches.items():
+            stats = delta.get((cache_id, None, None))
+            if not self.is_tuned(cache_id) or cache['mode'] is None or stats is None:
+                continue
+
+            state = self.device_state(cache['device'], cache_id)
+            if 'level' not in state:
+                state['level'] = self._running_level(cache_id)
+            current = min(state['level'], len(self.levels) - 1)
+            metrics = self._metrics(cache_id, stats, elapsed)
+            hit_ratio = metrics['Hit ratio [%]']
+            occupancy = metrics['Occupancy [%]']
+            evictions = metrics['Evictions [MiB/s]']
+            trigger = self.levels[max(current, 1)]['trigger']
+
+            picked = current
+            requests = stats.get('Total requests [Requests]') or 0
+            if requests >= self.min_requests and None not in (hit_ratio, occupancy):
+                if occupancy < trigger:
+                    picked = max(current - 1, 0)
+                    reason = 'occupancy below nhit trigger'
+                elif hit_ratio > self.high_hit_ratio:
+                    picked = max(current - 1, 0)
+                    reason = 'hit ratio above high threshold'
+                elif hit_ratio < self.low_hit_ratio and evictions:
+                    picked = min(current + 1, len(self.levels) - 1)
+                    reason = 'hit ratio below low threshold while evicting'
+
+            level = self.settled(state, current, picked)
+            state['level'] = level
+            metrics['Level'] = level
+            if level == current:
+                changes.append(None)
+                continue
+
+            params = dict(self.levels[level])
+            policy = params.pop('policy')
+            if params:
+                changes.append(self.change('promotion-nhit', cache_id, reason, metrics, **params))
+            changes.append(self.change('promotion', cache_id, reason, metrics, policy=policy))
+
+        return changes
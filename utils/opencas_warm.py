@@ -0,0 +1,484 @@
+#
+# Copyright(c) 2026 Huawei Technologies Co., Ltd.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Hot set capture and cache warm-up, see `casctl capture` and `casctl warm`.
+"""
+
+import mmap
+import os
+import queue
+import subprocess
+import threading
+import time
+
+import opencas
+
+
+hot_set_path = '/etc/opencas/hot-set'
+hot_set_sector = 512
+
+
+def read_hot_set(path=hot_set_path):
+    """
+    Stream hot set file, yielding (cache_id, core_id, core device, first
+    sector, sectors) of each extent. The file lists extents of each core,
+    in 512 B sectors, sorted and not overlapping, under header line of the
+    core:
+
+        core <cache id> <core id> <core device>
+        <first sector> <sectors>
+        ...
+
+    Empty lines and lines starting with # are ignored.
+    """
+    core = None
+    end = 0
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            try:
+                if fields[0] == 'core':
+                    if len(fields) != 4:
+                        raise ValueError
+                    core = (int(fields[1]), int(fields[2]), fields[3])
+                    end = 0
+                    continue
+
+                first, sectors = (int(field) for field in fields)
+            except ValueError:
+                raise ValueError(f'{path}:{number}: Invalid line "{line.strip()}"')
+            if core is None:
+                raise ValueError(f'{path}:{number}: Extent before core header')
+            if first < end or sectors <= 0:
+                raise ValueError(f'{path}:{number}: Extents are not sorted or overlap')
+            end = first + sectors
+
+            yield core + (first, sectors)
+
+
+class RateLimiter(object):
+    """Paces threads reading data, so that together they stay below rate [B/s]"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.next = 0.0
+
+    def acquire(self, size):
+        with self.lock:
+            now = time.monotonic()
+            self.next = max(self.next, now)
+            delay = self.next - now
+            self.next += size / self.rate
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Warmer(object):
+    """
+    Read hot set (see read_hot_set()) of cores through their exported
+    objects with O_DIRECT, so that the data gets promoted into empty cache
+    after cold start instead of waiting for the workload to miss it.
+
+    Reads of each extent are repeated to reach insertion threshold of caches
+    using nhit promotion policy. Unless keep_seq_cutoff is set, sequential
+    cutoff of warmed cores is disabled until restore(), as large reads of
+    the warm-up would be passed through otherwise.
+
+    Cores which are not active, whose device is not the one recorded, or
+    whose cache doesn't promote reads (pass-through or write-only mode) are
+    skipped and listed in skipped as ((cache_id, core_id), reason).
+    """
+    alignment = 4096
+    open_flags = os.O_RDONLY | getattr(os, 'O_DIRECT', 0)
+    read_modes = ('wt', 'wb', 'wa')
+
+    def __init__(self, path=hot_set_path, jobs=4, bandwidth=None, io_size=1 << 20, repeat=None,
+                 keep_seq_cutoff=False, topology=None):
+        if io_size <= 0 or io_size % self.alignment:
+            raise ValueError(f'IO size has to be multiple of {self.alignment} B')
+        if jobs < 1:
+            raise ValueError('Number of jobs has to be positive')
+
+        topology = topology or opencas.get_topology()
+        self.path = path
+        self.jobs = jobs
+        self.limiter = RateLimiter(bandwidth) if bandwidth else None
+        self.io_size = io_size
+        self.repeat = repeat
+        self.keep_seq_cutoff = keep_seq_cutoff
+        self.lock = threading.Lock()
+        self.cores = {}
+        self.skipped = []
+        self.repeats = {}
+        self.undo = []
+
+        skipped = set()
+        for key, start, end in self._extents():
+            if key not in self.cores and key not in skipped:
+                reason = self._check_core(topology, key)
+                if reason:
+                    self.skipped.append((key, reason))
+                    skipped.add(key)
+                    continue
+                self.cores[key] = {
+                    'exp_obj': topology.cores[key]['exp_obj'], 'done': 0, 'total': 0
+                }
+            if key in self.cores:
+                self.cores[key]['total'] += end - start
+
+    def _check_core(self, topology, key):
+        core = topology.cores.get(key)
+        if core is None or core['status'] != 'Active':
+            return 'Core is not active'
+        if os.path.realpath(core['device']) != os.path.realpath(self.devices[key]):
+            return f'Core device is {core["device"]}, not {self.devices[key]}'
+        mode = opencas.running_mode(topology.caches[key[0]]['mode'])
+        if mode not in self.read_modes:
+            return f'Cache mode {mode} doesn\'t promote reads'
+        return None
+
+    def _extents(self):
+        """
+        Yield ((cache_id, core_id), start, end) byte ranges of hot set
+        extents aligned for O_DIRECT, with neighbours overlapping after
+        alignment merged
+        """
+        self.devices = {}
+        last = None
+        for cache_id, core_id, device, first, sectors in read_hot_set(self.path):
+            key = (cache_id, core_id)
+            self.devices[key] = device
+            start = first * hot_set_sector // self.alignment * self.alignment
+            end = -(-(first + sectors) * hot_set_sector // self.alignment) * self.alignment
+
+            if last and last[0] == key and start <= last[2]:
+                last = (key, last[1], max(end, last[2]))
+                continue
+            if last:
+                yield last
+            last = (key, start, end)
+        if last:
+            yield last
+
+    def _steps(self, cache_id, core_id):
+        """(step, undo step) pairs preparing core for warm-up"""
+        policy = opencas.get_param_options('seq-cutoff', cache_id, core_id=core_id)['policy']
+        if self.keep_seq_cutoff or policy == 'never':
+            return []
+        return [(
+            opencas.PlanStep(
+                f'Set core {cache_id}-{core_id} sequential cutoff policy {policy} -> never',
+                opencas.casadm.set_param, 'seq-cutoff', cache_id, core_id=core_id, policy='never'
+            ),
+            opencas.PlanStep(
+                f'Set core {cache_id}-{core_id} sequential cutoff policy never -> {policy}',
+                opencas.casadm.set_param, 'seq-cutoff', cache_id, core_id=core_id, policy=policy
+            ),
+        )]
+
+    def start(self, report=None):
+        """
+        Find number of reads promoting data in each cache and prepare cores.
+        report, if given, is called with each PlanStep run. Steps run before
+        a failure are still undone by restore().
+        """
+        for cache_id in sorted({cache_id for cache_id, _ in self.cores}):
+            repeat = self.repeat
+            if repeat is None:
+                repeat = 1
+                if opencas.get_param_options('promotion', cache_id)['policy'] == 'nhit':
+                    repeat = int(opencas.get_param_options('promotion-nhit', cache_id)['threshold'])
+            self.repeats[cache_id] = max(repeat, 1)
+
+        for cache_id, core_id in sorted(self.cores):
+            for step, undo in self._steps(cache_id, core_id):
+                step.run()
+                self.undo.append(undo)
+                if report:
+                    report(step)
+
+    def restore(self, report=None):
+        """
+        Set back everything changed by start(), in reverse order. Errors are
+        collected and raised as CompoundException.
+        """
+        opencas.undo_steps(self.undo, report)
+
+    def progress(self, stats):
+        """
+        Return (cache_id, core_id) -> (bytes read, bytes of hot set, core
+        occupancy [%] of cache) of warmed cores, occupancy taken from
+        get_all_stats() result and None for cores missing there
+        """
+        progress = {}
+        for key, core in self.cores.items():
+            occupancy = None
+            cache = stats.get((key[0], None, None))
+            core_stats = stats.get((key[0], key[1], None))
+            if cache and core_stats:
+                size = cache['Occupancy [4KiB Blocks]'] + cache['Free [4KiB Blocks]']
+                if size:
+                    occupancy = 100.0 * core_stats['Occupancy [4KiB Blocks]'] / size
+            with self.lock:
+                progress[key] = (core['done'], core['total'], occupancy)
+        return progress
+
+    def _produce(self, tasks, stop):
+        try:
+            for key, start, end in self._extents():
+                if key not in self.cores:
+                    continue
+                for offset in range(start, end, self.io_size):
+                    task = (key, offset, min(self.io_size, end - offset))
+                    while not stop.is_set():
+                        try:
+                            tasks.put(task, timeout=1)
+                            break
+                        except queue.Full:
+                            pass
+                    if stop.is_set():
+                        return
+        finally:
+            for _ in range(self.jobs):
+                tasks.put(None)
+
+    def _work(self, tasks, fds, errors, stop):
+        # O_DIRECT needs aligned buffer, mmap gives page aligned one
+        buffer = mmap.mmap(-1, self.io_size)
+        view = memoryview(buffer)
+        try:
+            while True:
+                task = tasks.get()
+                if task is None:
+                    return
+                if stop.is_set():
+                    continue
+
+                key, offset, size = task
+                try:
+                    for _ in range(self.repeats.get(key[0], 1)):
+                        if self.limiter:
+                            self.limiter.acquire(size)
+                        with view[:size] as chunk:
+                            os.preadv(fds[key], [chunk], offset)
+                except OSError as e:
+                    errors.append(
+                        Exception(f'Reading {self.cores[key]["exp_obj"]} failed. Reason:\n{e}')
+                    )
+                    stop.set()
+                    continue
+
+                with self.lock:
+                    self.cores[key]['done'] += size
+        finally:
+            view.release()
+            buffer.close()
+
+    def run(self, interval=5, report=None, stop=None):
+        """
+        Read hot set with jobs threads. report, if given, is called with
+        progress() result every interval seconds and once reading is done.
+        Reading stops early once stop (threading.Event), if given, is set.
+        Return True if whole hot set was read.
+        """
+        stop = stop or threading.Event()
+        tasks = queue.Queue(maxsize=self.jobs * 4)
+        errors = []
+        fds = {}
+        threads = []
+        try:
+            for key, core in self.cores.items():
+                fds[key] = os.open(core['exp_obj'], self.open_flags)
+
+            threads.append(threading.Thread(target=self._produce, args=(tasks, stop)))
+            threads += [
+                threading.Thread(target=self._work, args=(tasks, fds, errors, stop))
+                for _ in range(self.jobs)
+            ]
+            for thread in threads:
+                thread.start()
+
+            running = True
+            while running:
+                deadline = time.monotonic() + interval
+                for thread in threads:
+                    thread.join(max(deadline - time.monotonic(), 0))
+                running = any(thread.is_alive() for thread in threads)
+                if report:
+                    report(self.progress(opencas.get_all_stats()))
+        finally:
+            # Make threads quit early if interrupted
+            stop.set()
+            for thread in threads:
+                thread.join()
+            for fd in fds.values():
+                os.close(fd)
+
+        if errors:
+            raise errors[0]
+        return all(core['done'] == core['total'] for core in self.cores.values())
+
+
+def write_hot_set(cores, path=hot_set_path):
+    """
+    Write hot set file read by read_hot_set(). cores is list of (cache_id,
+    core_id, core device, extents), extents being sorted (first sector,
+    sectors) tuples. File is replaced atomically.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as f:
+        f.write(f'# Open CAS hot set captured {time.strftime("%Y-%m-%d %H:%M:%S")}\n')
+        for cache_id, core_id, device, extents in cores:
+            f.write(f'core {cache_id} {core_id} {device}\n')
+            for first, sectors in extents:
+                f.write(f'{first} {sectors}\n')
+    os.replace(temporary, path)
+
+
+class HotSetCapture(object):
+    """
+    Capture hot set of cores by tracing requests to their exported objects
+    with blktrace. Requests are counted per region of granularity bytes and
+    most accessed regions of each core are kept, up to occupancy of the
+    core in cache (or max_size bytes, if given), so that warm-up doesn't
+    read more than the cache held. Kept regions are written as sorted
+    extents with adjacent ones merged (see write_hot_set()).
+    """
+    blktrace_path = '/usr/sbin/blktrace'
+    blkparse_path = '/usr/bin/blkparse'
+    # major minor RWBS sector sectors
+    blkparse_format = '%M %m %d %S %n\\n'
+    default_granularity = 1 << 16
+
+    def __init__(self, cache_ids=None, granularity=default_granularity, max_size=None,
+                 topology=None):
+        if granularity <= 0 or granularity % hot_set_sector:
+            raise ValueError(f'Granularity has to be multiple of {hot_set_sector} B')
+
+        topology = topology or opencas.get_topology()
+        self.granularity = granularity
+        self.max_size = max_size
+        self.cores = {
+            key: core for key, core in topology.cores.items()
+            if core['status'] == 'Active' and (cache_ids is None or key[0] in cache_ids)
+        }
+        self.counts = {key: {} for key in self.cores}
+
+    def _device_numbers(self):
+        numbers = {}
+        for key, core in self.cores.items():
+            st = os.stat(core['exp_obj'])
+            numbers[(os.major(st.st_rdev), os.minor(st.st_rdev))] = key
+        return numbers
+
+    def add(self, key, sector, sectors):
+        """Count request of sectors starting at sector to core key"""
+        counts = self.counts[key]
+        sectors_per_region = self.granularity // hot_set_sector
+        first = sector // sectors_per_region
+        last = (sector + sectors - 1) // sectors_per_region
+        for region in range(first, last + 1):
+            counts[region] = counts.get(region, 0) + 1
+
+    def parse(self, lines, numbers):
+        """
+        Count requests from blkparse output in blkparse_format, numbers
+        mapping (major, minor) of exported objects to core keys
+        """
+        for line in lines:
+            fields = line.split()
+            if len(fields) != 5:
+                continue
+            try:
+                major, minor, sector, sectors = (int(fields[i]) for i in (0, 1, 3, 4))
+            except ValueError:
+                continue
+            key = numbers.get((major, minor))
+            rwbs = fields[2]
+            # Discards and flushes don't bring data into cache
+            if key is None or sectors <= 0 or 'D' in rwbs or not ('R' in rwbs or 'W' in rwbs):
+                continue
+            self.add(key, sector, sectors)
+
+    def trace(self, duration):
+        """Trace requests queued to exported objects for duration seconds"""
+        numbers = self._device_numbers()
+        if not numbers:
+            return
+
+        blktrace_cmd = [self.blktrace_path, '-a', 'queue', '-w', str(max(int(duration), 1)),
+                        '-o', '-']
+        for core in self.cores.values():
+            blktrace_cmd += ['-d', core['exp_obj']]
+        blkparse_cmd = [self.blkparse_path, '-q', '-i', '-', '-f', self.blkparse_format]
+
+        blktrace = subprocess.Popen(blktrace_cmd, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+        try:
+            blkparse = subprocess.Popen(blkparse_cmd, stdin=blktrace.stdout,
+                                        stdout=subprocess.PIPE, universal_newlines=True)
+        except Exception:
+            blktrace.kill()
+            blktrace.wait()
+            raise
+        # blkparse gets EOF once blktrace exits
+        blktrace.stdout.close()
+        try:
+            self.parse(blkparse.stdout, numbers)
+        finally:
+            blkparse.stdout.close()
+            blkparse.wait()
+            _, stderr = blktrace.communicate()
+
+        if blktrace.returncode:
+            raise Exception(f'blktrace failed. Reason:\n{stderr.decode(errors="replace")}')
+
+    def extents(self, key, limit=None):
+        """
+        Sorted (first sector, sectors) extents of most accessed regions of
+        core key, no more than limit bytes in total
+        """
+        counts = self.counts[key]
+        regions = sorted(counts, key=lambda region: (-counts[region], region))
+        if limit is not None:
+            regions = regions[:limit // self.granularity]
+
+        sectors_per_region = self.granularity // hot_set_sector
+        extents = []
+        for region in sorted(regions):
+            first = region * sectors_per_region
+            if extents and extents[-1][0] + extents[-1][1] == first:
+                extents[-1] = (extents[-1][0], extents[-1][1] + sectors_per_region)
+            else:
+                extents.append((first, sectors_per_region))
+        return extents
+
+    def result(self, stats=None):
+        """
+        List of (cache_id, core_id, core device, extents) of captured cores,
+        as taken by write_hot_set(). Occupancy limiting hot set of each core
+        is taken from get_all_stats() result stats.
+        """
+        if stats is None and self.max_size is None:
+            stats = opencas.get_all_stats()
+        cores = []
+        for key, core in sorted(self.cores.items()):
+            limit = self.max_size
+            if limit is None and key + (None,) in stats:
+                limit = stats[key + (None,)]['Occupancy [4KiB Blocks]'] * 4096
+            cores.append(key + (core['device'], self.extents(key, limit)))
+        return cores
+
+    def capture(self, duration, path=hot_set_path):
+        """Trace cores for duration seconds and write their hot set to path"""
+        self.trace(duration)
+        cores = self.result()
+        write_hot_set(cores, path)
+        return cores